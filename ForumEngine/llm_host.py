@@ -3,11 +3,9 @@
 使用硅基流动的Qwen3模型作为论坛主持人，引导多个agent进行讨论
 """
 
-from openai import OpenAI
 import sys
 import os
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 import re
 
 # 添加项目根目录到Python路径以导入config
@@ -22,6 +20,9 @@ if utils_dir not in sys.path:
     sys.path.append(utils_dir)
 
 from utils.retry_helper import with_graceful_retry, SEARCH_API_RETRY_CONFIG
+# 与各引擎的 LLM 客户端使用同一模块名导入，进程内共享同一份客户端注册表、指标与缓存
+from llm_cache import get_llm_cache
+from llm_registry import build_messages, chat_completion, get_openai_client
 
 
 class ForumHost:
@@ -45,10 +46,8 @@ class ForumHost:
 
         self.base_url = base_url or settings.FORUM_HOST_BASE_URL
 
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
+        # 进程内共享的客户端（同一 base_url 与密钥复用连接池），保留 OpenAI SDK 默认的 2 次重试
+        self.client = get_openai_client(self.api_key, self.base_url, max_retries=2)
         self.model = model_name or settings.FORUM_HOST_MODEL_NAME  # Use configured model
 
         # Track previous summaries to avoid duplicates
@@ -76,13 +75,24 @@ class ForumHost:
             system_prompt = self._build_system_prompt()
             user_prompt = self._build_user_prompt(parsed_content)
             
-            # 调用API生成发言
-            response = self._call_qwen_api(system_prompt, user_prompt)
+            # 调用LLM；开启LLM响应缓存时，相同的提示词直接复用上次成功生成的发言
+            cache = get_llm_cache("ForumHost")
+            cache_params = {"temperature": 0.6, "top_p": 0.9}
+            cached = cache.lookup("ForumHost", self.model, system_prompt, user_prompt, cache_params) if cache else None
+            if cached is not None:
+                response = {"success": True, "content": cached}
+            else:
+                response = self._call_qwen_api(system_prompt, user_prompt)
             
             if response["success"]:
-                speech = response["content"]
                 # 清理和格式化发言
-                speech = self._format_host_speech(speech)
+                speech = self._format_host_speech(response["content"])
+                # 只缓存格式化后非空的发言；命中的条目为空时清除
+                if cache is not None:
+                    if speech and cached is None:
+                        cache.store("ForumHost", self.model, system_prompt, user_prompt, response["content"], cache_params)
+                    elif not speech and cached is not None:
+                        cache.evict("ForumHost", self.model, system_prompt, user_prompt, cache_params)
                 return speech
             else:
                 print(f"ForumHost: API调用失败 - {response.get('error', '未知错误')}")
@@ -211,19 +221,11 @@ class ForumHost:
     def _call_qwen_api(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         """调用Qwen API"""
         try:
-            current_time = datetime.now().strftime("%Y年%m月%d日%H时%M分")
-            time_prefix = f"今天的实际时间是{current_time}"
-            if user_prompt:
-                user_prompt = f"{time_prefix}\n{user_prompt}"
-            else:
-                user_prompt = time_prefix
-                
-            response = self.client.chat.completions.create(
+            response = chat_completion(
+                self.client,
+                "ForumHost",
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=build_messages(system_prompt, user_prompt),
                 temperature=0.6,
                 top_p=0.9,
             )
@@ -6,11 +6,13 @@ Deep Search Agent主类
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Union, Callable
 from loguru import logger
 
-from .llms import LLMClient
+from .llms import LLMClient, AsyncLLMClient
+from .llms.base import ENGINE_NAME
 from .nodes import (
     ReportStructureNode,
     FirstSearchNode, 
@@ -39,13 +41,16 @@ class DeepSearchAgent:
         
         # 初始化LLM客户端
         self.llm_client = self._initialize_llm()
+        self.async_llm_client = self._initialize_async_llm()
         
         
         # 初始化搜索工具集
         self.search_agency = MediaCrawlerDB()
         
-        # 初始化情感分析器
+        # 初始化情感分析器：模型在后台线程中预热，首次搜索只在确实需要模型时才等待
         self.sentiment_analyzer = multilingual_sentiment_analyzer
+        if self.config.SENTIMENT_WARMUP_ENABLED and self.sentiment_analyzer.warm_up():
+            logger.info("情感分析模型正在后台预热")
         
         # 初始化节点
         self._initialize_nodes()
@@ -64,17 +69,35 @@ class DeepSearchAgent:
     def _initialize_llm(self) -> LLMClient:
         """初始化LLM客户端"""
         return LLMClient(
+            ENGINE_NAME,
             api_key=self.config.INSIGHT_ENGINE_API_KEY,
             model_name=self.config.INSIGHT_ENGINE_MODEL_NAME,
             base_url=self.config.INSIGHT_ENGINE_BASE_URL,
+            max_concurrency=self.config.INSIGHT_ENGINE_LLM_MAX_CONCURRENCY,
+            requests_per_second=self.config.INSIGHT_ENGINE_LLM_REQUESTS_PER_SECOND,
+        )
+    
+    def _initialize_async_llm(self) -> AsyncLLMClient:
+        """初始化异步LLM客户端（段落总结节点经由它在共享事件循环上并发等待LLM调用）"""
+        return AsyncLLMClient(
+            ENGINE_NAME,
+            api_key=self.config.INSIGHT_ENGINE_API_KEY,
+            model_name=self.config.INSIGHT_ENGINE_MODEL_NAME,
+            base_url=self.config.INSIGHT_ENGINE_BASE_URL,
+            max_concurrency=self.config.INSIGHT_ENGINE_LLM_MAX_CONCURRENCY,
+            requests_per_second=self.config.INSIGHT_ENGINE_LLM_REQUESTS_PER_SECOND,
+            max_connections=self.config.LLM_MAX_CONNECTIONS,
+            timeout=self.llm_client.timeout,
         )
     
     def _initialize_nodes(self):
         """初始化处理节点"""
         self.first_search_node = FirstSearchNode(self.llm_client)
         self.reflection_node = ReflectionNode(self.llm_client)
-        self.first_summary_node = FirstSummaryNode(self.llm_client)
-        self.reflection_summary_node = ReflectionSummaryNode(self.llm_client)
+        # 总结节点的调用最长，经异步客户端执行：各段落工作线程的请求在同一事件循环上并发等待、共用连接池
+        summary_llm_client = self.async_llm_client.blocking()
+        self.first_summary_node = FirstSummaryNode(summary_llm_client, self.config.SUMMARY_PROMPT_TOKEN_BUDGET)
+        self.reflection_summary_node = ReflectionSummaryNode(summary_llm_client, self.config.SUMMARY_PROMPT_TOKEN_BUDGET)
         self.report_formatting_node = ReportFormattingNode(self.llm_client)
     
     def _validate_date_format(self, date_str: str) -> bool:
@@ -167,60 +190,61 @@ class DeepSearchAgent:
         logger.info(f"  🔍 原始查询: '{query}'")
         logger.info(f"  ✨ 优化后关键词: {optimized_response.optimized_keywords}")
         
-        # 使用优化后的关键词进行多次查询并整合结果
-        all_results = []
-        total_count = 0
+        # 所有优化后的关键词合并为一次多关键词查询（每张表一条SQL），结果中标注命中的关键词；
+        # 条数上限按关键词数放大，与逐个关键词查询时的总召回量一致
+        keywords = optimized_response.optimized_keywords
+        keyword_count = max(len(keywords), 1)
+        unique_results = []
+        streamed_sentiment = None
         
-        for keyword in optimized_response.optimized_keywords:
-            logger.info(f"    查询关键词: '{keyword}'")
+        try:
+            if tool_name == "search_topic_globally":
+                # 使用配置文件中的默认值，忽略agent提供的limit_per_table参数
+                limit_per_table = self.config.DEFAULT_SEARCH_TOPIC_GLOBALLY_LIMIT_PER_TABLE * keyword_count
+                response = self.search_agency.search_topic_globally(topic=keywords, limit_per_table=limit_per_table)
+            elif tool_name == "search_topic_by_date":
+                start_date = kwargs.get("start_date")
+                end_date = kwargs.get("end_date")
+                # 使用配置文件中的默认值，忽略agent提供的limit_per_table参数
+                limit_per_table = self.config.DEFAULT_SEARCH_TOPIC_BY_DATE_LIMIT_PER_TABLE * keyword_count
+                if not start_date or not end_date:
+                    raise ValueError("search_topic_by_date工具需要start_date和end_date参数")
+                response = self.search_agency.search_topic_by_date(topic=keywords, start_date=start_date, end_date=end_date, limit_per_table=limit_per_table)
+            elif tool_name == "get_comments_for_topic":
+                # 每个关键词分得配置值的一份，但保证最小值
+                limit = max(self.config.DEFAULT_GET_COMMENTS_FOR_TOPIC_LIMIT // keyword_count, 50) * keyword_count
+                response = None
+                if kwargs.get("enable_sentiment", True) and limit > self.config.SENTIMENT_STREAM_THRESHOLD:
+                    # 大批量评论：情感分析按游标流式覆盖全部 limit 条，返回给LLM的样本取流中的前阈值条，只读一遍数据库
+                    sample_size = self.config.SENTIMENT_STREAM_THRESHOLD
+                    sample, streamed_sentiment = self._stream_comment_sentiment(keywords, limit, sample_size)
+                    if sample:
+                        response = DBResponse("get_comments_for_topic", {"topic": keywords, "limit": sample_size},
+                                              results=sample, results_count=len(sample))
+                    limit = sample_size
+                if response is None:
+                    response = self.search_agency.get_comments_for_topic(topic=keywords, limit=limit)
+            elif tool_name == "search_topic_on_platform":
+                platform = kwargs.get("platform")
+                start_date = kwargs.get("start_date")
+                end_date = kwargs.get("end_date")
+                # 每个关键词分得配置值的一份，但保证最小值
+                limit = max(self.config.DEFAULT_SEARCH_TOPIC_ON_PLATFORM_LIMIT // keyword_count, 30) * keyword_count
+                if not platform:
+                    raise ValueError("search_topic_on_platform工具需要platform参数")
+                response = self.search_agency.search_topic_on_platform(platform=platform, topic=keywords, start_date=start_date, end_date=end_date, limit=limit)
+            else:
+                logger.info(f"    未知的搜索工具: {tool_name}，使用默认全局搜索")
+                response = self.search_agency.search_topic_globally(topic=keywords, limit_per_table=self.config.DEFAULT_SEARCH_TOPIC_GLOBALLY_LIMIT_PER_TABLE * keyword_count)
             
-            try:
-                if tool_name == "search_topic_globally":
-                    # 使用配置文件中的默认值，忽略agent提供的limit_per_table参数
-                    limit_per_table = self.config.DEFAULT_SEARCH_TOPIC_GLOBALLY_LIMIT_PER_TABLE
-                    response = self.search_agency.search_topic_globally(topic=keyword, limit_per_table=limit_per_table)
-                elif tool_name == "search_topic_by_date":
-                    start_date = kwargs.get("start_date")
-                    end_date = kwargs.get("end_date")
-                    # 使用配置文件中的默认值，忽略agent提供的limit_per_table参数
-                    limit_per_table = self.config.DEFAULT_SEARCH_TOPIC_BY_DATE_LIMIT_PER_TABLE
-                    if not start_date or not end_date:
-                        raise ValueError("search_topic_by_date工具需要start_date和end_date参数")
-                    response = self.search_agency.search_topic_by_date(topic=keyword, start_date=start_date, end_date=end_date, limit_per_table=limit_per_table)
-                elif tool_name == "get_comments_for_topic":
-                    # 使用配置文件中的默认值，按关键词数量分配，但保证最小值
-                    limit = self.config.DEFAULT_GET_COMMENTS_FOR_TOPIC_LIMIT // len(optimized_response.optimized_keywords)
-                    limit = max(limit, 50)
-                    response = self.search_agency.get_comments_for_topic(topic=keyword, limit=limit)
-                elif tool_name == "search_topic_on_platform":
-                    platform = kwargs.get("platform")
-                    start_date = kwargs.get("start_date")
-                    end_date = kwargs.get("end_date")
-                    # 使用配置文件中的默认值，按关键词数量分配，但保证最小值
-                    limit = self.config.DEFAULT_SEARCH_TOPIC_ON_PLATFORM_LIMIT // len(optimized_response.optimized_keywords)
-                    limit = max(limit, 30)
-                    if not platform:
-                        raise ValueError("search_topic_on_platform工具需要platform参数")
-                    response = self.search_agency.search_topic_on_platform(platform=platform, topic=keyword, start_date=start_date, end_date=end_date, limit=limit)
-                else:
-                    logger.info(f"    未知的搜索工具: {tool_name}，使用默认全局搜索")
-                    response = self.search_agency.search_topic_globally(topic=keyword, limit_per_table=self.config.DEFAULT_SEARCH_TOPIC_GLOBALLY_LIMIT_PER_TABLE)
-                
-                # 收集结果
-                if response.results:
-                    logger.info(f"     找到 {len(response.results)} 条结果")
-                    all_results.extend(response.results)
-                    total_count += len(response.results)
-                else:
-                    logger.info(f"     未找到结果")
-                    
-            except Exception as e:
-                logger.error(f"      查询'{keyword}'时出错: {str(e)}")
-                continue
-        
-        # 去重和整合结果
-        unique_results = self._deduplicate_results(all_results)
-        logger.info(f"  总计找到 {total_count} 条结果，去重后 {len(unique_results)} 条")
+            if response.error_message:
+                logger.error(f"      查询{keywords}时出错: {response.error_message}")
+            
+            # 去重和整合结果（单次遍历）
+            unique_results = self._deduplicate_results(response.results)
+            logger.info(f"  总计找到 {len(response.results)} 条结果，去重后 {len(unique_results)} 条")
+        except Exception as e:
+            logger.error(f"      查询{keywords}时出错: {str(e)}")
         
         # 构建整合后的响应
         integrated_response = DBResponse(
@@ -237,7 +261,9 @@ class DeepSearchAgent:
         
         # 检查是否需要进行情感分析
         enable_sentiment = kwargs.get("enable_sentiment", True)
-        if enable_sentiment and unique_results and len(unique_results) > 0:
+        if enable_sentiment and streamed_sentiment:
+            integrated_response.parameters["sentiment_analysis"] = streamed_sentiment
+        elif enable_sentiment and unique_results and len(unique_results) > 0:
             logger.info(f"  🎭 开始对搜索结果进行情感分析...")
             sentiment_analysis = self._perform_sentiment_analysis(unique_results)
             if sentiment_analysis:
@@ -251,15 +277,21 @@ class DeepSearchAgent:
         """
         去重搜索结果
         """
-        seen = set()
+        seen = {}
         unique_results = []
         
         for result in results:
             # 使用URL或内容作为去重标识
             identifier = result.url if result.url else result.title_or_content[:100]
             if identifier not in seen:
-                seen.add(identifier)
+                seen[identifier] = result
                 unique_results.append(result)
+            else:
+                # 合并重复记录命中的关键词
+                kept = seen[identifier]
+                for keyword in getattr(result, "matched_keywords", []):
+                    if keyword not in kept.matched_keywords:
+                        kept.matched_keywords.append(keyword)
         
         return unique_results
     
@@ -274,13 +306,24 @@ class DeepSearchAgent:
             情感分析结果字典，如果失败则返回None
         """
         try:
+            # 结果均已离线打分时无需加载模型
+            needs_model = any(getattr(result, "sentiment_label", None) is None for result in results)
+
             # 初始化情感分析器（如果尚未初始化且未被禁用）
-            if not self.sentiment_analyzer.is_initialized and not self.sentiment_analyzer.is_disabled:
-                logger.info("    初始化情感分析模型...")
-                if not self.sentiment_analyzer.initialize():
-                    logger.info("     情感分析模型初始化失败，将直接透传原始文本")
-            elif self.sentiment_analyzer.is_disabled:
-                logger.info("     情感分析功能已禁用，直接透传原始文本")
+            if not needs_model:
+                logger.info("    使用离线预计算的情感结果")
+            else:
+                self._ensure_sentiment_model()
+
+            if len(results) > self.config.SENTIMENT_STREAM_THRESHOLD:
+                # 结果很多时分批推理、增量汇总，不再为全部结果构建字典与逐条结果
+                batch_size = max(1, self.config.SENTIMENT_STREAM_BATCH_SIZE)
+                sentiment_analysis = None
+                for sentiment_analysis in self.sentiment_analyzer.analyze_stream(
+                    results[start:start + batch_size] for start in range(0, len(results), batch_size)
+                ):
+                    pass
+                return sentiment_analysis
 
             # 将查询结果转换为字典格式
             results_dict = []
@@ -290,7 +333,9 @@ class DeepSearchAgent:
                     "platform": result.platform,
                     "author": result.author_nickname,
                     "url": result.url,
-                    "publish_time": str(result.publish_time) if result.publish_time else None
+                    "publish_time": str(result.publish_time) if result.publish_time else None,
+                    "sentiment_label": getattr(result, "sentiment_label", None),
+                    "sentiment_confidence": getattr(result, "sentiment_confidence", None)
                 }
                 results_dict.append(result_dict)
             
@@ -307,6 +352,84 @@ class DeepSearchAgent:
             logger.exception(f"    ❌ 情感分析过程中发生错误: {str(e)}")
             return None
     
+    def _stream_comment_sentiment(self, keywords: List[str], max_results: int,
+                                  sample_size: int) -> Tuple[List, Optional[Dict[str, Any]]]:
+        """
+        流式分析话题评论的情感，同时收集流中的前 sample_size 条作为返回给LLM的样本
+
+        Returns:
+            (评论样本, 情感分析结果)；分析失败时情感分析结果为 None，样本保留已读取的部分
+        """
+        sample: List = []
+
+        def collect(batch: List) -> None:
+            if len(sample) < sample_size:
+                sample.extend(batch[:sample_size - len(sample)])
+
+        try:
+            logger.info(f"  🎭 开始流式情感分析（最多 {max_results} 条评论）...")
+            sentiment_analysis = None
+            for sentiment_analysis in self.stream_topic_sentiment(keywords, max_results=max_results, on_batch=collect):
+                logger.info(f"    已分析 {sentiment_analysis.get('processed', 0)} 条评论")
+            if sentiment_analysis:
+                logger.info(f"  ✅ 情感分析完成")
+            return sample, sentiment_analysis
+        except Exception as e:
+            logger.exception(f"    ❌ 流式情感分析过程中发生错误: {str(e)}")
+            return sample, None
+
+    def _ensure_sentiment_model(self) -> None:
+        """按需加载情感分析模型（后台预热进行中时等待其完成）"""
+        if not self.sentiment_analyzer.is_initialized and not self.sentiment_analyzer.is_disabled:
+            if self.sentiment_analyzer.is_warming_up:
+                logger.info("    等待情感分析模型预热完成...")
+            else:
+                logger.info("    初始化情感分析模型...")
+            if not self.sentiment_analyzer.initialize():
+                logger.info("     情感分析模型初始化失败，将直接透传原始文本")
+        elif self.sentiment_analyzer.is_disabled:
+            logger.info("     情感分析功能已禁用，直接透传原始文本")
+
+    def stream_topic_sentiment(
+        self,
+        topic: Union[str, List[str]],
+        platform: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        max_results: Optional[int] = None,
+        on_batch: Optional[Callable[[List[Any]], None]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        流式分析话题评论的情感：数据库游标分批读取 -> 预处理 -> 分词 -> 推理 -> 增量汇总
+
+        内存占用与评论总数无关。每处理完一批产出一次部分汇总（含 processed 已处理条数），
+        可用于进度展示；最后一次产出即最终结果，结构与 _perform_sentiment_analysis 的返回值一致。
+
+        Args:
+            topic: 话题关键词或关键词列表
+            platform: 只分析指定平台的评论
+            start_date: 开始日期 'YYYY-MM-DD'（需与 end_date 同时提供）
+            end_date: 结束日期 'YYYY-MM-DD'
+            max_results: 评论总数上限，默认不限
+            on_batch: 每读到一批评论（分析之前）时回调，可用于复用同一次读取的结果
+        """
+        self._ensure_sentiment_model()
+        batches = self.search_agency.stream_comments_for_topic(
+            topic, platform=platform, start_date=start_date, end_date=end_date,
+            batch_size=self.config.SENTIMENT_STREAM_BATCH_SIZE, max_results=max_results
+        )
+
+        def observed() -> Iterator[List[Any]]:
+            for batch in batches:
+                on_batch(batch)
+                yield batch
+
+        try:
+            yield from self.sentiment_analyzer.analyze_stream(observed() if on_batch else batches)
+        finally:
+            # 调用方提前结束迭代或出错时释放数据库游标
+            batches.close()
+
     def analyze_sentiment_only(self, texts: Union[str, List[str]]) -> Dict[str, Any]:
         """
         独立的情感分析工具
@@ -322,7 +445,10 @@ class DeepSearchAgent:
         try:
             # 初始化情感分析器（如果尚未初始化且未被禁用）
             if not self.sentiment_analyzer.is_initialized and not self.sentiment_analyzer.is_disabled:
-                logger.info("    初始化情感分析模型...")
+                if self.sentiment_analyzer.is_warming_up:
+                    logger.info("    等待情感分析模型预热完成...")
+                else:
+                    logger.info("    初始化情感分析模型...")
                 if not self.sentiment_analyzer.initialize():
                     logger.info("     情感分析模型初始化失败，将直接透传原始文本")
             elif self.sentiment_analyzer.is_disabled:
@@ -399,6 +525,8 @@ class DeepSearchAgent:
                 self._save_report(final_report)
 
             logger.info("深度研究完成！")
+            logger.info(f"查询结果缓存统计: {self.search_agency.cache_stats()}")
+            logger.info(f"LLM调用统计: {self.llm_client.get_metrics()}")
             
             return final_report
             
@@ -421,25 +549,48 @@ class DeepSearchAgent:
             _message += f"\n  {i}. {paragraph.title}"
         logger.info(_message)
     
-    def _process_paragraphs(self):
-        """处理所有段落"""
+    def _process_paragraphs(self, on_paragraph_done: Optional[Callable[[int, int], None]] = None):
+        """
+        处理所有段落
+        
+        段落之间在生成最终报告前互不依赖，按 PARAGRAPH_CONCURRENCY 并发研究；每个段落只写 State 中
+        自己下标处的数据，报告顺序与结构保持一致。LLM 请求数另由 LLM 客户端的并发上限约束。
+        
+        Args:
+            on_paragraph_done: 可选回调 (已完成段落数, 段落总数)，在调用线程中执行，用于更新进度
+        """
         total_paragraphs = len(self.state.paragraphs)
+        workers = max(1, min(self.config.PARAGRAPH_CONCURRENCY, total_paragraphs))
+        if workers > 1:
+            logger.info(f"\n[步骤 2] 并行处理 {total_paragraphs} 个段落（并发数 {workers}）")
         
-        for i in range(total_paragraphs):
-            logger.info(f"\n[步骤 2.{i+1}] 处理段落: {self.state.paragraphs[i].title}")
-            logger.info("-" * 50)
-            
-            # 初始搜索和总结
-            self._initial_search_and_summary(i)
-            
-            # 反思循环
-            self._reflection_loop(i)
-            
-            # 标记段落完成
-            self.state.paragraphs[i].research.mark_completed()
-            
-            progress = (i + 1) / total_paragraphs * 100
-            logger.info(f"段落处理完成 ({progress:.1f}%)")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="paragraph") as executor:
+            futures = [executor.submit(self._process_paragraph, i) for i in range(total_paragraphs)]
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    logger.info(f"段落处理完成 ({done / total_paragraphs * 100:.1f}%)")
+                    if on_paragraph_done:
+                        on_paragraph_done(done, total_paragraphs)
+            except BaseException:
+                # 任一段落失败时不再启动排队中的段落
+                for future in futures:
+                    future.cancel()
+                raise
+    
+    def _process_paragraph(self, paragraph_index: int):
+        """研究单个段落：初始搜索与总结、反思循环"""
+        logger.info(f"\n[步骤 2.{paragraph_index + 1}] 处理段落: {self.state.paragraphs[paragraph_index].title}")
+        logger.info("-" * 50)
+        
+        # 初始搜索和总结
+        self._initial_search_and_summary(paragraph_index)
+        
+        # 反思循环
+        self._reflection_loop(paragraph_index)
+        
+        # 标记段落完成
+        self.state.paragraphs[paragraph_index].research.mark_completed()
     
     def _initial_search_and_summary(self, paragraph_index: int):
         """执行初始搜索和总结"""
@@ -537,7 +688,7 @@ class DeepSearchAgent:
                     'platform': result.platform,
                     'content_type': result.content_type,
                     'author': result.author_nickname,
-                    'engagement': result.engagement
+                    'engagement': result.engagement.to_dict()
                 })
         
         if search_results:
@@ -670,7 +821,7 @@ class DeepSearchAgent:
                         'platform': result.platform,
                         'content_type': result.content_type,
                         'author': result.author_nickname,
-                        'engagement': result.engagement
+                        'engagement': result.engagement.to_dict()
                     })
             
             if search_results:
@@ -755,8 +906,10 @@ class DeepSearchAgent:
             logger.info(f"状态已保存到: {state_filepath}")
     
     def get_progress_summary(self) -> Dict[str, Any]:
-        """获取进度摘要"""
-        return self.state.get_progress_summary()
+        """获取进度摘要（附带数据库查询结果缓存的命中统计）"""
+        summary = self.state.get_progress_summary()
+        summary["query_cache"] = self.search_agency.cache_stats()
+        return summary
     
     def load_state(self, filepath: str):
         """从文件加载状态"""
@@ -3,6 +3,6 @@ LLM module
 Provides a unified OpenAI-compatible client for the Insight Engine.
 """
 
-from .base import LLMClient
+from .base import AsyncLLMClient, LLMClient
 
-__all__ = ["LLMClient"]
+__all__ = ["LLMClient", "AsyncLLMClient"]
@@ -16,7 +16,8 @@ from ..utils.text_processing import (
     clean_json_tags,
     extract_clean_response,
     fix_incomplete_json,
-    format_search_results_for_prompt
+    format_search_results_for_prompt,
+    is_valid_json_output
 )
 
 # 导入论坛读取工具
@@ -30,18 +31,22 @@ except ImportError:
     FORUM_READER_AVAILABLE = False
     logger.warning("无法导入forum_reader模块，将跳过HOST发言读取功能")
 
+from utils.prompt_budget import budget_summary_input
+
 
 class FirstSummaryNode(StateMutationNode):
     """根据搜索结果生成段落首次总结的节点"""
     
-    def __init__(self, llm_client):
+    def __init__(self, llm_client, token_budget: int = 0):
         """
         初始化首次总结节点
         
         Args:
             llm_client: LLM客户端
+            token_budget: 提示词token预算，超出时按相关度裁剪搜索结果（0表示不限）
         """
         super().__init__(llm_client, "FirstSummaryNode")
+        self.token_budget = token_budget
     
     def validate_input(self, input_data: Any) -> bool:
         """验证输入数据"""
@@ -89,18 +94,26 @@ class FirstSummaryNode(StateMutationNode):
                 except Exception as e:
                     logger.exception(f"读取HOST发言失败: {str(e)}")
             
-            # 转换为JSON字符串
-            message = json.dumps(data, ensure_ascii=False)
+            # 按token预算装入搜索结果（与查询最相关的优先），并记录各部分token数
+            data = budget_summary_input(self.node_name, SYSTEM_PROMPT_FIRST_SUMMARY, data, self.token_budget)
             
-            # 如果有HOST发言，添加到消息前面作为参考
+            # 如果有HOST发言，添加到消息前面作为参考（不再重复写入JSON）
+            formatted_host = ""
             if FORUM_READER_AVAILABLE and 'host_speech' in data and data['host_speech']:
-                formatted_host = format_host_speech_for_prompt(data['host_speech'])
-                message = formatted_host + "\n" + message
+                formatted_host = format_host_speech_for_prompt(data.pop('host_speech')) + "\n"
+            
+            # 转换为JSON字符串
+            message = formatted_host + json.dumps(data, ensure_ascii=False)
             
             logger.info("正在生成首次段落总结")
             
             # 调用LLM（流式，安全拼接UTF-8）
-            response = self.llm_client.stream_invoke_to_string(SYSTEM_PROMPT_FIRST_SUMMARY, message)
+            response = self.llm_client.stream_invoke_to_string(
+                SYSTEM_PROMPT_FIRST_SUMMARY,
+                message,
+                cache_node=self.node_name,
+                validate=lambda output: is_valid_json_output(output, ["paragraph_latest_state"]),
+            )
             
             # 处理响应
             processed_response = self.process_output(response)
@@ -199,14 +212,16 @@ class FirstSummaryNode(StateMutationNode):
 class ReflectionSummaryNode(StateMutationNode):
     """根据反思搜索结果更新段落总结的节点"""
     
-    def __init__(self, llm_client):
+    def __init__(self, llm_client, token_budget: int = 0):
         """
         初始化反思总结节点
         
         Args:
             llm_client: LLM客户端
+            token_budget: 提示词token预算，超出时按相关度裁剪搜索结果（0表示不限）
         """
         super().__init__(llm_client, "ReflectionSummaryNode")
+        self.token_budget = token_budget
     
     def validate_input(self, input_data: Any) -> bool:
         """验证输入数据"""
@@ -254,18 +269,26 @@ class ReflectionSummaryNode(StateMutationNode):
                 except Exception as e:
                     logger.exception(f"读取HOST发言失败: {str(e)}")
             
-            # 转换为JSON字符串
-            message = json.dumps(data, ensure_ascii=False)
+            # 按token预算装入搜索结果（与查询最相关的优先），并记录各部分token数
+            data = budget_summary_input(self.node_name, SYSTEM_PROMPT_REFLECTION_SUMMARY, data, self.token_budget)
             
-            # 如果有HOST发言，添加到消息前面作为参考
+            # 如果有HOST发言，添加到消息前面作为参考（不再重复写入JSON）
+            formatted_host = ""
             if FORUM_READER_AVAILABLE and 'host_speech' in data and data['host_speech']:
-                formatted_host = format_host_speech_for_prompt(data['host_speech'])
-                message = formatted_host + "\n" + message
+                formatted_host = format_host_speech_for_prompt(data.pop('host_speech')) + "\n"
+            
+            # 转换为JSON字符串
+            message = formatted_host + json.dumps(data, ensure_ascii=False)
             
             logger.info("正在生成反思总结")
             
             # 调用LLM（流式，安全拼接UTF-8）
-            response = self.llm_client.stream_invoke_to_string(SYSTEM_PROMPT_REFLECTION_SUMMARY, message)
+            response = self.llm_client.stream_invoke_to_string(
+                SYSTEM_PROMPT_REFLECTION_SUMMARY,
+                message,
+                cache_node=self.node_name,
+                validate=lambda output: is_valid_json_output(output, ["paragraph_latest_state"]),
+            )
             
             # 处理响应
             processed_response = self.process_output(response)
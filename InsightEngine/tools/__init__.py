@@ -6,6 +6,7 @@
 from .search import (
     MediaCrawlerDB,
     QueryResult,
+    Engagement,
     DBResponse,
     print_response_summary
 )
@@ -25,6 +26,7 @@ from .sentiment_analyzer import (
 __all__ = [
     "MediaCrawlerDB",
     "QueryResult",
+    "Engagement",
     "DBResponse",
     "print_response_summary",
     "KeywordOptimizer",
@@ -3,7 +3,6 @@
 使用Qwen AI将Agent生成的搜索词优化为更适合舆情数据库查询的关键词
 """
 
-from openai import OpenAI
 import json
 import sys
 import os
@@ -23,6 +22,8 @@ if utils_dir not in sys.path:
     sys.path.append(utils_dir)
 
 from retry_helper import with_graceful_retry, SEARCH_API_RETRY_CONFIG
+from llm_cache import get_llm_cache
+from llm_registry import chat_completion, get_openai_client
 
 @dataclass
 class KeywordOptimizationResponse:
@@ -54,10 +55,8 @@ class KeywordOptimizer:
 
         self.base_url = base_url or settings.KEYWORD_OPTIMIZER_BASE_URL
 
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
+        # 进程内共享的客户端（同一 base_url 与密钥复用连接池），保留 OpenAI SDK 默认的 2 次重试
+        self.client = get_openai_client(self.api_key, self.base_url, max_retries=2)
         self.model = model_name or settings.KEYWORD_OPTIMIZER_MODEL_NAME
     
     def optimize_keywords(self, original_query: str, context: str = "") -> KeywordOptimizationResponse:
@@ -78,8 +77,14 @@ class KeywordOptimizer:
             system_prompt = self._build_system_prompt()
             user_prompt = self._build_user_prompt(original_query, context)
             
-            # 调用Qwen API
-            response = self._call_qwen_api(system_prompt, user_prompt)
+            # 调用LLM；开启LLM响应缓存时，相同的提示词直接复用上次成功解析的结果
+            cache = get_llm_cache("KeywordOptimizer")
+            cache_params = {"temperature": 0.7}
+            cached = cache.lookup("KeywordOptimizer", self.model, system_prompt, user_prompt, cache_params) if cache else None
+            if cached is not None:
+                response = {"success": True, "content": cached}
+            else:
+                response = self._call_qwen_api(system_prompt, user_prompt)
             
             if response["success"]:
                 # 解析响应
@@ -98,6 +103,13 @@ class KeywordOptimizer:
                     # 验证关键词质量
                     validated_keywords = self._validate_keywords(keywords)
                     
+                    # 只缓存解析出有效关键词的响应；命中的条目解析不出关键词时清除
+                    if cache is not None:
+                        if not validated_keywords and cached is not None:
+                            cache.evict("KeywordOptimizer", self.model, system_prompt, user_prompt, cache_params)
+                        elif validated_keywords and cached is None:
+                            cache.store("KeywordOptimizer", self.model, system_prompt, user_prompt, content, cache_params)
+                    
                     logger.info(
                         f"✅ 优化成功: {len(validated_keywords)}个关键词" +
                         ("" if not validated_keywords else "\n" +
@@ -115,6 +127,8 @@ class KeywordOptimizer:
                 
                 except Exception as e:
                     logger.exception(f"⚠️ 解析响应失败，使用备用方案: {str(e)}")
+                    if cached is not None:
+                        cache.evict("KeywordOptimizer", self.model, system_prompt, user_prompt, cache_params)
                     # 备用方案：从原始查询中提取关键词
                     fallback_keywords = self._fallback_keyword_extraction(original_query)
                     return KeywordOptimizationResponse(
@@ -192,7 +206,9 @@ class KeywordOptimizer:
     def _call_qwen_api(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         """调用Qwen API"""
         try:
-            response = self.client.chat.completions.create(
+            response = chat_completion(
+                self.client,
+                "KeywordOptimizer",
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -0,0 +1,149 @@
+"""
+QueryResult 内存与耗时基准测试
+
+对比两种结果表示在「构建 N 条结果 + 按 URL/正文前缀去重」这一典型工具调用路径上的开销：
+
+- dict:  原实现，普通 dataclass（每实例 __dict__）+ 每条结果一个 engagement dict
+- slots: 当前实现，QueryResult 使用 __slots__，互动指标为固定字段的 Engagement
+
+使用合成数据，不依赖数据库。
+
+用法:
+    python -m InsightEngine.tools.result_benchmark
+    python -m InsightEngine.tools.result_benchmark --rows 50000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from .search import Engagement, QueryResult
+
+__all__ = ["benchmark"]
+
+
+@dataclass
+class _DictQueryResult:
+    """原 QueryResult 的等价实现，仅用于对比"""
+    platform: str
+    content_type: str
+    title_or_content: str
+    author_nickname: Optional[str] = None
+    url: Optional[str] = None
+    publish_time: Optional[datetime] = None
+    engagement: Dict[str, int] = field(default_factory=dict)
+    source_keyword: Optional[str] = None
+    hotness_score: float = 0.0
+    source_table: str = ""
+    matched_keywords: List[str] = field(default_factory=list)
+
+
+def _synthetic_rows(rows: int) -> List[Dict[str, Any]]:
+    rng = random.Random(42)
+    platforms = ['bilibili', 'douyin', 'kuaishou', 'weibo', 'xhs', 'zhihu', 'tieba']
+    # 约 20% 的行与其他行重复（转发/重复抓取），用于触发去重逻辑
+    distinct = max(1, int(rows * 0.8))
+    data = []
+    for idx in range(rows):
+        key = idx if idx < distinct else rng.randrange(distinct)
+        data.append({
+            'platform': platforms[key % len(platforms)], 'content': f"话题相关内容{key} " + "评论文本" * 10,
+            'author': f"user_{key}", 'url': f"https://example.com/{key}", 'publish_ts': 1_700_000_000_000 + key,
+            'likes_num': rng.randint(0, 10_000), 'comments_num': rng.randint(0, 1_000), 'shares_num': rng.randint(0, 500),
+        })
+    return data
+
+
+def _build_dict(rows: List[Dict[str, Any]]) -> List[Any]:
+    return [_DictQueryResult(
+        platform=r['platform'], content_type='note', title_or_content=r['content'], author_nickname=r['author'],
+        url=r['url'], publish_time=datetime.fromtimestamp(r['publish_ts'] / 1000),
+        engagement={'likes': r['likes_num'], 'comments': r['comments_num'], 'shares': r['shares_num']},
+        source_table='weibo_note', matched_keywords=['话题'],
+    ) for r in rows]
+
+
+def _build_slots(rows: List[Dict[str, Any]]) -> List[Any]:
+    return [QueryResult(
+        platform=r['platform'], content_type='note', title_or_content=r['content'], author_nickname=r['author'],
+        url=r['url'], publish_time=datetime.fromtimestamp(r['publish_ts'] / 1000),
+        engagement=Engagement(likes=r['likes_num'], comments=r['comments_num'], shares=r['shares_num']),
+        source_table='weibo_note', matched_keywords=['话题'],
+    ) for r in rows]
+
+
+def _deduplicate(results: List[Any]) -> List[Any]:
+    """与 DeepSearchAgent._deduplicate_results 相同的去重逻辑"""
+    seen = {}
+    unique_results = []
+    for result in results:
+        identifier = result.url if result.url else result.title_or_content[:100]
+        if identifier not in seen:
+            seen[identifier] = result
+            unique_results.append(result)
+        else:
+            kept = seen[identifier]
+            for keyword in result.matched_keywords:
+                if keyword not in kept.matched_keywords:
+                    kept.matched_keywords.append(keyword)
+    return unique_results
+
+
+def _measure(build: Callable[[List[Dict[str, Any]]], List[Any]], rows: List[Dict[str, Any]], repeat: int) -> Dict[str, float]:
+    build_times, dedup_times = [], []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        results = build(rows)
+        build_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        _deduplicate(results)
+        dedup_times.append(time.perf_counter() - start)
+        del results
+
+    gc.collect()
+    tracemalloc.start()
+    results = build(rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return {"build_ms": min(build_times) * 1000, "dedup_ms": min(dedup_times) * 1000, "memory_mb": current / 1024 / 1024}
+
+
+def benchmark(rows: int = 50_000, repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """
+    运行基准测试。
+
+    Args:
+        rows: 结果条数
+        repeat: 计时重复次数（取最小值）
+
+    Returns:
+        {"dict": {...}, "slots": {...}}，每项包含 build_ms、dedup_ms、memory_mb（结果对象本身占用的内存）
+    """
+    data = _synthetic_rows(rows)
+    report = {"dict": _measure(_build_dict, data, repeat), "slots": _measure(_build_slots, data, repeat)}
+    for name, stats in report.items():
+        logger.info(f"{name:>5}: rows={rows:,}  构建 {stats['build_ms']:8.1f} ms  去重 {stats['dedup_ms']:7.1f} ms  内存 {stats['memory_mb']:7.2f} MB")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QueryResult 内存与耗时基准测试")
+    parser.add_argument("--rows", type=int, default=50_000, help="结果条数")
+    parser.add_argument("--repeat", type=int, default=3, help="计时重复次数")
+    args = parser.parse_args()
+    benchmark(rows=args.rows, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,34 +21,128 @@ V3.0 核心更新:
 - search_topic_by_date: 在指定的历史日期范围内搜索与特定话题相关的内容。
 - get_comments_for_topic: 专门提取公众对于某一特定话题的评论数据。
 - search_topic_on_platform: 在指定的单个社交媒体平台上搜索特定话题。
+- get_sentiment_distribution: 基于离线预计算的情感，在数据库中按 (平台, 情感类别) 聚合话题相关内容。
+- stream_comments_for_topic / stream_topic_content: 以服务端游标 + (publish_ts, id) 键集分页分批产出结果，
+  用于情感分析等大批量拉取，内存占用与总行数无关。
+
+工具结果按 (工具名, 规范化参数, 源表数据版本) 缓存（见 utils/query_cache.py），源数据更新后自动失效。
+话题类工具优先查询跨平台统一投影表 social_content / social_comment（见 utils/social_projection.py），
+只取固定的窄列；投影表不可用或关闭 SOCIAL_PROJECTION_ENABLED 时回退到逐表查询。
 """
 
 import os
 import json
+import copy
+import functools
+import inspect
 import requests
+from collections.abc import Mapping
 from loguru import logger
 import asyncio
-from typing import List, Dict, Any, Optional, Literal
-from dataclasses import dataclass, field
-from ..utils.db import fetch_all
+import threading
+from typing import List, Dict, Any, Callable, Iterator, Optional, Literal, Tuple, Union
+from dataclasses import dataclass, field, replace
+from ..utils.db import fetch_all, fetch_many, iter_sync, run_sync, stream_all
+from ..utils.fulltext import get_fulltext_backend
+from ..utils import hotness, sentiment_scoring, social_projection
+from ..utils.query_cache import get_query_cache, make_cache_key
 from datetime import datetime, timedelta, date
 from InsightEngine.utils.config import settings
 
 # --- 1. 数据结构定义 ---
 
-@dataclass
+ENGAGEMENT_FIELDS = ('likes', 'comments', 'shares', 'views', 'favorites', 'coins', 'danmaku')
+
+
+class Engagement(Mapping):
+    """
+    固定字段的互动指标，以 __slots__ 存储，替代每条结果一个 dict。
+
+    兼容原 dict 的访问方式（engagement['likes']、.get()、.items()、dict(engagement)、与 dict 比较相等）；
+    未设置（None）的指标不出现在键中，与原先只包含已知指标的 dict 语义一致。
+    """
+    __slots__ = ENGAGEMENT_FIELDS
+
+    def __init__(self, likes: Optional[int] = None, comments: Optional[int] = None, shares: Optional[int] = None,
+                 views: Optional[int] = None, favorites: Optional[int] = None, coins: Optional[int] = None,
+                 danmaku: Optional[int] = None):
+        self.likes, self.comments, self.shares, self.views = likes, comments, shares, views
+        self.favorites, self.coins, self.danmaku = favorites, coins, danmaku
+
+    @classmethod
+    def from_mapping(cls, values: Optional[Mapping]) -> 'Engagement':
+        return cls(**{key: values[key] for key in ENGAGEMENT_FIELDS if values and values.get(key) is not None})
+
+    def __getitem__(self, key: str) -> int:
+        value = getattr(self, key, None) if key in ENGAGEMENT_FIELDS else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: int) -> None:
+        if key not in ENGAGEMENT_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return (key for key in ENGAGEMENT_FIELDS if getattr(self, key) is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for key in ENGAGEMENT_FIELDS if getattr(self, key) is not None)
+
+    def __reduce__(self):
+        return (Engagement, tuple(getattr(self, key) for key in ENGAGEMENT_FIELDS))
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def copy(self) -> 'Engagement':
+        return Engagement(*(getattr(self, key) for key in ENGAGEMENT_FIELDS))
+
+    def to_dict(self) -> Dict[str, int]:
+        return {key: getattr(self, key) for key in self}
+
+
+@dataclass(init=False)
 class QueryResult:
-    """统一的数据库查询结果数据类"""
+    """
+    统一的数据库查询结果数据类（单次工具调用常产生数千条，以 __slots__ 存储）。
+
+    与 Engagement 一样手写 __slots__ 与 __init__（dataclass(slots=True) 需要 Python 3.10），
+    dataclass 只生成 __repr__ / __eq__ 并支持 dataclasses.replace。
+    """
+    __slots__ = ('platform', 'content_type', 'title_or_content', 'author_nickname', 'url', 'publish_time',
+                 'engagement', 'source_keyword', 'hotness_score', 'source_table', 'matched_keywords',
+                 'duplicate_count', 'sentiment_label', 'sentiment_confidence')
     platform: str
     content_type: str
     title_or_content: str
-    author_nickname: Optional[str] = None
-    url: Optional[str] = None
-    publish_time: Optional[datetime] = None
-    engagement: Dict[str, int] = field(default_factory=dict)
-    source_keyword: Optional[str] = None
-    hotness_score: float = 0.0
-    source_table: str = ""
+    author_nickname: Optional[str]
+    url: Optional[str]
+    publish_time: Optional[datetime]
+    engagement: Engagement
+    source_keyword: Optional[str]
+    hotness_score: float
+    source_table: str
+    matched_keywords: List[str]
+    duplicate_count: int  # 折叠进本条结果的近重复记录数（含自身）
+    sentiment_label: Optional[str]  # 离线预计算的情感类别，未打分时为 None
+    sentiment_confidence: Optional[float]
+
+    def __init__(self, platform: str, content_type: str, title_or_content: str, author_nickname: Optional[str] = None,
+                 url: Optional[str] = None, publish_time: Optional[datetime] = None,
+                 engagement: Optional[Union[Engagement, Mapping]] = None, source_keyword: Optional[str] = None,
+                 hotness_score: float = 0.0, source_table: str = "", matched_keywords: Optional[List[str]] = None,
+                 duplicate_count: int = 1, sentiment_label: Optional[str] = None,
+                 sentiment_confidence: Optional[float] = None):
+        self.platform, self.content_type, self.title_or_content = platform, content_type, title_or_content
+        self.author_nickname, self.url, self.publish_time = author_nickname, url, publish_time
+        # 兼容以 dict 传入互动指标的调用方
+        self.engagement = engagement if isinstance(engagement, Engagement) else Engagement.from_mapping(engagement)
+        self.source_keyword, self.hotness_score, self.source_table = source_keyword, hotness_score, source_table
+        self.matched_keywords = [] if matched_keywords is None else matched_keywords
+        self.duplicate_count = duplicate_count
+        self.sentiment_label, self.sentiment_confidence = sentiment_label, sentiment_confidence
 
 @dataclass
 class DBResponse:
@@ -61,14 +155,97 @@ class DBResponse:
 
 # --- 2. 核心客户端与专用工具集 ---
 
+# 计算缓存键时读取的同步水位线，同一次工具调用中交给 ensure_fresh 复用（各段落线程各自一份）
+_call_watermarks = threading.local()
+
+def _cached_tool(source_tables: Callable[[Dict[str, Any]], List[str]], rollup: bool = False):
+    """
+    工具结果缓存装饰器。
+
+    Args:
+        source_tables: 根据调用参数返回该次查询依赖的源表，其 last_modify_ts 构成缓存的数据版本
+        rollup: 数据版本取自 content_hotness 的水位线（search_hot_content），否则取自统一投影表
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = get_query_cache()
+            if not cache.enabled:
+                return func(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name != 'self'}
+            if 'topic' in params:
+                params['topic'] = sorted(self._normalize_topics(params['topic']))
+            try:
+                version = self._data_version(source_tables(params), rollup)
+                if version is None:
+                    return func(self, *args, **kwargs)
+
+                key = make_cache_key(func.__name__, params, version)
+                cached = cache.get(key)
+                if cached is not None:
+                    logger.info(f"--- TOOL: {func.__name__} 命中查询缓存 ({cached.results_count} 条) ---")
+                    return _copy_response(cached)
+                response = func(self, *args, **kwargs)
+                if not response.error_message:
+                    cache.set(key, _copy_response(response))
+                return response
+            finally:
+                _call_watermarks.__dict__.pop('state', None)
+        return wrapper
+    return decorator
+
+
+def _copy_response(response: 'DBResponse') -> 'DBResponse':
+    """复制响应及结果对象，调用方对结果的修改（如合并 matched_keywords）不会写回缓存"""
+    results = [replace(r, engagement=r.engagement.copy(), matched_keywords=list(r.matched_keywords)) for r in response.results]
+    return replace(response, parameters=copy.deepcopy(response.parameters), results=results)
+
+
+def _platform_tables(platform: Optional[str]) -> List[str]:
+    sources = {**social_projection.SOCIAL_CONTENT_SOURCES, **social_projection.SOCIAL_COMMENT_SOURCES}
+    return [table for table, config in sources.items() if not platform or config['platform'] == platform]
+
+
 class MediaCrawlerDB:
     """包含多种专用舆情数据库查询工具的客户端"""
     # 权重定义
-    W_LIKE = 1.0
-    W_COMMENT = 5.0
-    W_SHARE = 10.0  # 分享/转发/收藏/投币等高价值互动
-    W_VIEW = 0.1
-    W_DANMAKU = 0.5
+    W_LIKE = hotness.HOTNESS_WEIGHTS['like']
+    W_COMMENT = hotness.HOTNESS_WEIGHTS['comment']
+    W_SHARE = hotness.HOTNESS_WEIGHTS['share']  # 分享/转发/收藏/投币等高价值互动
+    W_VIEW = hotness.HOTNESS_WEIGHTS['view']
+    W_DANMAKU = hotness.HOTNESS_WEIGHTS['danmaku']
+
+    # 入库归一化的互动指标列（BIGINT）与统一发布时间列 publish_ts（毫秒）
+    NORMALIZED_ENGAGEMENT_COLUMNS = {
+        'likes': 'likes_num', 'comments': 'comments_num', 'shares': 'shares_num', 'views': 'views_num',
+        'favorites': 'favorites_num', 'coins': 'coins_num', 'danmaku': 'danmaku_num',
+    }
+
+    # 尚未执行迁移（MindSpider/schema/migrate_engagement_columns.py）的旧表没有 publish_ts / *_num 列，
+    # 查询回退到原始列：各内容表的发布时间列及其存储格式，以及热度公式用到的原始互动列（文本存储，需 CAST）
+    MIGRATION_COMMAND = "python MindSpider/schema/migrate_engagement_columns.py"
+    LEGACY_TIME_COLUMNS = {
+        'bilibili_video': ('create_time', 'sec'), 'douyin_aweme': ('create_time', 'ms'), 'kuaishou_video': ('create_time', 'ms'),
+        'weibo_note': ('create_date_time', 'str'), 'xhs_note': ('time', 'ms'), 'zhihu_content': ('created_time', 'sec_str'),
+        'tieba_note': ('publish_time', 'str'),
+    }
+    LEGACY_HOTNESS_COLUMNS = {
+        'bilibili_video': {'likes_num': 'liked_count', 'comments_num': 'video_comment', 'shares_num': 'video_share_count',
+                           'favorites_num': 'video_favorite_count', 'coins_num': 'video_coin_count',
+                           'danmaku_num': 'video_danmaku', 'views_num': 'video_play_count'},
+        'douyin_aweme': {'likes_num': 'liked_count', 'comments_num': 'comment_count', 'shares_num': 'share_count', 'favorites_num': 'collected_count'},
+        'weibo_note': {'likes_num': 'liked_count', 'comments_num': 'comments_count', 'shares_num': 'shared_count'},
+        'xhs_note': {'likes_num': 'liked_count', 'comments_num': 'comment_count', 'shares_num': 'share_count', 'favorites_num': 'collected_count'},
+        'kuaishou_video': {'likes_num': 'liked_count', 'views_num': 'viewd_count'},
+        'zhihu_content': {'likes_num': 'voteup_count', 'comments_num': 'comment_count'},
+    }
+
+    # 流式读取时每个服务端游标查询（键集分页的一页）的最大行数
+    STREAM_PAGE_SIZE = 5000
 
     def __init__(self):
         """
@@ -76,25 +253,85 @@ class MediaCrawlerDB:
         """
         pass
         
+    @staticmethod
+    def _run_async(coro):
+        # 在数据库模块的常驻后台事件循环上执行，连接池始终绑定同一个循环
+        return run_sync(coro)
+
     def _execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
         try:
-            # 获取或创建event loop
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
-            # 直接运行协程
-            return loop.run_until_complete(fetch_all(query, params))
-        
+            return self._run_async(fetch_all(query, params))
         except Exception as e:
             logger.exception(f"数据库查询时发生错误: {e}")
             return []
 
+    def _execute_queries(self, queries: List[Tuple[str, Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+        """并发执行多条分表查询，总耗时取决于最慢的一张表；单表失败时该表返回空列表"""
+        try:
+            outcomes = self._run_async(fetch_many(queries))
+        except Exception as e:
+            logger.exception(f"数据库并发查询时发生错误: {e}")
+            return [[] for _ in queries]
+        results = []
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                logger.opt(exception=outcome).error(f"数据库查询时发生错误: {outcome}")
+                results.append([])
+            else:
+                results.append(outcome)
+        return results
+
+    def _prepare_topic_backend(self, table_fields: Dict[str, List[str]]) -> None:
+        """并发完成全文检索后端在各表上的准备工作（索引探测/增量同步）"""
+        backend = get_fulltext_backend()
+
+        async def _prepare_all():
+            return await asyncio.gather(*(backend.prepare(t, f) for t, f in table_fields.items()), return_exceptions=True)
+
+        try:
+            outcomes = self._run_async(_prepare_all())
+        except Exception as e:
+            logger.warning(f"全文检索后端 {backend.name} 准备失败: {e}")
+            return
+        for table, outcome in zip(table_fields, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"全文检索后端 {backend.name} 准备 {table} 失败: {outcome}")
+
+    def _build_topic_clause(self, table: str, fields: List[str], topic: str, param_prefix: str = "term") -> Tuple[str, Dict[str, Any]]:
+        """生成话题匹配的WHERE子句，具体匹配方式（LIKE/FULLTEXT/pg_trgm/本地倒排索引）由全文检索后端决定"""
+        return get_fulltext_backend().match_clause(table, fields, topic, param_prefix)
+
+    @staticmethod
+    def _normalize_topics(topic: Union[str, List[str]]) -> List[str]:
+        """将单个话题或关键词列表统一为去重后的非空关键词列表（保持原顺序）"""
+        topics = [topic] if isinstance(topic, str) else list(topic or [])
+        return list(dict.fromkeys(t.strip() for t in topics if t and t.strip()))
+
+    def _build_topics_clause(self, table: str, fields: List[str], topics: List[str], param_prefix: str = "term") -> Tuple[str, str, Dict[str, Any]]:
+        """
+        生成多关键词匹配子句: 一条查询同时匹配所有关键词，并为每个关键词生成命中标记列。
+
+        Returns:
+            (WHERE子句, 追加到SELECT的命中标记列片段（单关键词时为空串）, 绑定参数)
+        """
+        if len(topics) == 1:
+            where_clause, params = self._build_topic_clause(table, fields, topics[0], param_prefix)
+            return where_clause, "", params
+        clauses, tag_columns, params = [], [], {}
+        for idx, topic in enumerate(topics):
+            clause, clause_params = self._build_topic_clause(table, fields, topic, f"{param_prefix}_k{idx}")
+            clauses.append(clause)
+            tag_columns.append(f"CASE WHEN {clause} THEN 1 ELSE 0 END AS _kw_{idx}")
+            params.update(clause_params)
+        return f"({' OR '.join(clauses)})", ", " + ", ".join(tag_columns), params
+
+    @staticmethod
+    def _matched_keywords(row: Dict[str, Any], topics: List[str]) -> List[str]:
+        """根据命中标记列还原该行匹配到的关键词"""
+        if len(topics) == 1:
+            return list(topics)
+        return [topic for idx, topic in enumerate(topics) if row.get(f"_kw_{idx}")]
+
     @staticmethod
     def _to_datetime(ts: Any) -> Optional[datetime]:
         if not ts: return None
@@ -111,14 +348,90 @@ class MediaCrawlerDB:
     _table_columns_cache = {}
     def _get_table_columns(self, table_name: str) -> List[str]:
         if table_name in self._table_columns_cache: return self._table_columns_cache[table_name]
-        results = self._execute_query(f"SHOW COLUMNS FROM `{table_name}`")
-        columns = [row['Field'] for row in results] if results else []
+        # 限定当前库/模式，避免其它 schema 中的同名表混入列清单
+        schema_expr = "current_schema()" if settings.DB_DIALECT == 'postgresql' else "DATABASE()"
+        results = self._execute_query(
+            "SELECT column_name AS column_name FROM information_schema.columns "
+            f"WHERE table_schema = {schema_expr} AND table_name = :table_name",
+            {'table_name': table_name}
+        )
+        columns = [row['column_name'] for row in results] if results else []
         self._table_columns_cache[table_name] = columns
         return columns
 
-    def _extract_engagement(self, row: Dict[str, Any]) -> Dict[str, int]:
+    _legacy_tables_warned = set()
+    def _has_normalized_columns(self, table: str) -> bool:
+        """源表已迁移出 publish_ts / likes_num 列时返回 True；列清单读取不到时按已迁移处理"""
+        cols = self._get_table_columns(table)
+        if not cols or ('publish_ts' in cols and 'likes_num' in cols):
+            return True
+        if table not in self._legacy_tables_warned:
+            self._legacy_tables_warned.add(table)
+            logger.warning(f"{table} 缺少 publish_ts/likes_num 列，回退到原始列查询（无法走索引），请先执行一次: {self.MIGRATION_COMMAND}")
+        return False
+
+    @staticmethod
+    def _cast_int(expr: str) -> str:
+        return f"CAST({expr} AS {'BIGINT' if settings.DB_DIALECT == 'postgresql' else 'UNSIGNED'})"
+
+    @staticmethod
+    def _cast_text(expr: str) -> str:
+        return f"CAST({expr} AS {'TEXT' if settings.DB_DIALECT == 'postgresql' else 'CHAR'})"
+
+    def _data_version(self, tables: List[str], rollup: bool = False) -> Optional[Dict[str, Optional[int]]]:
+        """
+        查询结果缓存的数据版本: 各相关源表已同步到的最大 last_modify_ts。
+        优先读取汇总表/投影表的水位线（与情感打分进度并发读取，各一次小查询），读到的水位线留给本次调用的
+        ensure_fresh 复用；计算版本本身不触发就地刷新，有源表需要刷新时返回 None，由查询本身完成刷新。
+        汇总表/投影表不可用时对源表执行 MAX(last_modify_ts)。无法获取时返回 None，本次调用不使用缓存。
+        """
+        enabled = settings.HOTNESS_ROLLUP_ENABLED if rollup else settings.SOCIAL_PROJECTION_ENABLED
+        if enabled:
+            module = hotness if rollup else social_projection
+            try:
+                if rollup:
+                    watermarks, scoring = self._run_async(module.read_watermarks()), None
+                else:
+                    # 离线情感打分会回写投影表，打分进度也是数据版本的一部分
+                    async def _read():
+                        return await asyncio.gather(module.read_watermarks(), sentiment_scoring.scoring_version())
+                    watermarks, scoring = self._run_async(_read())
+                _call_watermarks.state = (rollup, watermarks)
+                versions = module.source_versions(watermarks)
+                if versions is None:
+                    return None
+                data_version = {table: versions.get(table) for table in tables}
+                if not rollup:
+                    data_version['_sentiment_scoring'] = scoring
+                return data_version
+            except Exception as e:
+                logger.warning(f"读取同步水位线失败，改用源表 MAX(last_modify_ts): {e}")
+        q = self._wrap_query_field_with_dialect
+        try:
+            outcomes = self._run_async(fetch_many([(f"SELECT MAX({q('last_modify_ts')}) AS v FROM {q(table)}", {}) for table in tables]))
+        except Exception as e:
+            logger.warning(f"获取查询缓存数据版本失败: {e}")
+            return None
+        return {table: (None if isinstance(outcome, BaseException) or not outcome else outcome[0]['v'])
+                for table, outcome in zip(tables, outcomes)}
+
+    @staticmethod
+    def _prefetched_watermarks(rollup: bool) -> Optional[Dict[str, Dict[str, int]]]:
+        """取出本次工具调用计算缓存键时已读取的水位线（只用一次，就地刷新后即过期）；未读取时返回 None，由 ensure_fresh 自行读取"""
+        state = _call_watermarks.__dict__.pop('state', None)
+        return state[1] if state is not None and state[0] == rollup else None
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """查询结果缓存的命中统计"""
+        return get_query_cache().stats()
+
+    def _extract_engagement(self, row: Dict[str, Any]) -> Engagement:
         """从数据行中提取并统一互动指标"""
-        engagement = {}
+        # 已迁移的表直接使用归一化的 BIGINT 列
+        if row.get('publish_ts') is not None or 'likes_num' in row:
+            return Engagement(**{key: int(row[col]) for key, col in self.NORMALIZED_ENGAGEMENT_COLUMNS.items()
+                                 if row.get(col) is not None})
+        engagement = Engagement()
         mapping = { 'likes': ['liked_count', 'like_count', 'voteup_count', 'comment_like_count'], 'comments': ['video_comment', 'comments_count', 'comment_count', 'total_replay_num', 'sub_comment_count'], 'shares': ['video_share_count', 'shared_count', 'share_count', 'total_forwards'], 'views': ['video_play_count', 'viewd_count'], 'favorites': ['video_favorite_count', 'collected_count'], 'coins': ['video_coin_count'], 'danmaku': ['video_danmaku'], }
         for key, potential_cols in mapping.items():
             for col in potential_cols:
@@ -128,6 +441,7 @@ class MediaCrawlerDB:
                     break
         return engagement
 
+    @_cached_tool(lambda params: list(hotness.HOTNESS_SOURCES), rollup=True)
     def search_hot_content(
         self,
         time_period: Literal['24h', 'week', 'year'] = 'week',
@@ -149,41 +463,104 @@ class MediaCrawlerDB:
         now = datetime.now()
         start_time = now - timedelta(days={'24h': 1, 'week': 7}.get(time_period, 365))
 
-        # 定义各平台的热度计算SQL片段
-        hotness_formulas = {
-            'bilibili_video': f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(video_comment AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(video_share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_favorite_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_coin_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(video_danmaku AS UNSIGNED), 0) * {self.W_DANMAKU} + COALESCE(CAST(video_play_count AS DECIMAL(20,2)), 0) * {self.W_VIEW})",
-            'douyin_aweme':   f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(collected_count AS UNSIGNED), 0) * {self.W_SHARE})",
-            'weibo_note':     f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comments_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(shared_count AS UNSIGNED), 0) * {self.W_SHARE})",
-            'xhs_note':       f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT} + COALESCE(CAST(share_count AS UNSIGNED), 0) * {self.W_SHARE} + COALESCE(CAST(collected_count AS UNSIGNED), 0) * {self.W_SHARE})",
-            'kuaishou_video': f"(COALESCE(CAST(liked_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(viewd_count AS DECIMAL(20,2)), 0) * {self.W_VIEW})",
-            'zhihu_content':  f"(COALESCE(CAST(voteup_count AS UNSIGNED), 0) * {self.W_LIKE} + COALESCE(CAST(comment_count AS UNSIGNED), 0) * {self.W_COMMENT})",
+        formatted_results = None
+        if settings.HOTNESS_ROLLUP_ENABLED:
+            formatted_results = self._search_hot_content_rollup(start_time, limit)
+        if formatted_results is None:
+            formatted_results = self._search_hot_content_live(start_time, limit)
+        return DBResponse("search_hot_content", params_for_log, results=formatted_results, results_count=len(formatted_results))
+
+    def _search_hot_content_rollup(self, start_time: datetime, limit: int) -> Optional[List[QueryResult]]:
+        """
+        从 content_hotness 汇总表按热度索引取 Top-N，再按 id 并发回表取展示字段。
+        汇总表不可用时返回 None，由调用方回退到实时计算。
+        """
+        watermarks = self._prefetched_watermarks(rollup=True)
+
+        async def _top():
+            await hotness.ensure_fresh(watermarks=watermarks)
+            return await hotness.query_top_hotness(int(start_time.timestamp() * 1000), limit)
+
+        try:
+            top_rows = self._run_async(_top())
+        except Exception as e:
+            logger.warning(f"热度汇总表不可用，回退到实时计算: {e}")
+            return None
+
+        ids_by_table: Dict[str, List[int]] = {}
+        for row in top_rows:
+            ids_by_table.setdefault(row['source_table'], []).append(int(row['content_id']))
+        tables = list(ids_by_table)
+        q = self._wrap_query_field_with_dialect
+        queries = [(f"SELECT * FROM {q(table)} WHERE {q('id')} IN ({', '.join(str(i) for i in ids_by_table[table])})", {}) for table in tables]
+        rows_by_key = {}
+        for table, rows in zip(tables, self._execute_queries(queries)):
+            for row in rows:
+                rows_by_key[(table, int(row['id']))] = row
+
+        field_map = {
+            'bilibili_video': ('title', 'nickname', 'video_url', 'video'), 'douyin_aweme': ('title', 'nickname', 'aweme_url', 'video'),
+            'kuaishou_video': ('title', 'nickname', 'video_url', 'video'), 'weibo_note': ('content', 'nickname', 'note_url', 'note'),
+            'xhs_note': ('title', 'nickname', 'note_url', 'note'), 'zhihu_content': ('title', 'user_nickname', 'content_url', 'content'),
         }
+        results = []
+        for top in top_rows:
+            table = top['source_table']
+            row = rows_by_key.get((table, int(top['content_id'])))
+            if row is None:
+                continue  # 源记录已被删除，等待下次全量刷新清理
+            title_col, author_col, url_col, content_type = field_map[table]
+            results.append(QueryResult(
+                platform=top['platform'], content_type=content_type, title_or_content=row.get(title_col) or '',
+                author_nickname=row.get(author_col), url=row.get(url_col),
+                publish_time=self._to_datetime(top['publish_ts']),
+                engagement=self._extract_engagement(row), hotness_score=float(top['hotness_score'] or 0.0),
+                source_keyword=row.get('source_keyword'), source_table=table,
+            ))
+        return results
 
-        all_queries, params = [], []
-        for table, formula in hotness_formulas.items():
-            time_filter_sql, time_filter_param = "", None
-            if table == 'weibo_note': time_filter_sql, time_filter_param = "`create_date_time` >= %s", start_time.strftime('%Y-%m-%d %H:%M:%S')
-            elif table in ['kuaishou_video', 'xhs_note', 'douyin_aweme']: time_col = 'time' if table == 'xhs_note' else 'create_time'; time_filter_sql, time_filter_param = f"`{time_col}` >= %s", str(int(start_time.timestamp() * 1000))
-            elif table == 'zhihu_content': time_filter_sql, time_filter_param = "CAST(`created_time` AS UNSIGNED) >= %s", str(int(start_time.timestamp()))
-            else: time_filter_sql, time_filter_param = "`create_time` >= %s", str(int(start_time.timestamp()))
+    def _search_hot_content_live(self, start_time: datetime, limit: int) -> List[QueryResult]:
+        """在各平台内容表上实时计算加权热度并全局排序（汇总表不可用时的回退路径）"""
+        q = self._wrap_query_field_with_dialect
+        legacy = {table: not self._has_normalized_columns(table) for table in hotness.HOTNESS_SOURCES}
+        metric_cols = [col for col, _ in hotness.HOTNESS_METRICS]
+
+        all_queries, params = [], {'limit': limit}
+        for idx, table in enumerate(hotness.HOTNESS_SOURCES):
+            if legacy[table]:
+                # 旧表：互动数取原始文本列 CAST，发布时间取原始时间列
+                raw_cols = self.LEGACY_HOTNESS_COLUMNS[table]
+                metrics = {col: f"COALESCE({self._cast_int(q(raw_cols[col]))}, 0)" if col in raw_cols else "0" for col in metric_cols}
+                ts = q(self.LEGACY_TIME_COLUMNS[table][0])
+            else:
+                # 统一的加权热度公式，直接基于归一化的 BIGINT 互动列
+                metrics = {col: f"COALESCE({q(col)}, 0)" for col in metric_cols}
+                ts = q('publish_ts')
+            if any(legacy.values()):
+                # 旧表的发布时间可能是字符串，UNION 各分支的类型需一致
+                ts = self._cast_text(ts)
+            formula = (f"({metrics['likes_num']} * {self.W_LIKE} + {metrics['comments_num']} * {self.W_COMMENT} + "
+                       f"({metrics['shares_num']} + {metrics['favorites_num']} + {metrics['coins_num']}) * {self.W_SHARE} + "
+                       f"{metrics['danmaku_num']} * {self.W_DANMAKU} + {metrics['views_num']} * {self.W_VIEW})")
+            time_clause, time_params = self._build_time_range_clause(table, start_time, param_prefix=f"t{idx}")
+            params.update(time_params)
 
             content_type = 'note' if table in ['weibo_note', 'xhs_note'] else 'content' if table == 'zhihu_content' else 'video'
-            query_template = "SELECT '{platform}' as p, '{type}' as t, {title} as title, {author} as author, {url} as url, {ts} as ts, {formula} as hotness_score, source_keyword, '{tbl}' as tbl FROM `{tbl}` WHERE {time_filter}"
+            query_template = "SELECT '{platform}' as p, '{type}' as t, {title} as title, {author} as author, {url} as url, {ts} as ts, {formula} as hotness_score, {metrics}, source_keyword, '{tbl}' as tbl FROM {qtbl} WHERE {time_clause}"
             
-            field_subs = {'platform': table.split('_')[0], 'type': content_type, 'title': 'title', 'author': 'nickname', 'url': 'video_url', 'ts': 'create_time', 'formula': formula, 'tbl': table, 'time_filter': time_filter_sql}
-            if table == 'weibo_note': field_subs.update({'title': 'content', 'url': 'note_url', 'ts': 'create_date_time'})
-            elif table == 'xhs_note': field_subs.update({'ts': 'time', 'url': 'note_url'})
-            elif table == 'zhihu_content': field_subs.update({'author': 'user_nickname', 'url': 'content_url', 'ts': 'created_time'})
+            field_subs = {'platform': table.split('_')[0], 'type': content_type, 'title': 'title', 'author': 'nickname', 'url': 'video_url', 'ts': ts, 'formula': formula,
+                          'metrics': ', '.join(f"{expr} as {col}" for col, expr in metrics.items()), 'tbl': table, 'qtbl': q(table), 'time_clause': time_clause}
+            if table == 'weibo_note': field_subs.update({'title': 'content', 'url': 'note_url'})
+            elif table == 'xhs_note': field_subs.update({'url': 'note_url'})
+            elif table == 'zhihu_content': field_subs.update({'author': 'user_nickname', 'url': 'content_url'})
             elif table == 'douyin_aweme': field_subs.update({'url': 'aweme_url'})
 
             all_queries.append(query_template.format(**field_subs))
-            params.append(time_filter_param)
         
-        final_query = f"({' ) UNION ALL ( '.join(all_queries)}) ORDER BY hotness_score DESC LIMIT %s"
-        raw_results = self._execute_query(final_query, tuple(params) + (limit,))
+        final_query = f"({' ) UNION ALL ( '.join(all_queries)}) ORDER BY hotness_score DESC LIMIT :limit"
+        raw_results = self._execute_query(final_query, params)
 
-        formatted_results = [QueryResult(platform=r['p'], content_type=r['t'], title_or_content=r['title'], author_nickname=r.get('author'), url=r['url'], publish_time=self._to_datetime(r['ts']), engagement=self._extract_engagement(r), hotness_score=r.get('hotness_score', 0.0), source_keyword=r.get('source_keyword'), source_table=r['tbl']) for r in raw_results]
-        return DBResponse("search_hot_content", params_for_log, results=formatted_results, results_count=len(formatted_results))    
+        return [QueryResult(platform=r['p'], content_type=r['t'], title_or_content=r['title'], author_nickname=r.get('author'), url=r['url'], publish_time=self._to_datetime(r['ts']), engagement=self._extract_engagement(r), hotness_score=r.get('hotness_score', 0.0), source_keyword=r.get('source_keyword'), source_table=r['tbl']) for r in raw_results]
 
     def _wrap_query_field_with_dialect(self, field: str) -> str:
         """根据数据库方言包装SQL查询"""
@@ -191,12 +568,172 @@ class MediaCrawlerDB:
             return f'"{field}"'
         return f'`{field}`'
 
-    def search_topic_globally(self, topic: str, limit_per_table: int = 100) -> DBResponse:
+    def _build_time_range_clause(self, table: str, start_dt: datetime, end_dt: Optional[datetime] = None,
+                                 param_prefix: str = "t") -> Tuple[str, Dict[str, Any]]:
+        """
+        生成 [start_dt, end_dt) 时间范围子句（end_dt 为 None 时只限定下界）：
+        已迁移的平台表与投影表统一使用带索引的 publish_ts（毫秒），daily_news 使用 crawl_date；
+        未迁移的旧内容表回退到原始时间列，旧评论表没有可靠的原始时间列，不加时间过滤
+        """
+        q = self._wrap_query_field_with_dialect
+        start, end = f":{param_prefix}_start", f":{param_prefix}_end"
+
+        def _clause(col: str, start_value: Any, end_value: Any) -> Tuple[str, Dict[str, Any]]:
+            if end_dt is None:
+                return f"({col} >= {start})", {start[1:]: start_value}
+            return f"({col} >= {start} AND {col} < {end})", {start[1:]: start_value, end[1:]: end_value}
+
+        if table == 'daily_news':
+            return _clause(q('crawl_date'), start_dt.date(), end_dt and end_dt.date())
+        projection_tables = (social_projection.SOCIAL_CONTENT_TABLE, social_projection.SOCIAL_COMMENT_TABLE)
+        if table in projection_tables or self._has_normalized_columns(table):
+            return _clause(q('publish_ts'), int(start_dt.timestamp() * 1000), end_dt and int(end_dt.timestamp() * 1000))
+        if table not in self.LEGACY_TIME_COLUMNS:
+            return "1=1", {}
+        time_col, time_type = self.LEGACY_TIME_COLUMNS[table]
+        if time_type == 'ms':
+            return _clause(q(time_col), int(start_dt.timestamp() * 1000), end_dt and int(end_dt.timestamp() * 1000))
+        if time_type == 'str':
+            return _clause(q(time_col), start_dt.strftime('%Y-%m-%d %H:%M:%S'), end_dt and end_dt.strftime('%Y-%m-%d %H:%M:%S'))
+        # sec 与 sec_str（秒级时间戳以字符串存储，需 CAST）
+        col = q(time_col) if time_type == 'sec' else self._cast_int(q(time_col))
+        return _clause(col, int(start_dt.timestamp()), end_dt and int(end_dt.timestamp()))
+
+    def _rows_to_results(self, rows: List[Dict[str, Any]], table: str, content_type: str, topics: List[str]) -> List[QueryResult]:
+        """将整表 SELECT * 的结果行转换为统一的 QueryResult"""
+        results = []
+        for row in rows:
+            content = (row.get('title') or row.get('content') or row.get('desc') or row.get('content_text', ''))
+            time_key = row.get('publish_ts') or row.get('create_time') or row.get('time') or row.get('created_time') or row.get('publish_time') or row.get('crawl_date')
+            results.append(QueryResult(
+                platform=table.split('_')[0], content_type=content_type,
+                title_or_content=content if content else '',
+                author_nickname=row.get('nickname') or row.get('user_nickname') or row.get('user_name'),
+                url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'),
+                publish_time=self._to_datetime(time_key),
+                engagement=self._extract_engagement(row),
+                source_keyword=row.get('source_keyword'),
+                source_table=table,
+                matched_keywords=self._matched_keywords(row, topics)
+            ))
+        return results
+
+    def _projection_ready(self) -> bool:
+        """统一投影表可用时返回 True（超过陈旧上限时先增量同步），否则由调用方回退到逐表查询"""
+        if not settings.SOCIAL_PROJECTION_ENABLED:
+            return False
+        try:
+            self._run_async(social_projection.ensure_fresh(watermarks=self._prefetched_watermarks(rollup=False)))
+            return True
+        except Exception as e:
+            logger.warning(f"统一投影表不可用，回退到逐表查询: {e}")
+            return False
+
+    def _build_projection_query(
+        self,
+        kind: Literal['content', 'comment'],
+        topics: List[str],
+        limit: int,
+        per_source: bool = True,
+        platform: Optional[str] = None,
+        start_dt: Optional[datetime] = None,
+        end_dt: Optional[datetime] = None,
+        order_by: str = 'source_id DESC',
+        after: Optional[Tuple[int, int]] = None,
+        collapse_duplicates: Optional[bool] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        生成统一投影表上的话题查询，只选取投影表的固定窄列。
+
+        Args:
+            per_source: True 时每张源表各取至多 limit 条（ROW_NUMBER 分区），否则整体取 limit 条
+            after: 键集分页游标 (publish_ts, id)，只返回按 (publish_ts DESC, id DESC) 排在其后的行
+            collapse_duplicates: 在匹配行中按 dup_key 折叠近重复内容，每组只保留最早发布的一条并带出
+                组内条数 dup_count；默认取 SEARCH_COLLAPSE_DUPLICATES
+        """
+        q = self._wrap_query_field_with_dialect
+        if kind == 'content':
+            table, columns, fields = (social_projection.SOCIAL_CONTENT_TABLE, social_projection.SOCIAL_CONTENT_COLUMNS,
+                                      social_projection.SOCIAL_CONTENT_SEARCH_FIELDS)
+        else:
+            table, columns, fields = (social_projection.SOCIAL_COMMENT_TABLE, social_projection.SOCIAL_COMMENT_COLUMNS,
+                                      social_projection.SOCIAL_COMMENT_SEARCH_FIELDS)
+        where_clause, tag_columns, params = self._build_topics_clause(table, fields, topics)
+        conditions = [where_clause]
+        if platform:
+            conditions.append(f"{q('platform')} = :platform")
+            params['platform'] = platform
+        if start_dt and end_dt:
+            time_clause, time_params = self._build_time_range_clause(table, start_dt, end_dt)
+            conditions.append(time_clause)
+            params.update(time_params)
+        if after is not None:
+            conditions.append(f"({q('publish_ts')} < :after_ts OR ({q('publish_ts')} = :after_ts AND {q('id')} < :after_id))")
+            params.update({'after_ts': after[0], 'after_id': after[1]})
+        params['limit'] = limit
+        select_cols = ", ".join(q(col) for col in ['id'] + columns if col != 'last_modify_ts') + tag_columns
+        where_sql = " AND ".join(conditions)
+        if settings.SEARCH_COLLAPSE_DUPLICATES if collapse_duplicates is None else collapse_duplicates:
+            # 先在匹配行内按近重复分组取代表行，再做分源截取，避免同一条转发内容占满结果
+            source = (f"(SELECT * FROM (SELECT {select_cols}, "
+                      f"COUNT(*) OVER (PARTITION BY {q('dup_key')}) AS dup_count, "
+                      f"ROW_NUMBER() OVER (PARTITION BY {q('dup_key')} ORDER BY {q('publish_ts')}, {q('id')}) AS _dup_rn "
+                      f"FROM {q(table)} WHERE {where_sql}) grouped WHERE _dup_rn = 1) deduped")
+            select_cols, where_sql = "deduped.*", "1 = 1"
+        else:
+            source = q(table)
+        if per_source:
+            query = (f"SELECT * FROM (SELECT {select_cols}, ROW_NUMBER() OVER (PARTITION BY {q('source_table')} "
+                     f"ORDER BY {order_by}) AS _rn FROM {source} WHERE {where_sql}) ranked "
+                     f"WHERE _rn <= :limit")
+        else:
+            query = f"SELECT {select_cols} FROM {source} WHERE {where_sql} ORDER BY {order_by} LIMIT :limit"
+        return query, params
+
+    def _projection_rows_to_results(self, rows: List[Dict[str, Any]], topics: List[str], content_type: Optional[str] = None) -> List[QueryResult]:
+        """将投影表的窄列结果行转换为 QueryResult；评论行传入 content_type='comment'"""
+        return [QueryResult(
+            platform=row['platform'], content_type=content_type or row['content_type'],
+            title_or_content=row.get('title') or row.get('content') or '',
+            author_nickname=row.get('author'), url=row.get('url'),
+            publish_time=self._to_datetime(row.get('publish_ts')),
+            engagement=self._extract_engagement(row),
+            source_keyword=row.get('source_keyword'), source_table=row['source_table'],
+            matched_keywords=self._matched_keywords(row, topics),
+            duplicate_count=int(row.get('dup_count') or 1),
+            sentiment_label=sentiment_scoring.label_name(row.get('sentiment_label')),
+            sentiment_confidence=row.get('sentiment_confidence'),
+        ) for row in rows]
+
+    def _search_projection(self, queries: List[Tuple[str, Tuple[str, Dict[str, Any]]]], topics: List[str], table_order: Optional[List[str]] = None) -> List[QueryResult]:
+        """
+        并发执行投影表查询并转换结果。
+
+        Args:
+            queries: [(kind, (sql, params))]，kind 为 'content' 或 'comment'
+            table_order: 给定时按源表顺序、源表内按 id 倒序排列结果（与逐表查询的输出顺序一致）
+        """
+        self._prepare_topic_backend({
+            social_projection.SOCIAL_CONTENT_TABLE if kind == 'content' else social_projection.SOCIAL_COMMENT_TABLE:
+                social_projection.SOCIAL_CONTENT_SEARCH_FIELDS if kind == 'content' else social_projection.SOCIAL_COMMENT_SEARCH_FIELDS
+            for kind, _ in queries
+        })
+        rank = {table: idx for idx, table in enumerate(table_order or [])}
+        results = []
+        for (kind, _), rows in zip(queries, self._execute_queries([query for _, query in queries])):
+            if table_order:
+                rows = sorted(rows, key=lambda r: (rank.get(r['source_table'], len(rank)), -int(r['source_id'])))
+            results.extend(self._projection_rows_to_results(rows, topics, 'comment' if kind == 'comment' else None))
+        return results
+
+    @_cached_tool(lambda params: _platform_tables(None))
+    def search_topic_globally(self, topic: Union[str, List[str]], limit_per_table: int = 100) -> DBResponse:
         """
         【工具】全局话题搜索: 在数据库中（内容、评论、标签、来源关键字）全面搜索指定话题。
 
         Args:
-            topic (str): 要搜索的话题关键词。
+            topic (Union[str, List[str]]): 要搜索的话题关键词；传入列表时一次查询匹配全部关键词，
+                结果的 matched_keywords 标明每条记录命中的关键词。
             limit_per_table (int): 从每个相关表中返回的最大记录数，默认为 100。
 
         Returns:
@@ -204,42 +741,38 @@ class MediaCrawlerDB:
         """
         params_for_log = {'topic': topic, 'limit_per_table': limit_per_table}
         logger.info(f"--- TOOL: 全局话题搜索 (params: {params_for_log}) ---")
+        topics = self._normalize_topics(topic)
+        if not topics:
+            return DBResponse("search_topic_globally", params_for_log, error_message="话题关键词不能为空。")
         
-        search_term, all_results = f"%{topic}%", []
+        all_results = []
         search_configs = { 'bilibili_video': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, 'bilibili_video_comment': {'fields': ['content'], 'type': 'comment'}, 'douyin_aweme': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, 'douyin_aweme_comment': {'fields': ['content'], 'type': 'comment'}, 'kuaishou_video': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, 'kuaishou_video_comment': {'fields': ['content'], 'type': 'comment'}, 'weibo_note': {'fields': ['content', 'source_keyword'], 'type': 'note'}, 'weibo_note_comment': {'fields': ['content'], 'type': 'comment'}, 'xhs_note': {'fields': ['title', 'desc', 'tag_list', 'source_keyword'], 'type': 'note'}, 'xhs_note_comment': {'fields': ['content'], 'type': 'comment'}, 'zhihu_content': {'fields': ['title', 'desc', 'content_text', 'source_keyword'], 'type': 'content'}, 'zhihu_comment': {'fields': ['content'], 'type': 'comment'}, 'tieba_note': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'note'}, 'tieba_comment': {'fields': ['content'], 'type': 'comment'}, 'daily_news': {'fields': ['title'], 'type': 'news'}, }
-        
+
+        if self._projection_ready():
+            all_results = self._search_projection([
+                ('content', self._build_projection_query('content', topics, limit_per_table)),
+                ('comment', self._build_projection_query('comment', topics, limit_per_table)),
+            ], topics, table_order=list(search_configs))
+            return DBResponse("search_topic_globally", params_for_log, results=all_results, results_count=len(all_results))
+
+        self._prepare_topic_backend({table: config['fields'] for table, config in search_configs.items()})
+        queries = []
         for table, config in search_configs.items():
-            param_dict = {}
-            where_clauses = []
-            for idx, field in enumerate(config['fields']):
-                pname = f"term_{idx}"
-                where_clauses.append(f'{self._wrap_query_field_with_dialect(field)} LIKE :{pname}')
-                param_dict[pname] = search_term
+            where_clause, tag_columns, param_dict = self._build_topics_clause(table, config['fields'], topics)
             param_dict['limit'] = limit_per_table
-            where_clause = " OR ".join(where_clauses)
-            query = f'SELECT * FROM {self._wrap_query_field_with_dialect(table)} WHERE {where_clause} ORDER BY id DESC LIMIT :limit'
-            raw_results = self._execute_query(query, param_dict)
-            for row in raw_results:
-                content = (row.get('title') or row.get('content') or row.get('desc') or row.get('content_text', ''))
-                time_key = row.get('create_time') or row.get('time') or row.get('created_time') or row.get('publish_time') or row.get('crawl_date')
-                all_results.append(QueryResult(
-                    platform=table.split('_')[0], content_type=config['type'],
-                    title_or_content=content if content else '',
-                    author_nickname=row.get('nickname') or row.get('user_nickname') or row.get('user_name'),
-                    url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'),
-                    publish_time=self._to_datetime(time_key),
-                    engagement=self._extract_engagement(row),
-                    source_keyword=row.get('source_keyword'),
-                    source_table=table
-                ))
+            queries.append((f'SELECT *{tag_columns} FROM {self._wrap_query_field_with_dialect(table)} WHERE {where_clause} ORDER BY id DESC LIMIT :limit', param_dict))
+        for (table, config), raw_results in zip(search_configs.items(), self._execute_queries(queries)):
+            all_results.extend(self._rows_to_results(raw_results, table, config['type'], topics))
         return DBResponse("search_topic_globally", params_for_log, results=all_results, results_count=len(all_results))
 
-    def search_topic_by_date(self, topic: str, start_date: str, end_date: str, limit_per_table: int = 100) -> DBResponse:
+    @_cached_tool(lambda params: list(social_projection.SOCIAL_CONTENT_SOURCES))
+    def search_topic_by_date(self, topic: Union[str, List[str]], start_date: str, end_date: str, limit_per_table: int = 100) -> DBResponse:
         """
         【工具】按日期搜索话题: 在明确的历史时间段内，搜索与特定话题相关的内容。
 
         Args:
-            topic (str): 要搜索的话题关键词。
+            topic (Union[str, List[str]]): 要搜索的话题关键词；传入列表时一次查询匹配全部关键词，
+                结果的 matched_keywords 标明每条记录命中的关键词。
             start_date (str): 开始日期，格式 'YYYY-MM-DD'。
             end_date (str): 结束日期，格式 'YYYY-MM-DD'。
             limit_per_table (int): 从每个相关表中返回的最大记录数，默认为 100。
@@ -249,52 +782,49 @@ class MediaCrawlerDB:
         """
         params_for_log = {'topic': topic, 'start_date': start_date, 'end_date': end_date, 'limit_per_table': limit_per_table}
         logger.info(f"--- TOOL: 按日期搜索话题 (params: {params_for_log}) ---")
+        topics = self._normalize_topics(topic)
+        if not topics:
+            return DBResponse("search_topic_by_date", params_for_log, error_message="话题关键词不能为空。")
         
         try:
             start_dt, end_dt = datetime.strptime(start_date, '%Y-%m-%d'), datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
         except ValueError:
             return DBResponse("search_topic_by_date", params_for_log, error_message="日期格式错误，请使用 'YYYY-MM-DD' 格式。")
         
-        search_term, all_results = f"%{topic}%", []
+        all_results = []
         search_configs = {
-            'bilibili_video': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video', 'time_col': 'create_time', 'time_type': 'sec'}, 'douyin_aweme': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video', 'time_col': 'create_time', 'time_type': 'ms'},
-            'kuaishou_video': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video', 'time_col': 'create_time', 'time_type': 'ms'}, 'weibo_note': {'fields': ['content', 'source_keyword'], 'type': 'note', 'time_col': 'create_date_time', 'time_type': 'str'},
-            'xhs_note': {'fields': ['title', 'desc', 'tag_list', 'source_keyword'], 'type': 'note', 'time_col': 'time', 'time_type': 'ms'}, 'zhihu_content': {'fields': ['title', 'desc', 'content_text', 'source_keyword'], 'type': 'content', 'time_col': 'created_time', 'time_type': 'sec_str'},
-            'tieba_note': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'note', 'time_col': 'publish_time', 'time_type': 'str'}, 'daily_news': {'fields': ['title'], 'type': 'news', 'time_col': 'crawl_date', 'time_type': 'date_str'},
+            'bilibili_video': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, 'douyin_aweme': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'},
+            'kuaishou_video': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, 'weibo_note': {'fields': ['content', 'source_keyword'], 'type': 'note'},
+            'xhs_note': {'fields': ['title', 'desc', 'tag_list', 'source_keyword'], 'type': 'note'}, 'zhihu_content': {'fields': ['title', 'desc', 'content_text', 'source_keyword'], 'type': 'content'},
+            'tieba_note': {'fields': ['title', 'desc', 'source_keyword'], 'type': 'note'}, 'daily_news': {'fields': ['title'], 'type': 'news'},
         }
 
+        if self._projection_ready():
+            all_results = self._search_projection([
+                ('content', self._build_projection_query('content', topics, limit_per_table, start_dt=start_dt, end_dt=end_dt)),
+            ], topics, table_order=list(search_configs))
+            return DBResponse("search_topic_by_date", params_for_log, results=all_results, results_count=len(all_results))
+
+        self._prepare_topic_backend({table: config['fields'] for table, config in search_configs.items()})
+        queries = []
         for table, config in search_configs.items():
-            param_dict = {}
-            where_clauses = []
-            for idx, field in enumerate(config['fields']):
-                pname = f"term_{idx}"
-                where_clauses.append(f'{self._wrap_query_field_with_dialect(field)} LIKE :{pname}')
-                param_dict[pname] = search_term
+            where_clause, tag_columns, param_dict = self._build_topics_clause(table, config['fields'], topics)
+            time_clause, time_params = self._build_time_range_clause(table, start_dt, end_dt)
+            param_dict.update(time_params)
             param_dict['limit'] = limit_per_table
-            where_clause = ' OR '.join(where_clauses)
-            query = f'SELECT * FROM {self._wrap_query_field_with_dialect(table)} WHERE {where_clause} ORDER BY id DESC LIMIT :limit'
-            raw_results = self._execute_query(query, param_dict)
-            for row in raw_results:
-                content = (row.get('title') or row.get('content') or row.get('desc') or row.get('content_text', ''))
-                time_key = row.get('create_time') or row.get('time') or row.get('created_time') or row.get('publish_time') or row.get('crawl_date')
-                all_results.append(QueryResult(
-                    platform=table.split('_')[0], content_type=config['type'],
-                    title_or_content=content if content else '',
-                    author_nickname=row.get('nickname') or row.get('user_nickname') or row.get('user_name'),
-                    url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'),
-                    publish_time=self._to_datetime(time_key),
-                    engagement=self._extract_engagement(row),
-                    source_keyword=row.get('source_keyword'),
-                    source_table=table
-                ))
+            queries.append((f'SELECT *{tag_columns} FROM {self._wrap_query_field_with_dialect(table)} WHERE {where_clause} AND {time_clause} ORDER BY id DESC LIMIT :limit', param_dict))
+        for (table, config), raw_results in zip(search_configs.items(), self._execute_queries(queries)):
+            all_results.extend(self._rows_to_results(raw_results, table, config['type'], topics))
         return DBResponse("search_topic_by_date", params_for_log, results=all_results, results_count=len(all_results))
         
-    def get_comments_for_topic(self, topic: str, limit: int = 500) -> DBResponse:
+    @_cached_tool(lambda params: list(social_projection.SOCIAL_COMMENT_SOURCES))
+    def get_comments_for_topic(self, topic: Union[str, List[str]], limit: int = 500) -> DBResponse:
         """
         【工具】获取话题评论: 专门搜索并返回所有平台中与特定话题相关的公众评论数据。
 
         Args:
-            topic (str): 要搜索的话题关键词。
+            topic (Union[str, List[str]]): 要搜索的话题关键词；传入列表时一次查询匹配全部关键词，
+                结果的 matched_keywords 标明每条记录命中的关键词。
             limit (int): 返回评论的总数量上限，默认为 500。
 
         Returns:
@@ -302,34 +832,55 @@ class MediaCrawlerDB:
         """
         params_for_log = {'topic': topic, 'limit': limit}
         logger.info(f"--- TOOL: 获取话题评论 (params: {params_for_log}) ---")
+        topics = self._normalize_topics(topic)
+        if not topics:
+            return DBResponse("get_comments_for_topic", params_for_log, error_message="话题关键词不能为空。")
         
-        search_term = f"%{topic}%"
+        if self._projection_ready():
+            formatted = self._search_projection([
+                ('comment', self._build_projection_query('comment', topics, limit, per_source=False, order_by='publish_ts DESC')),
+            ], topics)
+            return DBResponse("get_comments_for_topic", params_for_log, results=formatted, results_count=len(formatted))
+
         comment_tables = ['bilibili_video_comment', 'douyin_aweme_comment', 'kuaishou_video_comment', 'weibo_note_comment', 'xhs_note_comment', 'zhihu_comment', 'tieba_comment']
+        q = self._wrap_query_field_with_dialect
+        self._prepare_topic_backend({table: ['content'] for table in comment_tables})
         
-        all_queries = []
-        for table in comment_tables:
+        legacy = {table: not self._has_normalized_columns(table) for table in comment_tables}
+        all_queries, params = [], {}
+        for idx, table in enumerate(comment_tables):
             cols = self._get_table_columns(table)
             author_col = 'user_nickname' if 'user_nickname' in cols else 'nickname'
-            like_col = 'comment_like_count' if 'comment_like_count' in cols else 'like_count' if 'like_count' in cols else None
-            time_col = 'publish_time' if 'publish_time' in cols else 'create_date_time' if 'create_date_time' in cols else 'create_time'
-            like_select = f"`{like_col}` as likes" if like_col else "'0' as likes"
+            topic_clause, tag_columns, topic_params = self._build_topics_clause(table, ['content'], topics, param_prefix=f"term_{idx}")
+            params.update(topic_params)
+            if legacy[table]:
+                # 旧表：点赞数取原始文本列 CAST，发布时间取原始时间列
+                like_col = 'comment_like_count' if 'comment_like_count' in cols else 'like_count' if 'like_count' in cols else None
+                time_col = 'publish_time' if 'publish_time' in cols else 'create_date_time' if 'create_date_time' in cols else 'create_time'
+                ts, likes = q(time_col), f"COALESCE({self._cast_int(q(like_col))}, 0)" if like_col else "0"
+            else:
+                ts, likes = q('publish_ts'), q('likes_num')
+            if any(legacy.values()):
+                # 旧表的发布时间可能是字符串，UNION 各分支的类型需一致
+                ts = self._cast_text(ts)
             
-            query = (f"SELECT '{table.split('_')[0]}' as platform, `content`, `{author_col}` as author, "
-                     f"`{time_col}` as ts, {like_select}, '{table}' as source_table "
-                     f"FROM `{table}` WHERE `content` LIKE %s")
+            query = (f"SELECT '{table.split('_')[0]}' as platform, {q('content')}, {q(author_col)} as author, "
+                     f"{ts} as ts, {likes} as likes, '{table}' as source_table{tag_columns} "
+                     f"FROM {q(table)} WHERE {topic_clause}")
             all_queries.append(query)
 
-        final_query = f"({' ) UNION ALL ( '.join(all_queries)}) ORDER BY ts DESC LIMIT %s"
-        params = (search_term,) * len(comment_tables) + (limit,)
+        final_query = f"({' ) UNION ALL ( '.join(all_queries)}) ORDER BY ts DESC LIMIT :limit"
+        params['limit'] = limit
         raw_results = self._execute_query(final_query, params)
         
-        formatted = [QueryResult(platform=r['platform'], content_type='comment', title_or_content=r['content'], author_nickname=r['author'], publish_time=self._to_datetime(r['ts']), engagement={'likes': int(r['likes']) if str(r['likes']).isdigit() else 0}, source_table=r['source_table']) for r in raw_results]
+        formatted = [QueryResult(platform=r['platform'], content_type='comment', title_or_content=r['content'], author_nickname=r['author'], publish_time=self._to_datetime(r['ts']), engagement=Engagement(likes=int(r['likes'] or 0)), source_table=r['source_table'], matched_keywords=self._matched_keywords(r, topics)) for r in raw_results]
         return DBResponse("get_comments_for_topic", params_for_log, results=formatted, results_count=len(formatted))
 
+    @_cached_tool(lambda params: _platform_tables(params.get('platform')))
     def search_topic_on_platform(
         self,
         platform: Literal['bilibili', 'weibo', 'douyin', 'kuaishou', 'xhs', 'zhihu', 'tieba'],
-        topic: str,
+        topic: Union[str, List[str]],
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         limit: int = 20
@@ -339,7 +890,8 @@ class MediaCrawlerDB:
 
         Args:
             platform (Literal['bilibili', ...]): 要搜索的平台，必须是七个支持的平台之一。
-            topic (str): 要搜索的话题关键词。
+            topic (Union[str, List[str]]): 要搜索的话题关键词；传入列表时一次查询匹配全部关键词，
+                结果的 matched_keywords 标明每条记录命中的关键词。
             start_date (Optional[str]): 开始日期，格式 'YYYY-MM-DD'。默认为None。
             end_date (Optional[str]): 结束日期，格式 'YYYY-MM-DD'。默认为None。
             limit (int): 返回结果的最大数量，默认为 20。
@@ -349,16 +901,18 @@ class MediaCrawlerDB:
         """
         params_for_log = {'platform': platform, 'topic': topic, 'start_date': start_date, 'end_date': end_date, 'limit': limit}
         logger.info(f"--- TOOL: 平台定向搜索 (params: {params_for_log}) ---")
+        topics = self._normalize_topics(topic)
+        if not topics:
+            return DBResponse("search_topic_on_platform", params_for_log, error_message="话题关键词不能为空。")
 
-        all_configs = { 'bilibili': [{'table': 'bilibili_video', 'fields': ['title', 'desc', 'source_keyword'], 'type': 'video', 'time_col': 'create_time', 'time_type': 'sec'}, {'table': 'bilibili_video_comment', 'fields': ['content'], 'type': 'comment'}], 'douyin': [{'table': 'douyin_aweme', 'fields': ['title', 'desc', 'source_keyword'], 'type': 'video', 'time_col': 'create_time', 'time_type': 'ms'}, {'table': 'douyin_aweme_comment', 'fields': ['content'], 'type': 'comment'}], 'kuaishou': [{'table': 'kuaishou_video', 'fields': ['title', 'desc', 'source_keyword'], 'type': 'video', 'time_col': 'create_time', 'time_type': 'ms'}, {'table': 'kuaishou_video_comment', 'fields': ['content'], 'type': 'comment'}], 'weibo': [{'table': 'weibo_note', 'fields': ['content', 'source_keyword'], 'type': 'note', 'time_col': 'create_date_time', 'time_type': 'str'}, {'table': 'weibo_note_comment', 'fields': ['content'], 'type': 'comment'}], 'xhs': [{'table': 'xhs_note', 'fields': ['title', 'desc', 'tag_list', 'source_keyword'], 'type': 'note', 'time_col': 'time', 'time_type': 'ms'}, {'table': 'xhs_note_comment', 'fields': ['content'], 'type': 'comment'}], 'zhihu': [{'table': 'zhihu_content', 'fields': ['title', 'desc', 'content_text', 'source_keyword'], 'type': 'content', 'time_col': 'created_time', 'time_type': 'sec_str'}, {'table': 'zhihu_comment', 'fields': ['content'], 'type': 'comment'}], 'tieba': [{'table': 'tieba_note', 'fields': ['title', 'desc', 'source_keyword'], 'type': 'note', 'time_col': 'publish_time', 'time_type': 'str'}, {'table': 'tieba_comment', 'fields': ['content'], 'type': 'comment'}] }
+        all_configs = { 'bilibili': [{'table': 'bilibili_video', 'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, {'table': 'bilibili_video_comment', 'fields': ['content'], 'type': 'comment'}], 'douyin': [{'table': 'douyin_aweme', 'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, {'table': 'douyin_aweme_comment', 'fields': ['content'], 'type': 'comment'}], 'kuaishou': [{'table': 'kuaishou_video', 'fields': ['title', 'desc', 'source_keyword'], 'type': 'video'}, {'table': 'kuaishou_video_comment', 'fields': ['content'], 'type': 'comment'}], 'weibo': [{'table': 'weibo_note', 'fields': ['content', 'source_keyword'], 'type': 'note'}, {'table': 'weibo_note_comment', 'fields': ['content'], 'type': 'comment'}], 'xhs': [{'table': 'xhs_note', 'fields': ['title', 'desc', 'tag_list', 'source_keyword'], 'type': 'note'}, {'table': 'xhs_note_comment', 'fields': ['content'], 'type': 'comment'}], 'zhihu': [{'table': 'zhihu_content', 'fields': ['title', 'desc', 'content_text', 'source_keyword'], 'type': 'content'}, {'table': 'zhihu_comment', 'fields': ['content'], 'type': 'comment'}], 'tieba': [{'table': 'tieba_note', 'fields': ['title', 'desc', 'source_keyword'], 'type': 'note'}, {'table': 'tieba_comment', 'fields': ['content'], 'type': 'comment'}] }
         
         if platform not in all_configs:
             return DBResponse("search_topic_on_platform", params_for_log, error_message=f"不支持的平台: {platform}")
 
-        search_term, all_results = f"%{topic}%", []
+        all_results = []
         platform_configs = all_configs[platform]
 
-        time_clause, time_params_tuple = "", ()
         if start_date and end_date:
             try:
                 start_dt, end_dt = datetime.strptime(start_date, '%Y-%m-%d'), datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
@@ -367,36 +921,249 @@ class MediaCrawlerDB:
         else:
             start_dt, end_dt = None, None
 
+        if self._projection_ready():
+            all_results = self._search_projection([
+                (kind, self._build_projection_query(kind, topics, limit, platform=platform, start_dt=start_dt, end_dt=end_dt))
+                for kind in ('content', 'comment')
+            ], topics, table_order=[config['table'] for config in platform_configs])
+            return DBResponse("search_topic_on_platform", params_for_log, results=all_results, results_count=len(all_results))
+
+        self._prepare_topic_backend({config['table']: config['fields'] for config in platform_configs})
+        queries = []
         for config in platform_configs:
             table = config['table']
-            topic_clause = " OR ".join([f"`{field}` LIKE %s" for field in config['fields']])
-            query = f"SELECT * FROM `{table}` WHERE {topic_clause}"
-            params = [search_term] * len(config['fields'])
-
-            if start_dt and end_dt and 'time_col' in config:
-                time_col, time_type = config['time_col'], config['time_type']
-                if time_type == 'sec': t_params = (int(start_dt.timestamp()), int(end_dt.timestamp()))
-                elif time_type == 'ms': t_params = (int(start_dt.timestamp() * 1000), int(end_dt.timestamp() * 1000))
-                elif time_type in ['str', 'date_str']: t_params = (start_dt.strftime('%Y-%m-%d'), end_dt.strftime('%Y-%m-%d'))
-                else: t_params = (str(int(start_dt.timestamp())), str(int(end_dt.timestamp())))
-                
-                t_clause = f"`{time_col}` >= %s AND `{time_col}` < %s"
-                if table == 'zhihu_content': t_clause = f"CAST(`{time_col}` AS UNSIGNED) >= %s AND CAST(`{time_col}` AS UNSIGNED) < %s"
-                
-                query += f" AND ({t_clause})"
-                params.extend(t_params)
-
-            query += f" ORDER BY id DESC LIMIT %s"
-            params.append(limit)
-
-            raw_results = self._execute_query(query, tuple(params))
+            q = self._wrap_query_field_with_dialect
+            topic_clause, tag_columns, params = self._build_topics_clause(table, config['fields'], topics)
+            query = f"SELECT *{tag_columns} FROM {q(table)} WHERE {topic_clause}"
+
+            if start_dt and end_dt:
+                time_clause, time_params = self._build_time_range_clause(table, start_dt, end_dt)
+                query += f" AND {time_clause}"
+                params.update(time_params)
+
+            query += f" ORDER BY id DESC LIMIT :limit"
+            params['limit'] = limit
+            queries.append((query, params))
+
+        for config, raw_results in zip(platform_configs, self._execute_queries(queries)):
+            table = config['table']
             for row in raw_results:
                 content = (row.get('title') or row.get('content') or row.get('desc') or row.get('content_text', ''))
-                time_key = config.get('time_col') and row.get(config.get('time_col'))
-                all_results.append(QueryResult(platform=platform, content_type=config['type'], title_or_content=content if content else '', author_nickname=row.get('nickname') or row.get('user_nickname'), url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'), publish_time=self._to_datetime(time_key), engagement=self._extract_engagement(row), source_keyword=row.get('source_keyword'), source_table=table))
+                time_key = row.get('publish_ts')
+                all_results.append(QueryResult(platform=platform, content_type=config['type'], title_or_content=content if content else '', author_nickname=row.get('nickname') or row.get('user_nickname'), url=row.get('video_url') or row.get('note_url') or row.get('content_url') or row.get('url') or row.get('aweme_url'), publish_time=self._to_datetime(time_key), engagement=self._extract_engagement(row), source_keyword=row.get('source_keyword'), source_table=table, matched_keywords=self._matched_keywords(row, topics)))
         
         return DBResponse("search_topic_on_platform", params_for_log, results=all_results, results_count=len(all_results))
 
+    @_cached_tool(lambda params: _platform_tables(params.get('platform')))
+    def get_sentiment_distribution(
+        self,
+        topic: Union[str, List[str]],
+        platform: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> DBResponse:
+        """
+        【工具】情感分布聚合: 基于离线预计算的情感（见 utils/sentiment_scoring.py），在数据库中按
+        (平台, 情感类别) 统计与话题相关的内容和评论，不加载情感模型。
+
+        Args:
+            topic (Union[str, List[str]]): 话题关键词
+            platform (Optional[str]): 只统计指定平台，默认全部平台
+            start_date (Optional[str]): 开始日期，格式 'YYYY-MM-DD'
+            end_date (Optional[str]): 结束日期，格式 'YYYY-MM-DD'
+
+        Returns:
+            DBResponse: 统计结果位于 parameters["sentiment_distribution"]，包含 by_platform、overall、
+                scored（已打分条数）、unscored（尚未打分条数）与 average_confidence。
+        """
+        params_for_log = {'topic': topic, 'platform': platform, 'start_date': start_date, 'end_date': end_date}
+        logger.info(f"--- TOOL: 情感分布聚合 (params: {params_for_log}) ---")
+        topics = self._normalize_topics(topic)
+        if not topics:
+            return DBResponse("get_sentiment_distribution", params_for_log, error_message="话题关键词不能为空。")
+        start_dt = end_dt = None
+        if start_date and end_date:
+            try:
+                start_dt, end_dt = datetime.strptime(start_date, '%Y-%m-%d'), datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
+            except ValueError:
+                return DBResponse("get_sentiment_distribution", params_for_log, error_message="日期格式错误，请使用 'YYYY-MM-DD' 格式。")
+        if not self._projection_ready():
+            return DBResponse("get_sentiment_distribution", params_for_log, error_message="统一投影表不可用，无法聚合预计算的情感。")
+
+        q = self._wrap_query_field_with_dialect
+        targets = {social_projection.SOCIAL_CONTENT_TABLE: social_projection.SOCIAL_CONTENT_SEARCH_FIELDS,
+                   social_projection.SOCIAL_COMMENT_TABLE: social_projection.SOCIAL_COMMENT_SEARCH_FIELDS}
+        self._prepare_topic_backend(targets)
+        queries = []
+        for table, fields in targets.items():
+            where_clause, _, params = self._build_topics_clause(table, fields, topics)
+            conditions = [where_clause]
+            if platform:
+                conditions.append(f"{q('platform')} = :platform")
+                params['platform'] = platform
+            if start_dt and end_dt:
+                time_clause, time_params = self._build_time_range_clause(table, start_dt, end_dt)
+                conditions.append(time_clause)
+                params.update(time_params)
+            queries.append((f"SELECT {q('platform')} AS platform, {q('sentiment_label')} AS label, COUNT(*) AS cnt, "
+                            f"SUM({q('sentiment_confidence')}) AS conf_sum FROM {q(table)} "
+                            f"WHERE {' AND '.join(conditions)} GROUP BY {q('platform')}, {q('sentiment_label')}", params))
+
+        by_platform: Dict[str, Dict[str, int]] = {}
+        overall: Dict[str, int] = {}
+        scored = unscored = 0
+        confidence_sum = 0.0
+        for rows in self._execute_queries(queries):
+            for row in rows:
+                name = sentiment_scoring.label_name(row['label'])
+                if name is None:
+                    unscored += int(row['cnt'])
+                    continue
+                by_platform.setdefault(row['platform'], {})
+                by_platform[row['platform']][name] = by_platform[row['platform']].get(name, 0) + int(row['cnt'])
+                overall[name] = overall.get(name, 0) + int(row['cnt'])
+                scored += int(row['cnt'])
+                confidence_sum += float(row['conf_sum'] or 0)
+
+        params_for_log['sentiment_distribution'] = {
+            'by_platform': by_platform, 'overall': overall, 'scored': scored, 'unscored': unscored,
+            'average_confidence': round(confidence_sum / scored, 4) if scored else 0.0,
+        }
+        return DBResponse("get_sentiment_distribution", params_for_log, results_count=scored)
+
+    def stream_comments_for_topic(
+        self,
+        topic: Union[str, List[str]],
+        platform: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        batch_size: int = 500,
+        max_results: Optional[int] = None,
+    ) -> Iterator[List[QueryResult]]:
+        """
+        【流式】分批产出与话题相关的评论，按发布时间从新到旧排列。
+
+        与 get_comments_for_topic 不同，结果不会一次性加载到内存：底层使用服务端游标读取
+        social_comment，并以 (publish_ts, id) 键集分页推进，适合把大量评论直接送入情感分析批处理。
+
+        Args:
+            topic (Union[str, List[str]]): 话题关键词或关键词列表。
+            platform (Optional[str]): 只返回指定平台的评论，默认为全部平台。
+            start_date (Optional[str]): 开始日期，格式 'YYYY-MM-DD'，需与 end_date 同时提供。
+            end_date (Optional[str]): 结束日期，格式 'YYYY-MM-DD'。
+            batch_size (int): 每批产出的结果数量，默认为 500。
+            max_results (Optional[int]): 总数量上限，默认不限。
+
+        Yields:
+            List[QueryResult]: 每批至多 batch_size 条评论。
+        """
+        yield from self._stream_topic('comment', topic, platform, start_date, end_date, batch_size, max_results)
+
+    def stream_topic_content(
+        self,
+        topic: Union[str, List[str]],
+        platform: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        batch_size: int = 500,
+        max_results: Optional[int] = None,
+    ) -> Iterator[List[QueryResult]]:
+        """
+        【流式】分批产出与话题相关的内容（视频/笔记/文章/新闻），按发布时间从新到旧排列。
+
+        参数与 stream_comments_for_topic 相同。
+
+        Yields:
+            List[QueryResult]: 每批至多 batch_size 条内容。
+        """
+        yield from self._stream_topic('content', topic, platform, start_date, end_date, batch_size, max_results)
+
+    def _stream_topic(
+        self,
+        kind: Literal['content', 'comment'],
+        topic: Union[str, List[str]],
+        platform: Optional[str],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        batch_size: int,
+        max_results: Optional[int],
+    ) -> Iterator[List[QueryResult]]:
+        params_for_log = {'kind': kind, 'topic': topic, 'platform': platform, 'start_date': start_date,
+                          'end_date': end_date, 'batch_size': batch_size, 'max_results': max_results}
+        logger.info(f"--- TOOL: 流式话题读取 (params: {params_for_log}) ---")
+        topics = self._normalize_topics(topic)
+        if not topics:
+            logger.warning("话题关键词不能为空。")
+            return
+        start_dt = end_dt = None
+        if start_date and end_date:
+            try:
+                start_dt, end_dt = datetime.strptime(start_date, '%Y-%m-%d'), datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
+            except ValueError:
+                logger.warning("日期格式错误，请使用 'YYYY-MM-DD' 格式。")
+                return
+
+        if not self._projection_ready():
+            yield from self._stream_topic_fallback(kind, topics, platform, start_dt, end_dt, batch_size, max_results)
+            return
+
+        table = social_projection.SOCIAL_CONTENT_TABLE if kind == 'content' else social_projection.SOCIAL_COMMENT_TABLE
+        fields = social_projection.SOCIAL_CONTENT_SEARCH_FIELDS if kind == 'content' else social_projection.SOCIAL_COMMENT_SEARCH_FIELDS
+        self._prepare_topic_backend({table: fields})
+        content_type = 'comment' if kind == 'comment' else None
+        # 每一页是一次独立的服务端游标查询，页内按 batch_size 分批读取；页与页之间用键集游标衔接，
+        # 避免单个游标长时间占用连接，也避免 OFFSET 深翻页
+        page_size = max(batch_size, self.STREAM_PAGE_SIZE)
+        after, emitted = None, 0
+        while True:
+            query, params = self._build_projection_query(kind, topics, page_size, per_source=False, platform=platform,
+                                                         start_dt=start_dt, end_dt=end_dt,
+                                                         order_by='publish_ts DESC, id DESC', after=after,
+                                                         collapse_duplicates=False)
+            page_rows = 0
+            batches = iter_sync(stream_all(query, params, batch_size))
+            try:
+                for rows in batches:
+                    page_rows += len(rows)
+                    after = (int(rows[-1]['publish_ts'] or 0), int(rows[-1]['id']))
+                    if max_results is not None:
+                        rows = rows[:max_results - emitted]
+                    emitted += len(rows)
+                    yield self._projection_rows_to_results(rows, topics, content_type)
+                    if max_results is not None and emitted >= max_results:
+                        return
+            finally:
+                batches.close()
+            if page_rows < page_size:
+                return
+
+    def _stream_topic_fallback(
+        self,
+        kind: Literal['content', 'comment'],
+        topics: List[str],
+        platform: Optional[str],
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime],
+        batch_size: int,
+        max_results: Optional[int],
+    ) -> Iterator[List[QueryResult]]:
+        """投影表不可用时退化为一次逐表查询，再按批切分产出"""
+        limit = max_results or self.STREAM_PAGE_SIZE
+        if kind == 'comment':
+            results = self.get_comments_for_topic(topics, limit=limit).results
+        elif start_dt and end_dt:
+            results = self.search_topic_by_date(topics, start_dt.strftime('%Y-%m-%d'),
+                                                (end_dt - timedelta(days=1)).strftime('%Y-%m-%d'), limit_per_table=limit).results
+        else:
+            results = self.search_topic_globally(topics, limit_per_table=limit).results
+        results = [r for r in results if (r.content_type == 'comment') == (kind == 'comment')
+                   and (not platform or r.platform == platform)
+                   and (not start_dt or (r.publish_time and start_dt <= r.publish_time < end_dt))]
+        results.sort(key=lambda r: r.publish_time or datetime.min, reverse=True)
+        results = results[:limit]
+        for idx in range(0, len(results), batch_size):
+            yield results[idx:idx + batch_size]
+
 # --- 3. 测试与使用示例 ---
 def print_response_summary(response: DBResponse):
     """简化的打印函数，用于展示测试结果"""
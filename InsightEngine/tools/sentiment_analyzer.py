@@ -3,34 +3,68 @@
 基于WeiboMultilingualSentiment模型为InsightEngine提供情感分析功能
 """
 
+import hashlib
+import importlib.util
 import os
 import sys
-from typing import List, Dict, Any, Optional, Union
+import threading
+import time
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
 from dataclasses import dataclass
 import re
 
-try:
-    import torch
-    TORCH_AVAILABLE = True
-except ImportError:
-    torch = None  # type: ignore
-    TORCH_AVAILABLE = False
+import numpy as np
 
-try:
-    from transformers import AutoTokenizer, AutoModelForSequenceClassification
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    AutoTokenizer = None  # type: ignore
-    AutoModelForSequenceClassification = None  # type: ignore
-    TRANSFORMERS_AVAILABLE = False
+from InsightEngine.utils.config import settings
+from InsightEngine.utils.sentiment_cache import content_hash, get_sentiment_cache
+from InsightEngine.utils import sentiment_stats
+
+# PyTorch / Transformers 的导入本身需要数秒，这里只检查是否已安装，实际导入推迟到首次加载模型时
+TORCH_AVAILABLE = importlib.util.find_spec("torch") is not None
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec("transformers") is not None
+torch = None  # type: ignore
+AutoConfig = None  # type: ignore
+AutoTokenizer = None  # type: ignore
+AutoModelForSequenceClassification = None  # type: ignore
+
+from .sentiment_onnx import ONNXRUNTIME_AVAILABLE, OnnxSentimentModel, export_onnx, onnx_model_path
+from .sentiment_service import SentimentServiceClient
+from .sentiment_cascade import CascadeMetrics, FastSentimentModel, get_fast_sentiment_model
 
 
 # INFO：若想跳过情感分析，可手动切换此开关为False
 SENTIMENT_ANALYSIS_ENABLED = True
 
+# 参与模型指纹的文件：配置、分词器与权重（save_pretrained 的输出）
+FINGERPRINT_SUFFIXES = (".json", ".txt", ".model", ".safetensors", ".bin")
+
+
+def _sentiment_backend() -> str:
+    """实际使用的推理后端：SENTIMENT_BACKEND=onnx 且 onnxruntime 可用时为 onnx，否则为 torch"""
+    return "onnx" if (settings.SENTIMENT_BACKEND or "torch").lower() == "onnx" and ONNXRUNTIME_AVAILABLE else "torch"
+
+
+def _import_ml_modules(need_torch: bool = True) -> None:
+    """按需导入 Transformers（以及 torch 后端或导出 ONNX 时需要的 PyTorch）"""
+    global torch, AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+    if need_torch and torch is None:
+        import torch as _torch
+        torch = _torch
+    if AutoTokenizer is None:
+        from transformers import (
+            AutoConfig as _AutoConfig,
+            AutoModelForSequenceClassification as _AutoModelForSequenceClassification,
+            AutoTokenizer as _AutoTokenizer,
+        )
+        AutoConfig = _AutoConfig
+        AutoTokenizer = _AutoTokenizer
+        AutoModelForSequenceClassification = _AutoModelForSequenceClassification
+
+
 def _describe_missing_dependencies() -> str:
     missing = []
-    if not TORCH_AVAILABLE:
+    # onnx 后端推理不需要 PyTorch（仅首次导出模型时需要）
+    if not TORCH_AVAILABLE and _sentiment_backend() != "onnx":
         missing.append("PyTorch")
     if not TRANSFORMERS_AVAILABLE:
         missing.append("Transformers")
@@ -62,6 +96,8 @@ class BatchSentimentResult:
     failed_count: int
     average_confidence: float
     analysis_performed: bool = True
+    # N×K 概率矩阵（行与 results 对应，列为情感类别），分析失败的行为 NaN；统计见 utils.sentiment_stats
+    probabilities: Optional[np.ndarray] = None
 
 
 class WeiboMultilingualSentimentAnalyzer:
@@ -70,14 +106,34 @@ class WeiboMultilingualSentimentAnalyzer:
     封装WeiboMultilingualSentiment模型，为AI Agent提供情感分析功能
     """
     
-    def __init__(self):
-        """初始化情感分析器"""
+    def __init__(self, use_service: bool = True):
+        """
+        初始化情感分析器
+
+        Args:
+            use_service: 配置了 SENTIMENT_SERVICE_URL 时是否优先使用共享情感分析服务（服务进程自身为 False）
+        """
+        self.use_service = use_service
+        self.service: Optional[SentimentServiceClient] = None
+        # 服务暂不可用时下一次重新探测的时间（time.monotonic），None 表示无需探测
+        self._service_retry_at: Optional[float] = None
         self.model = None
+        self.model_config = None
+        self.onnx_model: Optional[OnnxSentimentModel] = None
+        self.backend = "torch"
         self.tokenizer = None
         self.device = None
+        self._model_fingerprint = ""
         self.is_initialized = False
         self.is_disabled = False
         self.disable_reason: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.cascade_metrics = CascadeMetrics()
+        self._init_lock = threading.Lock()
+        # HuggingFace 快速分词器与模型不支持多线程并发调用（并行段落会同时分析，报 "Already borrowed"），
+        # 分词与推理串行执行
+        self._inference_lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
         
         # 情感标签映射（5级分类）
         self.sentiment_map = {
@@ -90,7 +146,8 @@ class WeiboMultilingualSentimentAnalyzer:
 
         if not SENTIMENT_ANALYSIS_ENABLED:
             self.disable("情感分析功能已在配置中关闭。")
-        elif not (TORCH_AVAILABLE and TRANSFORMERS_AVAILABLE):
+        elif _describe_missing_dependencies() and not self._service_url():
+            # 使用共享服务时本进程不需要 PyTorch / Transformers
             missing = _describe_missing_dependencies() or "未知依赖"
             self.disable(f"缺少依赖: {missing}，情感分析已禁用。")
 
@@ -105,7 +162,9 @@ class WeiboMultilingualSentimentAnalyzer:
         self.is_disabled = True
         self.disable_reason = reason or "Sentiment analysis disabled."
         if drop_state:
+            self.service = None
             self.model = None
+            self.onnx_model = None
             self.tokenizer = None
             self.device = None
             self.is_initialized = False
@@ -115,7 +174,7 @@ class WeiboMultilingualSentimentAnalyzer:
         if not SENTIMENT_ANALYSIS_ENABLED:
             self.disable("情感分析功能已在配置中关闭。")
             return False
-        if not (TORCH_AVAILABLE and TRANSFORMERS_AVAILABLE):
+        if _describe_missing_dependencies() and self.service is None and not self._service_url():
             missing = _describe_missing_dependencies() or "未知依赖"
             self.disable(f"缺少依赖: {missing}，情感分析已禁用。")
             return False
@@ -123,9 +182,70 @@ class WeiboMultilingualSentimentAnalyzer:
         self.disable_reason = None
         return True
 
+    def _service_url(self) -> str:
+        return (settings.SENTIMENT_SERVICE_URL or "").strip() if self.use_service else ""
+
+    def _connect_service(self, wait: Optional[float] = None) -> bool:
+        """
+        配置了共享情感分析服务且服务就绪时改为服务客户端，不在本进程加载模型
+
+        服务仍在加载模型时最多等待 wait 秒（默认 SENTIMENT_SERVICE_READY_WAIT_SECONDS），
+        之后仍未就绪或不可达时返回 False，并安排在 SENTIMENT_SERVICE_REPROBE_SECONDS 后重新探测。
+        """
+        url = self._service_url()
+        if not url:
+            return False
+        client = SentimentServiceClient(url)
+        status = client.wait_until_ready(settings.SENTIMENT_SERVICE_READY_WAIT_SECONDS if wait is None else wait)
+        if status is None or status.get("status") != "ready":
+            if status is None:
+                reason = "服务不可达"
+            elif status.get("status") == "loading":
+                reason = "服务仍在加载模型"
+            else:
+                reason = f"服务模型不可用（{status.get('reason')}）"
+            self._service_retry_at = time.monotonic() + settings.SENTIMENT_SERVICE_REPROBE_SECONDS
+            print(f"情感分析服务暂不可用: {url}（{reason}），改为进程内推理，"
+                  f"{settings.SENTIMENT_SERVICE_REPROBE_SECONDS:.0f}s 后重新探测")
+            return False
+
+        self._service_retry_at = None
+        self.service = client
+        self.backend = "service"
+        self.device = url
+        self.is_initialized = True
+        self.is_disabled = False
+        self.disable_reason = None
+        print(f"使用共享情感分析服务: {url}")
+        return True
+
+    def _reprobe_service(self) -> None:
+        """服务此前不可用且到了重新探测时间时探测一次（不等待），就绪后切回服务并释放进程内模型"""
+        if (self.service is not None or self._service_retry_at is None or not SENTIMENT_ANALYSIS_ENABLED
+                or time.monotonic() < self._service_retry_at):
+            return
+        with self._init_lock:
+            if self.service is not None or time.monotonic() < (self._service_retry_at or 0):
+                return
+            if self._connect_service(wait=0):
+                with self._inference_lock:
+                    self.model = None
+                    self.onnx_model = None
+                    self.tokenizer = None
+
+    def _fallback_to_local(self, error: Exception) -> bool:
+        """服务调用失败时放弃服务，改为在本进程加载模型"""
+        print(f"情感分析服务调用失败（{error}），改为进程内推理")
+        self.service = None
+        self._service_retry_at = time.monotonic() + settings.SENTIMENT_SERVICE_REPROBE_SECONDS
+        self.backend = "torch"
+        self.device = None
+        self.is_initialized = False
+        return self._load_local_model()
+
     def _select_device(self):
         """Select the best available torch device."""
-        if not TORCH_AVAILABLE:
+        if torch is None:
             return None
         if torch.cuda.is_available():
             return torch.device("cuda")
@@ -134,37 +254,88 @@ class WeiboMultilingualSentimentAnalyzer:
             return torch.device("mps")
         return torch.device("cpu")
     
+    @property
+    def is_warming_up(self) -> bool:
+        return self._warmup_thread is not None and self._warmup_thread.is_alive()
+
+    def warm_up(self) -> bool:
+        """
+        在后台线程中加载模型（含首次下载），不阻塞调用方
+
+        之后真正需要模型的 initialize() 调用会等待预热完成，而不是重复加载。
+
+        Returns:
+            是否启动了（或已有）预热线程；已加载或已禁用时返回 False
+        """
+        if self.is_initialized or self.is_disabled:
+            return False
+        if self.is_warming_up:
+            return True
+        self._warmup_thread = threading.Thread(target=self.initialize, name="sentiment-warmup", daemon=True)
+        self._warmup_thread.start()
+        return True
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """等待后台预热结束，返回模型是否可用"""
+        thread = self._warmup_thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.is_initialized and not self.is_disabled
+
     def initialize(self) -> bool:
         """
-        初始化模型和分词器
+        初始化模型和分词器（线程安全：后台预热进行中时等待其完成）
         
         Returns:
             是否初始化成功
         """
+        with self._init_lock:
+            return self._initialize()
+
+    def _initialize(self) -> bool:
         if self.is_disabled:
             reason = self.disable_reason or "情感分析功能已禁用"
             print(f"情感分析功能已禁用，跳过模型加载：{reason}")
             return False
 
-        if not (TORCH_AVAILABLE and TRANSFORMERS_AVAILABLE):
+        if self.is_initialized:
+            print("模型已经初始化，无需重复加载")
+            return True
+
+        if self._connect_service():
+            return True
+        return self._load_local_model()
+
+    def _load_local_model(self) -> bool:
+        """在本进程加载模型和分词器"""
+        if _describe_missing_dependencies():
             missing = _describe_missing_dependencies() or "未知依赖"
             self.disable(f"缺少依赖: {missing}，情感分析已禁用。", drop_state=True)
             print(f"缺少依赖: {missing}，无法加载情感分析模型。")
             return False
 
-        if self.is_initialized:
-            print("模型已经初始化，无需重复加载")
-            return True
-            
         try:
             print("正在加载多语言情感分析模型...")
+            started = time.perf_counter()
             
             # 使用多语言情感分析模型
             model_name = "tabularisai/multilingual-sentiment-analysis"
             local_model_path = os.path.join(weibo_sentiment_path, "model")
             
+            backend = _sentiment_backend()
+            if (settings.SENTIMENT_BACKEND or "torch").lower() == "onnx" and backend != "onnx":
+                print("onnxruntime 未安装，情感分析改用 torch 后端")
+            onnx_path = onnx_model_path(local_model_path, settings.SENTIMENT_ONNX_QUANTIZE)
+            # 已导出 ONNX 时无需导入 PyTorch
+            _import_ml_modules(need_torch=not (backend == "onnx" and os.path.exists(onnx_path)))
+
             # 检查本地是否已有模型
-            if os.path.exists(local_model_path):
+            if backend == "onnx" and os.path.exists(onnx_path):
+                # 已导出 ONNX 时只需分词器与模型配置，不加载 PyTorch 权重
+                print("从本地加载 ONNX 模型...")
+                self.tokenizer = AutoTokenizer.from_pretrained(local_model_path)
+                self.model_config = AutoConfig.from_pretrained(local_model_path)
+            elif os.path.exists(local_model_path):
                 print("从本地加载模型...")
                 self.tokenizer = AutoTokenizer.from_pretrained(local_model_path)
                 self.model = AutoModelForSequenceClassification.from_pretrained(local_model_path)
@@ -179,27 +350,40 @@ class WeiboMultilingualSentimentAnalyzer:
                 self.tokenizer.save_pretrained(local_model_path)
                 self.model.save_pretrained(local_model_path)
                 print(f"模型已保存到: {local_model_path}")
-            
-            # 设置设备
-            device = self._select_device()
-            if device is None:
-                raise RuntimeError("未检测到可用的计算设备")
-
-            self.device = device
-            self.model.to(self.device)
-            self.model.eval()
-            self.is_initialized = True
-            self.enable()
 
-            device_type = getattr(self.device, "type", str(self.device))
-            if device_type == "cuda":
-                print("检测到可用 GPU，已优先使用 CUDA 进行推理。")
-            elif device_type == "mps":
-                print("检测到 Apple MPS 设备，已使用 MPS 进行推理。")
+            if backend == "onnx":
+                if self.model is not None:
+                    self.model_config = self.model.config
+                    self.model = None  # 释放 PyTorch 权重，推理只使用 ONNX 会话
+                self.onnx_model = OnnxSentimentModel(export_onnx(local_model_path, settings.SENTIMENT_ONNX_QUANTIZE))
+                self.device = "cpu (onnxruntime)"
+                print(f"使用 ONNX Runtime 后端: {self.onnx_model.path}")
             else:
-                print("未检测到 GPU，自动使用 CPU 进行推理。")
+                # 设置设备
+                device = self._select_device()
+                if device is None:
+                    raise RuntimeError("未检测到可用的计算设备")
+
+                self.device = device
+                self.model.to(self.device)
+                self.model.eval()
+                self.model_config = self.model.config
+
+                device_type = getattr(self.device, "type", str(self.device))
+                if device_type == "cuda":
+                    print("检测到可用 GPU，已优先使用 CUDA 进行推理。")
+                elif device_type == "mps":
+                    print("检测到 Apple MPS 设备，已使用 MPS 进行推理。")
+                else:
+                    print("未检测到 GPU，自动使用 CPU 进行推理。")
+
+            self.backend = backend
+            self._model_fingerprint = self._fingerprint_model(local_model_path)
+            self.load_seconds = time.perf_counter() - started
+            self.is_initialized = True
+            self.enable()
             
-            print(f"模型加载成功! 使用设备: {self.device}")
+            print(f"模型加载成功! 使用设备: {self.device}，耗时 {self.load_seconds:.1f}s")
             print("支持语言: 中文、英文、西班牙文、阿拉伯文、日文、韩文等22种语言")
             print("情感等级: 非常负面、负面、中性、正面、非常正面")
             
@@ -231,6 +415,115 @@ class WeiboMultilingualSentimentAnalyzer:
         
         return text
     
+    @property
+    def model_version(self) -> str:
+        """模型版本：模型配置/权重指纹与影响输出的推理参数，情感分析缓存以此区分条目"""
+        if self.service is not None and self.service.model_version:
+            return self.service.model_version
+        params = f"{settings.SENTIMENT_MAX_LENGTH}:{settings.SENTIMENT_TRUNCATION}:{settings.SENTIMENT_HEAD_TOKENS}"
+        if self.backend == "onnx":
+            # 量化模型的输出与 fp32 略有差异，按后端区分缓存条目
+            params += f":onnx:{'int8' if settings.SENTIMENT_ONNX_QUANTIZE else 'fp32'}"
+        return hashlib.sha1(f"{self._model_fingerprint}:{params}".encode("utf-8")).hexdigest()[:16]
+
+    def _fingerprint_model(self, model_path: str) -> str:
+        """
+        根据模型配置与本地配置/分词器/权重文件（大小、修改时间）计算模型指纹
+
+        只统计 FINGERPRINT_SUFFIXES 中的文件：同一目录下导出的 .onnx 等派生文件不影响 torch 后端的输出，
+        导出或重新量化时不应让缓存失效（onnx 后端已在 model_version 的推理参数中区分）。
+        """
+        digest = hashlib.sha1(self.model_config.to_json_string().encode("utf-8"))
+        if os.path.isdir(model_path):
+            for name in sorted(os.listdir(model_path)):
+                path = os.path.join(model_path, name)
+                if not os.path.isfile(path) or not name.endswith(FINGERPRINT_SUFFIXES):
+                    continue
+                stat = os.stat(path)
+                digest.update(f"{name}:{stat.st_size}:{int(stat.st_mtime)}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _to_result(self, text: str, prediction: int, probabilities: List[float]) -> SentimentResult:
+        return SentimentResult(
+            text=text,
+            sentiment_label=self.sentiment_map[prediction],
+            confidence=probabilities[prediction],
+            probability_distribution=dict(zip(self.sentiment_map.values(), probabilities)),
+            success=True
+        )
+
+    def _encode(self, texts: List[str]) -> List[List[int]]:
+        """
+        将已预处理的文本编码为 token id（含特殊 token），不做补齐
+
+        超过 SENTIMENT_MAX_LENGTH 的文本按 SENTIMENT_TRUNCATION 截断：
+        head 只保留开头；head_tail 保留开头 SENTIMENT_HEAD_TOKENS 个 token 与结尾剩余部分，
+        长帖的结论/表态常出现在末尾。
+        """
+        with self._inference_lock:
+            max_length = min(settings.SENTIMENT_MAX_LENGTH, getattr(self.tokenizer, "model_max_length", 512) or 512)
+            budget = max(1, max_length - self.tokenizer.num_special_tokens_to_add())
+            head_tail = (settings.SENTIMENT_TRUNCATION or "head").lower() == "head_tail"
+            head_tokens = min(max(0, settings.SENTIMENT_HEAD_TOKENS), budget)
+
+            encoded = []
+            for ids in self.tokenizer(texts, add_special_tokens=False, truncation=False)["input_ids"]:
+                if len(ids) > budget:
+                    if head_tail and head_tokens < budget:
+                        ids = ids[:head_tokens] + ids[len(ids) - (budget - head_tokens):]
+                    else:
+                        ids = ids[:budget]
+                encoded.append(self.tokenizer.build_inputs_with_special_tokens(ids))
+            return encoded
+
+    def _predict_encoded(self, encoded: List[List[int]]) -> List[Tuple[int, List[float]]]:
+        """
+        对一批已编码的文本做一次前向推理
+
+        补齐长度取批内最长序列（向上取整到 8 的倍数），而非固定的 512；整批只做一次 softmax/argmax，
+        结果一次性拷回 CPU，避免逐条 .item() 造成的设备同步。
+
+        Returns:
+            与输入顺序一致的 [(预测类别, 各类别概率)]
+        """
+        with self._inference_lock:
+            return self._predict_encoded_locked(encoded)
+
+    def _predict_encoded_locked(self, encoded: List[List[int]]) -> List[Tuple[int, List[float]]]:
+        if self.onnx_model is not None:
+            inputs = self.tokenizer.pad(
+                {"input_ids": encoded},
+                padding="longest",
+                pad_to_multiple_of=8,
+                return_attention_mask=True,
+                return_tensors='np'
+            )
+            logits = self.onnx_model.logits(dict(inputs))
+            logits = logits - logits.max(axis=-1, keepdims=True)
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=-1, keepdims=True)
+            return list(zip(probabilities.argmax(axis=-1).tolist(), probabilities.astype(float).tolist()))
+
+        inputs = self.tokenizer.pad(
+            {"input_ids": encoded},
+            padding="longest",
+            pad_to_multiple_of=8,
+            return_attention_mask=True,
+            return_tensors='pt'
+        )
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+
+        with torch.inference_mode():
+            logits = self.model(**inputs).logits
+            probabilities = torch.softmax(logits, dim=-1)
+            predictions = torch.argmax(probabilities, dim=-1)
+
+        return list(zip(predictions.cpu().tolist(), probabilities.float().cpu().tolist()))
+
+    def _predict_batch(self, texts: List[str]) -> List[Tuple[int, List[float]]]:
+        """编码并推理一批已预处理的文本"""
+        return self._predict_encoded(self._encode(texts))
+
     def analyze_single_text(self, text: str) -> SentimentResult:
         """
         对单个文本进行情感分析
@@ -241,6 +534,7 @@ class WeiboMultilingualSentimentAnalyzer:
         Returns:
             SentimentResult对象
         """
+        self._reprobe_service()
         if self.is_disabled:
             return SentimentResult(
                 text=text,
@@ -263,6 +557,9 @@ class WeiboMultilingualSentimentAnalyzer:
                 analysis_performed=False
             )
 
+        if self.service is not None:
+            return self.analyze_batch([text], show_progress=False).results[0]
+
         try:
             # 预处理文本
             processed_text = self._preprocess_text(text)
@@ -278,41 +575,17 @@ class WeiboMultilingualSentimentAnalyzer:
                     analysis_performed=False
                 )
 
-            # 分词编码
-            inputs = self.tokenizer(
-                processed_text,
-                max_length=512,
-                padding=True,
-                truncation=True,
-                return_tensors='pt'
-            )
-
-            # 转移到设备
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-
-            # 预测
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                probabilities = torch.softmax(logits, dim=1)
-                prediction = torch.argmax(probabilities, dim=1).item()
-
-            # 构建结果
-            confidence = probabilities[0][prediction].item()
-            label = self.sentiment_map[prediction]
+            cache = get_sentiment_cache()
+            digest, model_version = content_hash(processed_text), self.model_version
+            cached = cache.get_many([digest], model_version) if cache is not None else {}
+            if digest in cached:
+                prediction, probabilities = cached[digest]
+            else:
+                prediction, probabilities = self._predict_batch([processed_text])[0]
+                if cache is not None:
+                    cache.put_many({digest: (prediction, probabilities)}, model_version)
 
-            # 构建概率分布字典
-            prob_dist = {}
-            for label_name, prob in zip(self.sentiment_map.values(), probabilities[0]):
-                prob_dist[label_name] = prob.item()
-
-            return SentimentResult(
-                text=text,
-                sentiment_label=label,
-                confidence=confidence,
-                probability_distribution=prob_dist,
-                success=True
-            )
+            return self._to_result(text, prediction, probabilities)
 
         except Exception as e:
             return SentimentResult(
@@ -325,13 +598,20 @@ class WeiboMultilingualSentimentAnalyzer:
                 analysis_performed=False
             )
 
-    def analyze_batch(self, texts: List[str], show_progress: bool = True) -> BatchSentimentResult:
+    def analyze_batch(self, texts: List[str], show_progress: bool = True, batch_size: Optional[int] = None,
+                      cascade: bool = True) -> BatchSentimentResult:
         """
         批量情感分析
+
+        文本一次性分词后按 token 长度排序、分成若干小批，每批补齐到批内最长长度后做一次前向推理；
+        结果顺序与输入一致。
         
         Args:
             texts: 文本列表
-            show_progress: 是否显示进度
+            show_progress: 是否显示进度（按批输出）
+            batch_size: 每批文本数，默认取 SENTIMENT_BATCH_SIZE
+            cascade: 是否使用级联快速模型（SENTIMENT_CASCADE_ENABLED 开启时）；离线打分传 False，
+                保证写入的结果都来自 model_version 所标识的模型
             
         Returns:
             BatchSentimentResult对象
@@ -345,6 +625,13 @@ class WeiboMultilingualSentimentAnalyzer:
                 average_confidence=0.0,
                 analysis_performed=not self.is_disabled and self.is_initialized
             )
+
+        self._reprobe_service()
+        if self.service is not None and not self.is_disabled:
+            try:
+                return self._summarize_batch([SentimentResult(**item) for item in self.service.analyze(list(texts), cascade)])
+            except Exception as e:
+                self._fallback_to_local(e)
         
         if self.is_disabled or not self.is_initialized:
             passthrough_results = [
@@ -368,31 +655,194 @@ class WeiboMultilingualSentimentAnalyzer:
                 analysis_performed=False
             )
         
-        results = []
-        success_count = 0
-        total_confidence = 0.0
-        
+        results: List[Optional[SentimentResult]] = [None] * len(texts)
+        matrix = np.full((len(texts), len(self.sentiment_map)), np.nan)
+        pending: List[Tuple[int, str]] = []
         for i, text in enumerate(texts):
-            if show_progress and len(texts) > 1:
-                print(f"处理进度: {i+1}/{len(texts)}")
-            
-            result = self.analyze_single_text(text)
-            results.append(result)
-            
-            if result.success:
-                success_count += 1
-                total_confidence += result.confidence
-        
-        average_confidence = total_confidence / success_count if success_count > 0 else 0.0
-        failed_count = len(texts) - success_count
+            processed_text = self._preprocess_text(text)
+            if processed_text:
+                pending.append((i, processed_text))
+            else:
+                results[i] = SentimentResult(
+                    text=text,
+                    sentiment_label="输入错误",
+                    confidence=0.0,
+                    probability_distribution={},
+                    success=False,
+                    error_message="输入文本为空或无效内容",
+                    analysis_performed=False
+                )
+
+        # 相同内容只推理一次；已缓存（同一模型版本）的内容直接复用，不再送入模型
+        groups: Dict[str, List[int]] = {}
+        unique: List[Tuple[str, str]] = []
+        for i, processed in pending:
+            digest = content_hash(processed)
+            if digest not in groups:
+                groups[digest] = []
+                unique.append((digest, processed))
+            groups[digest].append(i)
+
+        cache = get_sentiment_cache()
+        model_version = self.model_version
+        cached = cache.get_many(groups, model_version) if cache is not None else {}
+        for digest, (prediction, probabilities) in cached.items():
+            for i in groups[digest]:
+                results[i] = self._to_result(texts[i], prediction, probabilities)
+                matrix[i] = probabilities
+        unique = [(digest, processed) for digest, processed in unique if digest not in cached]
+        cache_hits = sum(len(groups[digest]) for digest in cached)
+
+        # 级联模式：快速模型先为全部未缓存文本打分，置信度足够的直接采用，其余才升级到 Transformer
+        started = time.perf_counter()
+        fast_model = get_fast_sentiment_model() if unique and cascade else None
+        fallback: Dict[str, List[float]] = {}
+        if fast_model is not None:
+            cascade_total = len(unique)
+            unique, fallback = self._cascade_prefilter(fast_model, unique, groups, texts, results, matrix)
+        fast_seconds = time.perf_counter() - started
+
+        # 一次性编码后按 token 长度排序分桶，同一批内长度相近，补齐的 token 最少；结果按原下标写回
+        try:
+            encoded = self._encode([processed for _, processed in unique])
+        except Exception as e:
+            print(f"批量分词失败，改为逐条分析: {e}")
+            encoded = [None] * len(unique)
+        order = sorted(range(len(unique)), key=lambda k: len(encoded[k]) if encoded[k] is not None else 0)
+        unique = [(unique[k][0], encoded[k]) for k in order]
+        batch_size = max(1, batch_size or settings.SENTIMENT_BATCH_SIZE)
+        scored: Dict[str, Tuple[int, List[float]]] = {}
+        batches = [unique[start:start + batch_size] for start in range(0, len(unique), batch_size)]
+        deadline = None
+        if fallback:
+            # 快速模型最没把握的批次先升级；超出时间预算后剩余批次保留快速模型的结果
+            batches.sort(key=lambda batch: sum(max(fallback[digest]) for digest, _ in batch) / len(batch))
+            if settings.SENTIMENT_CASCADE_BUDGET_MS > 0:
+                deadline = time.perf_counter() + settings.SENTIMENT_CASCADE_BUDGET_MS / 1000.0
+        budget_skipped, processed_count = 0, 0
+
+        for batch in batches:
+            processed_count += len(batch)
+            if deadline is not None and time.perf_counter() > deadline:
+                for digest, _ in batch:
+                    probabilities = fallback[digest]
+                    for i in groups[digest]:
+                        results[i] = self._to_result(texts[i], int(np.argmax(probabilities)), probabilities)
+                        matrix[i] = probabilities
+                budget_skipped += len(batch)
+                continue
+            try:
+                if any(ids is None for _, ids in batch):
+                    raise ValueError("分词结果缺失")
+                predictions = self._predict_encoded([ids for _, ids in batch])
+            except Exception as e:
+                # 整批失败时逐条重试，单条异常文本不影响同批其它文本
+                print(f"批量推理失败，改为逐条分析: {e}")
+                for digest, _ in batch:
+                    for i in groups[digest]:
+                        results[i] = self.analyze_single_text(texts[i])
+                        if results[i].success:
+                            matrix[i] = [results[i].probability_distribution[name] for name in self.sentiment_map.values()]
+                continue
+
+            for (digest, _), (prediction, probabilities) in zip(batch, predictions):
+                scored[digest] = (prediction, probabilities)
+                for i in groups[digest]:
+                    results[i] = self._to_result(texts[i], prediction, probabilities)
+                    matrix[i] = probabilities
+
+            if show_progress and len(unique) > batch_size:
+                print(f"处理进度: {processed_count}/{len(unique)}")
+
+        if cache is not None:
+            cache.put_many(scored, model_version)
+        if fast_model is not None:
+            self.cascade_metrics.record(
+                texts=cascade_total,
+                accepted=cascade_total - len(unique),
+                escalated=len(unique) - budget_skipped,
+                budget_skipped=budget_skipped,
+                fast_seconds=fast_seconds,
+                escalation_seconds=time.perf_counter() - started - fast_seconds
+            )
+        if show_progress and pending:
+            cascade_note = (f"快速模型采用 {cascade_total - len(unique)} 条，超出预算未升级 {budget_skipped} 条，"
+                            if fast_model is not None else "")
+            print(f"情感分析完成: {len(pending)} 条（缓存命中 {cache_hits} 条，{cascade_note}"
+                  f"模型推理 {len(unique) - budget_skipped} 条），耗时 {time.perf_counter() - started:.2f}s")
+
+        return self._summarize_batch(results, matrix)
+
+    def _cascade_prefilter(
+        self,
+        fast_model: FastSentimentModel,
+        unique: List[Tuple[str, str]],
+        groups: Dict[str, List[int]],
+        texts: List[str],
+        results: List[Optional[SentimentResult]],
+        matrix: np.ndarray
+    ) -> Tuple[List[Tuple[str, str]], Dict[str, List[float]]]:
+        """
+        用快速模型为待推理文本打分，置信度 >= SENTIMENT_CASCADE_THRESHOLD 的直接写入结果
+
+        Returns:
+            (需要升级到 Transformer 的文本, {内容哈希: 快速模型的五级概率}（超出时间预算时作为结果）)
+        """
+        try:
+            probabilities = fast_model.sentiment_probabilities([processed for _, processed in unique], len(self.sentiment_map))
+        except Exception as e:
+            print(f"级联快速模型打分失败，全部使用 Transformer: {e}")
+            return unique, {}
+
+        confident = probabilities.max(axis=1) >= settings.SENTIMENT_CASCADE_THRESHOLD
+        escalate, fallback = [], {}
+        for (digest, processed), row, accept in zip(unique, probabilities.tolist(), confident):
+            if accept:
+                for i in groups[digest]:
+                    results[i] = self._to_result(texts[i], int(np.argmax(row)), row)
+                    matrix[i] = row
+            else:
+                escalate.append((digest, processed))
+                fallback[digest] = row
+        return escalate, fallback
+
+    def _summarize_batch(self, results: List[SentimentResult], probabilities: Optional[np.ndarray] = None) -> BatchSentimentResult:
+        """
+        汇总逐条结果为 BatchSentimentResult
+
+        probabilities 为空时（服务端返回、离线预计算的结果）由各结果的概率分布组装矩阵
+        """
+        if probabilities is None:
+            probabilities = sentiment_stats.probability_matrix(
+                [result.probability_distribution if result.success else None for result in results],
+                list(self.sentiment_map.values())
+            )
+        valid = sentiment_stats.valid_rows(probabilities)
+        success_count = int(valid.sum())
+        average_confidence = float(probabilities[valid].max(axis=1).mean()) if success_count > 0 else 0.0
         
         return BatchSentimentResult(
             results=results,
-            total_processed=len(texts),
+            total_processed=len(results),
             success_count=success_count,
-            failed_count=failed_count,
+            failed_count=len(results) - success_count,
             average_confidence=average_confidence,
-            analysis_performed=True
+            analysis_performed=True,
+            probabilities=probabilities
+        )
+
+    def _precomputed_result(self, text: str, item: Dict[str, Any]) -> Optional[SentimentResult]:
+        """查询结果中带有离线预计算的情感时转换为 SentimentResult，否则返回 None"""
+        label = item.get("sentiment_label")
+        if label not in self.sentiment_map.values():
+            return None
+        confidence = float(item.get("sentiment_confidence") or 0.0)
+        return SentimentResult(
+            text=text,
+            sentiment_label=label,
+            confidence=confidence,
+            probability_distribution={label: confidence},
+            success=True
         )
     
     def _build_passthrough_analysis(
@@ -456,22 +906,7 @@ class WeiboMultilingualSentimentAnalyzer:
                 }
             }
         
-        # 提取文本内容
-        texts_to_analyze = []
-        original_data = []
-        
-        for item in query_results:
-            # 尝试多个可能的文本字段
-            text_content = ""
-            for field in [text_field, "title_or_content", "content", "title", "text"]:
-                if field in item and item[field]:
-                    text_content = str(item[field])
-                    break
-            
-            if text_content.strip():
-                texts_to_analyze.append(text_content)
-                original_data.append(item)
-        
+        texts_to_analyze, original_data, batch_result = self._analyze_items(query_results, text_field)
         if not texts_to_analyze:
             return {
                 "sentiment_analysis": {
@@ -481,18 +916,14 @@ class WeiboMultilingualSentimentAnalyzer:
                     "summary": "查询结果中没有找到可分析的文本内容"
                 }
             }
-        
-        if self.is_disabled:
+
+        if batch_result is None:
             return self._build_passthrough_analysis(
                 original_data=original_data,
                 reason=self.disable_reason or "情感分析模型不可用",
                 texts=texts_to_analyze
             )
         
-        # 执行批量情感分析
-        print(f"正在对{len(texts_to_analyze)}条内容进行情感分析...")
-        batch_result = self.analyze_batch(texts_to_analyze, show_progress=True)
-        
         if not batch_result.analysis_performed:
             reason = self.disable_reason or "情感分析功能不可用"
             if batch_result.results:
@@ -506,34 +937,26 @@ class WeiboMultilingualSentimentAnalyzer:
                 results=batch_result.results
             )
         
-        # 统计情感分布
-        sentiment_distribution = {}
+        # 分布统计都在概率矩阵上做数组运算
+        labels = list(self.sentiment_map.values())
+        probabilities = batch_result.probabilities
+        valid = sentiment_stats.valid_rows(probabilities)
+        confidence = np.where(valid, np.nan_to_num(probabilities).max(axis=1), 0.0)
+        sentiment_distribution = sentiment_stats.label_counts(probabilities, labels)
+
         high_confidence_results = []
-        
-        for result, original_item in zip(batch_result.results, original_data):
-            if result.success:
-                # 统计情感分布
-                sentiment = result.sentiment_label
-                if sentiment not in sentiment_distribution:
-                    sentiment_distribution[sentiment] = 0
-                sentiment_distribution[sentiment] += 1
-                
-                # 收集高置信度结果
-                if result.confidence >= min_confidence:
-                    high_confidence_results.append({
-                        "original_data": original_item,
-                        "sentiment": result.sentiment_label,
-                        "confidence": result.confidence,
-                        "text_preview": result.text[:100] + "..." if len(result.text) > 100 else result.text
-                    })
+        for k in np.flatnonzero(valid & (confidence >= min_confidence)):
+            result = batch_result.results[k]
+            high_confidence_results.append({
+                "original_data": original_data[k],
+                "sentiment": result.sentiment_label,
+                "confidence": result.confidence,
+                "text_preview": result.text[:100] + "..." if len(result.text) > 100 else result.text
+            })
         
         # 生成情感分析摘要
         total_analyzed = batch_result.success_count
-        if total_analyzed > 0:
-            dominant_sentiment = max(sentiment_distribution.items(), key=lambda x: x[1])
-            sentiment_summary = f"共分析{total_analyzed}条内容，主要情感倾向为'{dominant_sentiment[0]}'({dominant_sentiment[1]}条，占{dominant_sentiment[1]/total_analyzed*100:.1f}%)"
-        else:
-            sentiment_summary = "情感分析失败"
+        sentiment_summary = self._summary_text(total_analyzed, sentiment_distribution)
         
         return {
             "sentiment_analysis": {
@@ -541,11 +964,182 @@ class WeiboMultilingualSentimentAnalyzer:
                 "success_rate": f"{batch_result.success_count}/{batch_result.total_processed}",
                 "average_confidence": round(batch_result.average_confidence, 4),
                 "sentiment_distribution": sentiment_distribution,
+                "confidence_histogram": sentiment_stats.confidence_histogram(probabilities),
+                "platform_distribution": sentiment_stats.group_distribution(
+                    probabilities, [item.get("platform") for item in original_data], labels
+                ),
+                "time_distribution": sentiment_stats.sentiment_time_series(
+                    probabilities, [item.get("publish_time") for item in original_data], labels, bucket="day"
+                ),
                 "high_confidence_results": high_confidence_results,  # 返回所有高置信度结果，不做限制
                 "summary": sentiment_summary
             }
         }
+
+    @staticmethod
+    def _summary_text(total_analyzed: int, sentiment_distribution: Dict[str, int]) -> str:
+        if total_analyzed <= 0 or not sentiment_distribution:
+            return "情感分析失败"
+        dominant_sentiment = max(sentiment_distribution.items(), key=lambda x: x[1])
+        return f"共分析{total_analyzed}条内容，主要情感倾向为'{dominant_sentiment[0]}'({dominant_sentiment[1]}条，占{dominant_sentiment[1]/total_analyzed*100:.1f}%)"
+
+    @staticmethod
+    def _as_item(item: Any) -> Dict[str, Any]:
+        """查询结果（QueryResult 或字典）-> analyze_query_results 使用的条目字典"""
+        if isinstance(item, dict):
+            return item
+        return {
+            "content": getattr(item, "title_or_content", None),
+            "platform": getattr(item, "platform", None),
+            "author": getattr(item, "author_nickname", None),
+            "url": getattr(item, "url", None),
+            "publish_time": str(item.publish_time) if getattr(item, "publish_time", None) else None,
+            "sentiment_label": getattr(item, "sentiment_label", None),
+            "sentiment_confidence": getattr(item, "sentiment_confidence", None)
+        }
+
+    def analyze_stream(
+        self,
+        result_batches: Iterable[Iterable[Any]],
+        text_field: str = "content",
+        min_confidence: float = 0.5,
+        max_samples: int = 20
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        流式情感分析：逐批读取 -> 预处理 -> 分词 -> 推理 -> 增量汇总
+
+        每次只持有一批结果，汇总由 SentimentAggregator 增量累加，内存占用与总条数无关；
+        每处理完一批产出一次当前的部分汇总（可用于进度展示），最后一次产出即最终结果。
+        高置信度样本只保留置信度最高的 max_samples 条。
+
+        Args:
+            result_batches: 分批的查询结果（QueryResult 或字典），如 MediaCrawlerDB.stream_comments_for_topic
+            text_field: 文本内容字段名
+            min_confidence: 高置信度样本的最小置信度
+            max_samples: 保留的高置信度样本数
+
+        Yields:
+            与 analyze_query_results 的 "sentiment_analysis" 结构一致的部分汇总，另含 processed（已读取条数）
+        """
+        labels = list(self.sentiment_map.values())
+        aggregator = sentiment_stats.SentimentAggregator(labels, min_confidence=min_confidence, max_samples=max_samples)
+        for batch in result_batches:
+            items = [self._as_item(item) for item in batch]
+            _, original_data, batch_result = self._analyze_items(items, text_field, show_progress=False)
+            if batch_result is not None and batch_result.analysis_performed:
+                aggregator.update(
+                    batch_result.probabilities,
+                    platforms=[item.get("platform") for item in original_data],
+                    times=[item.get("publish_time") for item in original_data],
+                    samples=original_data
+                )
+            else:
+                aggregator.update(np.full((len(original_data), len(labels)), np.nan))
+
+            snapshot = aggregator.snapshot()
+            snapshot["high_confidence_results"] = [
+                {
+                    "original_data": item,
+                    "sentiment": label,
+                    "confidence": confidence,
+                    "text_preview": str(item.get(text_field) or item.get("content") or "")[:100]
+                }
+                for item, label, confidence in aggregator.high_confidence_samples()
+            ]
+            snapshot["summary"] = self._summary_text(snapshot["total_analyzed"], snapshot["sentiment_distribution"])
+            if not snapshot["total_analyzed"] and (self.is_disabled or not self.is_initialized):
+                # 模型不可用且没有离线预计算的情感
+                snapshot["available"] = False
+                snapshot["reason"] = self.disable_reason or "情感分析模型未初始化"
+            yield snapshot
+
+    def _analyze_items(
+        self,
+        query_results: List[Dict[str, Any]],
+        text_field: str = "content",
+        show_progress: bool = True
+    ) -> Tuple[List[str], List[Dict[str, Any]], Optional[BatchSentimentResult]]:
+        """
+        提取查询结果中的文本并分析（离线预计算的情感直接复用）
+
+        Returns:
+            (文本列表, 对应的原始条目, 批量结果)；没有可分析文本或模型已禁用时批量结果为 None
+        """
+        texts_to_analyze = []
+        original_data = []
+        
+        for item in query_results:
+            # 尝试多个可能的文本字段
+            text_content = ""
+            for field in [text_field, "title_or_content", "content", "title", "text"]:
+                if field in item and item[field]:
+                    text_content = str(item[field])
+                    break
+            
+            if text_content.strip():
+                texts_to_analyze.append(text_content)
+                original_data.append(item)
+        
+        if not texts_to_analyze:
+            return texts_to_analyze, original_data, None
+        
+        # 已离线打分（sentiment_scoring）的结果直接使用，只有其余文本才需要模型
+        precomputed = [self._precomputed_result(text, item) for text, item in zip(texts_to_analyze, original_data)]
+        if any(precomputed):
+            missing = [k for k, result in enumerate(precomputed) if result is None]
+            if missing:
+                if show_progress:
+                    print(f"使用预计算情感 {len(precomputed) - len(missing)} 条，对其余{len(missing)}条内容进行情感分析...")
+                scored = self.analyze_batch([texts_to_analyze[k] for k in missing], show_progress=show_progress)
+                for k, result in zip(missing, scored.results):
+                    precomputed[k] = result
+            return texts_to_analyze, original_data, self._summarize_batch(precomputed)
+        if self.is_disabled:
+            return texts_to_analyze, original_data, None
+
+        # 执行批量情感分析
+        if show_progress:
+            print(f"正在对{len(texts_to_analyze)}条内容进行情感分析...")
+        return texts_to_analyze, original_data, self.analyze_batch(texts_to_analyze, show_progress=show_progress)
+
+    def sentiment_time_series(
+        self,
+        query_results: List[Dict[str, Any]],
+        bucket: str = "day",
+        text_field: str = "content",
+        time_field: str = "publish_time"
+    ) -> List[Dict[str, Any]]:
+        """
+        查询结果的情感时间序列
+
+        Args:
+            query_results: 查询结果列表（同 analyze_query_results）
+            bucket: 时间桶，hour / day / week / month
+            text_field: 文本内容字段名
+            time_field: 发布时间字段名
+
+        Returns:
+            按时间升序的 [{"bucket": ..., "total": n, "distribution": {...}, "average_score": x}]；
+            已有 BatchSentimentResult 时可直接调用 utils.sentiment_stats.sentiment_time_series
+        """
+        _, original_data, batch_result = self._analyze_items(query_results, text_field)
+        if batch_result is None or not batch_result.analysis_performed:
+            return []
+        return sentiment_stats.sentiment_time_series(
+            batch_result.probabilities,
+            [item.get(time_field) for item in original_data],
+            list(self.sentiment_map.values()),
+            bucket=bucket
+        )
     
+    def _status(self) -> str:
+        """模型就绪状态：ready / warming_up / disabled / not_loaded"""
+        if self.is_initialized and not self.is_disabled:
+            return "ready"
+        if self.is_warming_up:
+            return "warming_up"
+        return "disabled" if self.is_disabled else "not_loaded"
+
     def get_model_info(self) -> Dict[str, Any]:
         """
         获取模型信息
@@ -563,7 +1157,11 @@ class WeiboMultilingualSentimentAnalyzer:
             ],
             "sentiment_levels": list(self.sentiment_map.values()),
             "is_initialized": self.is_initialized,
-            "device": str(self.device) if self.device else "未设置"
+            "status": self._status(),
+            "load_seconds": round(self.load_seconds, 2) if self.load_seconds is not None else None,
+            "backend": self.backend,
+            "device": str(self.device) if self.device else "未设置",
+            "cascade": self.cascade_metrics.snapshot() if settings.SENTIMENT_CASCADE_ENABLED else None
         }
 
 
@@ -0,0 +1,265 @@
+"""
+情感分析分词/补齐策略基准测试（CPU）
+
+在一份抓取的评论样本上对比两种推理路径的吞吐：
+
+- fixed512: 原实现的分词方式，每条文本补齐到 max_length=512（按输入顺序分批）
+- dynamic:  当前实现，按 token 长度排序分桶，每批补齐到批内最长长度（analyze_batch）
+
+同时报告两种路径实际送入模型的 token 数（含补齐），补齐浪费通常是吞吐差距的主要来源。
+样本默认取自 social_comment 投影表中最近的评论，也可以用 --file 指定每行一条文本的文件。
+
+--compare-backends 对比 torch 与 ONNX Runtime（默认 int8 量化）两个推理后端：吞吐，以及
+ONNX 结果相对 torch 的类别一致率与概率的平均/最大绝对偏差（精度回归检查）。
+--cascade 对比级联模式（TF-IDF+SVM 快速模型 + Transformer）与只用 Transformer：端到端吞吐、
+升级到 Transformer 的比例，以及级联结果相对 Transformer 的类别一致率。
+测量期间关闭情感分析结果缓存。
+
+用法:
+    python -m InsightEngine.tools.sentiment_benchmark
+    python -m InsightEngine.tools.sentiment_benchmark --limit 1000 --batch-size 32
+    python -m InsightEngine.tools.sentiment_benchmark --file comments.txt --device cpu
+    python -m InsightEngine.tools.sentiment_benchmark --compare-backends
+    python -m InsightEngine.tools.sentiment_benchmark --cascade --threshold 0.9
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from .sentiment_analyzer import WeiboMultilingualSentimentAnalyzer
+from ..utils import social_projection
+from ..utils.db import fetch_all, run_sync
+from ..utils.config import settings
+from ..utils.fulltext import quote_identifier
+
+__all__ = ["load_comment_sample", "benchmark", "compare_backends", "compare_cascade"]
+
+
+@contextlib.contextmanager
+def _override_settings(**overrides: Any) -> Iterator[None]:
+    """临时修改配置（如关闭结果缓存、切换推理后端），退出时恢复"""
+    previous = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+
+
+def load_comment_sample(limit: int = 1000, path: Optional[str] = None) -> List[str]:
+    """读取评论样本：给定 path 时按行读取，否则取 social_comment 中最近的 limit 条非空评论"""
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()][:limit]
+    table = quote_identifier(social_projection.SOCIAL_COMMENT_TABLE)
+    rows = run_sync(fetch_all(
+        f"SELECT content FROM {table} WHERE content IS NOT NULL AND content <> '' "
+        "ORDER BY publish_ts DESC LIMIT :limit",
+        {"limit": limit},
+    ))
+    return [row['content'] for row in rows]
+
+
+def _run_fixed512(analyzer: WeiboMultilingualSentimentAnalyzer, texts: List[str], batch_size: int) -> int:
+    """原实现的分词方式（补齐到 512），返回送入模型的 token 总数"""
+    import torch
+
+    tokens = 0
+    for start in range(0, len(texts), batch_size):
+        inputs = analyzer.tokenizer(
+            texts[start:start + batch_size], max_length=512, padding='max_length', truncation=True, return_tensors='pt'
+        )
+        inputs = {k: v.to(analyzer.device) for k, v in inputs.items()}
+        with torch.inference_mode():
+            torch.softmax(analyzer.model(**inputs).logits, dim=-1).cpu()
+        tokens += int(inputs['input_ids'].numel())
+    return tokens
+
+
+def _dynamic_tokens(analyzer: WeiboMultilingualSentimentAnalyzer, texts: List[str], batch_size: int) -> int:
+    """按 analyze_batch 的分桶方式估算送入模型的 token 总数"""
+    lengths = sorted(len(ids) for ids in analyzer._encode(texts))
+    tokens = 0
+    for start in range(0, len(lengths), batch_size):
+        batch = lengths[start:start + batch_size]
+        tokens += len(batch) * (-(-batch[-1] // 8) * 8)
+    return tokens
+
+
+def benchmark(texts: List[str], batch_size: int = 32, device: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    运行基准测试。
+
+    Args:
+        texts: 评论样本
+        batch_size: 每批文本数（两种路径相同）
+        device: 指定推理设备（如 cpu），默认自动选择
+
+    Returns:
+        {"fixed512": {...}, "dynamic": {...}}，每项包含 seconds、texts_per_sec、tokens
+    """
+    with _override_settings(SENTIMENT_CACHE_ENABLED=False, SENTIMENT_BACKEND="torch"):
+        return _benchmark_padding(texts, batch_size, device)
+
+
+def _benchmark_padding(texts: List[str], batch_size: int, device: Optional[str]) -> Dict[str, Dict[str, float]]:
+    analyzer = WeiboMultilingualSentimentAnalyzer()
+    if not analyzer.initialize():
+        raise RuntimeError(analyzer.disable_reason or "情感分析模型不可用")
+    if device:
+        import torch
+
+        analyzer.device = torch.device(device)
+        analyzer.model.to(analyzer.device)
+
+    texts = [processed for processed in (analyzer._preprocess_text(t) for t in texts) if processed]
+    if not texts:
+        raise ValueError("样本中没有可分析的文本")
+
+    # 预热一次，排除首批的初始化开销
+    analyzer.analyze_batch(texts[:batch_size], show_progress=False, batch_size=batch_size)
+
+    start = time.perf_counter()
+    fixed_tokens = _run_fixed512(analyzer, texts, batch_size)
+    fixed_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer.analyze_batch(texts, show_progress=False, batch_size=batch_size)
+    dynamic_seconds = time.perf_counter() - start
+
+    report = {
+        "fixed512": {"seconds": fixed_seconds, "texts_per_sec": len(texts) / fixed_seconds, "tokens": fixed_tokens},
+        "dynamic": {"seconds": dynamic_seconds, "texts_per_sec": len(texts) / dynamic_seconds,
+                    "tokens": _dynamic_tokens(analyzer, texts, batch_size)},
+    }
+    for name, stats in report.items():
+        logger.info(f"{name:>8}: {len(texts)} 条  耗时 {stats['seconds']:7.2f}s  吞吐 {stats['texts_per_sec']:8.1f} 条/s  "
+                    f"送入模型 token {int(stats['tokens']):,}")
+    logger.info(f"加速比: {report['dynamic']['texts_per_sec'] / report['fixed512']['texts_per_sec']:.1f}x "
+                f"(device={analyzer.device}, batch_size={batch_size})")
+    return report
+
+
+def _timed_batch(backend: str, texts: List[str], batch_size: int) -> Dict[str, Any]:
+    with _override_settings(SENTIMENT_BACKEND=backend):
+        analyzer = WeiboMultilingualSentimentAnalyzer()
+        if not analyzer.initialize():
+            raise RuntimeError(analyzer.disable_reason or f"{backend} 后端不可用")
+        if backend == "onnx" and analyzer.backend != "onnx":
+            raise RuntimeError("onnxruntime 未安装，无法对比 ONNX 后端")
+        analyzer.analyze_batch(texts[:batch_size], show_progress=False, batch_size=batch_size)
+        start = time.perf_counter()
+        result = analyzer.analyze_batch(texts, show_progress=False, batch_size=batch_size)
+        seconds = time.perf_counter() - start
+    return {"seconds": seconds, "texts_per_sec": len(texts) / seconds, "results": result.results}
+
+
+def compare_backends(texts: List[str], batch_size: int = 32) -> Dict[str, Any]:
+    """
+    对比 torch（CPU）与 ONNX Runtime 后端的吞吐与精度偏差。
+
+    Returns:
+        {"torch": {...}, "onnx": {...}, "agreement": 类别一致率, "mean_abs_delta": 概率平均绝对偏差,
+         "max_abs_delta": 概率最大绝对偏差}
+    """
+    texts = [t for t in texts if t and t.strip()]
+    if not texts:
+        raise ValueError("样本中没有可分析的文本")
+    with _override_settings(SENTIMENT_CACHE_ENABLED=False):
+        torch_run = _timed_batch("torch", texts, batch_size)
+        onnx_run = _timed_batch("onnx", texts, batch_size)
+
+    pairs = [(a, b) for a, b in zip(torch_run.pop("results"), onnx_run.pop("results")) if a.success and b.success]
+    deltas = [abs(a.probability_distribution[label] - b.probability_distribution.get(label, 0.0))
+              for a, b in pairs for label in a.probability_distribution]
+    report = {
+        "torch": torch_run,
+        "onnx": onnx_run,
+        "agreement": sum(a.sentiment_label == b.sentiment_label for a, b in pairs) / len(pairs) if pairs else 0.0,
+        "mean_abs_delta": sum(deltas) / len(deltas) if deltas else 0.0,
+        "max_abs_delta": max(deltas) if deltas else 0.0,
+    }
+    for name in ("torch", "onnx"):
+        logger.info(f"{name:>5}: {len(texts)} 条  耗时 {report[name]['seconds']:7.2f}s  吞吐 {report[name]['texts_per_sec']:8.1f} 条/s")
+    logger.info(f"ONNX 加速比 {report['onnx']['texts_per_sec'] / report['torch']['texts_per_sec']:.1f}x  "
+                f"类别一致率 {report['agreement']:.2%}  概率偏差 平均 {report['mean_abs_delta']:.4f} / 最大 {report['max_abs_delta']:.4f} "
+                f"(int8={settings.SENTIMENT_ONNX_QUANTIZE})")
+    return report
+
+
+def compare_cascade(texts: List[str], batch_size: int = 32, threshold: Optional[float] = None) -> Dict[str, Any]:
+    """
+    对比级联模式与只用 Transformer 的吞吐与结果一致性。
+
+    Returns:
+        {"transformer": {...}, "cascade": {...}, "escalated_fraction": 升级比例, "agreement": 类别一致率}
+    """
+    from .sentiment_cascade import get_fast_sentiment_model
+
+    texts = [t for t in texts if t and t.strip()]
+    if not texts:
+        raise ValueError("样本中没有可分析的文本")
+    threshold = settings.SENTIMENT_CASCADE_THRESHOLD if threshold is None else threshold
+    with _override_settings(SENTIMENT_CACHE_ENABLED=False, SENTIMENT_CASCADE_ENABLED=True,
+                            SENTIMENT_CASCADE_THRESHOLD=threshold):
+        if get_fast_sentiment_model() is None:
+            raise RuntimeError("级联快速模型不可用，请先训练 WeiboSentiment_MachineLearning 的 SVM 模型")
+        analyzer = WeiboMultilingualSentimentAnalyzer()
+        if not analyzer.initialize():
+            raise RuntimeError(analyzer.disable_reason or "情感分析模型不可用")
+        analyzer.analyze_batch(texts[:batch_size], show_progress=False, batch_size=batch_size)
+
+        with _override_settings(SENTIMENT_CASCADE_ENABLED=False):
+            start = time.perf_counter()
+            baseline = analyzer.analyze_batch(texts, show_progress=False, batch_size=batch_size).results
+            transformer_seconds = time.perf_counter() - start
+
+        analyzer.cascade_metrics.reset()
+        start = time.perf_counter()
+        cascaded = analyzer.analyze_batch(texts, show_progress=False, batch_size=batch_size).results
+        cascade_seconds = time.perf_counter() - start
+        metrics = analyzer.cascade_metrics.snapshot()
+
+    pairs = [(a, b) for a, b in zip(baseline, cascaded) if a.success and b.success]
+    report = {
+        "transformer": {"seconds": transformer_seconds, "texts_per_sec": len(texts) / transformer_seconds},
+        "cascade": {"seconds": cascade_seconds, "texts_per_sec": len(texts) / cascade_seconds, "metrics": metrics},
+        "escalated_fraction": metrics["escalated_fraction"],
+        "agreement": sum(a.sentiment_label == b.sentiment_label for a, b in pairs) / len(pairs) if pairs else 0.0,
+    }
+    for name in ("transformer", "cascade"):
+        logger.info(f"{name:>11}: {len(texts)} 条  耗时 {report[name]['seconds']:7.2f}s  吞吐 {report[name]['texts_per_sec']:8.1f} 条/s")
+    logger.info(f"级联加速比 {report['cascade']['texts_per_sec'] / report['transformer']['texts_per_sec']:.1f}x  "
+                f"升级比例 {report['escalated_fraction']:.2%}  类别一致率 {report['agreement']:.2%} (threshold={threshold})")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="情感分析分词/补齐策略基准测试")
+    parser.add_argument("--limit", type=int, default=1000, help="评论样本条数")
+    parser.add_argument("--file", help="每行一条文本的样本文件，默认从 social_comment 表读取")
+    parser.add_argument("--batch-size", type=int, default=32, help="每批文本数")
+    parser.add_argument("--device", default="cpu", help="推理设备，默认 cpu")
+    parser.add_argument("--compare-backends", action="store_true", help="对比 torch 与 ONNX Runtime 后端的吞吐与精度偏差")
+    parser.add_argument("--cascade", action="store_true", help="对比级联模式与只用 Transformer 的吞吐、升级比例与一致率")
+    parser.add_argument("--threshold", type=float, help="级联快速模型的置信度阈值，默认 SENTIMENT_CASCADE_THRESHOLD")
+    args = parser.parse_args()
+    texts = load_comment_sample(args.limit, args.file)
+    if args.compare_backends:
+        compare_backends(texts, batch_size=args.batch_size)
+    elif args.cascade:
+        compare_cascade(texts, batch_size=args.batch_size, threshold=args.threshold)
+    else:
+        benchmark(texts, batch_size=args.batch_size, device=args.device)
+
+
+if __name__ == "__main__":
+    main()
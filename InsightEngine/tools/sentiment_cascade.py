@@ -0,0 +1,146 @@
+"""
+情感分析级联（cascade）的快速模型
+
+仓库中的 WeiboSentiment_MachineLearning 训练了 TF-IDF + SVM 等轻量模型，推理成本比多语言 Transformer
+低几个数量级。级联模式（SENTIMENT_CASCADE_ENABLED）下 WeiboMultilingualSentimentAnalyzer 先用快速模型给
+所有未缓存的文本打分：
+
+- 快速模型置信度 >= SENTIMENT_CASCADE_THRESHOLD 的文本直接采用其结果
+- 其余文本升级（escalate）到 Transformer；SENTIMENT_CASCADE_BUDGET_MS > 0 时按置信度从低到高升级，
+  单次批量分析中 Transformer 的耗时超出预算后，剩余文本保留快速模型的结果
+
+快速模型是二分类（负面/正面），其结果映射到五级类别中的「负面」「正面」；只有 Transformer 的结果写入
+情感分析缓存。级联指标（升级比例、端到端吞吐）见 CascadeMetrics 与 get_model_info()。
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import pickle
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from InsightEngine.utils.config import settings
+
+__all__ = [
+    "FastSentimentModel",
+    "CascadeMetrics",
+    "default_fast_model_path",
+    "get_fast_sentiment_model",
+]
+
+
+_ML_MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "SentimentAnalysisModel", "WeiboSentiment_MachineLearning",
+)
+
+# 快速模型的二分类 -> 五级类别下标（与 SENTIMENT_LABELS 一致：1 = 负面，3 = 正面）
+_BINARY_TO_LABEL = (1, 3)
+
+
+def default_fast_model_path() -> str:
+    return os.path.join(_ML_MODEL_DIR, "model", "svm_model.pkl")
+
+
+def _load_processing() -> Callable[[str], str]:
+    """加载训练时使用的预处理函数（jieba 分词、否定词拼接），保证推理与训练的特征一致"""
+    spec = importlib.util.spec_from_file_location("weibo_sentiment_ml_utils", os.path.join(_ML_MODEL_DIR, "utils.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.processing
+
+
+class FastSentimentModel:
+    """WeiboSentiment_MachineLearning 训练产出的 TF-IDF + 分类器（默认 SVM）二分类模型"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        self.path = path
+        self.name = data.get("model_name", "SVM")
+        self.model = data["model"]
+        self.vectorizer = data["vectorizer"]
+        if self.vectorizer is None or not hasattr(self.model, "predict_proba"):
+            raise ValueError(f"{self.name} 模型不支持 TF-IDF 概率输出，无法用于级联")
+        classes = list(self.model.classes_)
+        self._columns = [classes.index(label) for label in (0, 1)]
+        self._processing = _load_processing()
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """N×2 概率矩阵，列为 (负面, 正面)"""
+        features = self.vectorizer.transform([self._processing(text) for text in texts])
+        return np.asarray(self.model.predict_proba(features))[:, self._columns]
+
+    def sentiment_probabilities(self, texts: List[str], num_labels: int = 5) -> np.ndarray:
+        """N×num_labels 概率矩阵：二分类概率放在「负面」「正面」两列，其余为 0"""
+        binary = self.predict_proba(texts)
+        probabilities = np.zeros((len(texts), num_labels))
+        probabilities[:, list(_BINARY_TO_LABEL)] = binary
+        return probabilities
+
+
+class CascadeMetrics:
+    """级联统计：快速模型直接采用、升级到 Transformer、因超出时间预算未升级的条数与耗时，线程安全"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.texts = 0
+        self.accepted = 0
+        self.escalated = 0
+        self.budget_skipped = 0
+        self.fast_seconds = 0.0
+        self.escalation_seconds = 0.0
+
+    def record(self, texts: int, accepted: int, escalated: int, budget_skipped: int,
+               fast_seconds: float, escalation_seconds: float) -> None:
+        with self._lock:
+            self.texts += texts
+            self.accepted += accepted
+            self.escalated += escalated
+            self.budget_skipped += budget_skipped
+            self.fast_seconds += fast_seconds
+            self.escalation_seconds += escalation_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            seconds = self.fast_seconds + self.escalation_seconds
+            return {
+                "texts": self.texts,
+                "accepted": self.accepted,
+                "escalated": self.escalated,
+                "budget_skipped": self.budget_skipped,
+                "escalated_fraction": round(self.escalated / self.texts, 4) if self.texts else 0.0,
+                "fast_seconds": round(self.fast_seconds, 3),
+                "escalation_seconds": round(self.escalation_seconds, 3),
+                "texts_per_sec": round(self.texts / seconds, 1) if seconds else 0.0,
+            }
+
+
+_fast_model: Optional[FastSentimentModel] = None
+_fast_model_error: Optional[str] = None
+_fast_model_lock = threading.Lock()
+
+
+def get_fast_sentiment_model() -> Optional[FastSentimentModel]:
+    """按配置加载（单例）级联快速模型；未开启级联或模型不可用时返回 None（只告警一次）"""
+    global _fast_model, _fast_model_error
+    if not settings.SENTIMENT_CASCADE_ENABLED:
+        return None
+    with _fast_model_lock:
+        if _fast_model is None and _fast_model_error is None:
+            path = settings.SENTIMENT_CASCADE_MODEL_PATH or default_fast_model_path()
+            try:
+                _fast_model = FastSentimentModel(path)
+                logger.info(f"情感分析级联快速模型已加载: {_fast_model.name} ({path})")
+            except Exception as e:
+                _fast_model_error = str(e)
+                logger.warning(f"情感分析级联快速模型不可用，所有文本直接使用 Transformer: {e}")
+        return _fast_model
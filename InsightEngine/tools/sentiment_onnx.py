@@ -0,0 +1,135 @@
+"""
+多语言情感模型的 ONNX Runtime 推理后端
+
+部署环境多为纯 CPU 机器，完整的 fp32 PyTorch 模型推理慢、内存占用大。本模块提供：
+
+- export_onnx:        将本地 HuggingFace 模型一次性导出为 ONNX（动态 batch / 序列长度），
+                      可选再做动态 int8 量化（onnxruntime.quantization.quantize_dynamic）
+- OnnxSentimentModel: 基于 onnxruntime.InferenceSession 的推理封装，线程数由 SENTIMENT_ONNX_THREADS 控制
+
+WeiboMultilingualSentimentAnalyzer 在 SENTIMENT_BACKEND=onnx 时使用本后端，对外仍是同一个
+analyze_batch 接口；分词、补齐与截断逻辑与 torch 后端完全相同。
+导出需要 torch（仅首次），推理只依赖 onnxruntime 与 numpy。
+
+导出命令:
+    python -m InsightEngine.tools.sentiment_onnx --export
+    python -m InsightEngine.tools.sentiment_onnx --export --no-quantize
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+from typing import Dict, Optional
+
+import numpy as np
+from loguru import logger
+
+from InsightEngine.utils.config import settings
+
+# onnxruntime 在创建推理会话时才导入，避免拖慢引擎启动
+ONNXRUNTIME_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+
+__all__ = [
+    "ONNXRUNTIME_AVAILABLE",
+    "onnx_model_path",
+    "export_onnx",
+    "OnnxSentimentModel",
+]
+
+
+def onnx_model_path(model_dir: str, quantize: bool) -> str:
+    """导出文件位置：与 HuggingFace 模型放在同一目录"""
+    return os.path.join(model_dir, "model.int8.onnx" if quantize else "model.onnx")
+
+
+def export_onnx(model_dir: str, quantize: bool = True, opset: int = 14) -> str:
+    """
+    将本地模型导出为 ONNX，已存在时直接返回路径
+
+    Args:
+        model_dir: HuggingFace 模型目录（save_pretrained 的输出）
+        quantize: 是否在 fp32 导出结果上做动态 int8 量化
+        opset: ONNX opset 版本
+
+    Returns:
+        可直接加载的 ONNX 文件路径
+    """
+    target = onnx_model_path(model_dir, quantize)
+    if os.path.exists(target):
+        return target
+
+    fp32_path = onnx_model_path(model_dir, quantize=False)
+    if not os.path.exists(fp32_path):
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        logger.info(f"正在导出情感模型为 ONNX: {fp32_path}")
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+        model.eval()
+        model.config.return_dict = False
+        sample = tokenizer(["导出样例文本", "sample"], padding=True, return_tensors="pt")
+        dynamic_axes = {"input_ids": {0: "batch", 1: "sequence"}, "attention_mask": {0: "batch", 1: "sequence"},
+                        "logits": {0: "batch"}}
+        with torch.inference_mode():
+            torch.onnx.export(
+                model,
+                (sample["input_ids"], sample["attention_mask"]),
+                fp32_path,
+                input_names=["input_ids", "attention_mask"],
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=opset,
+                do_constant_folding=True,
+            )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info(f"正在对 ONNX 模型做动态 int8 量化: {target}")
+        quantize_dynamic(fp32_path, target, weight_type=QuantType.QInt8)
+    return target
+
+
+class OnnxSentimentModel:
+    """onnxruntime 推理会话封装：输入 numpy 的 input_ids / attention_mask，输出 logits"""
+
+    def __init__(self, path: str, threads: Optional[int] = None):
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime 未安装，无法使用 ONNX 推理后端")
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = settings.SENTIMENT_ONNX_THREADS if threads is None else threads
+        if threads and threads > 0:
+            options.intra_op_num_threads = threads
+        self.path = path
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_names = {item.name for item in self.session.get_inputs()}
+
+    def logits(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        feed = {name: np.asarray(value, dtype=np.int64) for name, value in inputs.items() if name in self.input_names}
+        return self.session.run(["logits"], feed)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多语言情感模型 ONNX 导出工具")
+    parser.add_argument("--export", action="store_true", help="导出 ONNX 模型（默认同时做 int8 动态量化）")
+    parser.add_argument("--no-quantize", action="store_true", help="只导出 fp32 ONNX，不做量化")
+    parser.add_argument("--model-dir", help="HuggingFace 模型目录，默认使用情感分析器的本地模型目录")
+    args = parser.parse_args()
+
+    if args.export:
+        from .sentiment_analyzer import weibo_sentiment_path
+        model_dir = args.model_dir or os.path.join(weibo_sentiment_path, "model")
+        path = export_onnx(model_dir, quantize=not args.no_quantize)
+        logger.info(f"ONNX 模型已就绪: {path}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+共享情感分析推理服务
+
+app.py 启动的每个 Streamlit 子进程（以及离线打分、报告生成等脚本）原先各自加载一份情感模型，
+内存占用成倍增加，并发请求也无法合并成大批推理。本模块提供一个独占模型的本地推理进程：
+
+- HTTP 接口（仅监听本机）:
+    GET  /health   服务状态（loading / ready / disabled）、模型版本、推理后端与批处理统计
+    POST /analyze  {"texts": [...], "cascade": true} -> {"results": [...], "model_version": "..."}，结果顺序与输入一致；
+                   cascade=false 时跳过级联快速模型，全部由 Transformer 打分（离线打分使用）
+- 微批处理: 并发到达的请求进入同一队列，由单个推理线程合并后调用一次 analyze_batch；
+  自第一条请求到达起最多等待 SENTIMENT_SERVICE_MAX_LATENCY_MS 毫秒，
+  或凑满 SENTIMENT_SERVICE_MAX_BATCH 条文本即开始推理
+- SentimentServiceClient: 客户端，WeiboMultilingualSentimentAnalyzer 在配置了 SENTIMENT_SERVICE_URL 时
+  通过它调用服务；服务不可达或在 SENTIMENT_SERVICE_READY_WAIT_SECONDS 内仍未加载完模型时，
+  分析器回退到进程内推理，并每隔 SENTIMENT_SERVICE_REPROBE_SECONDS 重新探测，服务就绪后切回服务
+
+结果缓存（sentiment_cache）在服务端进程内生效，各客户端共享命中。
+
+启动命令（app.py 在 SENTIMENT_SERVICE_AUTOSTART 开启时自动启动，并把地址传给子进程）:
+    python -m InsightEngine.tools.sentiment_service --serve
+    python -m InsightEngine.tools.sentiment_service --serve --host 127.0.0.1 --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from loguru import logger
+
+from InsightEngine.utils.config import settings
+
+__all__ = [
+    "SentimentMicroBatcher",
+    "SentimentServiceClient",
+    "serve",
+]
+
+
+class SentimentMicroBatcher:
+    """
+    将并发请求合并为批量推理
+
+    所有推理都在同一个后台线程中执行，模型只被一个线程访问；请求线程通过 Future 等待各自的结果。
+    """
+
+    def __init__(self, analyzer: Any, max_batch: int = 64, max_latency_ms: float = 10.0):
+        self.analyzer = analyzer
+        self.max_batch = max(1, max_batch)
+        self.max_latency = max(0.0, max_latency_ms) / 1000.0
+        self._queue: "queue.Queue[Tuple[List[str], bool, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+        self.status = "loading"
+        self.batches = 0
+        self.texts = 0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def submit(self, texts: List[str], cascade: bool = True) -> Future:
+        """提交一组文本，返回结果为 List[SentimentResult] 的 Future；cascade=False 时不使用级联快速模型"""
+        future: Future = Future()
+        self._queue.put((texts, cascade, future))
+        return future
+
+    def queue_size(self) -> int:
+        return self._queue.qsize()
+
+    def _collect(self) -> List[Tuple[List[str], bool, Future]]:
+        """阻塞等待第一条请求，之后在延迟窗口内继续收集，直到凑满 max_batch 条文本"""
+        items = [self._queue.get()]
+        count = len(items[0][0])
+        deadline = time.monotonic() + self.max_latency
+        while count < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            items.append(item)
+            count += len(item[0])
+        return items
+
+    def _run(self) -> None:
+        # 模型在推理线程中加载，服务启动后即可响应 /health，请求在加载完成前排队等待
+        if self.analyzer.is_initialized or self.analyzer.initialize():
+            self.status = "ready"
+            logger.info(f"情感分析服务模型已就绪: backend={self.analyzer.backend}, model={self.analyzer.model_version}")
+        else:
+            self.status = "disabled"
+            logger.warning(f"情感分析服务模型不可用: {self.analyzer.disable_reason}")
+
+        while True:
+            collected = self._collect()
+            # 是否使用级联快速模型不同的请求分开推理
+            for cascade in (True, False):
+                items = [(batch_texts, future) for batch_texts, flag, future in collected if flag == cascade]
+                if items:
+                    self._analyze(items, cascade)
+
+    def _analyze(self, items: List[Tuple[List[str], Future]], cascade: bool) -> None:
+        texts = [text for batch_texts, _ in items for text in batch_texts]
+        try:
+            batch = self.analyzer.analyze_batch(texts, show_progress=False, cascade=cascade)
+        except Exception as e:
+            logger.exception(f"情感分析服务推理失败: {e}")
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.texts += len(texts)
+        offset = 0
+        for batch_texts, future in items:
+            future.set_result(batch.results[offset:offset + len(batch_texts)])
+            offset += len(batch_texts)
+        if len(items) > 1:
+            logger.debug(f"情感分析服务: 合并 {len(items)} 个请求共 {len(texts)} 条文本")
+
+
+def _make_handler(batcher: SentimentMicroBatcher):
+    analyzer = batcher.analyzer
+
+    class SentimentRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/") != "/health":
+                self._send_json(404, {"error": "not found"})
+                return
+            ready = batcher.status == "ready"
+            self._send_json(200, {
+                "status": batcher.status,
+                "reason": analyzer.disable_reason if batcher.status == "disabled" else None,
+                "model_version": analyzer.model_version if ready else None,
+                "backend": analyzer.backend if ready else None,
+                "device": str(analyzer.device) if ready else None,
+                "queue_size": batcher.queue_size(),
+                "batches": batcher.batches,
+                "texts": batcher.texts,
+            })
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/analyze":
+                self._send_json(404, {"error": "not found"})
+                return
+            if batcher.status == "disabled":
+                self._send_json(503, {"error": analyzer.disable_reason or "情感分析模型不可用"})
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                texts = [str(text) if text is not None else "" for text in payload.get("texts", [])]
+                cascade = bool(payload.get("cascade", True))
+            except (ValueError, AttributeError) as e:
+                self._send_json(400, {"error": f"请求格式错误: {e}"})
+                return
+            try:
+                results = batcher.submit(texts, cascade).result(timeout=settings.SENTIMENT_SERVICE_TIMEOUT)
+            except Exception as e:
+                self._send_json(500, {"error": f"推理失败: {e}"})
+                return
+            self._send_json(200, {
+                "results": [asdict(result) for result in results],
+                "model_version": analyzer.model_version,
+            })
+
+        def log_message(self, format, *args):
+            logger.debug(f"情感分析服务 {self.address_string()} {format % args}")
+
+    return SentimentRequestHandler
+
+
+def serve(host: Optional[str] = None, port: Optional[int] = None) -> None:
+    """启动情感分析服务（阻塞运行）"""
+    from .sentiment_analyzer import WeiboMultilingualSentimentAnalyzer
+
+    host = host or settings.SENTIMENT_SERVICE_HOST
+    port = port or settings.SENTIMENT_SERVICE_PORT
+    # 服务进程自身必须在进程内推理，不能再把请求转发给服务
+    analyzer = WeiboMultilingualSentimentAnalyzer(use_service=False)
+    batcher = SentimentMicroBatcher(
+        analyzer,
+        max_batch=settings.SENTIMENT_SERVICE_MAX_BATCH,
+        max_latency_ms=settings.SENTIMENT_SERVICE_MAX_LATENCY_MS,
+    )
+    batcher.start()
+
+    server = ThreadingHTTPServer((host, port), _make_handler(batcher))
+    server.daemon_threads = True
+    logger.info(f"情感分析服务已启动: http://{host}:{port} (max_batch={batcher.max_batch}, "
+                f"max_latency={settings.SENTIMENT_SERVICE_MAX_LATENCY_MS}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("情感分析服务正在关闭...")
+    finally:
+        server.server_close()
+
+
+class SentimentServiceClient:
+    """情感分析服务客户端"""
+
+    def __init__(self, url: str, timeout: Optional[float] = None):
+        self.url = url.rstrip("/")
+        self.timeout = settings.SENTIMENT_SERVICE_TIMEOUT if timeout is None else timeout
+        self.model_version: Optional[str] = None
+        self.backend: Optional[str] = None
+
+    def health(self) -> Optional[Dict[str, Any]]:
+        """查询服务状态，服务不可达时返回 None"""
+        try:
+            response = requests.get(f"{self.url}/health", timeout=min(self.timeout, 2))
+            response.raise_for_status()
+            status = response.json()
+        except (requests.RequestException, ValueError):
+            return None
+        self.model_version = status.get("model_version") or self.model_version
+        self.backend = status.get("backend") or self.backend
+        return status
+
+    def wait_until_ready(self, timeout: float, interval: float = 0.5) -> Optional[Dict[str, Any]]:
+        """
+        查询服务状态，服务仍在加载模型（loading）时在 timeout 秒内轮询等待
+
+        Returns:
+            最后一次查询到的状态（可能仍为 loading），服务不可达时返回 None
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        status = self.health()
+        while status is not None and status.get("status") == "loading" and time.monotonic() < deadline:
+            time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            status = self.health()
+        return status
+
+    def analyze(self, texts: List[str], cascade: bool = True) -> List[Dict[str, Any]]:
+        """
+        请求服务分析一组文本（cascade=False 时服务端不使用级联快速模型）
+
+        Returns:
+            与输入顺序一致的 SentimentResult 字段字典列表
+
+        Raises:
+            requests.RequestException: 服务不可达、超时或返回错误状态
+        """
+        response = requests.post(f"{self.url}/analyze", json={"texts": texts, "cascade": cascade}, timeout=self.timeout)
+        response.raise_for_status()
+        payload = response.json()
+        self.model_version = payload.get("model_version") or self.model_version
+        results = payload.get("results", [])
+        if len(results) != len(texts):
+            raise ValueError(f"情感分析服务返回 {len(results)} 条结果，期望 {len(texts)} 条")
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InsightEngine 共享情感分析推理服务")
+    parser.add_argument("--serve", action="store_true", help="启动服务（独占模型，合并并发请求批量推理）")
+    parser.add_argument("--host", help="监听地址，默认 SENTIMENT_SERVICE_HOST")
+    parser.add_argument("--port", type=int, help="监听端口，默认 SENTIMENT_SERVICE_PORT")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.host, args.port)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
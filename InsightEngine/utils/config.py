@@ -14,6 +14,9 @@ class Settings(BaseSettings):
     INSIGHT_ENGINE_API_KEY: Optional[str] = Field(None, description="Insight Engine LLM API密钥")
     INSIGHT_ENGINE_BASE_URL: Optional[str] = Field(None, description="Insight Engine LLM base url，可选")
     INSIGHT_ENGINE_MODEL_NAME: Optional[str] = Field(None, description="Insight Engine LLM模型名称")
+    INSIGHT_ENGINE_LLM_MAX_CONCURRENCY: int = Field(4, description="Insight Agent LLM同时进行的请求数上限（并行研究段落时限流，同一BaseUrl的同步与异步请求共享，0表示不限）")
+    INSIGHT_ENGINE_LLM_REQUESTS_PER_SECOND: float = Field(0.0, description="Insight Agent LLM每秒请求数上限（同一BaseUrl的同步与异步请求共享令牌桶，0表示不限）")
+    LLM_MAX_CONNECTIONS: int = Field(100, description="异步LLM客户端共享HTTP连接池的最大连接数")
     INSIGHT_ENGINE_PROVIDER: Optional[str] = Field(None, description="Insight Engine模型提供者，不再建议使用")
     DB_HOST: Optional[str] = Field("bettafish-db", description="数据库主机，PostgreSQL容器服务名")
     DB_USER: Optional[str] = Field("bettafish", description="数据库用户名")
@@ -24,8 +27,10 @@ class Settings(BaseSettings):
     DB_DIALECT: Optional[str] = Field("postgresql", description="数据库方言，如mysql、postgresql等，SQLAlchemy后端选择")
     MAX_REFLECTIONS: int = Field(3, description="最大反思次数")
     MAX_PARAGRAPHS: int = Field(6, description="最大段落数")
+    PARAGRAPH_CONCURRENCY: int = Field(5, description="同时研究的段落数（段落之间互不依赖，1表示逐个处理）")
     SEARCH_TIMEOUT: int = Field(240, description="单次搜索请求超时")
     MAX_CONTENT_LENGTH: int = Field(500000, description="搜索最大内容长度")
+    SUMMARY_PROMPT_TOKEN_BUDGET: int = Field(32000, description="总结节点提示词的token预算，超出时按与查询的相关度保留搜索结果（0表示不限）")
     DEFAULT_SEARCH_HOT_CONTENT_LIMIT: int = Field(100, description="热榜内容默认最大数")
     DEFAULT_SEARCH_TOPIC_GLOBALLY_LIMIT_PER_TABLE: int = Field(50, description="按表全局话题最大数")
     DEFAULT_SEARCH_TOPIC_BY_DATE_LIMIT_PER_TABLE: int = Field(100, description="按日期话题最大数")
@@ -33,6 +38,54 @@ class Settings(BaseSettings):
     DEFAULT_SEARCH_TOPIC_ON_PLATFORM_LIMIT: int = Field(200, description="平台搜索话题最大数")
     MAX_SEARCH_RESULTS_FOR_LLM: int = Field(0, description="供LLM用搜索结果最大数")
     MAX_HIGH_CONFIDENCE_SENTIMENT_RESULTS: int = Field(0, description="高置信度情感分析最大数")
+    SENTIMENT_BATCH_SIZE: int = Field(32, description="情感分析每批推理的文本数（按长度排序分桶）")
+    SENTIMENT_MAX_LENGTH: int = Field(512, description="情感分析单条文本的最大token数（含特殊token），批内按实际最长长度补齐")
+    SENTIMENT_TRUNCATION: str = Field("head", description="超长文本截断策略：head（保留开头）或head_tail（保留开头与结尾）")
+    SENTIMENT_HEAD_TOKENS: int = Field(128, description="head_tail截断时保留的开头token数，其余预算留给结尾")
+    SENTIMENT_STREAM_THRESHOLD: int = Field(1000, description="结果数超过该值时情感分析改为流式处理（游标分批读取、分批推理、增量汇总），评论工具返回给LLM的样本也截断为该值")
+    SENTIMENT_STREAM_BATCH_SIZE: int = Field(500, description="流式情感分析每批读取并推理的条数")
+    SENTIMENT_WARMUP_ENABLED: bool = Field(True, description="创建InsightEngine Agent时是否在后台线程预热（加载/下载）情感分析模型")
+    SENTIMENT_BACKEND: str = Field("torch", description="情感分析推理后端：torch或onnx（onnxruntime，适合纯CPU部署，首次使用时自动导出）")
+    SENTIMENT_ONNX_QUANTIZE: bool = Field(True, description="onnx后端是否使用动态int8量化模型")
+    SENTIMENT_ONNX_THREADS: int = Field(0, description="onnx后端的intra-op线程数，0表示由onnxruntime自动决定")
+    SENTIMENT_CASCADE_ENABLED: bool = Field(False, description="情感分析级联模式：先用TF-IDF+SVM快速模型打分，只有低置信度文本升级到多语言Transformer")
+    SENTIMENT_CASCADE_MODEL_PATH: str = Field("", description="级联快速模型文件（WeiboSentiment_MachineLearning训练产出的pkl），留空使用svm_model.pkl")
+    SENTIMENT_CASCADE_THRESHOLD: float = Field(0.9, description="快速模型置信度不低于该值时直接采用，否则升级到Transformer")
+    SENTIMENT_CASCADE_BUDGET_MS: float = Field(0.0, description="单次批量分析中升级到Transformer的时间预算（毫秒），超出后剩余文本保留快速模型结果；0表示不限")
+    SENTIMENT_CACHE_ENABLED: bool = Field(True, description="是否按内容哈希缓存情感分析结果（模型或推理参数变化后自动失效）")
+    SENTIMENT_CACHE_PATH: str = Field("cache/sentiment_cache.sqlite3", description="情感分析结果的SQLite持久化文件路径，留空则仅保存在内存")
+    SENTIMENT_CACHE_MAX_ENTRIES: int = Field(50000, description="情感分析结果进程内LRU缓存的最大条目数")
+    SENTIMENT_CACHE_MAX_AGE_DAYS: int = Field(30, description="情感分析持久化缓存条目的最长保留天数（打开缓存时清理），0 表示不清理")
+    SENTIMENT_SERVICE_URL: str = Field("", description="共享情感分析服务地址（如http://127.0.0.1:8765），留空则在进程内加载模型推理")
+    SENTIMENT_SERVICE_HOST: str = Field("127.0.0.1", description="情感分析服务监听地址")
+    SENTIMENT_SERVICE_PORT: int = Field(8765, description="情感分析服务监听端口")
+    SENTIMENT_SERVICE_AUTOSTART: bool = Field(True, description="app.py启动系统时是否自动启动共享情感分析服务并让各引擎子进程使用它")
+    SENTIMENT_SERVICE_MAX_BATCH: int = Field(64, description="情感分析服务单次合并推理的最大文本数")
+    SENTIMENT_SERVICE_MAX_LATENCY_MS: float = Field(10.0, description="情感分析服务合并请求的最长等待时间（毫秒）")
+    SENTIMENT_SERVICE_TIMEOUT: float = Field(120.0, description="情感分析服务请求超时（秒）")
+    SENTIMENT_SERVICE_READY_WAIT_SECONDS: float = Field(5.0, description="连接时服务仍在加载模型的最长等待时间（秒），超时则视为服务暂不可用")
+    SENTIMENT_SERVICE_REPROBE_SECONDS: float = Field(30.0, description="服务暂不可用时重新探测的间隔（秒），服务就绪后切回服务并释放进程内模型")
+    SEARCH_INDEX_BACKEND: str = Field("like", description="话题搜索的全文检索后端：like、mysql、pg_trgm、pg_tsvector、local或auto（按DB_DIALECT自动选择）")
+    FULLTEXT_PG_TS_CONFIG: str = Field("chinese", description="pg_tsvector后端使用的文本搜索配置名（需zhparser）")
+    FULLTEXT_LOCAL_INDEX_PATH: str = Field("", description="local后端倒排索引的持久化文件路径（local后端必填，首次由 python -m InsightEngine.utils.fulltext --build-local-index --full 离线构建）")
+    FULLTEXT_LOCAL_MAX_CANDIDATES: int = Field(5000, description="local后端单次查询最多下推到数据库的候选id数（候选更多时直接由数据库LIKE匹配）")
+    FULLTEXT_LOCAL_INLINE_SYNC_SECONDS: float = Field(1.0, description="查询前就地增量同步local后端倒排索引的时间上限（秒），未同步的新行由数据库直接LIKE匹配；0 表示不在查询中同步")
+    FULLTEXT_LOCAL_SAVE_INTERVAL_SECONDS: int = Field(600, description="local后端倒排索引增量同步后两次持久化的最小间隔（秒），进程退出时也会保存")
+    DB_MAX_CONCURRENCY: int = Field(8, description="单次工具调用中并发执行的分表查询数上限")
+    HOTNESS_ROLLUP_ENABLED: bool = Field(True, description="search_hot_content是否使用content_hotness热度汇总表（表不存在时自动回退实时计算）")
+    HOTNESS_MAX_STALENESS_SECONDS: int = Field(900, description="热度汇总表允许的最大陈旧时间（秒），超过则查询前先增量刷新")
+    HOTNESS_INLINE_REFRESH_SECONDS: float = Field(2.0, description="查询前就地增量刷新热度汇总表的时间上限（秒），剩余积压留给定时任务；0 表示不在查询中刷新")
+    SOCIAL_PROJECTION_ENABLED: bool = Field(True, description="话题搜索工具是否查询social_content/social_comment统一投影表（表不可用时自动回退逐表查询）")
+    SOCIAL_PROJECTION_MAX_STALENESS_SECONDS: int = Field(300, description="统一投影表允许的最大陈旧时间（秒），超过则查询前先增量同步")
+    SOCIAL_PROJECTION_INLINE_REFRESH_SECONDS: float = Field(2.0, description="查询前就地增量同步统一投影表的时间上限（秒），剩余积压留给定时任务；0 表示不在查询中同步")
+    SIMHASH_MAX_DISTANCE: int = Field(3, description="SimHash 汉明距离不超过该值的内容视为近重复（同步入库时分组，-1 关闭近重复分组）")
+    SIMHASH_CANDIDATE_WINDOW_DAYS: int = Field(30, description="近重复分组只与发布时间相差该天数以内的已入库内容比较，限制同步时取出的候选签名数量")
+    SEARCH_COLLAPSE_DUPLICATES: bool = Field(True, description="话题搜索结果是否在数据库中按近重复分组折叠，只保留每组最早发布的一条")
+    QUERY_CACHE_ENABLED: bool = Field(True, description="是否缓存数据库查询工具的结果（源数据更新后自动失效）")
+    QUERY_CACHE_BACKEND: str = Field("memory", description="查询结果缓存后端：memory（进程内LRU+TTL）或redis")
+    QUERY_CACHE_TTL_SECONDS: int = Field(600, description="查询结果缓存条目的存活时间（秒）")
+    QUERY_CACHE_MAX_ENTRIES: int = Field(256, description="memory缓存后端的最大条目数（LRU淘汰）")
+    QUERY_CACHE_REDIS_URL: str = Field("redis://localhost:6379/0", description="redis缓存后端的连接URL")
     OUTPUT_DIR: str = Field("reports", description="输出路径")
     SAVE_INTERMEDIATE_STATES: bool = Field(True, description="是否保存中间状态")
 
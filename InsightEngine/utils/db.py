@@ -10,7 +10,8 @@ from __future__ import annotations
 from urllib.parse import quote_plus
 import asyncio
 import os
-from typing import Any, Dict, Iterable, List, Optional, Union
+import threading
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy import text
@@ -19,10 +20,18 @@ from InsightEngine.utils.config import settings
 __all__ = [
     "get_async_engine",
     "fetch_all",
+    "fetch_many",
+    "stream_all",
+    "run_sync",
+    "iter_sync",
 ]
 
 
+T = TypeVar("T")
+
 _engine: Optional[AsyncEngine] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
 
 
 def _build_database_url() -> str:
@@ -70,3 +79,82 @@ async def fetch_all(query: str, params: Optional[Union[Iterable[Any], Dict[str,
         return [dict(row) for row in rows]
 
 
+async def stream_all(
+    query: str,
+    params: Optional[Union[Iterable[Any], Dict[str, Any]]] = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    使用服务端游标（stream_results）执行只读查询，按批产出字典列表。
+
+    结果集不会一次性加载到内存，单批最多 batch_size 行；迭代结束或提前关闭时释放连接。
+    """
+    engine: AsyncEngine = get_async_engine()
+    async with engine.connect() as conn:
+        result = await conn.stream(text(query), params or {})
+        try:
+            async for partition in result.mappings().partitions(batch_size):
+                yield [dict(row) for row in partition]
+        finally:
+            await result.close()
+
+
+async def fetch_many(
+    queries: Sequence[Tuple[str, Optional[Union[Iterable[Any], Dict[str, Any]]]]],
+    max_concurrency: Optional[int] = None,
+) -> List[Union[List[Dict[str, Any]], BaseException]]:
+    """
+    并发执行多条只读查询，结果顺序与传入顺序一致。
+
+    同时在途的查询数量不超过 max_concurrency（默认取 DB_MAX_CONCURRENCY），
+    单条查询失败时对应位置返回异常对象，不影响其他查询。
+    """
+    limit = max(1, max_concurrency or settings.DB_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(query: str, params: Optional[Union[Iterable[Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await fetch_all(query, params)
+
+    return await asyncio.gather(*(_run(q, p) for q, p in queries), return_exceptions=True)
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """获取（必要时启动）常驻后台线程的事件循环，连接池绑定在该循环上。"""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="insight-db-loop", daemon=True)
+            thread.start()
+            _loop = loop
+    return _loop
+
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    在后台事件循环中执行协程并同步等待结果，供同步代码（Agent 工具）调用。
+
+    所有数据库协程都在同一个循环上运行，避免连接池跨事件循环复用；
+    可以从任意线程调用，也可以在已有运行中事件循环的线程里调用。
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+    return future.result(timeout)
+
+
+def iter_sync(agen: AsyncIterator[T], timeout: Optional[float] = None) -> Iterator[T]:
+    """
+    将异步迭代器桥接为同步迭代器，每一步都在后台事件循环上执行。
+
+    同步调用方提前结束迭代（break / close）时会关闭底层异步迭代器，从而释放服务端游标。
+    """
+    try:
+        while True:
+            try:
+                yield run_sync(agen.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+    finally:
+        aclose = getattr(agen, "aclose", None)
+        if aclose is not None:
+            run_sync(aclose(), timeout)
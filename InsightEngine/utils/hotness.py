@@ -0,0 +1,259 @@
+"""
+内容热度物化表（content_hotness）
+
+`search_hot_content` 原先每次调用都要对六张平台内容表逐行计算加权热度，
+再 UNION ALL 后做全局排序。本模块基于归一化的 BIGINT 互动列与 publish_ts（毫秒），
+把热度分值预先计算到汇总表中：
+
+- content_hotness:            (platform, source_table, content_id, publish_ts, hotness_score)，
+                              在 (hotness_score, publish_ts) 与 (publish_ts, hotness_score) 上建索引：
+                              窗口较宽（周/年）时按热度倒序扫描索引、在索引内过滤 publish_ts，取到 Top-N 即停；
+                              窗口较窄（24h）时按 publish_ts 范围扫描
+- content_hotness_watermark:  每张源表的增量同步水位线 (last_modify_ts, last_id) 与最近追平时间
+
+刷新按 `(last_modify_ts, id)` 复合水位线分批增量进行（见 watermark.py），只处理新增或被更新的行。
+查询时若某源表最近一次追平早于 HOTNESS_MAX_STALENESS_SECONDS，则在 HOTNESS_INLINE_REFRESH_SECONDS
+内就地增量刷新，剩余积压留给下次查询或定时任务。首次构建必须先执行一次 `--refresh --full`，
+汇总表未构建时查询回退到实时计算。
+
+表结构定义位置：
+- MindSpider/schema/models_sa.py（ContentHotness / ContentHotnessWatermark）
+
+刷新命令（可配置为定时任务）:
+    python -m InsightEngine.utils.hotness --refresh
+    python -m InsightEngine.utils.hotness --refresh --full
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import text
+
+from InsightEngine.utils.config import settings
+from . import query_cache
+from .db import fetch_all, get_async_engine
+from .watermark import (RefreshFailures, fetch_batch, load_watermarks, require_built, save_watermark,
+                        stale_tables)
+
+__all__ = [
+    "HOTNESS_WEIGHTS",
+    "HOTNESS_SOURCES",
+    "HOTNESS_METRICS",
+    "compute_hotness",
+    "refresh_content_hotness",
+    "ensure_fresh",
+    "read_watermarks",
+    "source_versions",
+    "query_top_hotness",
+]
+
+
+# 各类互动指标的权重（MediaCrawlerDB 的 W_* 常量引用此处）
+HOTNESS_WEIGHTS: Dict[str, float] = {
+    "like": 1.0,
+    "comment": 5.0,
+    "share": 10.0,  # 分享/转发/收藏/投币等高价值互动
+    "view": 0.1,
+    "danmaku": 0.5,
+}
+
+# 参与热度计算的源表及其平台名
+HOTNESS_SOURCES: Dict[str, str] = {
+    'bilibili_video': 'bilibili',
+    'douyin_aweme': 'douyin',
+    'weibo_note': 'weibo',
+    'xhs_note': 'xhs',
+    'kuaishou_video': 'kuaishou',
+    'zhihu_content': 'zhihu',
+}
+
+# 归一化互动列（BIGINT，入库时由 MediaCrawler ORM 事件填充）及其权重类别
+HOTNESS_METRICS: List[Tuple[str, str]] = [
+    ('likes_num', 'like'), ('comments_num', 'comment'), ('shares_num', 'share'), ('favorites_num', 'share'),
+    ('coins_num', 'share'), ('danmaku_num', 'danmaku'), ('views_num', 'view'),
+]
+
+HOTNESS_TABLE = "content_hotness"
+WATERMARK_TABLE = "content_hotness_watermark"
+REFRESH_BATCH_SIZE = 2000
+
+BUILD_COMMAND = "python -m InsightEngine.utils.hotness --refresh --full"
+
+_refresh_lock: Optional[asyncio.Lock] = None
+_failures = RefreshFailures()
+
+
+def compute_hotness(row: Dict[str, Any]) -> float:
+    """按 HOTNESS_METRICS 与 HOTNESS_WEIGHTS 计算单行的加权热度"""
+    return sum(float(row.get(col) or 0) * HOTNESS_WEIGHTS[kind] for col, kind in HOTNESS_METRICS)
+
+
+def _q(name: str) -> str:
+    return f'"{name}"' if (settings.DB_DIALECT or "").lower() in ("postgresql", "postgres") else f"`{name}`"
+
+
+async def _load_watermarks() -> Dict[str, Dict[str, int]]:
+    return await load_watermarks(WATERMARK_TABLE, _q)
+
+
+async def _refresh_table(table: str, watermark: Optional[Dict[str, int]], full: bool,
+                         deadline: Optional[float] = None) -> int:
+    """增量刷新单张源表，返回本次写入的行数；到达 deadline（time.monotonic）时在批次之间停止"""
+    columns = ['id', 'last_modify_ts', 'publish_ts'] + [col for col, _ in HOTNESS_METRICS]
+    last_ts, last_id = (0, 0) if full or not watermark else (int(watermark['last_modify_ts'] or 0), int(watermark['last_id'] or 0))
+    # 未追平前沿用上次的追平时间，避免部分刷新让陈旧度检查误以为已是最新
+    refreshed_at = 0 if full or not watermark else int(watermark['refreshed_at'] or 0)
+    engine = get_async_engine()
+    total = 0
+
+    if full:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DELETE FROM {_q(HOTNESS_TABLE)} WHERE source_table = :tbl"), {"tbl": table})
+
+    caught_up = False
+    while deadline is None or time.monotonic() < deadline:
+        rows = await fetch_batch(table, columns, last_ts, last_id, REFRESH_BATCH_SIZE, _q)
+        if not rows:
+            caught_up = True
+            break
+
+        records = []
+        for row in rows:
+            records.append({
+                "platform": HOTNESS_SOURCES[table], "source_table": table, "content_id": int(row['id']),
+                "publish_ts": int(row.get('publish_ts') or 0), "hotness_score": compute_hotness(row),
+                "last_modify_ts": int(row.get('last_modify_ts') or 0),
+            })
+        last_ts, last_id = int(rows[-1].get('last_modify_ts') or 0), int(rows[-1]['id'])
+        caught_up = len(rows) < REFRESH_BATCH_SIZE
+        if caught_up:
+            refreshed_at = int(time.time())
+
+        # 先删后插实现跨方言的 upsert；与水位线推进处于同一事务
+        async with engine.begin() as conn:
+            ids = [rec["content_id"] for rec in records]
+            id_list = ", ".join(str(content_id) for content_id in ids)
+            await conn.execute(
+                text(f"DELETE FROM {_q(HOTNESS_TABLE)} WHERE source_table = :tbl AND content_id IN ({id_list})"),
+                {"tbl": table},
+            )
+            await conn.execute(
+                text(f"INSERT INTO {_q(HOTNESS_TABLE)} (platform, source_table, content_id, publish_ts, hotness_score, last_modify_ts) "
+                     "VALUES (:platform, :source_table, :content_id, :publish_ts, :hotness_score, :last_modify_ts)"),
+                records,
+            )
+            await save_watermark(conn, WATERMARK_TABLE, table, last_ts, last_id, refreshed_at, _q)
+        total += len(records)
+        if caught_up:
+            return total
+
+    if caught_up or not watermark:
+        # 没有新数据也要更新追平时间，陈旧度检查据此判断
+        async with engine.begin() as conn:
+            await save_watermark(conn, WATERMARK_TABLE, table, last_ts, last_id,
+                                 int(time.time()) if caught_up else refreshed_at, _q)
+    else:
+        logger.info(f"{table} 热度刷新达到时间上限，已处理 {total} 行，剩余积压留待下次刷新")
+    return total
+
+
+async def refresh_content_hotness(full: bool = False, tables: Optional[List[str]] = None,
+                                  budget_seconds: Optional[float] = None) -> Dict[str, int]:
+    """
+    刷新 content_hotness 汇总表。
+
+    Args:
+        full: True 时清空后全量重建，否则按水位线只处理新增/更新的行
+        tables: 只刷新这些源表，默认全部
+        budget_seconds: 本次刷新的时间上限（秒），None 表示直到追平
+
+    Returns:
+        每张源表本次写入的行数
+    """
+    global _refresh_lock
+    if _refresh_lock is None:
+        _refresh_lock = asyncio.Lock()
+    deadline = None if budget_seconds is None else time.monotonic() + budget_seconds
+    async with _refresh_lock:
+        watermarks = {} if full else await _load_watermarks()
+        stats: Dict[str, int] = {}
+        for table in tables or list(HOTNESS_SOURCES):
+            try:
+                stats[table] = await _refresh_table(table, watermarks.get(table), full, deadline)
+                _failures.clear(table)
+            except Exception as e:
+                logger.warning(f"刷新热度汇总表失败 {table}: {e}")
+                _failures.record(table)
+                stats[table] = 0
+        logger.info(f"content_hotness 刷新完成: {stats}")
+        return stats
+
+
+async def read_watermarks() -> Dict[str, Dict[str, int]]:
+    """读取各源表的同步水位线（一次小查询）；同一次工具调用中可传给 source_versions 与 ensure_fresh 复用"""
+    return await _load_watermarks()
+
+
+def _pending_refresh(watermarks: Dict[str, Dict[str, int]], max_staleness: int) -> List[str]:
+    """超过陈旧上限、查询时需要就地刷新的源表（失败退避中的除外；未开启就地刷新时为空）"""
+    if settings.HOTNESS_INLINE_REFRESH_SECONDS <= 0:
+        return []
+    return [table for table in stale_tables(watermarks, HOTNESS_SOURCES, max_staleness)
+            if not _failures.backing_off(table, max_staleness)]
+
+
+async def ensure_fresh(max_staleness: Optional[int] = None,
+                       watermarks: Optional[Dict[str, Dict[str, int]]] = None) -> None:
+    """
+    查询前检查陈旧度，超过上限的源表在 HOTNESS_INLINE_REFRESH_SECONDS 内就地增量刷新
+
+    汇总表从未构建时抛出 WatermarkNotBuilt（调用方回退到实时计算）；刷新失败的源表在一个陈旧周期内不再重试。
+    watermarks 为调用方已读取的水位线（read_watermarks），未提供时在此读取。
+    """
+    max_staleness = settings.HOTNESS_MAX_STALENESS_SECONDS if max_staleness is None else max_staleness
+    watermarks = await _load_watermarks() if watermarks is None else watermarks
+    require_built(watermarks, HOTNESS_SOURCES, BUILD_COMMAND)
+    stale = _pending_refresh(watermarks, max_staleness)
+    if stale:
+        await refresh_content_hotness(tables=stale, budget_seconds=settings.HOTNESS_INLINE_REFRESH_SECONDS)
+
+
+def source_versions(watermarks: Dict[str, Dict[str, int]], max_staleness: Optional[int] = None) -> Optional[Dict[str, int]]:
+    """
+    由已读取的水位线得到各源表已同步到的 last_modify_ts，用作查询结果缓存的数据版本（不触发刷新）
+
+    汇总表从未构建时抛出 WatermarkNotBuilt；有源表需要就地刷新时返回 None（见 query_cache.source_versions）。
+    """
+    max_staleness = settings.HOTNESS_MAX_STALENESS_SECONDS if max_staleness is None else max_staleness
+    require_built(watermarks, HOTNESS_SOURCES, BUILD_COMMAND)
+    return query_cache.source_versions(watermarks, _pending_refresh(watermarks, max_staleness))
+
+
+async def query_top_hotness(start_ts: int, limit: int) -> List[Dict[str, Any]]:
+    """取指定时间（毫秒时间戳）之后热度最高的 Top-N（走 (hotness_score, publish_ts) 或 (publish_ts, hotness_score) 索引）"""
+    return await fetch_all(
+        f"SELECT platform, source_table, content_id, publish_ts, hotness_score FROM {_q(HOTNESS_TABLE)} "
+        "WHERE publish_ts >= :start_ts ORDER BY hotness_score DESC LIMIT :limit",
+        {"start_ts": start_ts, "limit": limit},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InsightEngine 内容热度汇总表工具")
+    parser.add_argument("--refresh", action="store_true", help="按水位线增量刷新 content_hotness（不限时，直到追平）")
+    parser.add_argument("--full", action="store_true", help="与 --refresh 一起使用：清空后全量重建（首次构建必须执行）")
+    args = parser.parse_args()
+
+    if args.refresh:
+        asyncio.run(refresh_content_hotness(full=args.full))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
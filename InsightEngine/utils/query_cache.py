@@ -0,0 +1,247 @@
+"""
+InsightEngine 查询结果缓存
+
+同一次研究流程中，FirstSearchNode 与 ReflectionNode 经常在不同段落里选择同一个工具、
+使用相同（或经优化后相同）的关键词，每次都会重新访问数据库。本模块为 MediaCrawlerDB
+的工具提供结果缓存：
+
+- 缓存键: (工具名, 规范化后的参数, 数据版本)。话题关键词会去空白、去重并排序；
+  数据版本取相关源表已同步的最大 last_modify_ts，源数据有任何新增/更新时旧条目自然失效。
+- memory 后端: 进程内 LRU + TTL（默认）
+- redis  后端: 多进程/多实例共享，依赖可选的 redis 包；不可用时自动退回 memory 后端
+
+统计信息（命中/未命中/写入/淘汰）通过 `QueryCache.stats()` 获取，DeepSearchAgent 的
+进度摘要中会附带这些数据。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from InsightEngine.utils.config import settings
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "QueryCache",
+    "make_cache_key",
+    "source_versions",
+    "get_query_cache",
+]
+
+
+_MISSING = object()
+
+
+def make_cache_key(tool_name: str, params: Dict[str, Any], version: Any = None) -> str:
+    """
+    生成缓存键。
+
+    Args:
+        tool_name: 工具名
+        params: 工具参数（调用方负责把话题等参数规范化）
+        version: 数据版本，源数据变化时应随之变化
+
+    Returns:
+        形如 "insight:query:<tool>:<sha1>" 的字符串
+    """
+    payload = json.dumps({"params": params, "version": version}, sort_keys=True, ensure_ascii=False, default=str)
+    return f"insight:query:{tool_name}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+
+def source_versions(watermarks: Dict[str, Dict[str, int]], pending_refresh: List[str]) -> Optional[Dict[str, int]]:
+    """
+    汇总表/投影表的数据版本：各源表已同步到的 last_modify_ts
+
+    计算缓存键本身不触发刷新：有源表超过陈旧上限、查询时需要就地刷新时返回 None，
+    本次调用不使用缓存，由查询路径上的 ensure_fresh 完成刷新。
+
+    Args:
+        watermarks: 汇总表模块读取到的水位线（hotness / social_projection 的 read_watermarks）
+        pending_refresh: 查询时将就地刷新的源表
+    """
+    if pending_refresh:
+        return None
+    return {table: int(row['last_modify_ts'] or 0) for table, row in watermarks.items()}
+
+
+class CacheBackend:
+    """缓存后端基类：get 未命中时返回 _MISSING"""
+
+    name = "base"
+
+    def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class MemoryCacheBackend(CacheBackend):
+    """进程内 LRU + TTL 缓存，线程安全"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis 缓存：值以 pickle 序列化，过期由 SETEX 控制，容量淘汰交给 Redis 的 maxmemory-policy"""
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl_seconds: float):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis 未安装，无法使用 redis 缓存后端")
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self._client = redis.Redis.from_url(url)
+        self._client.ping()
+
+    def get(self, key: str) -> Any:
+        blob = self._client.get(key)
+        return _MISSING if blob is None else pickle.loads(blob)
+
+    def set(self, key: str, value: Any) -> None:
+        self._client.setex(key, self.ttl_seconds, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match="insight:query:*"):
+            self._client.delete(key)
+
+
+class QueryCache:
+    """带命中统计的查询结果缓存；后端异常只记录日志并按未命中处理，不影响查询本身"""
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """返回缓存值，未命中时返回 None"""
+        if not self.enabled:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"查询缓存读取失败（{self.backend.name}）: {e}")
+            value = _MISSING
+            with self._lock:
+                self.errors += 1
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        try:
+            self.backend.set(key, value)
+            with self._lock:
+                self.sets += 1
+        except Exception as e:
+            logger.warning(f"查询缓存写入失败（{self.backend.name}）: {e}")
+            with self._lock:
+                self.errors += 1
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """命中统计，供进度摘要展示"""
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "sets": self.sets,
+            "evictions": getattr(self.backend, "evictions", None),
+            "size": self.backend.size(),
+            "errors": self.errors,
+        }
+
+
+_cache: Optional[QueryCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryCache:
+    """按配置创建（单例）查询缓存；redis 后端不可用时退回 memory 后端"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            backend: Optional[CacheBackend] = None
+            if (settings.QUERY_CACHE_BACKEND or "memory").lower() == "redis":
+                try:
+                    backend = RedisCacheBackend(settings.QUERY_CACHE_REDIS_URL, settings.QUERY_CACHE_TTL_SECONDS)
+                except Exception as e:
+                    logger.warning(f"Redis 查询缓存不可用，改用进程内缓存: {e}")
+            if backend is None:
+                backend = MemoryCacheBackend(settings.QUERY_CACHE_MAX_ENTRIES, settings.QUERY_CACHE_TTL_SECONDS)
+            _cache = QueryCache(backend, enabled=settings.QUERY_CACHE_ENABLED)
+            logger.info(f"查询结果缓存: {backend.name} (enabled={_cache.enabled})")
+        return _cache
@@ -0,0 +1,238 @@
+"""
+情感分析结果缓存
+
+同一批评论/帖子会在多次工具调用、多次研究流程中反复出现，每次都重新跑一遍模型。
+本模块按 (内容哈希, 模型版本) 缓存模型输出（预测类别与完整概率分布）：
+
+- 内容哈希: 预处理后文本的 SHA-1
+- 模型版本: 由 WeiboMultilingualSentimentAnalyzer 根据模型配置、权重文件与截断参数计算，
+  模型或推理参数变化后版本随之变化，旧条目自然不再命中
+- 进程内 LRU 位于持久化的 SQLite 表之前；SENTIMENT_CACHE_PATH 为空时只使用进程内缓存
+- 持久化条目按写入时间清理：打开缓存时删除早于 SENTIMENT_CACHE_MAX_AGE_DAYS 天的条目。
+  多个进程可能同时使用不同的模型版本（如 torch 与 onnx 后端），因此不会自动删除其它版本的条目；
+  需要时通过命令行显式清理
+
+只有未命中的文本才会送入模型。
+
+维护命令:
+    python -m InsightEngine.utils.sentiment_cache --stats
+    python -m InsightEngine.utils.sentiment_cache --prune-days 7
+    python -m InsightEngine.utils.sentiment_cache --keep-version <模型版本>
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from InsightEngine.utils.config import settings
+
+__all__ = [
+    "content_hash",
+    "SentimentCache",
+    "get_sentiment_cache",
+]
+
+
+# (预测类别, 各类别概率)
+CachedPrediction = Tuple[int, List[float]]
+
+
+def content_hash(text: str) -> str:
+    """预处理后文本的内容哈希"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """进程内 LRU + SQLite 持久化的情感分析结果缓存，线程安全"""
+
+    def __init__(self, path: str = "", max_entries: int = 50000, max_age_days: int = 0):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[str, str], CachedPrediction]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+                "content_hash TEXT NOT NULL, model_version TEXT NOT NULL, label INTEGER NOT NULL, "
+                "probabilities TEXT NOT NULL, created_at INTEGER NOT NULL, "
+                "PRIMARY KEY (content_hash, model_version))"
+            )
+            self._conn.commit()
+            if max_age_days > 0:
+                self.prune(max_age_days=max_age_days)
+
+    def prune(self, max_age_days: int = 0, keep_version: Optional[str] = None) -> int:
+        """
+        清理持久化条目，返回删除的条数
+
+        Args:
+            max_age_days: 删除写入时间早于该天数的条目，0 表示不按时间清理
+            keep_version: 删除除该模型版本以外的所有条目，None 表示不按版本清理
+        """
+        if self._conn is None:
+            return 0
+        conditions, params = [], []
+        if max_age_days > 0:
+            conditions.append("created_at < ?")
+            params.append(int(time.time()) - max_age_days * 86400)
+        if keep_version is not None:
+            conditions.append("model_version <> ?")
+            params.append(keep_version)
+        if not conditions:
+            return 0
+        with self._lock:
+            deleted = self._conn.execute(
+                f"DELETE FROM sentiment_cache WHERE {' OR '.join(conditions)}", params
+            ).rowcount
+            self._conn.commit()
+            self._entries = OrderedDict(
+                (key, value) for key, value in self._entries.items()
+                if keep_version is None or key[1] == keep_version
+            )
+        if deleted:
+            logger.info(f"情感分析缓存: 清理持久化条目 {deleted} 条")
+        return deleted
+
+    def _remember(self, key: Tuple[str, str], value: CachedPrediction) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, hashes: Iterable[str], model_version: str) -> Dict[str, CachedPrediction]:
+        """批量查询，返回命中的 {内容哈希: (类别, 概率)}"""
+        hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, CachedPrediction] = {}
+        with self._lock:
+            missing = []
+            for digest in hashes:
+                value = self._entries.get((digest, model_version))
+                if value is None:
+                    missing.append(digest)
+                else:
+                    self._entries.move_to_end((digest, model_version))
+                    found[digest] = value
+
+            if self._conn is not None and missing:
+                # SQLite 默认最多 999 个绑定参数
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT content_hash, label, probabilities FROM sentiment_cache "
+                        f"WHERE model_version = ? AND content_hash IN ({', '.join('?' for _ in chunk)})",
+                        [model_version] + chunk,
+                    ).fetchall()
+                    for digest, label, probabilities in rows:
+                        value = (int(label), json.loads(probabilities))
+                        found[digest] = value
+                        self._remember((digest, model_version), value)
+
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, CachedPrediction], model_version: str) -> None:
+        """批量写入 {内容哈希: (类别, 概率)}"""
+        if not items:
+            return
+        with self._lock:
+            for digest, value in items.items():
+                self._remember((digest, model_version), value)
+            if self._conn is not None:
+                now = int(time.time())
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sentiment_cache "
+                    "(content_hash, model_version, label, probabilities, created_at) VALUES (?, ?, ?, ?, ?)",
+                    [(digest, model_version, int(label), json.dumps(probabilities), now)
+                     for digest, (label, probabilities) in items.items()],
+                )
+                self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM sentiment_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, object]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "memory_entries": len(self._entries),
+            "path": self.path or None,
+        }
+
+    def version_counts(self) -> Dict[str, int]:
+        """各模型版本的持久化条目数"""
+        if self._conn is None:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT model_version, COUNT(*) FROM sentiment_cache GROUP BY model_version"
+            ).fetchall()
+        return {version: count for version, count in rows}
+
+
+_cache: Optional[SentimentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_sentiment_cache() -> Optional[SentimentCache]:
+    """按配置创建（单例）情感分析缓存；关闭时返回 None，持久化文件不可用时退回进程内缓存"""
+    global _cache
+    if not settings.SENTIMENT_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = SentimentCache(settings.SENTIMENT_CACHE_PATH, settings.SENTIMENT_CACHE_MAX_ENTRIES,
+                                        settings.SENTIMENT_CACHE_MAX_AGE_DAYS)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"情感分析持久化缓存不可用，改用进程内缓存: {e}")
+                _cache = SentimentCache("", settings.SENTIMENT_CACHE_MAX_ENTRIES)
+            logger.info(f"情感分析结果缓存: {settings.SENTIMENT_CACHE_PATH or 'memory'}")
+        return _cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InsightEngine 情感分析结果缓存维护工具")
+    parser.add_argument("--path", default=settings.SENTIMENT_CACHE_PATH, help="SQLite 缓存文件路径")
+    parser.add_argument("--stats", action="store_true", help="显示各模型版本的条目数")
+    parser.add_argument("--prune-days", type=int, default=0, help="删除写入时间早于该天数的条目")
+    parser.add_argument("--keep-version", help="只保留该模型版本的条目，删除其它版本")
+    args = parser.parse_args()
+
+    if not args.path:
+        parser.error("未配置 SENTIMENT_CACHE_PATH，请通过 --path 指定缓存文件")
+    cache = SentimentCache(args.path)
+    if args.prune_days or args.keep_version:
+        cache.prune(max_age_days=args.prune_days, keep_version=args.keep_version)
+    elif not args.stats:
+        parser.print_help()
+        return
+    for version, count in cache.version_counts().items():
+        print(f"{version}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+离线情感打分（social_content / social_comment）
+
+情感分析原先只在 InsightEngine Agent 内部按需执行，用户等待报告时才加载模型、逐批打分。
+本模块把打分移到离线流程：按水位线增量扫描统一投影表中新同步的行，批量打分后回写
+sentiment_label（类别下标，见 SENTIMENT_LABELS）、sentiment_confidence 与 sentiment_model（模型版本）。
+离线打分不受请求延迟约束，因此不使用级联快速模型，sentiment_model 所标识的模型即为给出结果的模型。
+
+投影表在源行内容更新时先删后插，新行总会得到更大的自增 ID，因此水位线取投影表的 ID：
+每次只需处理 ID 大于水位线的行，源表的新增（add_ts）与更新（last_modify_ts）都会被覆盖。
+模型更换后使用 --rescore 对模型版本不一致的行重新打分。
+
+MediaCrawlerDB 的话题工具直接返回这些预计算的情感，并可在 SQL 中按 (platform, sentiment_label)
+聚合，请求路径上不再需要加载模型。
+
+表结构定义位置：
+- MindSpider/schema/models_sa.py（SocialContent / SocialComment 的 sentiment_* 列，SentimentScoringWatermark）
+
+打分命令（可配置为定时任务，在 social_projection --refresh 之后执行）:
+    python -m InsightEngine.utils.sentiment_scoring --score
+    python -m InsightEngine.utils.sentiment_scoring --score --rescore
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import text
+
+from .db import fetch_all, get_async_engine
+from .fulltext import quote_identifier as _q
+from .social_projection import SOCIAL_COMMENT_TABLE, SOCIAL_CONTENT_TABLE
+
+__all__ = [
+    "SENTIMENT_LABELS",
+    "SCORING_TARGETS",
+    "label_name",
+    "score_pending",
+    "scoring_version",
+]
+
+
+# 情感类别（下标即 sentiment_label 列的取值，与多语言情感模型的输出顺序一致）
+SENTIMENT_LABELS: List[str] = ["非常负面", "负面", "中性", "正面", "非常正面"]
+
+# 投影表 -> 参与打分的文本列（按顺序取第一个非空值，与 QueryResult.title_or_content 一致）
+SCORING_TARGETS: Dict[str, List[str]] = {
+    SOCIAL_CONTENT_TABLE: ['title', 'content'],
+    SOCIAL_COMMENT_TABLE: ['content'],
+}
+
+WATERMARK_TABLE = "sentiment_scoring_watermark"
+SCORING_BATCH_SIZE = 512
+
+_score_lock: Optional[asyncio.Lock] = None
+
+
+def label_name(label: Optional[int]) -> Optional[str]:
+    """sentiment_label 列的取值 -> 类别名称，未打分时返回 None"""
+    if label is None:
+        return None
+    label = int(label)
+    return SENTIMENT_LABELS[label] if 0 <= label < len(SENTIMENT_LABELS) else None
+
+
+async def _load_watermarks() -> Dict[str, int]:
+    rows = await fetch_all(f"SELECT target_table, last_id FROM {_q(WATERMARK_TABLE)}")
+    return {row['target_table']: int(row['last_id'] or 0) for row in rows}
+
+
+async def scoring_version() -> Optional[int]:
+    """最近一次打分的时间，用作查询结果缓存数据版本的一部分；从未打分或水位线表不存在时返回 None"""
+    try:
+        rows = await fetch_all(f"SELECT MAX(refreshed_at) AS v FROM {_q(WATERMARK_TABLE)}")
+    except Exception:
+        return None
+    return int(rows[0]['v']) if rows and rows[0]['v'] is not None else None
+
+
+async def _save_watermark(conn, table: str, last_id: int) -> None:
+    await conn.execute(text(f"DELETE FROM {_q(WATERMARK_TABLE)} WHERE target_table = :tbl"), {"tbl": table})
+    await conn.execute(
+        text(f"INSERT INTO {_q(WATERMARK_TABLE)} (target_table, last_id, refreshed_at) VALUES (:tbl, :last_id, :now)"),
+        {"tbl": table, "last_id": last_id, "now": int(time.time())},
+    )
+
+
+async def _score_table(table: str, analyzer: Any, last_id: int, rescore: bool) -> int:
+    """
+    为单张投影表打分，返回本次写入的行数。
+
+    Args:
+        last_id: 增量模式下的水位线；rescore 时从头扫描
+        rescore: 只处理模型版本与当前不一致（含未打分）的行，不推进水位线之外的状态
+    """
+    text_cols = SCORING_TARGETS[table]
+    model_version = analyzer.model_version
+    label_index = {name: idx for idx, name in enumerate(SENTIMENT_LABELS)}
+    engine = get_async_engine()
+    conditions = [f"{_q('id')} > :last_id"]
+    if rescore:
+        conditions.append(f"({_q('sentiment_model')} IS NULL OR {_q('sentiment_model')} <> :model)")
+    cursor, watermark, total = (0 if rescore else last_id), last_id, 0
+
+    while True:
+        rows = await fetch_all(
+            f"SELECT {_q('id')}, {', '.join(_q(col) for col in text_cols)} FROM {_q(table)} "
+            f"WHERE {' AND '.join(conditions)} ORDER BY {_q('id')} LIMIT :batch",
+            {"last_id": cursor, "model": model_version, "batch": SCORING_BATCH_SIZE},
+        )
+        if not rows:
+            break
+
+        texts = [next((str(row[col]) for col in text_cols if row.get(col)), "") for row in rows]
+        # 模型推理是 CPU 密集操作，放到线程中执行，避免阻塞事件循环
+        # 不使用级联快速模型：sentiment_model 记录的是 Transformer 的模型版本，结果必须都出自该模型
+        batch = await asyncio.to_thread(analyzer.analyze_batch, texts, show_progress=False, cascade=False)
+        if not batch.analysis_performed:
+            # 模型在打分过程中被禁用或不可用：不写入也不推进水位线，下次从同一位置继续
+            logger.warning(f"{table} 情感分析未执行，停止本次打分: {analyzer.disable_reason}")
+            break
+
+        # 水位线只推进到连续打分成功（或没有文本可打分）的最后一行，推理失败的行下次重试
+        updates, done_id, failed_id = [], None, None
+        for row, row_text, result in zip(rows, texts, batch.results):
+            if result.success and result.sentiment_label in label_index:
+                updates.append({"id": int(row['id']), "label": label_index[result.sentiment_label],
+                                "confidence": float(result.confidence), "model": model_version})
+            elif row_text.strip() and failed_id is None:
+                failed_id = int(row['id'])
+            if failed_id is None:
+                done_id = int(row['id'])
+        if done_id is not None:
+            watermark = max(watermark, done_id)
+
+        async with engine.begin() as conn:
+            if updates:
+                await conn.execute(
+                    text(f"UPDATE {_q(table)} SET {_q('sentiment_label')} = :label, "
+                         f"{_q('sentiment_confidence')} = :confidence, {_q('sentiment_model')} = :model "
+                         f"WHERE {_q('id')} = :id"),
+                    updates,
+                )
+            await _save_watermark(conn, table, watermark)
+        total += len(updates)
+        if failed_id is not None:
+            logger.warning(f"{table} 自 id={failed_id} 起有行打分失败，水位线停在 {watermark}，下次打分时重试")
+            break
+        cursor = int(rows[-1]['id'])
+        if len(rows) < SCORING_BATCH_SIZE:
+            break
+    return total
+
+
+async def score_pending(rescore: bool = False, analyzer: Any = None) -> Dict[str, int]:
+    """
+    对投影表中尚未打分的行执行情感打分。
+
+    Args:
+        rescore: True 时对所有模型版本与当前不一致的行重新打分，否则只处理水位线之后的新行
+        analyzer: 情感分析器，默认使用全局的 multilingual_sentiment_analyzer
+
+    Returns:
+        每张投影表本次写入的行数；模型不可用时返回空字典
+    """
+    global _score_lock
+    if analyzer is None:
+        from InsightEngine.tools.sentiment_analyzer import multilingual_sentiment_analyzer as analyzer
+    if not analyzer.is_initialized and not analyzer.initialize():
+        logger.warning(f"情感分析模型不可用，跳过离线打分: {analyzer.disable_reason}")
+        return {}
+
+    if _score_lock is None:
+        _score_lock = asyncio.Lock()
+    async with _score_lock:
+        watermarks = await _load_watermarks()
+        stats: Dict[str, int] = {}
+        for table in SCORING_TARGETS:
+            try:
+                stats[table] = await _score_table(table, analyzer, watermarks.get(table, 0), rescore)
+            except Exception as e:
+                logger.warning(f"离线情感打分失败 {table}: {e}")
+                stats[table] = 0
+        logger.info(f"离线情感打分完成 (model={analyzer.model_version}): {stats}")
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InsightEngine 离线情感打分工具")
+    parser.add_argument("--score", action="store_true", help="对水位线之后新同步的行打分")
+    parser.add_argument("--rescore", action="store_true", help="与 --score 一起使用：对模型版本不一致的所有行重新打分")
+    args = parser.parse_args()
+
+    if args.score:
+        asyncio.run(score_pending(rescore=args.rescore))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+情感分析结果的向量化统计
+
+analyze_batch 返回的 BatchSentimentResult 附带 N×K 的概率矩阵（每行一条文本、每列一个情感类别，
+分析失败的行为 NaN）。本模块的统计都在这个矩阵上用 NumPy 数组运算完成，不再逐条遍历结果字典：
+
+- label_counts:          各类别条数
+- confidence_histogram:  置信度（行最大概率）直方图
+- group_distribution:    按任意键（如平台）分组的类别分布与平均情感得分
+- sentiment_time_series: 按时间桶（小时/天/周/月）聚合的情感时间序列
+- SentimentAggregator:   上述统计的增量版本，逐批累加，用于流式处理大量评论（内存占用与总条数无关）
+
+情感得分为概率对类别极性（非常负面 -2 ... 非常正面 +2）的期望，取值 [-2, 2]。
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+__all__ = [
+    "TIME_BUCKETS",
+    "probability_matrix",
+    "valid_rows",
+    "polarity_scores",
+    "label_counts",
+    "confidence_histogram",
+    "group_distribution",
+    "to_datetime64",
+    "sentiment_time_series",
+    "SentimentAggregator",
+]
+
+
+TIME_BUCKETS = ("hour", "day", "week", "month")
+
+
+def probability_matrix(distributions: Sequence[Optional[Dict[str, float]]], labels: Sequence[str]) -> np.ndarray:
+    """
+    将逐条的 {类别: 概率} 组装为 N×K 矩阵，None（分析失败）对应整行 NaN
+
+    只有概率分布不完整的结果（如离线预计算只保存了预测类别的置信度）才需要走这里；
+    模型推理得到的概率在 analyze_batch 中直接写入矩阵。
+    """
+    matrix = np.full((len(distributions), len(labels)), np.nan)
+    for row, distribution in enumerate(distributions):
+        if distribution is not None:
+            matrix[row] = [distribution.get(label, 0.0) for label in labels]
+    return matrix
+
+
+def valid_rows(probabilities: np.ndarray) -> np.ndarray:
+    """分析成功的行（布尔掩码）"""
+    return ~np.isnan(probabilities).any(axis=1)
+
+
+def polarity_scores(probabilities: np.ndarray) -> np.ndarray:
+    """
+    每行的情感得分（类别极性的期望），失败行为 NaN
+
+    按行和归一化：离线预计算的结果只保存了预测类别的置信度，其得分即该类别的极性。
+    """
+    k = probabilities.shape[1]
+    polarity = np.arange(k, dtype=float) - (k - 1) / 2
+    totals = probabilities.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(totals > 0, (probabilities @ polarity) / totals, np.nan)
+
+
+def label_counts(probabilities: np.ndarray, labels: Sequence[str]) -> Dict[str, int]:
+    """各类别（按行最大概率）的条数，只返回出现过的类别"""
+    valid = valid_rows(probabilities)
+    counts = np.bincount(probabilities[valid].argmax(axis=1), minlength=len(labels))
+    return {label: int(count) for label, count in zip(labels, counts) if count}
+
+
+def confidence_histogram(probabilities: np.ndarray, bins: int = 10) -> List[Dict[str, Any]]:
+    """置信度直方图：[{"range": "0.9-1.0", "count": n}, ...]，区间等分 [0, 1]"""
+    confidence = probabilities[valid_rows(probabilities)].max(axis=1)
+    counts, edges = np.histogram(confidence, bins=bins, range=(0.0, 1.0))
+    return [
+        {"range": f"{edges[i]:.1f}-{edges[i + 1]:.1f}", "count": int(counts[i])}
+        for i in range(len(counts))
+    ]
+
+
+def group_distribution(
+    probabilities: np.ndarray,
+    keys: Sequence[Any],
+    labels: Sequence[str],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    按分组键聚合类别分布
+
+    Returns:
+        {键: {"total": 条数, "distribution": {类别: 条数}, "average_score": 平均情感得分}}，
+        键为空或分析失败的行不计入
+    """
+    keys = np.asarray([str(key) if key not in (None, "") else "" for key in keys], dtype=object)
+    valid = valid_rows(probabilities) & (keys != "")
+    if not valid.any():
+        return {}
+    groups, inverse = np.unique(keys[valid].astype(str), return_inverse=True)
+    return _aggregate(probabilities[valid], inverse, [str(group) for group in groups], labels)
+
+
+def _aggregate(
+    probabilities: np.ndarray,
+    inverse: np.ndarray,
+    groups: List[str],
+    labels: Sequence[str],
+) -> Dict[str, Dict[str, Any]]:
+    """按组下标 inverse 汇总：每组的条数、类别分布与平均得分"""
+    counts = np.zeros((len(groups), len(labels)), dtype=int)
+    np.add.at(counts, (inverse, probabilities.argmax(axis=1)), 1)
+    totals = np.bincount(inverse, minlength=len(groups))
+    scores = np.bincount(inverse, weights=polarity_scores(probabilities), minlength=len(groups)) / totals
+    return {
+        group: {
+            "total": int(totals[i]),
+            "distribution": {label: int(n) for label, n in zip(labels, counts[i]) if n},
+            "average_score": round(float(scores[i]), 4),
+        }
+        for i, group in enumerate(groups)
+    }
+
+
+def to_datetime64(values: Sequence[Any]) -> np.ndarray:
+    """
+    将发布时间（datetime、ISO 字符串或 Unix 时间戳）转为 datetime64[s]，无法解析的为 NaT
+
+    整列都是可解析的日期字符串/datetime 时一次完成转换；含时间戳（秒或毫秒）或无法解析的值时逐条转换。
+    """
+    def _one(value: Any) -> np.datetime64:
+        if value is None or value == "":
+            return np.datetime64("NaT")
+        if isinstance(value, (int, float, np.integer, np.floating)):
+            seconds = float(value) / 1000 if value > 1e12 else float(value)
+            return np.datetime64(int(seconds), "s")
+        try:
+            return np.datetime64(str(value).replace(" ", "T")[:19], "s")
+        except ValueError:
+            return np.datetime64("NaT")
+
+    if not any(isinstance(v, (int, float, np.integer, np.floating)) for v in values):
+        try:
+            return np.asarray([v if v not in ("", None) else "NaT" for v in values], dtype="datetime64[s]")
+        except (ValueError, TypeError):
+            pass
+    return np.asarray([_one(v) for v in values], dtype="datetime64[s]")
+
+
+def _bucket_starts(times: np.ndarray, bucket: str) -> np.ndarray:
+    if bucket == "hour":
+        return times.astype("datetime64[h]").astype("datetime64[s]")
+    if bucket == "day":
+        return times.astype("datetime64[D]").astype("datetime64[s]")
+    if bucket == "week":
+        days = times.astype("datetime64[D]").astype(np.int64)
+        # 1970-01-01 是周四，偏移后按周一对齐
+        return (days - (days + 3) % 7).astype("datetime64[D]").astype("datetime64[s]")
+    if bucket == "month":
+        return times.astype("datetime64[M]").astype("datetime64[s]")
+    raise ValueError(f"不支持的时间桶: {bucket}，可选 {', '.join(TIME_BUCKETS)}")
+
+
+def _bucket_names(times: np.ndarray, bucket: str) -> np.ndarray:
+    """时间 -> 时间桶名称（字符串顺序即时间顺序）：2024-01-01 10:00 / 2024-01-01 / 2024-01"""
+    starts = _bucket_starts(times, bucket)
+    if bucket == "hour":
+        return np.char.add(np.char.replace(np.datetime_as_string(starts, unit="h"), "T", " "), ":00")
+    return np.datetime_as_string(starts, unit="M" if bucket == "month" else "D")
+
+
+def sentiment_time_series(
+    probabilities: np.ndarray,
+    times: Sequence[Any],
+    labels: Sequence[str],
+    bucket: str = "day",
+) -> List[Dict[str, Any]]:
+    """
+    按时间桶聚合情感
+
+    Args:
+        probabilities: N×K 概率矩阵
+        times: 每行对应的发布时间（datetime / 字符串 / 时间戳）
+        labels: 类别名称（与矩阵列顺序一致）
+        bucket: hour / day / week / month
+
+    Returns:
+        按时间升序的 [{"bucket": 桶起始时间, "total": n, "distribution": {...}, "average_score": x}]，
+        发布时间缺失或分析失败的行不计入
+    """
+    stamps = to_datetime64(times)
+    valid = valid_rows(probabilities) & ~np.isnat(stamps)
+    if not valid.any():
+        return []
+    buckets, inverse = np.unique(_bucket_names(stamps[valid], bucket), return_inverse=True)
+    names = [str(name) for name in buckets]
+    aggregated = _aggregate(probabilities[valid], inverse, names, labels)
+    return [{"bucket": name, **aggregated[name]} for name in names]
+
+
+class SentimentAggregator:
+    """
+    情感统计的增量汇总
+
+    每批调用一次 update（传入该批的概率矩阵与平台、发布时间），随时可用 snapshot 取得当前的部分结果。
+    只保存各类别计数、置信度直方图、按平台/时间桶的计数与得分和，以及置信度最高的 max_samples 条样本，
+    内存占用与已处理条数无关。
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        bins: int = 10,
+        bucket: str = "day",
+        min_confidence: float = 0.5,
+        max_samples: int = 20,
+    ):
+        self.labels = list(labels)
+        self.bins = bins
+        self.bucket = bucket
+        self.min_confidence = min_confidence
+        self.max_samples = max(0, max_samples)
+        self.processed = 0
+        self.failed = 0
+        self.label_counts = np.zeros(len(self.labels), dtype=int)
+        self.confidence_sum = 0.0
+        self.histogram = np.zeros(bins, dtype=int)
+        # 分组名 -> {键: [各类别计数, 得分和]}
+        self._groups: Dict[str, Dict[str, List[Any]]] = {"platform": {}, "time": {}}
+        # 小根堆 (置信度, 序号, 类别下标, 样本)，保留置信度最高的 max_samples 条
+        self._samples: List[Tuple[float, int, int, Any]] = []
+        self._sequence = itertools.count()
+
+    def update(
+        self,
+        probabilities: np.ndarray,
+        platforms: Optional[Sequence[Any]] = None,
+        times: Optional[Sequence[Any]] = None,
+        samples: Optional[Sequence[Any]] = None,
+    ) -> None:
+        """
+        累加一批结果
+
+        Args:
+            probabilities: 该批的 N×K 概率矩阵（失败行为 NaN）
+            platforms: 每行的平台，可选
+            times: 每行的发布时间，可选
+            samples: 每行对应的原始条目，置信度不低于 min_confidence 的进入高置信度样本候选
+        """
+        valid = valid_rows(probabilities)
+        self.processed += len(probabilities)
+        self.failed += int((~valid).sum())
+        if not valid.any():
+            return
+
+        rows = probabilities[valid]
+        predicted = rows.argmax(axis=1)
+        confidence = rows.max(axis=1)
+        scores = polarity_scores(rows)
+        self.label_counts += np.bincount(predicted, minlength=len(self.labels))
+        self.confidence_sum += float(confidence.sum())
+        self.histogram += np.histogram(confidence, bins=self.bins, range=(0.0, 1.0))[0]
+
+        if platforms is not None:
+            keys = np.asarray([str(key) if key not in (None, "") else "" for key in platforms], dtype=object)[valid]
+            mask = keys != ""
+            self._accumulate("platform", keys[mask].astype(str), predicted[mask], scores[mask])
+        if times is not None:
+            stamps = to_datetime64(times)[valid]
+            mask = ~np.isnat(stamps)
+            if mask.any():
+                self._accumulate("time", _bucket_names(stamps[mask], self.bucket), predicted[mask], scores[mask])
+
+        if samples is not None and self.max_samples:
+            positions = np.flatnonzero(valid)
+            for k in np.flatnonzero(confidence >= self.min_confidence):
+                entry = (float(confidence[k]), next(self._sequence), int(predicted[k]), samples[positions[k]])
+                if len(self._samples) < self.max_samples:
+                    heapq.heappush(self._samples, entry)
+                elif entry[0] > self._samples[0][0]:
+                    heapq.heapreplace(self._samples, entry)
+
+    def _accumulate(self, name: str, keys: np.ndarray, predicted: np.ndarray, scores: np.ndarray) -> None:
+        if not len(keys):
+            return
+        groups, inverse = np.unique(keys, return_inverse=True)
+        counts = np.zeros((len(groups), len(self.labels)), dtype=int)
+        np.add.at(counts, (inverse, predicted), 1)
+        score_sums = np.bincount(inverse, weights=scores, minlength=len(groups))
+        table = self._groups[name]
+        for group, group_counts, score_sum in zip(groups, counts, score_sums):
+            entry = table.setdefault(str(group), [np.zeros(len(self.labels), dtype=int), 0.0])
+            entry[0] += group_counts
+            entry[1] += float(score_sum)
+
+    def _group_snapshot(self, name: str) -> Dict[str, Dict[str, Any]]:
+        snapshot = {}
+        for key in sorted(self._groups[name]):
+            counts, score_sum = self._groups[name][key]
+            total = int(counts.sum())
+            snapshot[key] = {
+                "total": total,
+                "distribution": {label: int(n) for label, n in zip(self.labels, counts) if n},
+                "average_score": round(score_sum / total, 4) if total else 0.0,
+            }
+        return snapshot
+
+    def high_confidence_samples(self) -> List[Tuple[Any, str, float]]:
+        """置信度最高的样本 [(原始条目, 类别, 置信度)]，按置信度降序"""
+        return [(sample, self.labels[label], confidence)
+                for confidence, _, label, sample in sorted(self._samples, reverse=True)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """当前的汇总结果（字段与 analyze_query_results 的统计部分一致）"""
+        analyzed = self.processed - self.failed
+        return {
+            "processed": self.processed,
+            "total_analyzed": analyzed,
+            "success_rate": f"{analyzed}/{self.processed}",
+            "average_confidence": round(self.confidence_sum / analyzed, 4) if analyzed else 0.0,
+            "sentiment_distribution": {label: int(n) for label, n in zip(self.labels, self.label_counts) if n},
+            "confidence_histogram": [
+                {"range": f"{i / self.bins:.1f}-{(i + 1) / self.bins:.1f}", "count": int(n)}
+                for i, n in enumerate(self.histogram)
+            ],
+            "platform_distribution": self._group_snapshot("platform"),
+            "time_distribution": [{"bucket": key, **value} for key, value in self._group_snapshot("time").items()],
+        }
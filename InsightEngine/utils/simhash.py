@@ -0,0 +1,114 @@
+"""
+SimHash 近重复签名
+
+对文本做归一化（去掉链接、@提及、转发链、话题标记、标点与空白）后，按字符 n-gram 计算 64 位 SimHash。
+内容只有少量改动的转发/搬运文本，签名之间的汉明距离很小；统一投影表在同步时据此为每行分配
+近重复分组键 dup_key，查询工具即可在 SQL 中按 dup_key 折叠重复内容。
+
+64 位签名被切成 4 段 16 位（band）分别建索引：汉明距离 <= 3 的两个签名至少有一段完全相同
+（抽屉原理），同步时只需按段等值查找候选再精确计算距离。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+from typing import List
+
+__all__ = [
+    "SIMHASH_BITS",
+    "SIMHASH_BANDS",
+    "normalize_text",
+    "simhash",
+    "hamming_distance",
+    "simhash_bands",
+    "to_signed64",
+    "to_unsigned64",
+]
+
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+_MASK64 = (1 << SIMHASH_BITS) - 1
+
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_REPOST_RE = re.compile(r"//@[^:：\s]+[:：]?")
+_MENTION_RE = re.compile(r"@[\w\-一-鿿]+")
+_TAG_RE = re.compile(r"#([^#]+)#")
+_REPOST_PREFIX_RE = re.compile(r"^(转发微博|轉發微博|repost)\s*", re.IGNORECASE)
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """去掉链接、转发链、@提及、话题井号、标点与空白，并统一为小写"""
+    if not text:
+        return ""
+    text = _URL_RE.sub(" ", text)
+    text = _REPOST_RE.sub(" ", text)
+    text = _MENTION_RE.sub(" ", text)
+    text = _TAG_RE.sub(r"\1", text)
+    text = _REPOST_PREFIX_RE.sub("", text.strip())
+    return _NON_WORD_RE.sub("", text).lower()
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str, ngram: int = 3) -> int:
+    """
+    计算文本的 64 位 SimHash（无符号整数）
+
+    Args:
+        text: 原始文本
+        ngram: 字符 n-gram 长度，文本短于 ngram 时整体作为一个特征
+
+    Returns:
+        64 位无符号签名；归一化后为空文本时返回 0
+    """
+    normalized = normalize_text(text)
+    if not normalized:
+        return 0
+    if len(normalized) <= ngram:
+        features = Counter([normalized])
+    else:
+        features = Counter(normalized[i:i + ngram] for i in range(len(normalized) - ngram + 1))
+
+    weights = [0] * SIMHASH_BITS
+    for token, weight in features.items():
+        h = _token_hash(token)
+        for bit in range(SIMHASH_BITS):
+            if (h >> bit) & 1:
+                weights[bit] += weight
+            else:
+                weights[bit] -= weight
+
+    result = 0
+    for bit, value in enumerate(weights):
+        if value > 0:
+            result |= 1 << bit
+    return result
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """两个 64 位签名之间的汉明距离"""
+    return bin((a ^ b) & _MASK64).count("1")
+
+
+def simhash_bands(value: int) -> List[int]:
+    """将 64 位签名切成 SIMHASH_BANDS 段，每段为 0..65535 的整数"""
+    return [(value >> (i * _BAND_BITS)) & _BAND_MASK for i in range(SIMHASH_BANDS)]
+
+
+def to_signed64(value: int) -> int:
+    """无符号 64 位 -> 有符号（用于存入 BIGINT 列）"""
+    value &= _MASK64
+    return value - (1 << SIMHASH_BITS) if value >= (1 << (SIMHASH_BITS - 1)) else value
+
+
+def to_unsigned64(value: int) -> int:
+    """有符号 BIGINT -> 无符号 64 位"""
+    return value & _MASK64
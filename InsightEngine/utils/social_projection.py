@@ -0,0 +1,414 @@
+"""
+跨平台统一内容投影表（social_content / social_comment）
+
+MediaCrawler 每个平台各有一张内容表和评论表，列名互不相同（title/desc/content_text、
+nickname/user_nickname、video_url/note_url/aweme_url ...）。MediaCrawlerDB 的每个工具原先都要
+对十余张表逐一 `SELECT *`，再用 `row.get(...) or row.get(...)` 链在 Python 中拼出统一字段。
+
+本模块通过 ETL 把各源表投影为两张固定的窄表：
+
+- social_content:  platform, content_type, source_table, source_id, title, content, tags, author, url,
+                   source_keyword, publish_ts（毫秒）, 归一化互动列, last_modify_ts
+- social_comment:  platform, source_table, source_id, content, author, publish_ts（毫秒）,
+                   likes_num, comments_num, last_modify_ts
+- 两张投影表都带有离线情感打分列 sentiment_label / sentiment_confidence / sentiment_model，
+  由 sentiment_scoring.py 在同步之后单独回填
+- social_projection_watermark: 每张源表的增量同步水位线 (last_modify_ts, last_id) 与最近刷新时间
+
+两张投影表另有近重复签名列：simhash（64 位 SimHash，见 simhash.py）、simhash_b0..b3（签名的 4 段，
+各自与 publish_ts 建联合索引）与 dup_key（近重复分组键）。签名在同步入库时计算一次：按段查找发布时间相近
+（SIMHASH_CANDIDATE_WINDOW_DAYS 天内）的已入库候选签名，汉明距离不超过 SIMHASH_MAX_DISTANCE 的行沿用候选的
+dup_key，否则以自身签名作为新分组。
+查询工具据此在 SQL 中按 dup_key 折叠转发/搬运造成的近重复内容。
+
+查询工具只需访问这两张表，只取所需的列；在 (publish_ts, id)、(platform, publish_ts) 与
+(source_table, source_id) 上建有索引，(publish_ts, id) 同时用作流式读取的键集分页游标。同步方式与 content_hotness 相同：按
+`(last_modify_ts, id)` 复合水位线分批增量进行（见 watermark.py），查询前若某源表最近一次追平早于
+SOCIAL_PROJECTION_MAX_STALENESS_SECONDS，则在 SOCIAL_PROJECTION_INLINE_REFRESH_SECONDS 内就地增量同步，
+剩余积压留给下次查询或定时任务。首次构建必须先执行一次 `--refresh --full`，投影表未构建时查询工具回退到逐表查询。
+
+表结构定义位置：
+- MindSpider/schema/models_sa.py（SocialContent / SocialComment / SocialProjectionWatermark）
+
+刷新命令（可配置为定时任务）:
+    python -m InsightEngine.utils.social_projection --refresh
+    python -m InsightEngine.utils.social_projection --refresh --full
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import text
+
+from InsightEngine.utils.config import settings
+from . import query_cache
+from .db import fetch_all, get_async_engine
+from .fulltext import quote_identifier as _q
+from .simhash import (SIMHASH_BANDS, hamming_distance, simhash, simhash_bands, to_signed64,
+                      to_unsigned64)
+from .watermark import (RefreshFailures, fetch_batch, load_watermarks, require_built, save_watermark,
+                        stale_tables)
+
+__all__ = [
+    "SOCIAL_CONTENT_TABLE",
+    "SOCIAL_COMMENT_TABLE",
+    "SOCIAL_CONTENT_SOURCES",
+    "SOCIAL_COMMENT_SOURCES",
+    "SOCIAL_CONTENT_COLUMNS",
+    "SOCIAL_COMMENT_COLUMNS",
+    "SOCIAL_CONTENT_SEARCH_FIELDS",
+    "SOCIAL_COMMENT_SEARCH_FIELDS",
+    "SIGNATURE_COLUMNS",
+    "refresh_social_projection",
+    "ensure_fresh",
+    "read_watermarks",
+    "source_versions",
+]
+
+
+SOCIAL_CONTENT_TABLE = "social_content"
+SOCIAL_COMMENT_TABLE = "social_comment"
+WATERMARK_TABLE = "social_projection_watermark"
+REFRESH_BATCH_SIZE = 2000
+
+# 内容源表 -> 平台、内容类型与 {投影列: 源列} 映射
+SOCIAL_CONTENT_SOURCES: Dict[str, Dict[str, Any]] = {
+    'bilibili_video': {'platform': 'bilibili', 'content_type': 'video',
+                       'columns': {'title': 'title', 'content': 'desc', 'author': 'nickname', 'url': 'video_url'}},
+    'douyin_aweme': {'platform': 'douyin', 'content_type': 'video',
+                     'columns': {'title': 'title', 'content': 'desc', 'author': 'nickname', 'url': 'aweme_url'}},
+    'kuaishou_video': {'platform': 'kuaishou', 'content_type': 'video',
+                       'columns': {'title': 'title', 'content': 'desc', 'author': 'nickname', 'url': 'video_url'}},
+    'weibo_note': {'platform': 'weibo', 'content_type': 'note',
+                   'columns': {'content': 'content', 'author': 'nickname', 'url': 'note_url'}},
+    'xhs_note': {'platform': 'xhs', 'content_type': 'note',
+                 'columns': {'title': 'title', 'content': 'desc', 'tags': 'tag_list', 'author': 'nickname', 'url': 'note_url'}},
+    'zhihu_content': {'platform': 'zhihu', 'content_type': 'content',
+                      'columns': {'title': 'title', 'content': 'content_text', 'author': 'user_nickname', 'url': 'content_url'}},
+    'tieba_note': {'platform': 'tieba', 'content_type': 'note',
+                   'columns': {'title': 'title', 'content': 'desc', 'author': 'user_nickname', 'url': 'note_url'}},
+    # 热榜新闻没有互动指标与 publish_ts，发布时间取 crawl_date
+    'daily_news': {'platform': 'daily', 'content_type': 'news',
+                   'columns': {'title': 'title', 'url': 'url'}, 'time_col': 'crawl_date'},
+}
+
+# 评论源表 -> 平台与作者列
+SOCIAL_COMMENT_SOURCES: Dict[str, Dict[str, Any]] = {
+    'bilibili_video_comment': {'platform': 'bilibili', 'columns': {'content': 'content', 'author': 'nickname'}},
+    'douyin_aweme_comment': {'platform': 'douyin', 'columns': {'content': 'content', 'author': 'nickname'}},
+    'kuaishou_video_comment': {'platform': 'kuaishou', 'columns': {'content': 'content', 'author': 'nickname'}},
+    'weibo_note_comment': {'platform': 'weibo', 'columns': {'content': 'content', 'author': 'nickname'}},
+    'xhs_note_comment': {'platform': 'xhs', 'columns': {'content': 'content', 'author': 'nickname'}},
+    'zhihu_comment': {'platform': 'zhihu', 'columns': {'content': 'content', 'author': 'user_nickname'}},
+    'tieba_comment': {'platform': 'tieba', 'columns': {'content': 'content', 'author': 'user_nickname'}},
+}
+
+CONTENT_ENGAGEMENT_COLUMNS = ['likes_num', 'comments_num', 'shares_num', 'views_num',
+                              'favorites_num', 'coins_num', 'danmaku_num']
+COMMENT_ENGAGEMENT_COLUMNS = ['likes_num', 'comments_num']
+
+# 投影表的列（查询工具按需从中选取）
+# 离线情感打分列（见 sentiment_scoring.py）；同步写入时置空，行内容更新后重新打分
+SENTIMENT_COLUMNS = ['sentiment_label', 'sentiment_confidence', 'sentiment_model']
+
+SOCIAL_CONTENT_COLUMNS: List[str] = (['platform', 'content_type', 'source_table', 'source_id', 'title', 'content', 'tags',
+                                      'author', 'url', 'source_keyword', 'publish_ts']
+                                     + CONTENT_ENGAGEMENT_COLUMNS + SENTIMENT_COLUMNS + ['last_modify_ts'])
+SOCIAL_COMMENT_COLUMNS: List[str] = (['platform', 'source_table', 'source_id', 'content', 'author', 'publish_ts']
+                                     + COMMENT_ENGAGEMENT_COLUMNS + SENTIMENT_COLUMNS + ['last_modify_ts'])
+
+# 近重复签名列（同步时写入，查询时只用于折叠，不返回给调用方）
+SIGNATURE_COLUMNS: List[str] = ['simhash', 'dup_key'] + [f'simhash_b{i}' for i in range(SIMHASH_BANDS)]
+
+# 投影表上参与话题匹配的字段
+SOCIAL_CONTENT_SEARCH_FIELDS: List[str] = ['title', 'content', 'tags', 'source_keyword']
+SOCIAL_COMMENT_SEARCH_FIELDS: List[str] = ['content']
+
+BUILD_COMMAND = "python -m InsightEngine.utils.social_projection --refresh --full"
+
+# 全部需要同步的源表（内容表在前）
+_ALL_SOURCES = list(SOCIAL_CONTENT_SOURCES) + list(SOCIAL_COMMENT_SOURCES)
+
+_refresh_lock: Optional[asyncio.Lock] = None
+_failures = RefreshFailures()
+
+
+def _date_to_ms(value: Any) -> Optional[int]:
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    if isinstance(value, date):
+        return int(datetime.combine(value, datetime.min.time()).timestamp() * 1000)
+    if isinstance(value, str) and value:
+        try:
+            return int(datetime.fromisoformat(value.strip()).timestamp() * 1000)
+        except ValueError:
+            return None
+    return None
+
+
+def _source_spec(table: str) -> Dict[str, Any]:
+    """源表的同步规格：目标表、需要读取的源列与投影时使用的互动列"""
+    if table in SOCIAL_CONTENT_SOURCES:
+        config = SOCIAL_CONTENT_SOURCES[table]
+        target, columns = SOCIAL_CONTENT_TABLE, SOCIAL_CONTENT_COLUMNS
+        metrics = [] if table == 'daily_news' else CONTENT_ENGAGEMENT_COLUMNS
+        extra = ['source_keyword'] if table != 'daily_news' else []
+    else:
+        config = SOCIAL_COMMENT_SOURCES[table]
+        target, columns, metrics, extra = SOCIAL_COMMENT_TABLE, SOCIAL_COMMENT_COLUMNS, COMMENT_ENGAGEMENT_COLUMNS, []
+    time_cols = [config['time_col']] if config.get('time_col') else ['publish_ts']
+    source_cols = list(dict.fromkeys(['id', 'last_modify_ts'] + list(config['columns'].values()) + extra + metrics + time_cols))
+    return {'config': config, 'target': target, 'columns': columns + SIGNATURE_COLUMNS, 'metrics': metrics,
+            'source_cols': source_cols}
+
+
+def _to_record(table: str, spec: Dict[str, Any], row: Dict[str, Any]) -> Dict[str, Any]:
+    config = spec['config']
+    record: Dict[str, Any] = {col: None for col in spec['columns']}
+    record.update({
+        'platform': config['platform'], 'source_table': table, 'source_id': int(row['id']),
+        'last_modify_ts': int(row.get('last_modify_ts') or 0),
+    })
+    if 'content_type' in record:
+        record['content_type'] = config['content_type']
+        record['source_keyword'] = row.get('source_keyword')
+    for target_col, source_col in config['columns'].items():
+        record[target_col] = row.get(source_col)
+    for col in CONTENT_ENGAGEMENT_COLUMNS:
+        if col in record:
+            record[col] = int(row.get(col) or 0) if col in spec['metrics'] else 0
+    # 发布时间未知时记为 0，保证 (publish_ts, id) 可作为键集分页的排序键
+    if config.get('time_col'):
+        record['publish_ts'] = _date_to_ms(row.get(config['time_col'])) or 0
+    else:
+        record['publish_ts'] = int(row.get('publish_ts') or 0)
+    return record
+
+
+def _signature_text(record: Dict[str, Any]) -> str:
+    return " ".join(str(record[col]) for col in ('title', 'content') if record.get(col))
+
+
+def _time_windows(publish_times: List[int], window_ms: int) -> List[Tuple[int, int]]:
+    """把发布时间聚成若干互不重叠的区间，每个区间向两侧各扩展 window_ms（相距超过 2*window_ms 的时间分属不同区间）"""
+    windows: List[Tuple[int, int]] = []
+    for ts in sorted(set(publish_times)):
+        if windows and ts - window_ms <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], ts + window_ms)
+        else:
+            windows.append((ts - window_ms, ts + window_ms))
+    return windows
+
+
+async def _load_candidates(target: str, records: List[Dict[str, Any]],
+                           signatures: List[int]) -> List[Dict[int, List[Dict[str, Any]]]]:
+    """
+    按段从投影表取出候选签名：只取发布时间在本批记录前后 SIMHASH_CANDIDATE_WINDOW_DAYS 天内的行，
+    每个时间区间、每一段一条查询，走 (simhash_bN, publish_ts) 索引；发布时间未知的记录只与本批内的记录比较
+    """
+    band_maps: List[Dict[int, List[Dict[str, Any]]]] = [{} for _ in range(SIMHASH_BANDS)]
+    window_ms = settings.SIMHASH_CANDIDATE_WINDOW_DAYS * 86400 * 1000
+    dated = [(rec['publish_ts'], sig) for rec, sig in zip(records, signatures) if sig and rec['publish_ts']]
+    for start, end in _time_windows([ts for ts, _ in dated], window_ms):
+        window_sigs = [sig for ts, sig in dated if start <= ts <= end]
+        for i in range(SIMHASH_BANDS):
+            values = sorted({simhash_bands(sig)[i] for sig in window_sigs})
+            rows = await fetch_all(
+                f"SELECT source_table, source_id, simhash, dup_key FROM {_q(target)} "
+                f"WHERE {_q(f'simhash_b{i}')} IN ({', '.join(str(v) for v in values)}) "
+                f"AND {_q('publish_ts')} BETWEEN :start AND :end",
+                {"start": start, "end": end},
+            )
+            for row in rows:
+                band_maps[i].setdefault(simhash_bands(to_unsigned64(int(row['simhash'])))[i], []).append(row)
+    return band_maps
+
+
+async def _assign_signatures(target: str, records: List[Dict[str, Any]]) -> None:
+    """
+    为一批记录计算 SimHash 并分配 dup_key。
+
+    候选签名见 _load_candidates，本批内先处理的记录也作为后续记录的候选；
+    与同一源行（更新时的旧版本）匹配不算重复。
+    """
+    max_distance = settings.SIMHASH_MAX_DISTANCE
+    signatures = [simhash(_signature_text(rec)) for rec in records]
+    band_maps: List[Dict[int, List[Dict[str, Any]]]] = [{} for _ in range(SIMHASH_BANDS)]
+    if max_distance >= 0:
+        band_maps = await _load_candidates(target, records, signatures)
+
+    for rec, sig in zip(records, signatures):
+        bands = simhash_bands(sig)
+        rec['simhash'] = to_signed64(sig)
+        rec.update({f'simhash_b{i}': band for i, band in enumerate(bands)})
+        if not sig:
+            # 空文本不参与折叠：以源行为分组键，保证各自独立
+            rec['dup_key'] = to_signed64(int.from_bytes(
+                hashlib.blake2b(f"{rec['source_table']}:{rec['source_id']}".encode(), digest_size=8).digest(), 'big'))
+            continue
+
+        best = None
+        if max_distance >= 0:
+            for i, band in enumerate(bands):
+                for cand in band_maps[i].get(band, ()):
+                    if cand['source_table'] == rec['source_table'] and int(cand['source_id']) == rec['source_id']:
+                        continue
+                    distance = hamming_distance(sig, to_unsigned64(int(cand['simhash'])))
+                    if distance <= max_distance and (best is None or distance < best[0]):
+                        best = (distance, int(cand['dup_key']))
+        rec['dup_key'] = best[1] if best else rec['simhash']
+        for i, band in enumerate(bands):
+            band_maps[i].setdefault(band, []).append(rec)
+
+
+async def _load_watermarks() -> Dict[str, Dict[str, int]]:
+    return await load_watermarks(WATERMARK_TABLE, _q)
+
+
+async def _refresh_table(table: str, watermark: Optional[Dict[str, int]], full: bool,
+                         deadline: Optional[float] = None) -> int:
+    """增量同步单张源表到对应的投影表，返回本次写入的行数；到达 deadline（time.monotonic）时在批次之间停止"""
+    spec = _source_spec(table)
+    target = spec['target']
+    insert_cols = ", ".join(_q(col) for col in spec['columns'])
+    insert_values = ", ".join(f":{col}" for col in spec['columns'])
+    last_ts, last_id = (0, 0) if full or not watermark else (int(watermark['last_modify_ts'] or 0), int(watermark['last_id'] or 0))
+    # 未追平前沿用上次的追平时间，避免部分同步让陈旧度检查误以为已是最新
+    refreshed_at = 0 if full or not watermark else int(watermark['refreshed_at'] or 0)
+    engine = get_async_engine()
+    total = 0
+
+    if full:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DELETE FROM {_q(target)} WHERE source_table = :tbl"), {"tbl": table})
+
+    caught_up = False
+    while deadline is None or time.monotonic() < deadline:
+        rows = await fetch_batch(table, spec['source_cols'], last_ts, last_id, REFRESH_BATCH_SIZE, _q)
+        if not rows:
+            caught_up = True
+            break
+
+        records = [_to_record(table, spec, row) for row in rows]
+        await _assign_signatures(target, records)
+        last_ts, last_id = int(rows[-1].get('last_modify_ts') or 0), int(rows[-1]['id'])
+        caught_up = len(rows) < REFRESH_BATCH_SIZE
+        if caught_up:
+            refreshed_at = int(time.time())
+
+        # 先删后插实现跨方言的 upsert；与水位线推进处于同一事务
+        async with engine.begin() as conn:
+            id_list = ", ".join(str(rec['source_id']) for rec in records)
+            await conn.execute(
+                text(f"DELETE FROM {_q(target)} WHERE source_table = :tbl AND source_id IN ({id_list})"),
+                {"tbl": table},
+            )
+            await conn.execute(text(f"INSERT INTO {_q(target)} ({insert_cols}) VALUES ({insert_values})"), records)
+            await save_watermark(conn, WATERMARK_TABLE, table, last_ts, last_id, refreshed_at, _q)
+        total += len(records)
+        if caught_up:
+            return total
+
+    if caught_up or not watermark:
+        # 没有新数据也要更新追平时间，陈旧度检查据此判断
+        async with engine.begin() as conn:
+            await save_watermark(conn, WATERMARK_TABLE, table, last_ts, last_id,
+                                 int(time.time()) if caught_up else refreshed_at, _q)
+    else:
+        logger.info(f"{table} 投影同步达到时间上限，已处理 {total} 行，剩余积压留待下次同步")
+    return total
+
+
+async def refresh_social_projection(full: bool = False, tables: Optional[List[str]] = None,
+                                    budget_seconds: Optional[float] = None) -> Dict[str, int]:
+    """
+    刷新 social_content / social_comment 投影表。
+
+    Args:
+        full: True 时清空后全量重建，否则按水位线只处理新增/更新的行
+        tables: 只同步这些源表，默认全部
+        budget_seconds: 本次同步的时间上限（秒），None 表示直到追平
+
+    Returns:
+        每张源表本次写入的行数
+    """
+    global _refresh_lock
+    if _refresh_lock is None:
+        _refresh_lock = asyncio.Lock()
+    deadline = None if budget_seconds is None else time.monotonic() + budget_seconds
+    async with _refresh_lock:
+        watermarks = {} if full else await _load_watermarks()
+        stats: Dict[str, int] = {}
+        for table in tables or _ALL_SOURCES:
+            try:
+                stats[table] = await _refresh_table(table, watermarks.get(table), full, deadline)
+                _failures.clear(table)
+            except Exception as e:
+                logger.warning(f"同步统一投影表失败 {table}: {e}")
+                _failures.record(table)
+                stats[table] = 0
+        logger.info(f"social_content/social_comment 刷新完成: {stats}")
+        return stats
+
+
+async def read_watermarks() -> Dict[str, Dict[str, int]]:
+    """读取各源表的同步水位线（一次小查询）；同一次工具调用中可传给 source_versions 与 ensure_fresh 复用"""
+    return await _load_watermarks()
+
+
+def _pending_refresh(watermarks: Dict[str, Dict[str, int]], max_staleness: int) -> List[str]:
+    """超过陈旧上限、查询时需要就地同步的源表（失败退避中的除外；未开启就地同步时为空）"""
+    if settings.SOCIAL_PROJECTION_INLINE_REFRESH_SECONDS <= 0:
+        return []
+    return [table for table in stale_tables(watermarks, _ALL_SOURCES, max_staleness)
+            if not _failures.backing_off(table, max_staleness)]
+
+
+async def ensure_fresh(max_staleness: Optional[int] = None,
+                       watermarks: Optional[Dict[str, Dict[str, int]]] = None) -> None:
+    """
+    查询前检查陈旧度，超过上限的源表在 SOCIAL_PROJECTION_INLINE_REFRESH_SECONDS 内就地增量同步
+
+    投影表从未构建时抛出 WatermarkNotBuilt（调用方回退到逐表查询）；同步失败的源表在一个陈旧周期内不再重试。
+    watermarks 为调用方已读取的水位线（read_watermarks），未提供时在此读取。
+    """
+    max_staleness = settings.SOCIAL_PROJECTION_MAX_STALENESS_SECONDS if max_staleness is None else max_staleness
+    watermarks = await _load_watermarks() if watermarks is None else watermarks
+    require_built(watermarks, _ALL_SOURCES, BUILD_COMMAND)
+    stale = _pending_refresh(watermarks, max_staleness)
+    if stale:
+        await refresh_social_projection(tables=stale, budget_seconds=settings.SOCIAL_PROJECTION_INLINE_REFRESH_SECONDS)
+
+
+def source_versions(watermarks: Dict[str, Dict[str, int]], max_staleness: Optional[int] = None) -> Optional[Dict[str, int]]:
+    """
+    由已读取的水位线得到各源表已同步到的 last_modify_ts，用作查询结果缓存的数据版本（不触发同步）
+
+    投影表从未构建时抛出 WatermarkNotBuilt；有源表需要就地同步时返回 None（见 query_cache.source_versions）。
+    """
+    max_staleness = settings.SOCIAL_PROJECTION_MAX_STALENESS_SECONDS if max_staleness is None else max_staleness
+    require_built(watermarks, _ALL_SOURCES, BUILD_COMMAND)
+    return query_cache.source_versions(watermarks, _pending_refresh(watermarks, max_staleness))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InsightEngine 跨平台统一投影表工具")
+    parser.add_argument("--refresh", action="store_true", help="按水位线增量同步 social_content / social_comment（不限时，直到追平）")
+    parser.add_argument("--full", action="store_true", help="与 --refresh 一起使用：清空后全量重建（首次构建必须执行）")
+    args = parser.parse_args()
+
+    if args.refresh:
+        asyncio.run(refresh_social_projection(full=args.full))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+按 (last_modify_ts, id) 复合水位线增量同步源表的公共部分
+
+content_hotness（hotness.py）与 social_content / social_comment（social_projection.py）共用：
+
+- fetch_batch:   取水位线之后的一批源表行。谓词是直接作用于 last_modify_ts 列的行值比较，
+                 可走 (last_modify_ts, id) 索引做范围扫描，无需排序；
+                 该索引与 last_modify_ts 的 NOT NULL DEFAULT 0 回填由 MindSpider/schema/migrate_engagement_columns.py 完成
+- load_watermarks / save_watermark: 读写水位线表 (source_table, last_modify_ts, last_id, refreshed_at)；
+                 refreshed_at 只在某表追平源表时更新，因此陈旧度检查反映的是真正追平的时间
+- require_built: 汇总表/投影表从未构建时抛出 WatermarkNotBuilt，首次构建必须通过命令行 --refresh --full 完成，
+                 而不是在用户查询中就地全量构建
+- RefreshFailures: 刷新失败的源表在退避期内不再于查询路径上重试，避免每次查询都重跑同一段积压
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+
+from .db import fetch_all
+
+__all__ = [
+    "WatermarkNotBuilt",
+    "RefreshFailures",
+    "fetch_batch",
+    "load_watermarks",
+    "save_watermark",
+    "require_built",
+    "stale_tables",
+]
+
+
+class WatermarkNotBuilt(RuntimeError):
+    """汇总表/投影表尚未完成首次全量构建"""
+
+
+class RefreshFailures:
+    """记录各源表最近一次刷新失败的时间，用于查询路径上的失败退避"""
+
+    def __init__(self):
+        self._failed_at: Dict[str, float] = {}
+
+    def record(self, table: str) -> None:
+        self._failed_at[table] = time.time()
+
+    def clear(self, table: str) -> None:
+        self._failed_at.pop(table, None)
+
+    def backing_off(self, table: str, backoff_seconds: float) -> bool:
+        failed_at = self._failed_at.get(table)
+        return failed_at is not None and time.time() - failed_at < backoff_seconds
+
+
+async def fetch_batch(table: str, columns: List[str], last_ts: int, last_id: int, batch_size: int,
+                      quote: Callable[[str], str]) -> List[Dict[str, Any]]:
+    """按 (last_modify_ts, id) 升序取水位线 (last_ts, last_id) 之后的至多 batch_size 行"""
+    ts_col, id_col = quote('last_modify_ts'), quote('id')
+    return await fetch_all(
+        f"SELECT {', '.join(quote(col) for col in columns)} FROM {quote(table)} "
+        f"WHERE ({ts_col}, {id_col}) > (:ts, :last_id) "
+        f"ORDER BY {ts_col}, {id_col} LIMIT :batch",
+        {"ts": last_ts, "last_id": last_id, "batch": batch_size},
+    )
+
+
+async def load_watermarks(watermark_table: str, quote: Callable[[str], str]) -> Dict[str, Dict[str, int]]:
+    rows = await fetch_all(f"SELECT source_table, last_modify_ts, last_id, refreshed_at FROM {quote(watermark_table)}")
+    return {row['source_table']: row for row in rows}
+
+
+async def save_watermark(conn, watermark_table: str, table: str, last_ts: int, last_id: int, refreshed_at: int,
+                         quote: Callable[[str], str]) -> None:
+    await conn.execute(text(f"DELETE FROM {quote(watermark_table)} WHERE source_table = :tbl"), {"tbl": table})
+    await conn.execute(
+        text(f"INSERT INTO {quote(watermark_table)} (source_table, last_modify_ts, last_id, refreshed_at) "
+             "VALUES (:tbl, :ts, :last_id, :refreshed_at)"),
+        {"tbl": table, "ts": last_ts, "last_id": last_id, "refreshed_at": refreshed_at},
+    )
+
+
+def require_built(watermarks: Dict[str, Dict[str, int]], tables: Iterable[str], command: str) -> None:
+    """任一源表没有水位线（从未构建）时抛出 WatermarkNotBuilt"""
+    missing = [table for table in tables if table not in watermarks]
+    if missing:
+        raise WatermarkNotBuilt(f"{', '.join(missing)} 尚未构建，请先执行一次: {command}")
+
+
+def stale_tables(watermarks: Dict[str, Dict[str, int]], tables: Iterable[str], max_staleness: int,
+                 now: Optional[int] = None) -> List[str]:
+    """最近一次追平时间早于陈旧上限的源表"""
+    now = int(time.time()) if now is None else now
+    return [table for table in tables
+            if now - int((watermarks.get(table) or {}).get('refreshed_at') or 0) > max_staleness]
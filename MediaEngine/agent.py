@@ -6,10 +6,12 @@ Deep Search Agent主类
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 from loguru import logger
-from .llms import LLMClient
+from .llms import LLMClient, AsyncLLMClient
+from .llms.base import ENGINE_NAME
 from .nodes import (
     ReportStructureNode,
     FirstSearchNode, 
@@ -37,6 +39,7 @@ class DeepSearchAgent:
         
         # 初始化LLM客户端
         self.llm_client = self._initialize_llm()
+        self.async_llm_client = self._initialize_async_llm()
         
         # 初始化搜索工具集
         self.search_agency = BochaMultimodalSearch(api_key=(self.config.BOCHA_API_KEY or self.config.BOCHA_WEB_SEARCH_API_KEY))
@@ -57,17 +60,35 @@ class DeepSearchAgent:
     def _initialize_llm(self) -> LLMClient:
         """初始化LLM客户端"""
         return LLMClient(
+            ENGINE_NAME,
             api_key=(self.config.MEDIA_ENGINE_API_KEY or self.config.MINDSPIDER_API_KEY),
             model_name=(self.config.MEDIA_ENGINE_MODEL_NAME or self.config.MINDSPIDER_MODEL_NAME),
             base_url=(self.config.MEDIA_ENGINE_BASE_URL or self.config.MINDSPIDER_BASE_URL),
+            max_concurrency=self.config.MEDIA_ENGINE_LLM_MAX_CONCURRENCY,
+            requests_per_second=self.config.MEDIA_ENGINE_LLM_REQUESTS_PER_SECOND,
+        )
+    
+    def _initialize_async_llm(self) -> AsyncLLMClient:
+        """初始化异步LLM客户端（段落总结节点经由它在共享事件循环上并发等待LLM调用）"""
+        return AsyncLLMClient(
+            ENGINE_NAME,
+            api_key=(self.config.MEDIA_ENGINE_API_KEY or self.config.MINDSPIDER_API_KEY),
+            model_name=(self.config.MEDIA_ENGINE_MODEL_NAME or self.config.MINDSPIDER_MODEL_NAME),
+            base_url=(self.config.MEDIA_ENGINE_BASE_URL or self.config.MINDSPIDER_BASE_URL),
+            max_concurrency=self.config.MEDIA_ENGINE_LLM_MAX_CONCURRENCY,
+            requests_per_second=self.config.MEDIA_ENGINE_LLM_REQUESTS_PER_SECOND,
+            max_connections=self.config.LLM_MAX_CONNECTIONS,
+            timeout=self.llm_client.timeout,
         )
     
     def _initialize_nodes(self):
         """初始化处理节点"""
         self.first_search_node = FirstSearchNode(self.llm_client)
         self.reflection_node = ReflectionNode(self.llm_client)
-        self.first_summary_node = FirstSummaryNode(self.llm_client)
-        self.reflection_summary_node = ReflectionSummaryNode(self.llm_client)
+        # 总结节点的调用最长，经异步客户端执行：各段落工作线程的请求在同一事件循环上并发等待、共用连接池
+        summary_llm_client = self.async_llm_client.blocking()
+        self.first_summary_node = FirstSummaryNode(summary_llm_client, self.config.SUMMARY_PROMPT_TOKEN_BUDGET)
+        self.reflection_summary_node = ReflectionSummaryNode(summary_llm_client, self.config.SUMMARY_PROMPT_TOKEN_BUDGET)
         self.report_formatting_node = ReportFormattingNode(self.llm_client)
     
     def _validate_date_format(self, date_str: str) -> bool:
@@ -161,6 +182,7 @@ class DeepSearchAgent:
             
             logger.info(f"\n{'='*60}")
             logger.info("深度研究完成！")
+            logger.info(f"LLM调用统计: {self.llm_client.get_metrics()}")
             logger.info(f"{'='*60}")
             
             return final_report
@@ -186,25 +208,48 @@ class DeepSearchAgent:
             _message += f"\n  {i}. {paragraph.title}"
         logger.info(_message)
     
-    def _process_paragraphs(self):
-        """处理所有段落"""
+    def _process_paragraphs(self, on_paragraph_done: Optional[Callable[[int, int], None]] = None):
+        """
+        处理所有段落
+        
+        段落之间在生成最终报告前互不依赖，按 PARAGRAPH_CONCURRENCY 并发研究；每个段落只写 State 中
+        自己下标处的数据，报告顺序与结构保持一致。LLM 请求数另由 LLM 客户端的并发上限约束。
+        
+        Args:
+            on_paragraph_done: 可选回调 (已完成段落数, 段落总数)，在调用线程中执行，用于更新进度
+        """
         total_paragraphs = len(self.state.paragraphs)
+        workers = max(1, min(self.config.PARAGRAPH_CONCURRENCY, total_paragraphs))
+        if workers > 1:
+            logger.info(f"\n[步骤 2] 并行处理 {total_paragraphs} 个段落（并发数 {workers}）")
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="paragraph") as executor:
+            futures = [executor.submit(self._process_paragraph, i) for i in range(total_paragraphs)]
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    future.result()
+                    logger.info(f"段落处理完成 ({done / total_paragraphs * 100:.1f}%)")
+                    if on_paragraph_done:
+                        on_paragraph_done(done, total_paragraphs)
+            except BaseException:
+                # 任一段落失败时不再启动排队中的段落
+                for future in futures:
+                    future.cancel()
+                raise
+    
+    def _process_paragraph(self, paragraph_index: int):
+        """研究单个段落：初始搜索与总结、反思循环"""
+        logger.info(f"\n[步骤 2.{paragraph_index + 1}] 处理段落: {self.state.paragraphs[paragraph_index].title}")
+        logger.info("-" * 50)
         
-        for i in range(total_paragraphs):
-            logger.info(f"\n[步骤 2.{i+1}] 处理段落: {self.state.paragraphs[i].title}")
-            logger.info("-" * 50)
-            
-            # 初始搜索和总结
-            self._initial_search_and_summary(i)
-            
-            # 反思循环
-            self._reflection_loop(i)
-            
-            # 标记段落完成
-            self.state.paragraphs[i].research.mark_completed()
-            
-            progress = (i + 1) / total_paragraphs * 100
-            logger.info(f"段落处理完成 ({progress:.1f}%)")
+        # 初始搜索和总结
+        self._initial_search_and_summary(paragraph_index)
+        
+        # 反思循环
+        self._reflection_loop(paragraph_index)
+        
+        # 标记段落完成
+        self.state.paragraphs[paragraph_index].research.mark_completed()
     
     def _initial_search_and_summary(self, paragraph_index: int):
         """执行初始搜索和总结"""
@@ -15,7 +15,8 @@ from ..utils.text_processing import (
     remove_reasoning_from_output,
     clean_json_tags,
     extract_clean_response,
-    fix_incomplete_json
+    fix_incomplete_json,
+    is_valid_json_output
 )
 
 
@@ -52,7 +53,12 @@ class ReportStructureNode(StateMutationNode):
             logger.info(f"正在为查询生成报告结构: {self.query}")
             
             # 调用LLM
-            response = self.llm_client.stream_invoke_to_string(SYSTEM_PROMPT_REPORT_STRUCTURE, self.query)
+            response = self.llm_client.stream_invoke_to_string(
+                SYSTEM_PROMPT_REPORT_STRUCTURE,
+                self.query,
+                cache_node=self.node_name,
+                validate=lambda output: is_valid_json_output(output, ["title", "content"], allow_list=True),
+            )
             
             # 处理响应
             processed_response = self.process_output(response)
@@ -37,14 +37,19 @@ class Settings(BaseSettings):
     MEDIA_ENGINE_API_KEY: str = Field(None, description="Media Agent（推荐Gemini，这里我用了一个中转厂商，你也可以换成你自己的，申请地址：https://www.chataiapi.com/）API密钥")
     MEDIA_ENGINE_BASE_URL: Optional[str] = Field("https://www.chataiapi.com/v1", description="Media Agent LLM接口BaseUrl")
     MEDIA_ENGINE_MODEL_NAME: str = Field("gemini-2.5-pro", description="Media Agent LLM模型名称，如gemini-2.5-pro")
+    MEDIA_ENGINE_LLM_MAX_CONCURRENCY: int = Field(4, description="Media Agent LLM同时进行的请求数上限（并行研究段落时限流，同一BaseUrl的同步与异步请求共享，0表示不限）")
+    MEDIA_ENGINE_LLM_REQUESTS_PER_SECOND: float = Field(0.0, description="Media Agent LLM每秒请求数上限（同一BaseUrl的同步与异步请求共享令牌桶，0表示不限）")
+    LLM_MAX_CONNECTIONS: int = Field(100, description="异步LLM客户端共享HTTP连接池的最大连接数")
     
     BOCHA_WEB_SEARCH_API_KEY: Optional[str] = Field(None, description="Bocha Web Search API Key")
     BOCHA_API_KEY: Optional[str] = Field(None, description="Bocha 兼容键（别名）")
     
     SEARCH_TIMEOUT: int = Field(240, description="搜索超时（秒）")
     SEARCH_CONTENT_MAX_LENGTH: int = Field(20000, description="用于提示的最长内容长度")
+    SUMMARY_PROMPT_TOKEN_BUDGET: int = Field(32000, description="总结节点提示词的token预算，超出时按与查询的相关度保留搜索结果（0表示不限）")
     MAX_REFLECTIONS: int = Field(2, description="最大反思轮数")
     MAX_PARAGRAPHS: int = Field(5, description="最大段落数")
+    PARAGRAPH_CONCURRENCY: int = Field(5, description="同时研究的段落数（段落之间互不依赖，1表示逐个处理）")
     
     MINDSPIDER_API_KEY: Optional[str] = Field(None, description="MindSpider API密钥")
     MINDSPIDER_BASE_URL: Optional[str] = Field("https://api.deepseek.com", description="MindSpider LLM接口BaseUrl")
@@ -261,6 +261,35 @@ def validate_json_schema(data: Dict[str, Any], required_fields: List[str]) -> bo
     return all(field in data for field in required_fields)
 
 
+def is_valid_json_output(text: str, required_fields: List[str], allow_list: bool = False) -> bool:
+    """
+    判断LLM输出清理后能否解析为JSON且包含非空的必需字段
+    
+    用作 LLMClient.stream_invoke_to_string 的 validate 参数：只有节点能正确解析的响应才写入LLM缓存。
+    
+    Args:
+        text: LLM原始输出
+        required_fields: 必需字段列表
+        allow_list: 是否接受顶层为列表（如报告结构），此时至少一个元素满足即可
+        
+    Returns:
+        是否可解析
+    """
+    cleaned_text = clean_json_tags(remove_reasoning_from_output(text))
+    try:
+        result = json.loads(cleaned_text)
+    except JSONDecodeError:
+        fixed_json = fix_incomplete_json(cleaned_text)
+        if not fixed_json:
+            return False
+        try:
+            result = json.loads(fixed_json)
+        except JSONDecodeError:
+            return False
+    items = result if allow_list and isinstance(result, list) else [result]
+    return any(isinstance(item, dict) and all(item.get(field) for field in required_fields) for item in items)
+
+
 def truncate_content(content: str, max_length: int = 20000) -> str:
     """
     截断内容到指定长度
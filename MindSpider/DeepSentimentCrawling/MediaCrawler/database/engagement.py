@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# @Desc    : 互动指标与发布时间的入库归一化
+#
+# 各平台原始表中的点赞/评论/分享等计数大多以文本存储（如 "1.2万"），发布时间则分别是
+# 秒级时间戳、毫秒级时间戳、日期字符串或秒级时间戳字符串。查询侧每次都要 CAST 并按
+# time_type 分支处理，无法利用索引。
+#
+# 本模块在入库时把它们统一写入带类型的列：
+#   likes_num / comments_num / shares_num / views_num / favorites_num / coins_num / danmaku_num (BIGINT)
+#   publish_ts (BIGINT, 毫秒级时间戳)
+# ORM 模型通过 before_insert / before_update 事件调用 apply_normalized_columns 完成归一化；
+# 不经过 ORM 实体的 Core update() 不会触发事件，需用 normalized_update_values 把归一化列并入 SET 子句。
+# 存量数据由 MindSpider/schema/migrate_engagement_columns.py 回填。
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+# 内容表与评论表各自携带的归一化列
+CONTENT_NUMERIC_COLUMNS = ["likes_num", "comments_num", "shares_num", "views_num",
+                           "favorites_num", "coins_num", "danmaku_num"]
+COMMENT_NUMERIC_COLUMNS = ["likes_num", "comments_num"]
+
+# 表名 -> {归一化列: 原始列}，以及发布时间的原始列（按优先级）
+NORMALIZED_SOURCES: Dict[str, Dict[str, Any]] = {
+    "bilibili_video": {
+        "numeric": {"likes_num": "liked_count", "comments_num": "video_comment", "shares_num": "video_share_count",
+                    "views_num": "video_play_count", "favorites_num": "video_favorite_count",
+                    "coins_num": "video_coin_count", "danmaku_num": "video_danmaku"},
+        "time_cols": ["create_time"],
+    },
+    "bilibili_video_comment": {
+        "numeric": {"likes_num": "like_count", "comments_num": "sub_comment_count"},
+        "time_cols": ["create_time"],
+    },
+    "douyin_aweme": {
+        "numeric": {"likes_num": "liked_count", "comments_num": "comment_count", "shares_num": "share_count",
+                    "favorites_num": "collected_count"},
+        "time_cols": ["create_time"],
+    },
+    "douyin_aweme_comment": {
+        "numeric": {"likes_num": "like_count", "comments_num": "sub_comment_count"},
+        "time_cols": ["create_time"],
+    },
+    "kuaishou_video": {
+        "numeric": {"likes_num": "liked_count", "views_num": "viewd_count"},
+        "time_cols": ["create_time"],
+    },
+    "kuaishou_video_comment": {
+        "numeric": {"comments_num": "sub_comment_count"},
+        "time_cols": ["create_time"],
+    },
+    "weibo_note": {
+        "numeric": {"likes_num": "liked_count", "comments_num": "comments_count", "shares_num": "shared_count"},
+        "time_cols": ["create_time", "create_date_time"],
+    },
+    "weibo_note_comment": {
+        "numeric": {"likes_num": "comment_like_count", "comments_num": "sub_comment_count"},
+        "time_cols": ["create_time", "create_date_time"],
+    },
+    "xhs_note": {
+        "numeric": {"likes_num": "liked_count", "comments_num": "comment_count", "shares_num": "share_count",
+                    "favorites_num": "collected_count"},
+        "time_cols": ["time"],
+    },
+    "xhs_note_comment": {
+        "numeric": {"likes_num": "like_count", "comments_num": "sub_comment_count"},
+        "time_cols": ["create_time"],
+    },
+    "tieba_note": {
+        "numeric": {"comments_num": "total_replay_num"},
+        "time_cols": ["publish_time"],
+    },
+    "tieba_comment": {
+        "numeric": {"comments_num": "sub_comment_count"},
+        "time_cols": ["publish_time"],
+    },
+    "zhihu_content": {
+        "numeric": {"likes_num": "voteup_count", "comments_num": "comment_count"},
+        "time_cols": ["created_time"],
+    },
+    "zhihu_comment": {
+        "numeric": {"likes_num": "like_count", "comments_num": "sub_comment_count"},
+        "time_cols": ["publish_time"],
+    },
+}
+
+_UNIT_MULTIPLIERS = {"万": 10_000, "w": 10_000, "W": 10_000, "亿": 100_000_000}
+
+
+def parse_count(value: Any) -> int:
+    """
+    将互动计数转换为整数，兼容 "1.2万"、"3w"、"1,024"、"100+" 等写法
+    Args:
+        value: 原始计数
+
+    Returns:
+        整数计数，无法解析时为 0
+    """
+    if value is None or isinstance(value, bool):
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    raw = str(value).strip().replace(",", "").rstrip("+")
+    if not raw:
+        return 0
+    multiplier = 1
+    if raw[-1] in _UNIT_MULTIPLIERS:
+        multiplier, raw = _UNIT_MULTIPLIERS[raw[-1]], raw[:-1]
+    try:
+        return int(float(raw) * multiplier)
+    except ValueError:
+        return 0
+
+
+def to_epoch_ms(value: Any) -> Optional[int]:
+    """
+    将秒/毫秒时间戳（数值或字符串）、日期时间字符串、date/datetime 统一为毫秒级时间戳
+    Args:
+        value: 原始时间
+
+    Returns:
+        毫秒级时间戳，无法解析时为 None
+    """
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, datetime):
+            return int(value.timestamp() * 1000)
+        if isinstance(value, date):
+            return int(datetime.combine(value, datetime.min.time()).timestamp() * 1000)
+        text = str(value).strip()
+        if isinstance(value, (int, float)) or text.isdigit():
+            val = float(text)
+            return int(val if val > 1_000_000_000_000 else val * 1000)
+        return int(datetime.fromisoformat(text.split("+")[0].strip()).timestamp() * 1000)
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+
+
+def normalized_values(table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    根据原始列计算某行的归一化列取值
+    Args:
+        table: 表名
+        row: 原始列字典
+
+    Returns:
+        {归一化列: 值}，未知表返回空字典
+    """
+    config = NORMALIZED_SOURCES.get(table)
+    if not config:
+        return {}
+    values: Dict[str, Any] = {col: parse_count(row.get(src)) for col, src in config["numeric"].items()}
+    values["publish_ts"] = next(
+        (ts for ts in (to_epoch_ms(row.get(col)) for col in config["time_cols"]) if ts is not None), None
+    )
+    return values
+
+
+def normalized_update_values(table: str, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    计算 Core update() 的 SET 值中可由原始列推出的归一化列
+    只更新了部分原始列时，其余归一化列保持数据库中的原值（而不是被置为 0/NULL）
+    Args:
+        table: 表名
+        values: update().values() 的取值
+
+    Returns:
+        {归一化列: 值}
+    """
+    config = NORMALIZED_SOURCES.get(table)
+    if not config:
+        return {}
+    result: Dict[str, Any] = {col: parse_count(values[src])
+                              for col, src in config["numeric"].items() if src in values}
+    present_time_cols = [col for col in config["time_cols"] if col in values]
+    if present_time_cols:
+        publish_ts = next((ts for ts in (to_epoch_ms(values[col]) for col in present_time_cols) if ts is not None), None)
+        if publish_ts is not None:
+            result["publish_ts"] = publish_ts
+    return result
+
+
+def apply_normalized_columns(mapper, connection, target) -> None:
+    """ORM before_insert / before_update 事件回调：把归一化结果写回实体"""
+    table = getattr(target, "__tablename__", None)
+    config = NORMALIZED_SOURCES.get(table)
+    if not config:
+        return
+    source_cols: List[str] = list(config["numeric"].values()) + config["time_cols"]
+    row = {col: getattr(target, col, None) for col in source_cols}
+    for col, value in normalized_values(table, row).items():
+        setattr(target, col, value)
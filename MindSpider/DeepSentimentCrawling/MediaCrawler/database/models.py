@@ -1,10 +1,32 @@
-from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger
+from sqlalchemy import create_engine, Column, Integer, Text, String, BigInteger, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from .engagement import apply_normalized_columns
+
 Base = declarative_base()
 
-class BilibiliVideo(Base):
+
+class ContentEngagementMixin:
+    """内容表的归一化互动指标与统一发布时间（毫秒），由 before_insert/before_update 事件填充"""
+    likes_num = Column(BigInteger, default=0, index=True)
+    comments_num = Column(BigInteger, default=0)
+    shares_num = Column(BigInteger, default=0)
+    views_num = Column(BigInteger, default=0)
+    favorites_num = Column(BigInteger, default=0)
+    coins_num = Column(BigInteger, default=0)
+    danmaku_num = Column(BigInteger, default=0)
+    publish_ts = Column(BigInteger, index=True)
+
+
+class CommentEngagementMixin:
+    """评论表的归一化互动指标与统一发布时间（毫秒），由 before_insert/before_update 事件填充"""
+    likes_num = Column(BigInteger, default=0, index=True)
+    comments_num = Column(BigInteger, default=0)
+    publish_ts = Column(BigInteger, index=True)
+
+
+class BilibiliVideo(ContentEngagementMixin, Base):
     __tablename__ = 'bilibili_video'
     id = Column(Integer, primary_key=True)
     video_id = Column(BigInteger, nullable=False, index=True, unique=True)
@@ -29,7 +51,7 @@ class BilibiliVideo(Base):
     video_cover_url = Column(Text)
     source_keyword = Column(Text, default='')
 
-class BilibiliVideoComment(Base):
+class BilibiliVideoComment(CommentEngagementMixin, Base):
     __tablename__ = 'bilibili_video_comment'
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
@@ -91,7 +113,7 @@ class BilibiliUpDynamic(Base):
     add_ts = Column(BigInteger)
     last_modify_ts = Column(BigInteger)
 
-class DouyinAweme(Base):
+class DouyinAweme(ContentEngagementMixin, Base):
     __tablename__ = 'douyin_aweme'
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
@@ -120,7 +142,7 @@ class DouyinAweme(Base):
     note_download_url = Column(Text)
     source_keyword = Column(Text, default='')
 
-class DouyinAwemeComment(Base):
+class DouyinAwemeComment(CommentEngagementMixin, Base):
     __tablename__ = 'douyin_aweme_comment'
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
@@ -158,7 +180,7 @@ class DyCreator(Base):
     interaction = Column(Text)
     videos_count = Column(String(255))
 
-class KuaishouVideo(Base):
+class KuaishouVideo(ContentEngagementMixin, Base):
     __tablename__ = 'kuaishou_video'
     id = Column(Integer, primary_key=True)
     user_id = Column(String(64))
@@ -178,7 +200,7 @@ class KuaishouVideo(Base):
     video_play_url = Column(Text)
     source_keyword = Column(Text, default='')
 
-class KuaishouVideoComment(Base):
+class KuaishouVideoComment(CommentEngagementMixin, Base):
     __tablename__ = 'kuaishou_video_comment'
     id = Column(Integer, primary_key=True)
     user_id = Column(Text)
@@ -192,7 +214,7 @@ class KuaishouVideoComment(Base):
     create_time = Column(BigInteger)
     sub_comment_count = Column(Text)
 
-class WeiboNote(Base):
+class WeiboNote(ContentEngagementMixin, Base):
     __tablename__ = 'weibo_note'
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
@@ -213,7 +235,7 @@ class WeiboNote(Base):
     note_url = Column(Text)
     source_keyword = Column(Text, default='')
 
-class WeiboNoteComment(Base):
+class WeiboNoteComment(CommentEngagementMixin, Base):
     __tablename__ = 'weibo_note_comment'
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
@@ -264,7 +286,7 @@ class XhsCreator(Base):
     interaction = Column(Text)
     tag_list = Column(Text)
 
-class XhsNote(Base):
+class XhsNote(ContentEngagementMixin, Base):
     __tablename__ = 'xhs_note'
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
@@ -290,7 +312,7 @@ class XhsNote(Base):
     source_keyword = Column(Text, default='')
     xsec_token = Column(Text)
 
-class XhsNoteComment(Base):
+class XhsNoteComment(CommentEngagementMixin, Base):
     __tablename__ = 'xhs_note_comment'
     id = Column(Integer, primary_key=True)
     user_id = Column(String(255))
@@ -308,7 +330,7 @@ class XhsNoteComment(Base):
     parent_comment_id = Column(String(255))
     like_count = Column(Text)
 
-class TiebaNote(Base):
+class TiebaNote(ContentEngagementMixin, Base):
     __tablename__ = 'tieba_note'
     id = Column(Integer, primary_key=True)
     note_id = Column(String(644), index=True)
@@ -329,7 +351,7 @@ class TiebaNote(Base):
     last_modify_ts = Column(BigInteger)
     source_keyword = Column(Text, default='')
 
-class TiebaComment(Base):
+class TiebaComment(CommentEngagementMixin, Base):
     __tablename__ = 'tieba_comment'
     id = Column(Integer, primary_key=True)
     comment_id = Column(String(255), index=True)
@@ -364,7 +386,7 @@ class TiebaCreator(Base):
     fans = Column(Text)
     registration_duration = Column(Text)
 
-class ZhihuContent(Base):
+class ZhihuContent(ContentEngagementMixin, Base):
     __tablename__ = 'zhihu_content'
     id = Column(Integer, primary_key=True)
     content_id = Column(String(64), index=True)
@@ -392,7 +414,7 @@ class ZhihuContent(Base):
     # 副作用：无
     # 回滚策略：还原此行
 
-class ZhihuComment(Base):
+class ZhihuComment(CommentEngagementMixin, Base):
     __tablename__ = 'zhihu_comment'
     id = Column(Integer, primary_key=True)
     comment_id = Column(String(64), index=True)
@@ -431,4 +453,10 @@ class ZhihuCreator(Base):
     column_count = Column(Integer, default=0)
     get_voteup_count = Column(Integer, default=0)
     add_ts = Column(BigInteger)
-    last_modify_ts = Column(BigInteger)
\ No newline at end of file
+    last_modify_ts = Column(BigInteger)
+
+
+# 入库时统一归一化互动指标与发布时间
+for _mixin in (ContentEngagementMixin, CommentEngagementMixin):
+    event.listen(_mixin, "before_insert", apply_normalized_columns, propagate=True)
+    event.listen(_mixin, "before_update", apply_normalized_columns, propagate=True)
@@ -588,3 +588,126 @@ alter table douyin_aweme_comment add column `like_count` varchar(255) NOT NULL D
 alter table xhs_note add column xsec_token varchar(50) default null comment '签名算法';
 alter table douyin_aweme_comment add column `pictures` varchar(500) NOT NULL DEFAULT '' COMMENT '评论图片列表';
 alter table bilibili_video_comment add column `like_count` varchar(255) NOT NULL DEFAULT '0' COMMENT '点赞数';
+
+
+-- 归一化互动指标列（BIGINT）与统一发布时间 publish_ts（毫秒），入库时由 ORM 事件填充
+-- 存量数据回填：python MindSpider/schema/migrate_engagement_columns.py
+alter table bilibili_video
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `shares_num` bigint DEFAULT 0 COMMENT '分享/转发数(归一化)',
+    add column `views_num` bigint DEFAULT 0 COMMENT '播放/浏览数(归一化)',
+    add column `favorites_num` bigint DEFAULT 0 COMMENT '收藏数(归一化)',
+    add column `coins_num` bigint DEFAULT 0 COMMENT '投币数(归一化)',
+    add column `danmaku_num` bigint DEFAULT 0 COMMENT '弹幕数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_bilibili_video_likes_num` (`likes_num`),
+    add index `ix_bilibili_video_publish_ts` (`publish_ts`);
+alter table bilibili_video_comment
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_bilibili_video_comment_likes_num` (`likes_num`),
+    add index `ix_bilibili_video_comment_publish_ts` (`publish_ts`);
+alter table douyin_aweme
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `shares_num` bigint DEFAULT 0 COMMENT '分享/转发数(归一化)',
+    add column `views_num` bigint DEFAULT 0 COMMENT '播放/浏览数(归一化)',
+    add column `favorites_num` bigint DEFAULT 0 COMMENT '收藏数(归一化)',
+    add column `coins_num` bigint DEFAULT 0 COMMENT '投币数(归一化)',
+    add column `danmaku_num` bigint DEFAULT 0 COMMENT '弹幕数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_douyin_aweme_likes_num` (`likes_num`),
+    add index `ix_douyin_aweme_publish_ts` (`publish_ts`);
+alter table douyin_aweme_comment
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_douyin_aweme_comment_likes_num` (`likes_num`),
+    add index `ix_douyin_aweme_comment_publish_ts` (`publish_ts`);
+alter table kuaishou_video
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `shares_num` bigint DEFAULT 0 COMMENT '分享/转发数(归一化)',
+    add column `views_num` bigint DEFAULT 0 COMMENT '播放/浏览数(归一化)',
+    add column `favorites_num` bigint DEFAULT 0 COMMENT '收藏数(归一化)',
+    add column `coins_num` bigint DEFAULT 0 COMMENT '投币数(归一化)',
+    add column `danmaku_num` bigint DEFAULT 0 COMMENT '弹幕数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_kuaishou_video_likes_num` (`likes_num`),
+    add index `ix_kuaishou_video_publish_ts` (`publish_ts`);
+alter table kuaishou_video_comment
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_kuaishou_video_comment_likes_num` (`likes_num`),
+    add index `ix_kuaishou_video_comment_publish_ts` (`publish_ts`);
+alter table weibo_note
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `shares_num` bigint DEFAULT 0 COMMENT '分享/转发数(归一化)',
+    add column `views_num` bigint DEFAULT 0 COMMENT '播放/浏览数(归一化)',
+    add column `favorites_num` bigint DEFAULT 0 COMMENT '收藏数(归一化)',
+    add column `coins_num` bigint DEFAULT 0 COMMENT '投币数(归一化)',
+    add column `danmaku_num` bigint DEFAULT 0 COMMENT '弹幕数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_weibo_note_likes_num` (`likes_num`),
+    add index `ix_weibo_note_publish_ts` (`publish_ts`);
+alter table weibo_note_comment
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_weibo_note_comment_likes_num` (`likes_num`),
+    add index `ix_weibo_note_comment_publish_ts` (`publish_ts`);
+alter table xhs_note
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `shares_num` bigint DEFAULT 0 COMMENT '分享/转发数(归一化)',
+    add column `views_num` bigint DEFAULT 0 COMMENT '播放/浏览数(归一化)',
+    add column `favorites_num` bigint DEFAULT 0 COMMENT '收藏数(归一化)',
+    add column `coins_num` bigint DEFAULT 0 COMMENT '投币数(归一化)',
+    add column `danmaku_num` bigint DEFAULT 0 COMMENT '弹幕数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_xhs_note_likes_num` (`likes_num`),
+    add index `ix_xhs_note_publish_ts` (`publish_ts`);
+alter table xhs_note_comment
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_xhs_note_comment_likes_num` (`likes_num`),
+    add index `ix_xhs_note_comment_publish_ts` (`publish_ts`);
+alter table tieba_note
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `shares_num` bigint DEFAULT 0 COMMENT '分享/转发数(归一化)',
+    add column `views_num` bigint DEFAULT 0 COMMENT '播放/浏览数(归一化)',
+    add column `favorites_num` bigint DEFAULT 0 COMMENT '收藏数(归一化)',
+    add column `coins_num` bigint DEFAULT 0 COMMENT '投币数(归一化)',
+    add column `danmaku_num` bigint DEFAULT 0 COMMENT '弹幕数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_tieba_note_likes_num` (`likes_num`),
+    add index `ix_tieba_note_publish_ts` (`publish_ts`);
+alter table tieba_comment
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_tieba_comment_likes_num` (`likes_num`),
+    add index `ix_tieba_comment_publish_ts` (`publish_ts`);
+alter table zhihu_content
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `shares_num` bigint DEFAULT 0 COMMENT '分享/转发数(归一化)',
+    add column `views_num` bigint DEFAULT 0 COMMENT '播放/浏览数(归一化)',
+    add column `favorites_num` bigint DEFAULT 0 COMMENT '收藏数(归一化)',
+    add column `coins_num` bigint DEFAULT 0 COMMENT '投币数(归一化)',
+    add column `danmaku_num` bigint DEFAULT 0 COMMENT '弹幕数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_zhihu_content_likes_num` (`likes_num`),
+    add index `ix_zhihu_content_publish_ts` (`publish_ts`);
+alter table zhihu_comment
+    add column `likes_num` bigint DEFAULT 0 COMMENT '点赞数(归一化)',
+    add column `comments_num` bigint DEFAULT 0 COMMENT '评论/回复数(归一化)',
+    add column `publish_ts` bigint DEFAULT NULL COMMENT '发布时间(毫秒时间戳,归一化)',
+    add index `ix_zhihu_comment_likes_num` (`likes_num`),
+    add index `ix_zhihu_comment_publish_ts` (`publish_ts`);
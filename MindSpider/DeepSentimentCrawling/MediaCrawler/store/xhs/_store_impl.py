@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
+from database.engagement import normalized_update_values
 from database.models import XhsNote, XhsNoteComment, XhsCreator
 
 from tools.async_file_writer import AsyncFileWriter
@@ -135,6 +136,8 @@ class XhsDbStoreImplement(AbstractStore):
             "share_count": str(content_item.get("share_count")),
             "last_update_time": content_item.get("last_update_time"),
         }
+        # Core update() 不触发 ORM before_update 事件，归一化列需一并写入
+        update_data.update(normalized_update_values("xhs_note", update_data))
         stmt = update(XhsNote).where(XhsNote.note_id == note_id).values(**update_data)
         await session.execute(stmt)
 
@@ -184,6 +187,8 @@ class XhsDbStoreImplement(AbstractStore):
             "like_count": str(comment_item.get("like_count")),
             "sub_comment_count": comment_item.get("sub_comment_count"),
         }
+        # Core update() 不触发 ORM before_update 事件，归一化列需一并写入
+        update_data.update(normalized_update_values("xhs_note_comment", update_data))
         stmt = update(XhsNoteComment).where(XhsNoteComment.comment_id == comment_id).values(**update_data)
         await session.execute(stmt)
 
@@ -0,0 +1,71 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：  
+# 1. 不得用于任何商业用途。  
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。  
+# 3. 不得进行大规模爬取或对平台造成运营干扰。  
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。   
+# 5. 不得用于任何非法或不当的用途。
+#   
+# 详细许可条款请参阅项目根目录下的LICENSE文件。  
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。  
+
+
+
+# -*- coding: utf-8 -*-
+
+from datetime import date, datetime
+
+from database.engagement import normalized_update_values, normalized_values, parse_count, to_epoch_ms
+
+
+def test_parse_count_plain_and_units():
+    assert parse_count(42) == 42
+    assert parse_count(3.9) == 3
+    assert parse_count("1,024") == 1024
+    assert parse_count("100+") == 100
+    assert parse_count("1.2万") == 12000
+    assert parse_count("3w") == 30000
+    assert parse_count("2亿") == 200_000_000
+
+
+def test_parse_count_invalid_values():
+    assert parse_count(None) == 0
+    assert parse_count(True) == 0
+    assert parse_count("") == 0
+    assert parse_count("  ") == 0
+    assert parse_count("abc") == 0
+
+
+def test_to_epoch_ms_timestamps():
+    assert to_epoch_ms(1_700_000_000) == 1_700_000_000_000
+    assert to_epoch_ms("1700000000") == 1_700_000_000_000
+    assert to_epoch_ms(1_700_000_000_123) == 1_700_000_000_123
+    assert to_epoch_ms("1700000000123") == 1_700_000_000_123
+
+
+def test_to_epoch_ms_dates_and_strings():
+    moment = datetime(2024, 5, 1, 12, 30)
+    assert to_epoch_ms(moment) == int(moment.timestamp() * 1000)
+    assert to_epoch_ms(date(2024, 5, 1)) == int(datetime(2024, 5, 1).timestamp() * 1000)
+    assert to_epoch_ms("2024-05-01 12:30:00") == int(moment.timestamp() * 1000)
+    assert to_epoch_ms("2024-05-01 12:30:00+08:00") == int(moment.timestamp() * 1000)
+
+
+def test_to_epoch_ms_invalid_values():
+    assert to_epoch_ms(None) is None
+    assert to_epoch_ms("") is None
+    assert to_epoch_ms("not a date") is None
+
+
+def test_normalized_values():
+    values = normalized_values("weibo_note", {"liked_count": "1.5万", "comments_count": "12",
+                                              "create_time": None, "create_date_time": "2024-05-01 12:30:00"})
+    assert values["likes_num"] == 15000
+    assert values["comments_num"] == 12
+    assert values["shares_num"] == 0
+    assert values["publish_ts"] == int(datetime(2024, 5, 1, 12, 30).timestamp() * 1000)
+    assert normalized_values("unknown_table", {"liked_count": "1"}) == {}
+
+
+def test_normalized_update_values_only_touches_present_columns():
+    result = normalized_update_values("xhs_note", {"liked_count": "2w"})
+    assert result == {"likes_num": 20000}
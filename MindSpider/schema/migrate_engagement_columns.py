@@ -0,0 +1,187 @@
+"""
+MindSpider 数据库迁移：归一化互动指标列与统一发布时间列（SQLAlchemy 2.x 异步引擎）
+
+为 MediaCrawler 各平台内容表/评论表补充带类型的列并回填存量数据：
+- likes_num / comments_num / shares_num / views_num / favorites_num / coins_num / danmaku_num (BIGINT)
+- publish_ts (BIGINT，毫秒级时间戳)
+并在 likes_num、publish_ts 上建立索引，使时间范围过滤与按互动量排序可以走索引。
+
+同时为 InsightEngine 的增量同步（content_hotness / social_content / social_comment，见 InsightEngine/utils/watermark.py）准备源表：
+- last_modify_ts 回填为 0 并改为 NOT NULL DEFAULT 0，水位线谓词可直接比较该列
+- 建立 (last_modify_ts, id) 复合索引（含 daily_news），增量同步为索引范围扫描
+- 为 content_hotness 补充 (hotness_score, publish_ts) 索引，宽时间窗口的 Top-N 按热度倒序扫描索引
+
+新入库的数据由 MediaCrawler ORM 的 before_insert/before_update 事件自动填充，
+本脚本只需在升级时执行一次（可重复执行，已存在的列与索引会被跳过）。
+
+数据模型定义位置：
+- MindSpider/schema/models_bigdata.py（ContentEngagementMixin / CommentEngagementMixin）
+- MindSpider/DeepSentimentCrawling/MediaCrawler/database/engagement.py（归一化规则）
+
+用法:
+    python schema/migrate_engagement_columns.py
+    python schema/migrate_engagement_columns.py --all   # 重新回填全部行，而不仅是 publish_ts 为空的行
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from loguru import logger
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from init_database import _build_database_url
+
+# MediaCrawler 根目录，复用其入库归一化规则，保证回填结果与新入库数据一致
+mediacrawler_root = Path(__file__).parent.parent / "DeepSentimentCrawling" / "MediaCrawler"
+sys.path.append(str(mediacrawler_root))
+
+from database.engagement import (  # noqa: E402
+    COMMENT_NUMERIC_COLUMNS,
+    CONTENT_NUMERIC_COLUMNS,
+    NORMALIZED_SOURCES,
+    normalized_values,
+)
+
+BACKFILL_BATCH_SIZE = 2000
+INDEXED_COLUMNS = ["likes_num", "publish_ts"]
+# 只需要 (last_modify_ts, id) 水位线索引的其它增量同步源表
+WATERMARK_ONLY_TABLES = ["daily_news"]
+HOTNESS_SCORE_INDEX = ("content_hotness", "idx_content_hotness_score", ["hotness_score", "publish_ts"])
+
+
+def _target_columns(table: str) -> List[str]:
+    numeric = COMMENT_NUMERIC_COLUMNS if "comment" in table else CONTENT_NUMERIC_COLUMNS
+    return numeric + ["publish_ts"]
+
+
+async def _table_columns(conn: AsyncConnection, table: str) -> List[str]:
+    return await conn.run_sync(lambda sync_conn: [col["name"] for col in inspect(sync_conn).get_columns(table)])
+
+
+async def _add_missing_columns(conn: AsyncConnection, table: str) -> None:
+    existing = set(await _table_columns(conn, table))
+    indexes = await conn.run_sync(lambda sync_conn: {idx["name"] for idx in inspect(sync_conn).get_indexes(table)})
+    quote = conn.dialect.identifier_preparer.quote
+
+    for column in _target_columns(table):
+        if column not in existing:
+            default = "" if column == "publish_ts" else " DEFAULT 0"
+            await conn.execute(text(f"ALTER TABLE {quote(table)} ADD COLUMN {quote(column)} BIGINT{default}"))
+            logger.info(f"[migrate_engagement] {table}.{column} 已添加")
+    for column in INDEXED_COLUMNS:
+        index_name = f"ix_{table}_{column}"
+        if index_name not in indexes:
+            await conn.execute(text(f"CREATE INDEX {quote(index_name)} ON {quote(table)} ({quote(column)})"))
+            logger.info(f"[migrate_engagement] 索引 {index_name} 已创建")
+
+
+async def _prepare_watermark_column(conn: AsyncConnection, table: str) -> None:
+    """last_modify_ts 回填为 0 并改为 NOT NULL DEFAULT 0，再建立 (last_modify_ts, id) 索引"""
+    columns = await conn.run_sync(lambda sync_conn: {col["name"]: col for col in inspect(sync_conn).get_columns(table)})
+    if "last_modify_ts" not in columns:
+        logger.warning(f"[migrate_engagement] {table} 缺少 last_modify_ts 列，跳过水位线索引")
+        return
+    indexes = await conn.run_sync(lambda sync_conn: {idx["name"] for idx in inspect(sync_conn).get_indexes(table)})
+    quote = conn.dialect.identifier_preparer.quote
+    column = quote("last_modify_ts")
+
+    if columns["last_modify_ts"].get("nullable", True):
+        await conn.execute(text(f"UPDATE {quote(table)} SET {column} = 0 WHERE {column} IS NULL"))
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text(f"ALTER TABLE {quote(table)} ALTER COLUMN {column} SET DEFAULT 0, "
+                                    f"ALTER COLUMN {column} SET NOT NULL"))
+        else:
+            await conn.execute(text(f"ALTER TABLE {quote(table)} MODIFY COLUMN {column} BIGINT NOT NULL DEFAULT 0"))
+        logger.info(f"[migrate_engagement] {table}.last_modify_ts 已改为 NOT NULL DEFAULT 0")
+
+    index_name = f"ix_{table}_last_modify_ts_id"
+    if index_name not in indexes:
+        await conn.execute(text(f"CREATE INDEX {quote(index_name)} ON {quote(table)} ({column}, {quote('id')})"))
+        logger.info(f"[migrate_engagement] 索引 {index_name} 已创建")
+
+
+async def _create_hotness_score_index(conn: AsyncConnection) -> None:
+    table, index_name, columns = HOTNESS_SCORE_INDEX
+    if not await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(table)):
+        return
+    indexes = await conn.run_sync(lambda sync_conn: {idx["name"] for idx in inspect(sync_conn).get_indexes(table)})
+    if index_name not in indexes:
+        quote = conn.dialect.identifier_preparer.quote
+        await conn.execute(text(f"CREATE INDEX {quote(index_name)} ON {quote(table)} "
+                                f"({', '.join(quote(col) for col in columns)})"))
+        logger.info(f"[migrate_engagement] 索引 {index_name} 已创建")
+
+
+async def _backfill(conn: AsyncConnection, table: str, only_missing: bool) -> int:
+    config = NORMALIZED_SOURCES[table]
+    quote = conn.dialect.identifier_preparer.quote
+    # 老版本表可能缺少部分原始列，只读取实际存在的列
+    existing = set(await _table_columns(conn, table))
+    source_cols = [col for col in dict.fromkeys(list(config["numeric"].values()) + config["time_cols"]) if col in existing]
+    select_cols = ", ".join(quote(col) for col in ["id"] + source_cols)
+    missing_filter = f" AND {quote('publish_ts')} IS NULL" if only_missing else ""
+    targets = list(config["numeric"].keys()) + ["publish_ts"]
+    update_sql = text(
+        f"UPDATE {quote(table)} SET " + ", ".join(f"{quote(col)} = :{col}" for col in targets) + f" WHERE {quote('id')} = :id"
+    )
+
+    last_id, total = 0, 0
+    while True:
+        result = await conn.execute(
+            text(f"SELECT {select_cols} FROM {quote(table)} WHERE {quote('id')} > :last_id{missing_filter} "
+                 f"ORDER BY {quote('id')} LIMIT :batch"),
+            {"last_id": last_id, "batch": BACKFILL_BATCH_SIZE},
+        )
+        rows = [dict(row) for row in result.mappings().all()]
+        if not rows:
+            break
+        params: List[Dict] = []
+        for row in rows:
+            values = normalized_values(table, row)
+            values["id"] = row["id"]
+            params.append(values)
+        await conn.execute(update_sql, params)
+        await conn.commit()
+        last_id = rows[-1]["id"]
+        total += len(rows)
+    return total
+
+
+async def main(only_missing: bool = True) -> None:
+    engine = create_async_engine(_build_database_url(), pool_pre_ping=True, pool_recycle=1800)
+    for table in list(NORMALIZED_SOURCES) + WATERMARK_ONLY_TABLES:
+        try:
+            async with engine.begin() as conn:
+                has_table = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(table))
+                if not has_table:
+                    logger.warning(f"[migrate_engagement] 表 {table} 不存在，跳过")
+                    continue
+                await _prepare_watermark_column(conn, table)
+                if table in NORMALIZED_SOURCES:
+                    await _add_missing_columns(conn, table)
+            if table in NORMALIZED_SOURCES:
+                async with engine.connect() as conn:
+                    count = await _backfill(conn, table, only_missing)
+                logger.info(f"[migrate_engagement] {table} 回填 {count} 行")
+        except Exception as e:
+            logger.exception(f"[migrate_engagement] 迁移 {table} 失败: {e}")
+    try:
+        async with engine.begin() as conn:
+            await _create_hotness_score_index(conn)
+    except Exception as e:
+        logger.exception(f"[migrate_engagement] 创建热度索引失败: {e}")
+    await engine.dispose()
+    logger.info("[migrate_engagement] 归一化列迁移完成")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="为平台内容/评论表添加并回填归一化互动指标列")
+    parser.add_argument("--all", action="store_true", help="回填全部行（默认只处理 publish_ts 为空的行）")
+    args = parser.parse_args()
+    asyncio.run(main(only_missing=not args.all))
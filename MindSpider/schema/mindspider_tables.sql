@@ -105,6 +105,145 @@ CREATE TABLE `crawling_tasks` (
     FOREIGN KEY (`topic_id`) REFERENCES `daily_topics`(`topic_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='爬取任务表';
 
+-- ----------------------------
+-- Table structure for content_hotness
+-- 内容热度汇总表：InsightEngine search_hot_content 使用，按 last_modify_ts 增量刷新
+-- ----------------------------
+DROP TABLE IF EXISTS `content_hotness`;
+CREATE TABLE `content_hotness` (
+    `id` int NOT NULL AUTO_INCREMENT COMMENT '自增ID',
+    `platform` varchar(32) NOT NULL COMMENT '平台(bilibili|douyin|weibo|xhs|kuaishou|zhihu)',
+    `source_table` varchar(64) NOT NULL COMMENT '源内容表名',
+    `content_id` bigint NOT NULL COMMENT '源内容表中的自增ID',
+    `publish_ts` bigint NOT NULL DEFAULT 0 COMMENT '发布时间（毫秒级时间戳）',
+    `hotness_score` double NOT NULL DEFAULT 0 COMMENT '加权热度分值',
+    `last_modify_ts` bigint NOT NULL DEFAULT 0 COMMENT '源记录最后修改时间戳',
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uq_content_hotness_source` (`source_table`, `content_id`),
+    KEY `idx_content_hotness_publish_score` (`publish_ts`, `hotness_score`),
+    KEY `idx_content_hotness_score` (`hotness_score`, `publish_ts`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='内容热度汇总表';
+
+-- ----------------------------
+-- Table structure for content_hotness_watermark
+-- 热度汇总表各源表的增量刷新水位线
+-- ----------------------------
+DROP TABLE IF EXISTS `content_hotness_watermark`;
+CREATE TABLE `content_hotness_watermark` (
+    `source_table` varchar(64) NOT NULL COMMENT '源内容表名',
+    `last_modify_ts` bigint NOT NULL DEFAULT 0 COMMENT '已同步的最大last_modify_ts',
+    `last_id` bigint NOT NULL DEFAULT 0 COMMENT '同一last_modify_ts下已同步的最大ID',
+    `refreshed_at` bigint NOT NULL DEFAULT 0 COMMENT '最近一次刷新时间（秒级时间戳）',
+    PRIMARY KEY (`source_table`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='热度汇总表刷新水位线';
+
+-- ----------------------------
+-- Table structure for social_content
+-- 跨平台统一内容投影表：InsightEngine 话题搜索工具使用，按 last_modify_ts 增量同步
+-- ----------------------------
+DROP TABLE IF EXISTS `social_content`;
+CREATE TABLE `social_content` (
+    `id` int NOT NULL AUTO_INCREMENT COMMENT '自增ID',
+    `platform` varchar(32) NOT NULL COMMENT '平台(bilibili|douyin|kuaishou|weibo|xhs|zhihu|tieba|daily)',
+    `content_type` varchar(16) NOT NULL COMMENT '内容类型(video|note|content|news)',
+    `source_table` varchar(64) NOT NULL COMMENT '源内容表名',
+    `source_id` bigint NOT NULL COMMENT '源内容表中的自增ID',
+    `title` longtext COMMENT '标题',
+    `content` longtext COMMENT '正文/简介',
+    `tags` text COMMENT '标签',
+    `author` varchar(255) DEFAULT NULL COMMENT '作者昵称',
+    `url` varchar(512) DEFAULT NULL COMMENT '内容链接',
+    `source_keyword` varchar(255) DEFAULT NULL COMMENT '来源关键字',
+    `publish_ts` bigint NOT NULL DEFAULT 0 COMMENT '发布时间（毫秒级时间戳，未知为0）',
+    `likes_num` bigint NOT NULL DEFAULT 0 COMMENT '点赞数',
+    `comments_num` bigint NOT NULL DEFAULT 0 COMMENT '评论数',
+    `shares_num` bigint NOT NULL DEFAULT 0 COMMENT '分享/转发数',
+    `views_num` bigint NOT NULL DEFAULT 0 COMMENT '播放/浏览数',
+    `favorites_num` bigint NOT NULL DEFAULT 0 COMMENT '收藏数',
+    `coins_num` bigint NOT NULL DEFAULT 0 COMMENT '投币数',
+    `danmaku_num` bigint NOT NULL DEFAULT 0 COMMENT '弹幕数',
+    `simhash` bigint NOT NULL DEFAULT 0 COMMENT '标题+正文的64位SimHash（有符号存储）',
+    `dup_key` bigint NOT NULL DEFAULT 0 COMMENT '近重复分组键（同组首条记录的SimHash）',
+    `simhash_b0` int NOT NULL DEFAULT 0 COMMENT 'SimHash第1段（16位）',
+    `simhash_b1` int NOT NULL DEFAULT 0 COMMENT 'SimHash第2段（16位）',
+    `simhash_b2` int NOT NULL DEFAULT 0 COMMENT 'SimHash第3段（16位）',
+    `simhash_b3` int NOT NULL DEFAULT 0 COMMENT 'SimHash第4段（16位）',
+    `sentiment_label` int DEFAULT NULL COMMENT '离线情感打分类别（0非常负面 ~ 4非常正面，未打分为NULL）',
+    `sentiment_confidence` float DEFAULT NULL COMMENT '离线情感打分置信度',
+    `sentiment_model` varchar(32) DEFAULT NULL COMMENT '打分所用的模型版本',
+    `last_modify_ts` bigint NOT NULL DEFAULT 0 COMMENT '源记录最后修改时间戳',
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uq_social_content_source` (`source_table`, `source_id`),
+    KEY `idx_social_content_publish` (`publish_ts`, `id`),
+    KEY `idx_social_content_platform_publish` (`platform`, `publish_ts`),
+    KEY `idx_social_content_dup_key` (`dup_key`),
+    KEY `idx_social_content_simhash_b0` (`simhash_b0`, `publish_ts`),
+    KEY `idx_social_content_simhash_b1` (`simhash_b1`, `publish_ts`),
+    KEY `idx_social_content_simhash_b2` (`simhash_b2`, `publish_ts`),
+    KEY `idx_social_content_simhash_b3` (`simhash_b3`, `publish_ts`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='跨平台统一内容投影表';
+
+-- ----------------------------
+-- Table structure for social_comment
+-- 跨平台统一评论投影表
+-- ----------------------------
+DROP TABLE IF EXISTS `social_comment`;
+CREATE TABLE `social_comment` (
+    `id` int NOT NULL AUTO_INCREMENT COMMENT '自增ID',
+    `platform` varchar(32) NOT NULL COMMENT '平台',
+    `source_table` varchar(64) NOT NULL COMMENT '源评论表名',
+    `source_id` bigint NOT NULL COMMENT '源评论表中的自增ID',
+    `content` longtext COMMENT '评论内容',
+    `author` varchar(255) DEFAULT NULL COMMENT '评论者昵称',
+    `publish_ts` bigint NOT NULL DEFAULT 0 COMMENT '发布时间（毫秒级时间戳，未知为0）',
+    `likes_num` bigint NOT NULL DEFAULT 0 COMMENT '点赞数',
+    `comments_num` bigint NOT NULL DEFAULT 0 COMMENT '子评论数',
+    `simhash` bigint NOT NULL DEFAULT 0 COMMENT '评论内容的64位SimHash（有符号存储）',
+    `dup_key` bigint NOT NULL DEFAULT 0 COMMENT '近重复分组键（同组首条记录的SimHash）',
+    `simhash_b0` int NOT NULL DEFAULT 0 COMMENT 'SimHash第1段（16位）',
+    `simhash_b1` int NOT NULL DEFAULT 0 COMMENT 'SimHash第2段（16位）',
+    `simhash_b2` int NOT NULL DEFAULT 0 COMMENT 'SimHash第3段（16位）',
+    `simhash_b3` int NOT NULL DEFAULT 0 COMMENT 'SimHash第4段（16位）',
+    `sentiment_label` int DEFAULT NULL COMMENT '离线情感打分类别（0非常负面 ~ 4非常正面，未打分为NULL）',
+    `sentiment_confidence` float DEFAULT NULL COMMENT '离线情感打分置信度',
+    `sentiment_model` varchar(32) DEFAULT NULL COMMENT '打分所用的模型版本',
+    `last_modify_ts` bigint NOT NULL DEFAULT 0 COMMENT '源记录最后修改时间戳',
+    PRIMARY KEY (`id`),
+    UNIQUE KEY `uq_social_comment_source` (`source_table`, `source_id`),
+    KEY `idx_social_comment_publish` (`publish_ts`, `id`),
+    KEY `idx_social_comment_platform_publish` (`platform`, `publish_ts`),
+    KEY `idx_social_comment_dup_key` (`dup_key`),
+    KEY `idx_social_comment_simhash_b0` (`simhash_b0`, `publish_ts`),
+    KEY `idx_social_comment_simhash_b1` (`simhash_b1`, `publish_ts`),
+    KEY `idx_social_comment_simhash_b2` (`simhash_b2`, `publish_ts`),
+    KEY `idx_social_comment_simhash_b3` (`simhash_b3`, `publish_ts`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='跨平台统一评论投影表';
+
+-- ----------------------------
+-- Table structure for social_projection_watermark
+-- 统一投影表各源表的增量同步水位线
+-- ----------------------------
+DROP TABLE IF EXISTS `social_projection_watermark`;
+CREATE TABLE `social_projection_watermark` (
+    `source_table` varchar(64) NOT NULL COMMENT '源表名',
+    `last_modify_ts` bigint NOT NULL DEFAULT 0 COMMENT '已同步的最大last_modify_ts',
+    `last_id` bigint NOT NULL DEFAULT 0 COMMENT '同一last_modify_ts下已同步的最大ID',
+    `refreshed_at` bigint NOT NULL DEFAULT 0 COMMENT '最近一次刷新时间（秒级时间戳）',
+    PRIMARY KEY (`source_table`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='统一投影表同步水位线';
+
+-- ----------------------------
+-- Table structure for sentiment_scoring_watermark
+-- 统一投影表离线情感打分的增量水位线
+-- ----------------------------
+DROP TABLE IF EXISTS `sentiment_scoring_watermark`;
+CREATE TABLE `sentiment_scoring_watermark` (
+    `target_table` varchar(64) NOT NULL COMMENT '投影表名',
+    `last_id` bigint NOT NULL DEFAULT 0 COMMENT '已打分的最大ID',
+    `refreshed_at` bigint NOT NULL DEFAULT 0 COMMENT '最近一次打分时间（秒级时间戳）',
+    PRIMARY KEY (`target_table`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='离线情感打分水位线';
+
 -- ===============================
 -- MediaCrawler表结构扩展字段
 -- ===============================
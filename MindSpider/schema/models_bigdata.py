@@ -9,13 +9,41 @@
 本模块以MindSpider\DeepSentimentCrawling\MediaCrawler\database\models.py为准
 """
 
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, String, BigInteger, Text, ForeignKey
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column
+from sqlalchemy import Integer, String, BigInteger, Text, ForeignKey, Index
 
 # 使用 models_sa 中的 Base，确保所有表在同一个 metadata 中，外键引用可以正常工作
 from models_sa import Base
 
-class BilibiliVideo(Base):
+
+class WatermarkIndexMixin:
+    """InsightEngine 增量同步按 (last_modify_ts, id) 水位线做范围扫描（见 InsightEngine/utils/watermark.py）"""
+
+    @declared_attr.directive
+    def __table_args__(cls):
+        return (Index(f"ix_{cls.__tablename__}_last_modify_ts_id", "last_modify_ts", "id"),)
+
+
+class ContentEngagementMixin(WatermarkIndexMixin):
+    """内容表的归一化互动指标（BIGINT）与统一发布时间 publish_ts（毫秒），入库时由 MediaCrawler ORM 事件填充"""
+    likes_num: Mapped[int | None] = mapped_column(BigInteger, default=0, index=True, nullable=True)
+    comments_num: Mapped[int | None] = mapped_column(BigInteger, default=0, nullable=True)
+    shares_num: Mapped[int | None] = mapped_column(BigInteger, default=0, nullable=True)
+    views_num: Mapped[int | None] = mapped_column(BigInteger, default=0, nullable=True)
+    favorites_num: Mapped[int | None] = mapped_column(BigInteger, default=0, nullable=True)
+    coins_num: Mapped[int | None] = mapped_column(BigInteger, default=0, nullable=True)
+    danmaku_num: Mapped[int | None] = mapped_column(BigInteger, default=0, nullable=True)
+    publish_ts: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
+
+
+class CommentEngagementMixin(WatermarkIndexMixin):
+    """评论表的归一化互动指标（BIGINT）与统一发布时间 publish_ts（毫秒），入库时由 MediaCrawler ORM 事件填充"""
+    likes_num: Mapped[int | None] = mapped_column(BigInteger, default=0, index=True, nullable=True)
+    comments_num: Mapped[int | None] = mapped_column(BigInteger, default=0, nullable=True)
+    publish_ts: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
+
+
+class BilibiliVideo(ContentEngagementMixin, Base):
     __tablename__ = "bilibili_video"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     video_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True, unique=True)
@@ -25,7 +53,7 @@ class BilibiliVideo(Base):
     avatar: Mapped[str | None] = mapped_column(Text, nullable=True)
     liked_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     video_type: Mapped[str | None] = mapped_column(Text, nullable=True)
     title: Mapped[str | None] = mapped_column(Text, nullable=True)
     desc: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -42,7 +70,7 @@ class BilibiliVideo(Base):
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawling_tasks.id", ondelete="SET NULL"), nullable=True)
 
-class BilibiliVideoComment(Base):
+class BilibiliVideoComment(CommentEngagementMixin, Base):
     __tablename__ = "bilibili_video_comment"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -51,7 +79,7 @@ class BilibiliVideoComment(Base):
     sign: Mapped[str | None] = mapped_column(Text, nullable=True)
     avatar: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     comment_id: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     video_id: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -108,7 +136,7 @@ class BilibiliUpDynamic(Base):
     last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
 
 
-class DouyinAweme(Base):
+class DouyinAweme(ContentEngagementMixin, Base):
     __tablename__ = "douyin_aweme"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -120,7 +148,7 @@ class DouyinAweme(Base):
     user_signature: Mapped[str | None] = mapped_column(Text, nullable=True)
     ip_location: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     aweme_id: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     aweme_type: Mapped[str | None] = mapped_column(Text, nullable=True)
     title: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -139,7 +167,7 @@ class DouyinAweme(Base):
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawling_tasks.id", ondelete="SET NULL"), nullable=True)
 
-class DouyinAwemeComment(Base):
+class DouyinAwemeComment(CommentEngagementMixin, Base):
     __tablename__ = "douyin_aweme_comment"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -151,7 +179,7 @@ class DouyinAwemeComment(Base):
     user_signature: Mapped[str | None] = mapped_column(Text, nullable=True)
     ip_location: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     comment_id: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     aweme_id: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -179,14 +207,14 @@ class DyCreator(Base):
     videos_count: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
 
-class KuaishouVideo(Base):
+class KuaishouVideo(ContentEngagementMixin, Base):
     __tablename__ = "kuaishou_video"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
     nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
     avatar: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     video_id: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
     video_type: Mapped[str | None] = mapped_column(Text, nullable=True)
     title: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -201,21 +229,21 @@ class KuaishouVideo(Base):
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawling_tasks.id", ondelete="SET NULL"), nullable=True)
 
-class KuaishouVideoComment(Base):
+class KuaishouVideoComment(CommentEngagementMixin, Base):
     __tablename__ = "kuaishou_video_comment"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(Text, nullable=True)
     nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
     avatar: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     comment_id: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     video_id: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
     create_time: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     sub_comment_count: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-class WeiboNote(Base):
+class WeiboNote(ContentEngagementMixin, Base):
     __tablename__ = "weibo_note"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -225,7 +253,7 @@ class WeiboNote(Base):
     profile_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     ip_location: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     note_id: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
     create_time: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
@@ -238,7 +266,7 @@ class WeiboNote(Base):
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawling_tasks.id", ondelete="SET NULL"), nullable=True)
 
-class WeiboNoteComment(Base):
+class WeiboNoteComment(CommentEngagementMixin, Base):
     __tablename__ = "weibo_note_comment"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -248,7 +276,7 @@ class WeiboNoteComment(Base):
     profile_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     ip_location: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     comment_id: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     note_id: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     content: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -292,7 +320,7 @@ class XhsCreator(Base):
     tag_list: Mapped[str | None] = mapped_column(Text, nullable=True)
 
 
-class XhsNote(Base):
+class XhsNote(ContentEngagementMixin, Base):
     __tablename__ = "xhs_note"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -300,7 +328,7 @@ class XhsNote(Base):
     avatar: Mapped[str | None] = mapped_column(Text, nullable=True)
     ip_location: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     note_id: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
     type: Mapped[str | None] = mapped_column(Text, nullable=True)
     title: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -321,7 +349,7 @@ class XhsNote(Base):
     crawling_task_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawling_tasks.id", ondelete="SET NULL"), nullable=True)
 
 
-class XhsNoteComment(Base):
+class XhsNoteComment(CommentEngagementMixin, Base):
     __tablename__ = "xhs_note_comment"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -329,7 +357,7 @@ class XhsNoteComment(Base):
     avatar: Mapped[str | None] = mapped_column(Text, nullable=True)
     ip_location: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     comment_id: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
     create_time: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
     note_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -339,7 +367,7 @@ class XhsNoteComment(Base):
     parent_comment_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     like_count: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-class TiebaNote(Base):
+class TiebaNote(ContentEngagementMixin, Base):
     __tablename__ = "tieba_note"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     note_id: Mapped[str | None] = mapped_column(String(644), index=True, nullable=True)
@@ -357,12 +385,12 @@ class TiebaNote(Base):
     total_replay_page: Mapped[int | None] = mapped_column(Integer, default=0, nullable=True)
     ip_location: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     source_keyword: Mapped[str | None] = mapped_column(Text, default='', nullable=True)
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawling_tasks.id", ondelete="SET NULL"), nullable=True)
 
-class TiebaComment(Base):
+class TiebaComment(CommentEngagementMixin, Base):
     __tablename__ = "tieba_comment"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     comment_id: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
@@ -380,7 +408,7 @@ class TiebaComment(Base):
     note_id: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
     note_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
 
 
 class TiebaCreator(Base):
@@ -399,7 +427,7 @@ class TiebaCreator(Base):
     registration_duration: Mapped[str | None] = mapped_column(Text, nullable=True)
 
 
-class ZhihuContent(Base):
+class ZhihuContent(ContentEngagementMixin, Base):
     __tablename__ = "zhihu_content"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     content_id: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
@@ -420,11 +448,11 @@ class ZhihuContent(Base):
     user_avatar: Mapped[str | None] = mapped_column(Text, nullable=True)
     user_url_token: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     topic_id: Mapped[str | None] = mapped_column(String(64), ForeignKey("daily_topics.topic_id", ondelete="SET NULL"), nullable=True)
     crawling_task_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("crawling_tasks.id", ondelete="SET NULL"), nullable=True)
 
-class ZhihuComment(Base):
+class ZhihuComment(CommentEngagementMixin, Base):
     __tablename__ = "zhihu_comment"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     comment_id: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
@@ -442,7 +470,7 @@ class ZhihuComment(Base):
     user_nickname: Mapped[str | None] = mapped_column(Text, nullable=True)
     user_avatar: Mapped[str | None] = mapped_column(Text, nullable=True)
     add_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
-    last_modify_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
 
 
 class ZhihuCreator(Base):
@@ -21,6 +21,12 @@ __all__ = [
     "DailyTopic",
     "TopicNewsRelation",
     "CrawlingTask",
+    "ContentHotness",
+    "ContentHotnessWatermark",
+    "SocialContent",
+    "SocialComment",
+    "SocialProjectionWatermark",
+    "SentimentScoringWatermark",
 ]
 
 
@@ -124,3 +130,128 @@ class CrawlingTask(Base):
     last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
 
+class ContentHotness(Base):
+    """内容热度汇总表：由 InsightEngine/utils/hotness.py 按 last_modify_ts 增量刷新"""
+    __tablename__ = "content_hotness"
+    __table_args__ = (
+        UniqueConstraint("source_table", "content_id", name="uq_content_hotness_source"),
+        Index("idx_content_hotness_publish_score", "publish_ts", "hotness_score"),
+        Index("idx_content_hotness_score", "hotness_score", "publish_ts"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    platform: Mapped[str] = mapped_column(String(32), nullable=False)
+    source_table: Mapped[str] = mapped_column(String(64), nullable=False)
+    content_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    publish_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    hotness_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class ContentHotnessWatermark(Base):
+    """content_hotness 各源表的增量刷新水位线"""
+    __tablename__ = "content_hotness_watermark"
+
+    source_table: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    last_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    refreshed_at: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class SocialContent(Base):
+    """跨平台统一内容投影表：由 InsightEngine/utils/social_projection.py 从各平台内容表与 daily_news 增量同步"""
+    __tablename__ = "social_content"
+    __table_args__ = (
+        UniqueConstraint("source_table", "source_id", name="uq_social_content_source"),
+        Index("idx_social_content_publish", "publish_ts", "id"),
+        Index("idx_social_content_platform_publish", "platform", "publish_ts"),
+        Index("idx_social_content_dup_key", "dup_key"),
+        Index("idx_social_content_simhash_b0", "simhash_b0", "publish_ts"),
+        Index("idx_social_content_simhash_b1", "simhash_b1", "publish_ts"),
+        Index("idx_social_content_simhash_b2", "simhash_b2", "publish_ts"),
+        Index("idx_social_content_simhash_b3", "simhash_b3", "publish_ts"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    platform: Mapped[str] = mapped_column(String(32), nullable=False)
+    content_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    source_table: Mapped[str] = mapped_column(String(64), nullable=False)
+    source_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    title: Mapped[Optional[str]] = mapped_column(Text)
+    content: Mapped[Optional[str]] = mapped_column(Text)
+    tags: Mapped[Optional[str]] = mapped_column(Text)
+    author: Mapped[Optional[str]] = mapped_column(String(255))
+    url: Mapped[Optional[str]] = mapped_column(String(512))
+    source_keyword: Mapped[Optional[str]] = mapped_column(String(255))
+    publish_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    likes_num: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    comments_num: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    shares_num: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    views_num: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    favorites_num: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    coins_num: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    danmaku_num: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    simhash: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    dup_key: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    simhash_b0: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    simhash_b1: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    simhash_b2: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    simhash_b3: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sentiment_label: Mapped[Optional[int]] = mapped_column(Integer)
+    sentiment_confidence: Mapped[Optional[float]] = mapped_column(Float)
+    sentiment_model: Mapped[Optional[str]] = mapped_column(String(32))
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class SocialComment(Base):
+    """跨平台统一评论投影表：由 InsightEngine/utils/social_projection.py 从各平台评论表增量同步"""
+    __tablename__ = "social_comment"
+    __table_args__ = (
+        UniqueConstraint("source_table", "source_id", name="uq_social_comment_source"),
+        Index("idx_social_comment_publish", "publish_ts", "id"),
+        Index("idx_social_comment_platform_publish", "platform", "publish_ts"),
+        Index("idx_social_comment_dup_key", "dup_key"),
+        Index("idx_social_comment_simhash_b0", "simhash_b0", "publish_ts"),
+        Index("idx_social_comment_simhash_b1", "simhash_b1", "publish_ts"),
+        Index("idx_social_comment_simhash_b2", "simhash_b2", "publish_ts"),
+        Index("idx_social_comment_simhash_b3", "simhash_b3", "publish_ts"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    platform: Mapped[str] = mapped_column(String(32), nullable=False)
+    source_table: Mapped[str] = mapped_column(String(64), nullable=False)
+    source_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    content: Mapped[Optional[str]] = mapped_column(Text)
+    author: Mapped[Optional[str]] = mapped_column(String(255))
+    publish_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    likes_num: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    comments_num: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    simhash: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    dup_key: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    simhash_b0: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    simhash_b1: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    simhash_b2: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    simhash_b3: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sentiment_label: Mapped[Optional[int]] = mapped_column(Integer)
+    sentiment_confidence: Mapped[Optional[float]] = mapped_column(Float)
+    sentiment_model: Mapped[Optional[str]] = mapped_column(String(32))
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class SocialProjectionWatermark(Base):
+    """social_content / social_comment 各源表的增量同步水位线"""
+    __tablename__ = "social_projection_watermark"
+
+    source_table: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_modify_ts: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    last_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    refreshed_at: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class SentimentScoringWatermark(Base):
+    """social_content / social_comment 离线情感打分的增量水位线（投影表自增ID）"""
+    __tablename__ = "sentiment_scoring_watermark"
+
+    target_table: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    refreshed_at: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -72,6 +72,8 @@ class ReportFormattingNode(BaseNode):
             response = self.llm_client.stream_invoke_to_string(
                 SYSTEM_PROMPT_REPORT_FORMATTING,
                 message,
+                cache_node=self.node_name,
+                validate=lambda output: bool(clean_markdown_tags(remove_reasoning_from_output(output)).strip()),
             )
             
             # 处理响应
@@ -14,7 +14,8 @@ from ..utils.text_processing import (
     remove_reasoning_from_output,
     clean_json_tags,
     extract_clean_response,
-    fix_incomplete_json
+    fix_incomplete_json,
+    is_valid_json_output
 )
 
 
@@ -66,7 +67,12 @@ class FirstSearchNode(BaseNode):
             logger.info("正在生成首次搜索查询")
             
             # 调用LLM
-            response = self.llm_client.stream_invoke_to_string(SYSTEM_PROMPT_FIRST_SEARCH, message)
+            response = self.llm_client.stream_invoke_to_string(
+                SYSTEM_PROMPT_FIRST_SEARCH,
+                message,
+                cache_node=self.node_name,
+                validate=lambda output: is_valid_json_output(output, ["search_query"]),
+            )
             
             # 处理响应
             processed_response = self.process_output(response)
@@ -201,7 +207,12 @@ class ReflectionNode(BaseNode):
             logger.info("正在进行反思并生成新搜索查询")
             
             # 调用LLM
-            response = self.llm_client.stream_invoke_to_string(SYSTEM_PROMPT_REFLECTION, message)
+            response = self.llm_client.stream_invoke_to_string(
+                SYSTEM_PROMPT_REFLECTION,
+                message,
+                cache_node=self.node_name,
+                validate=lambda output: is_valid_json_output(output, ["search_query"]),
+            )
             
             # 处理响应
             processed_response = self.process_output(response)
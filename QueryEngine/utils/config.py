@@ -29,6 +29,9 @@ class Settings(BaseSettings):
     QUERY_ENGINE_API_KEY: str = Field(..., description="Query Engine LLM API密钥，用于主LLM。您可以更改每个部分LLM使用的API，🚩只要兼容OpenAI请求格式都可以，定义好KEY、BASE_URL与MODEL_NAME即可正常使用。")
     QUERY_ENGINE_BASE_URL: Optional[str] = Field(None, description="Query Engine LLM接口BaseUrl，可自定义厂商API")
     QUERY_ENGINE_MODEL_NAME: str = Field(..., description="Query Engine LLM模型名称")
+    QUERY_ENGINE_LLM_MAX_CONCURRENCY: int = Field(4, description="Query Agent LLM同时进行的请求数上限（并行研究段落时限流，同一BaseUrl的同步与异步请求共享，0表示不限）")
+    QUERY_ENGINE_LLM_REQUESTS_PER_SECOND: float = Field(0.0, description="Query Agent LLM每秒请求数上限（同一BaseUrl的同步与异步请求共享令牌桶，0表示不限）")
+    LLM_MAX_CONNECTIONS: int = Field(100, description="异步LLM客户端共享HTTP连接池的最大连接数")
     QUERY_ENGINE_PROVIDER: Optional[str] = Field(None, description="Query Engine LLM提供商（兼容字段）")
     
     # ====================== 数据库配置 ======================
@@ -46,8 +49,10 @@ class Settings(BaseSettings):
     # ================== 搜索参数配置 ====================
     SEARCH_TIMEOUT: int = Field(240, description="搜索超时（秒）")
     SEARCH_CONTENT_MAX_LENGTH: int = Field(20000, description="用于提示的最长内容长度")
+    SUMMARY_PROMPT_TOKEN_BUDGET: int = Field(32000, description="总结节点提示词的token预算，超出时按与查询的相关度保留搜索结果（0表示不限）")
     MAX_REFLECTIONS: int = Field(2, description="最大反思轮数")
     MAX_PARAGRAPHS: int = Field(5, description="最大段落数")
+    PARAGRAPH_CONCURRENCY: int = Field(5, description="同时研究的段落数（段落之间互不依赖，1表示逐个处理）")
     MAX_SEARCH_RESULTS: int = Field(20, description="最大搜索结果数")
     
     # ================== 输出配置 ====================
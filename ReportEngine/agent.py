@@ -10,6 +10,7 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List
 
 from .llms import LLMClient
+from .llms.base import ENGINE_NAME
 from .nodes import (
     TemplateSelectionNode,
     HTMLGenerationNode
@@ -164,9 +165,12 @@ class ReportAgent:
     def _initialize_llm(self) -> LLMClient:
         """初始化LLM客户端"""
         return LLMClient(
+            ENGINE_NAME,
             api_key=self.config.REPORT_ENGINE_API_KEY,
             model_name=self.config.REPORT_ENGINE_MODEL_NAME,
             base_url=self.config.REPORT_ENGINE_BASE_URL,
+            default_timeout=3000.0,
+            with_current_time=False,
         )
     
     def _initialize_nodes(self):
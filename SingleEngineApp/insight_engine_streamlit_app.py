@@ -149,22 +149,15 @@ def execute_research(query: str, config: Settings):
         agent._generate_report_structure(query)
         progress_bar.progress(20)
 
-        # 处理段落
+        # 处理段落（按 PARAGRAPH_CONCURRENCY 并行研究，进度回调在当前线程中执行）
         total_paragraphs = len(agent.state.paragraphs)
-        for i in range(total_paragraphs):
-            status_text.text(f"正在处理段落 {i + 1}/{total_paragraphs}: {agent.state.paragraphs[i].title}")
+        status_text.text(f"正在处理 {total_paragraphs} 个段落...")
 
-            # 初始搜索和总结
-            agent._initial_search_and_summary(i)
-            progress_value = 20 + (i + 0.5) / total_paragraphs * 60
-            progress_bar.progress(int(progress_value))
+        def on_paragraph_done(done: int, total: int):
+            status_text.text(f"段落处理进度 {done}/{total}")
+            progress_bar.progress(int(20 + done / total * 60))
 
-            # 反思循环
-            agent._reflection_loop(i)
-            agent.state.paragraphs[i].research.mark_completed()
-
-            progress_value = 20 + (i + 1) / total_paragraphs * 60
-            progress_bar.progress(int(progress_value))
+        agent._process_paragraphs(on_paragraph_done)
 
         # 生成最终报告
         status_text.text("正在生成最终报告...")
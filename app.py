@@ -245,6 +245,12 @@ def initialize_system_components():
 
     processes['forum']['status'] = 'stopped'
 
+    # 先启动情感分析服务，Streamlit 子进程启动时继承服务地址；失败不影响系统启动
+    service_started, service_message = start_sentiment_service()
+    logs.append(f"sentiment_service: {service_message}")
+    if not service_started:
+        logger.warning(service_message)
+
     for app_name, script_path in STREAMLIT_SCRIPTS.items():
         logs.append(f"检查文件: {script_path}")
         if os.path.exists(script_path):
@@ -451,6 +457,9 @@ processes = {
     'forum': {'process': None, 'port': None, 'status': 'stopped', 'output': [], 'log_file': None}  # 启动后标记为 running
 }
 
+# 共享情感分析服务进程（由 start_sentiment_service 管理）
+sentiment_service = {'process': None, 'log_file': None}
+
 STREAMLIT_SCRIPTS = {
     'insight': 'SingleEngineApp/insight_engine_streamlit_app.py',
     'media': 'SingleEngineApp/media_engine_streamlit_app.py',
@@ -660,6 +669,83 @@ def stop_streamlit_app(app_name):
     except Exception as e:
         return False, f"停止失败: {str(e)}"
 
+def start_sentiment_service(max_wait_time=15):
+    """
+    启动共享情感分析服务（独占情感模型的推理进程）。
+
+    启动成功后设置环境变量 SENTIMENT_SERVICE_URL，之后启动的 Streamlit 子进程继承该变量，
+    情感分析请求都发往这个服务，不再各自加载一份模型。启动失败时各引擎自动回退到进程内推理。
+    """
+    from config import settings
+
+    if settings.SENTIMENT_SERVICE_URL:
+        return True, f"使用已配置的情感分析服务: {settings.SENTIMENT_SERVICE_URL}"
+    if not settings.SENTIMENT_SERVICE_AUTOSTART:
+        return False, "未开启情感分析服务自动启动"
+
+    url = f"http://{settings.SENTIMENT_SERVICE_HOST}:{settings.SENTIMENT_SERVICE_PORT}"
+
+    def _service_alive():
+        # 模型仍在加载（loading）也算存活：各引擎连接时会短暂等待，未就绪则先在进程内推理并稍后重新探测
+        try:
+            response = requests.get(f"{url}/health", timeout=2)
+            return response.status_code == 200 and response.json().get("status") != "disabled"
+        except (requests.exceptions.RequestException, ValueError):
+            return False
+
+    if sentiment_service['process'] is None and _service_alive():
+        # 上一次启动遗留的服务仍在运行，直接复用
+        os.environ['SENTIMENT_SERVICE_URL'] = url
+        return True, f"复用已运行的情感分析服务: {url}"
+    if sentiment_service['process'] is not None and sentiment_service['process'].poll() is None:
+        return True, f"情感分析服务已在运行: {url}"
+
+    env = os.environ.copy()
+    env.update({
+        'PYTHONIOENCODING': 'utf-8',
+        'PYTHONUTF8': '1',
+        'PYTHONUNBUFFERED': '1',
+    })
+    log_file = open(LOG_DIR / 'sentiment_service.log', 'w', encoding='utf-8')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'InsightEngine.tools.sentiment_service', '--serve',
+         '--host', settings.SENTIMENT_SERVICE_HOST, '--port', str(settings.SENTIMENT_SERVICE_PORT)],
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+        cwd=os.getcwd(),
+        env=env,
+        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+    )
+    sentiment_service.update({'process': process, 'log_file': log_file})
+
+    # HTTP 服务先启动，模型在服务内部后台加载，这里只等待接口可访问
+    start_time = time.time()
+    while time.time() - start_time < max_wait_time:
+        if process.poll() is not None:
+            break
+        if _service_alive():
+            os.environ['SENTIMENT_SERVICE_URL'] = url
+            return True, f"情感分析服务已启动: {url}"
+        time.sleep(0.5)
+
+    stop_sentiment_service()
+    return False, "情感分析服务启动失败，各引擎将在进程内加载情感模型（详见 logs/sentiment_service.log）"
+
+def stop_sentiment_service():
+    """停止共享情感分析服务"""
+    process = sentiment_service['process']
+    if process is not None:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    if sentiment_service['log_file'] is not None:
+        sentiment_service['log_file'].close()
+    sentiment_service.update({'process': None, 'log_file': None})
+    os.environ.pop('SENTIMENT_SERVICE_URL', None)
+
 def check_app_status():
     """检查应用状态"""
     for app_name, info in processes.items():
@@ -709,6 +795,7 @@ def cleanup_processes():
     """清理所有进程"""
     for app_name in STREAMLIT_SCRIPTS:
         stop_streamlit_app(app_name)
+    stop_sentiment_service()
 
     processes['forum']['status'] = 'stopped'
     try:
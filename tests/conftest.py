@@ -0,0 +1,16 @@
+"""
+pytest 公共配置
+
+导入 InsightEngine 包时会创建关键词优化中间件，未配置 KEYWORD_OPTIMIZER_API_KEY 会直接报错；
+单元测试不调用外部 API，这里给一个占位值。
+"""
+
+import os
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "utils"))
+
+os.environ.setdefault("KEYWORD_OPTIMIZER_API_KEY", "test")
@@ -0,0 +1,155 @@
+"""
+测试InsightEngine/utils/fulltext.py中的本地倒排索引后端：候选召回、更新行的倒排项清理、
+未构建表回退LIKE、持久化，以及按水位线增量同步（同步部分使用SQLite临时库，依赖 aiosqlite）
+"""
+
+import asyncio
+
+import pytest
+
+from InsightEngine.utils import fulltext
+from InsightEngine.utils.fulltext import LocalInvertedIndexBackend
+
+
+def _index(**kwargs):
+    return LocalInvertedIndexBackend(index_path="", **kwargs)
+
+
+def _built_index(docs, **kwargs):
+    index = _index(**kwargs)
+    for doc_id, text in docs.items():
+        index.add_document("t", doc_id, text)
+    index._watermarks["t"] = (100, max(docs))
+    return index
+
+
+class TestCandidates:
+    """测试二元组倒排表求交得到的候选集"""
+
+    def test_candidates_are_superset_of_substring_matches(self):
+        docs = {1: "今天天气很好", 2: "天气预报说有雨", 3: "今天加班", 4: "气天"}
+        index = _built_index(docs)
+        ids = index.candidates("t", "天气")
+        assert set(ids) >= {doc_id for doc_id, text in docs.items() if "天气" in text}
+        assert 3 not in ids and 4 not in ids
+        assert ids == sorted(ids, reverse=True)
+
+    def test_whitespace_and_case_are_ignored(self):
+        index = _built_index({1: "Hello World"})
+        assert index.candidates("t", "OW") == [1]
+
+    def test_short_term_cannot_use_index(self):
+        index = _built_index({1: "天气"})
+        assert index.candidates("t", "天") is None
+
+    def test_too_many_candidates_fall_back_to_like(self):
+        index = _built_index({i: "天气" for i in range(1, 6)}, max_candidates=3)
+        assert index.candidates("t", "天气") is None
+
+    def test_updated_document_drops_old_tokens(self):
+        index = _built_index({1: "今天天气很好"})
+        index.add_document("t", 1, "明日有雨")
+        assert index.candidates("t", "天气") == []
+        assert index.candidates("t", "有雨") == [1]
+        assert "天气" not in index._postings["t"]
+
+
+class TestMatchClause:
+    """测试生成的匹配子句"""
+
+    def test_unbuilt_table_uses_like(self):
+        sql, params = _index().match_clause("t", ["content"], "天气", "term")
+        assert "IN" not in sql and params == {"term_0": "%天气%"}
+
+    def test_candidates_and_unsynced_rows(self):
+        sql, params = _built_index({7: "天气", 8: "下雨"}).match_clause("t", ["content"], "天气", "term")
+        assert "IN (7)" in sql
+        assert params == {"term_0": "%天气%", "term_wts": 100, "term_wid": 8}
+
+    def test_no_candidates_still_matches_unsynced_rows(self):
+        sql, params = _built_index({8: "下雨"}).match_clause("t", ["content"], "天气", "term")
+        assert "IN" not in sql and "term_wts" in params
+
+
+class TestPersistence:
+    """测试索引文件的保存与加载"""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "index.pkl")
+        index = LocalInvertedIndexBackend(index_path=path)
+        index.add_document("t", 1, "今天天气很好")
+        index._watermarks["t"] = (5, 1)
+        index.save(path)
+
+        loaded = LocalInvertedIndexBackend(index_path=path)
+        assert loaded.is_built("t")
+        assert loaded.candidates("t", "天气") == [1]
+        loaded.add_document("t", 1, "明日有雨")
+        assert loaded.candidates("t", "天气") == []
+
+    def test_outdated_format_is_ignored(self, tmp_path):
+        import pickle
+        path = tmp_path / "index.pkl"
+        path.write_bytes(pickle.dumps({"postings": {"t": {"天气": {1}}}, "watermarks": {"t": (0, 1)}}))
+        assert not LocalInvertedIndexBackend(index_path=str(path)).is_built("t")
+
+
+class TestSync:
+    """测试离线构建与查询前的限时增量同步"""
+
+    @pytest.fixture
+    def sqlite_engine(self, tmp_path, monkeypatch):
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import NullPool
+        from InsightEngine.utils import db
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'fulltext.db'}", poolclass=NullPool)
+        monkeypatch.setattr(db, "_engine", engine)
+        monkeypatch.setattr(fulltext, "quote_identifier", lambda name: f'"{name}"')
+        return engine
+
+    @staticmethod
+    async def _execute(engine, statement, params=None):
+        from sqlalchemy import text
+        async with engine.begin() as conn:
+            result = await conn.execute(text(statement), params or {})
+            return result.fetchall() if result.returns_rows else None
+
+    def test_build_then_bounded_sync(self, sqlite_engine, monkeypatch):
+        monkeypatch.setattr(LocalInvertedIndexBackend, "SYNC_BATCH_SIZE", 2)
+        index = _index()
+
+        async def scenario():
+            await self._execute(sqlite_engine, "CREATE TABLE t (id INTEGER PRIMARY KEY, "
+                                               "last_modify_ts BIGINT NOT NULL DEFAULT 0, content TEXT)")
+            await self._execute(sqlite_engine, "INSERT INTO t VALUES (:id, :ts, :content)",
+                                [{"id": 1, "ts": 10, "content": "今天天气很好"},
+                                 {"id": 2, "ts": 10, "content": "下雨"},
+                                 {"id": 3, "ts": 20, "content": "天气预报"}])
+
+            await index.prepare("t", ["content"])
+            assert not index.is_built("t")
+
+            stats = await index.build({"t": ["content"]})
+            await self._execute(sqlite_engine, "INSERT INTO t VALUES (4, 30, '天气转晴')")
+            await self._execute(sqlite_engine, "UPDATE t SET content = '多云', last_modify_ts = 40 WHERE id = 1")
+
+            # 不在查询中同步：新行与更新行都在水位线之后，仍由数据库直接匹配
+            monkeypatch.setattr(fulltext.settings, "FULLTEXT_LOCAL_INLINE_SYNC_SECONDS", 0)
+            await index.prepare("t", ["content"])
+            sql, params = index.match_clause("t", ["content"], "天气", "term")
+            unsynced = await self._execute(sqlite_engine, f"SELECT id FROM t WHERE {sql} ORDER BY id", params)
+
+            monkeypatch.setattr(fulltext.settings, "FULLTEXT_LOCAL_INLINE_SYNC_SECONDS", 5)
+            await index.prepare("t", ["content"])
+            sql, params = index.match_clause("t", ["content"], "天气", "term")
+            synced = await self._execute(sqlite_engine, f"SELECT id FROM t WHERE {sql} ORDER BY id", params)
+            return stats, unsynced, synced
+
+        stats, unsynced, synced = asyncio.run(scenario())
+        assert stats == {"t": 3}
+        assert [row[0] for row in unsynced] == [3, 4]
+        assert [row[0] for row in synced] == [3, 4]
+        assert index._watermarks["t"] == (40, 1)
+        assert index.candidates("t", "天气") == [4, 3]
@@ -0,0 +1,121 @@
+"""
+测试utils/llm_cache.py中的LLM响应缓存，以及LLMClient只缓存通过校验的响应
+"""
+
+import time
+
+import llm_cache
+import llm_client
+from llm_cache import LLMResponseCache, make_cache_key
+
+
+class TestCacheKey:
+    """测试缓存键"""
+
+    def test_time_prefix_is_ignored(self):
+        """客户端注入的当前时间不影响缓存键"""
+        assert make_cache_key("m", "s", "今天的实际时间是2024年01月01日10时00分\n问题") == make_cache_key("m", "s", "问题")
+
+    def test_sampling_params_change_key(self):
+        """采样参数参与缓存键，timeout 等其它参数不参与"""
+        base = make_cache_key("m", "s", "u", {"temperature": 0.7})
+        assert make_cache_key("m", "s", "u", {"temperature": 0.7, "timeout": 30}) == base
+        assert make_cache_key("m", "s", "u", {"temperature": 0.2}) != base
+        assert make_cache_key("other", "s", "u", {"temperature": 0.7}) != base
+
+
+class TestLLMResponseCache:
+    """测试读写、过期、淘汰与清除"""
+
+    def _cache(self, tmp_path, **kwargs):
+        return LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"), **kwargs)
+
+    def test_store_and_lookup(self, tmp_path):
+        cache = self._cache(tmp_path)
+        assert cache.lookup("Node", "m", "s", "u") is None
+        cache.store("Node", "m", "s", "u", "响应")
+        assert cache.lookup("Node", "m", "s", "u") == "响应"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    def test_empty_response_is_not_stored(self, tmp_path):
+        cache = self._cache(tmp_path)
+        cache.store("Node", "m", "s", "u", "")
+        assert cache.stats()["entries"] == 0
+
+    def test_expired_entry_is_dropped(self, tmp_path, monkeypatch):
+        cache = self._cache(tmp_path, ttl_seconds=60)
+        cache.store("Node", "m", "s", "u", "响应")
+        now = time.time()
+        monkeypatch.setattr(llm_cache.time, "time", lambda: now + 61)
+        assert cache.lookup("Node", "m", "s", "u") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_least_recently_hit_entry_is_evicted(self, tmp_path, monkeypatch):
+        cache = self._cache(tmp_path, max_entries=2)
+        clock = iter(range(1000, 2000))
+        monkeypatch.setattr(llm_cache.time, "time", lambda: next(clock))
+        cache.store("Node", "m", "s", "a", "A")
+        cache.store("Node", "m", "s", "b", "B")
+        assert cache.lookup("Node", "m", "s", "a") == "A"
+        cache.store("Node", "m", "s", "c", "C")
+        assert cache.lookup("Node", "m", "s", "b") is None
+        assert cache.lookup("Node", "m", "s", "a") == "A"
+        assert cache.lookup("Node", "m", "s", "c") == "C"
+
+    def test_evict(self, tmp_path):
+        cache = self._cache(tmp_path)
+        cache.store("Node", "m", "s", "u", "响应", {"temperature": 0.7})
+        cache.evict("Node", "m", "s", "u", {"temperature": 0.7})
+        assert cache.lookup("Node", "m", "s", "u", {"temperature": 0.7}) is None
+
+    def test_persists_across_instances(self, tmp_path):
+        self._cache(tmp_path).store("Node", "m", "s", "u", "响应")
+        assert self._cache(tmp_path).lookup("Node", "m", "s", "u") == "响应"
+
+
+class _ScriptedClient(llm_client.LLMClient):
+    """按顺序返回预设响应的 LLMClient，记录实际请求次数"""
+
+    def __init__(self, responses):
+        super().__init__("InsightEngine", "key", "model")
+        self.responses = list(responses)
+        self.calls = 0
+
+    def stream_invoke(self, system_prompt, user_prompt, **kwargs):
+        self.calls += 1
+        yield self.responses.pop(0)
+
+
+class TestValidatedCaching:
+    """测试 stream_invoke_to_string 只缓存通过校验的响应"""
+
+    def setup_method(self):
+        self.validate = lambda output: output.startswith("{")
+
+    def _use_cache(self, tmp_path, monkeypatch):
+        cache = LLMResponseCache(str(tmp_path / "llm_cache.sqlite3"))
+        monkeypatch.setattr(llm_client, "get_llm_cache", lambda node: cache)
+        return cache
+
+    def test_invalid_response_is_not_cached(self, tmp_path, monkeypatch):
+        cache = self._use_cache(tmp_path, monkeypatch)
+        client = _ScriptedClient(["不是JSON", "{}"])
+        assert client.stream_invoke_to_string("s", "u", cache_node="Node", validate=self.validate) == "不是JSON"
+        assert cache.stats()["entries"] == 0
+        assert client.stream_invoke_to_string("s", "u", cache_node="Node", validate=self.validate) == "{}"
+        assert client.stream_invoke_to_string("s", "u", cache_node="Node", validate=self.validate) == "{}"
+        assert client.calls == 2
+
+    def test_invalid_cached_entry_is_evicted_and_refetched(self, tmp_path, monkeypatch):
+        cache = self._use_cache(tmp_path, monkeypatch)
+        cache.store("Node", "model", "s", "u", "旧的无效响应")
+        client = _ScriptedClient(["{}"])
+        assert client.stream_invoke_to_string("s", "u", cache_node="Node", validate=self.validate) == "{}"
+        assert client.calls == 1
+        assert cache.lookup("Node", "model", "s", "u") == "{}"
+
+    def test_nothing_is_cached_without_validator(self, tmp_path, monkeypatch):
+        cache = self._use_cache(tmp_path, monkeypatch)
+        _ScriptedClient(["{}"]).stream_invoke_to_string("s", "u", cache_node="Node")
+        assert cache.stats()["entries"] == 0
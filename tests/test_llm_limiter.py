@@ -0,0 +1,133 @@
+"""
+测试utils/llm_limiter.py中按服务商共享的限流器（同步线程与协程共用同一份名额）
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_limiter import ProviderLimiter, TokenBucket, get_provider_limiter
+
+
+class _Peak:
+    """记录同时持有名额的最大数量"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def enter(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def exit(self):
+        with self._lock:
+            self.active -= 1
+
+
+class TestTokenBucket:
+    """测试令牌桶"""
+
+    def test_burst_then_wait(self):
+        """容量内的请求无需等待，之后按速率排队"""
+        bucket = TokenBucket(rate=10, capacity=2)
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert 0.05 < bucket.reserve() <= 0.1
+        assert 0.15 < bucket.reserve() <= 0.2
+
+    def test_acquire_paces_requests(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+        started = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        assert time.monotonic() - started >= 0.09
+
+
+class TestProviderLimiter:
+    """测试并发上限与注册表"""
+
+    def test_registry_is_keyed_by_base_url(self):
+        """同一 base_url（忽略末尾斜杠）共享限流器，限额以首次创建为准"""
+        first = get_provider_limiter("https://limiter-test.example/v1/", max_concurrency=3)
+        assert get_provider_limiter("https://limiter-test.example/v1", max_concurrency=9) is first
+        assert first.max_concurrency == 3
+        assert get_provider_limiter("https://other-limiter-test.example/v1") is not first
+
+    def test_sync_and_async_share_concurrency(self):
+        """线程与协程同时请求时，合计持有的名额不超过上限"""
+        limiter = ProviderLimiter(max_concurrency=2)
+        peak = _Peak()
+
+        def sync_call(_):
+            with limiter:
+                peak.enter()
+                time.sleep(0.05)
+                peak.exit()
+
+        async def async_call():
+            async with limiter:
+                peak.enter()
+                await asyncio.sleep(0.05)
+                peak.exit()
+
+        async def async_calls():
+            await asyncio.gather(*(async_call() for _ in range(4)))
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            async_future = executor.submit(asyncio.run, async_calls())
+            list(executor.map(sync_call, range(4)))
+            async_future.result(timeout=10)
+
+        assert peak.peak == 2
+        assert peak.active == 0
+
+    def test_cancelled_waiter_does_not_leak_slot(self):
+        """等待名额的协程被取消后，名额数量不变"""
+        limiter = ProviderLimiter(max_concurrency=1)
+
+        async def scenario():
+            with limiter:
+                async def waiter():
+                    async with limiter:
+                        pass
+
+                task = asyncio.create_task(waiter())
+                await asyncio.sleep(0.1)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            async with limiter:
+                return True
+
+        assert asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+    def test_granted_then_cancelled_waiter_passes_slot_on(self):
+        """名额已交给等待中的协程、它却在恢复前被取消时，名额转交给下一个等待者"""
+        limiter = ProviderLimiter(max_concurrency=1)
+
+        async def scenario():
+            await limiter.__aenter__()
+            entered = []
+
+            async def waiter(name):
+                async with limiter:
+                    entered.append(name)
+
+            first = asyncio.create_task(waiter("first"))
+            second = asyncio.create_task(waiter("second"))
+            await asyncio.sleep(0.05)
+            await limiter.__aexit__(None, None, None)
+            first.cancel()
+            await asyncio.gather(first, return_exceptions=True)
+            await asyncio.wait_for(second, timeout=2)
+            return entered
+
+        assert asyncio.run(scenario()) == ["second"]
+
+    def test_unlimited_limiter_does_not_block(self):
+        limiter = ProviderLimiter()
+        with limiter, limiter:
+            pass
@@ -0,0 +1,81 @@
+"""
+测试utils/llm_registry.py中流式响应的SSE解析：多行data拼接、注释行与其它字段忽略、
+[DONE] 之后继续读完响应体（连接可复用）、流内错误转为APIError（以假响应代替HTTP请求）
+"""
+
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import APIError
+
+import llm_registry
+from llm_registry import _iter_sse_data, stream_chat_completion
+
+
+class FakeResponse:
+    """按给定的行返回响应体，记录读取了多少行"""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.consumed = 0
+        self.http_request = httpx.Request("POST", "https://llm.example/v1/chat/completions")
+
+    def iter_lines(self):
+        for line in self.lines:
+            self.consumed += 1
+            yield line
+
+
+def _chunk(content):
+    return "data: " + json.dumps({"choices": [{"delta": {"content": content}}]})
+
+
+class TestSSEParser:
+    """SSE 事件解析"""
+
+    def test_events_split_on_blank_lines(self):
+        response = FakeResponse([_chunk("你"), "", _chunk("好"), ""])
+        assert [c["choices"][0]["delta"]["content"] for c in _iter_sse_data(response)] == ["你", "好"]
+
+    def test_multiline_data_is_joined(self):
+        response = FakeResponse(['data: {"a":', "data:1}", ""])
+        assert list(_iter_sse_data(response)) == [{"a": 1}]
+
+    def test_comments_and_other_fields_are_ignored(self):
+        response = FakeResponse([": keep-alive", "", "event: message", "id: 7", "retry: 1000", 'data: {"a": 1}', ""])
+        assert list(_iter_sse_data(response)) == [{"a": 1}]
+
+    def test_last_event_without_trailing_blank_line(self):
+        assert list(_iter_sse_data(FakeResponse(['data: {"a": 1}']))) == [{"a": 1}]
+
+    def test_done_stops_events_but_drains_body(self):
+        response = FakeResponse(['data: {"a": 1}', "", "data: [DONE]", "", 'data: {"a": 2}', "", ": tail"])
+        assert list(_iter_sse_data(response)) == [{"a": 1}]
+        assert response.consumed == len(response.lines)
+
+    def test_error_payload_raises_api_error(self):
+        response = FakeResponse(['data: {"error": {"message": "rate limited"}}', ""])
+        with pytest.raises(APIError, match="rate limited"):
+            list(_iter_sse_data(response))
+
+
+def test_stream_chat_completion_yields_content_and_usage(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(llm_registry.llm_metrics, "record", lambda engine, seconds, **kw: recorded.append((engine, kw)))
+    usage = {"prompt_tokens": 3, "completion_tokens": 2}
+    response = FakeResponse([": ping", "", _chunk("你"), "", _chunk("好"), "",
+                             "data: " + json.dumps({"choices": [], "usage": usage}), "", "data: [DONE]", ""])
+
+    @contextmanager
+    def create(stream, **kwargs):
+        yield response
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        with_streaming_response=SimpleNamespace(create=create))))
+    assert list(stream_chat_completion(client, "InsightEngine", model="m", messages=[])) == ["你", "好"]
+    (engine, kwargs), = recorded
+    assert engine == "InsightEngine"
+    assert kwargs["usage"] == usage and kwargs["error"] is False
@@ -0,0 +1,87 @@
+"""
+测试utils/prompt_budget.py中总结节点输入的token预算裁剪
+
+统一按无 tiktoken 时的字符估算计数（中文每字 1 个 token，其它字符每 4 个 1 个 token），结果与环境无关。
+"""
+
+import pytest
+
+import prompt_budget
+from prompt_budget import (
+    budget_summary_input,
+    count_tokens,
+    pack_search_results,
+    rank_search_results,
+    truncate_to_tokens,
+)
+
+
+@pytest.fixture(autouse=True)
+def _estimate_tokens(monkeypatch):
+    monkeypatch.setattr(prompt_budget, "_get_encoding", lambda: None)
+
+
+class TestTokenCounting:
+    """测试计数与截断"""
+
+    def test_count_tokens_estimate(self):
+        assert count_tokens(None) == 0
+        assert count_tokens("你好") == 2
+        assert count_tokens("abcd") == 1
+        assert count_tokens("abcde") == 2
+        assert count_tokens("你好abcd") == 3
+
+    def test_truncate_within_budget_is_unchanged(self):
+        assert truncate_to_tokens("你好", 5) == "你好"
+        assert truncate_to_tokens("你好", 0) == ""
+
+    def test_truncate_to_budget(self):
+        truncated = truncate_to_tokens("舆" * 100, 10)
+        assert truncated.endswith("...")
+        assert count_tokens(truncated) <= 10
+
+
+class TestPacking:
+    """测试按相关度装入搜索结果"""
+
+    def test_rank_prefers_relevant_results(self):
+        results = ["今日体育新闻汇总", "无关内容", "新能源汽车销量创新高，新能源车企竞争加剧"]
+        assert rank_search_results("新能源汽车销量", results)[0] == 2
+
+    def test_rank_keeps_order_without_query(self):
+        assert rank_search_results("", ["a", "b", "c"]) == [0, 1, 2]
+
+    def test_pack_respects_budget(self):
+        results = ["新能源汽车" * 100, "新能源汽车销量" * 10, "天气" * 50]
+        packed = pack_search_results("新能源汽车销量", results, 300)
+        assert sum(count_tokens(result) for result in packed) <= 300
+        assert packed[0] == results[1]
+
+    def test_pack_skips_results_that_do_not_fit(self):
+        """剩余预算不足 MIN_TRUNCATED_TOKENS 时跳过放不下的结果，继续尝试更短的"""
+        results = ["甲" * 150, "乙" * 150, "丙" * 100, "丁" * 10]
+        packed = pack_search_results("", results, 320)
+        assert packed == [results[0], results[1], results[3]]
+
+
+class TestBudgetSummaryInput:
+    """测试总结节点输入的整体预算"""
+
+    def _data(self):
+        return {
+            "title": "段落标题",
+            "content": "段落内容",
+            "search_query": "新能源汽车销量",
+            "search_results": ["新能源汽车销量" * 200, "天气" * 300, "新能源汽车" * 50],
+        }
+
+    def test_budget_trims_search_results(self):
+        data = self._data()
+        trimmed = budget_summary_input("FirstSummaryNode", "系统提示词", data, 1000)
+        assert sum(count_tokens(result) for result in trimmed["search_results"]) <= 1000
+        assert trimmed["title"] == data["title"]
+        assert data["search_results"] == self._data()["search_results"]
+
+    def test_zero_budget_keeps_everything(self):
+        data = self._data()
+        assert budget_summary_input("FirstSummaryNode", "系统提示词", data, 0)["search_results"] == data["search_results"]
@@ -0,0 +1,101 @@
+"""
+测试InsightEngine/utils/query_cache.py：缓存键、memory后端的TTL过期与LRU淘汰、命中统计，
+以及由水位线计算数据版本时不触发刷新
+"""
+
+import pytest
+
+from InsightEngine.utils import query_cache
+from InsightEngine.utils.query_cache import MemoryCacheBackend, QueryCache, make_cache_key
+
+
+class TestCacheKey:
+    """缓存键"""
+
+    def test_key_is_stable_and_order_independent(self):
+        a = make_cache_key("search_topic_globally", {"topic": ["a", "b"], "limit_per_table": 10}, {"weibo_note": 1})
+        b = make_cache_key("search_topic_globally", {"limit_per_table": 10, "topic": ["a", "b"]}, {"weibo_note": 1})
+        assert a == b
+        assert a.startswith("insight:query:search_topic_globally:")
+
+    def test_key_changes_with_params_tool_and_version(self):
+        base = make_cache_key("tool", {"limit": 10}, {"t": 1})
+        assert make_cache_key("tool", {"limit": 11}, {"t": 1}) != base
+        assert make_cache_key("other", {"limit": 10}, {"t": 1}) != base
+        assert make_cache_key("tool", {"limit": 10}, {"t": 2}) != base
+
+
+class TestMemoryBackend:
+    """进程内 LRU + TTL"""
+
+    def test_ttl_expiry(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(query_cache.time, "monotonic", lambda: now[0])
+        backend = MemoryCacheBackend(max_entries=10, ttl_seconds=5)
+        backend.set("k", "v")
+        assert backend.get("k") == "v"
+        now[0] += 6
+        assert backend.get("k") is query_cache._MISSING
+        assert backend.evictions == 1
+        assert backend.size() == 0
+
+    def test_lru_eviction_keeps_recently_used(self):
+        backend = MemoryCacheBackend(max_entries=2, ttl_seconds=60)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        assert backend.get("a") == 1  # a 成为最近使用
+        backend.set("c", 3)
+        assert backend.get("b") is query_cache._MISSING
+        assert backend.get("a") == 1
+        assert backend.get("c") == 3
+        assert backend.evictions == 1
+
+
+class TestQueryCache:
+    """命中统计与禁用"""
+
+    def test_stats(self):
+        cache = QueryCache(MemoryCacheBackend(max_entries=4, ttl_seconds=60))
+        assert cache.get("k") is None
+        cache.set("k", {"rows": 1})
+        assert cache.get("k") == {"rows": 1}
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["sets"], stats["size"]) == (1, 1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_disabled_cache_never_stores(self):
+        cache = QueryCache(MemoryCacheBackend(max_entries=4, ttl_seconds=60), enabled=False)
+        cache.set("k", 1)
+        assert cache.get("k") is None
+        assert cache.stats()["sets"] == 0
+
+
+class TestSourceVersions:
+    """由已读取的水位线计算数据版本"""
+
+    WATERMARKS = {"weibo_note": {"last_modify_ts": 5, "last_id": 1, "refreshed_at": 0},
+                  "xhs_note": {"last_modify_ts": None, "last_id": 0, "refreshed_at": 0}}
+
+    def test_versions_from_watermarks(self):
+        assert query_cache.source_versions(self.WATERMARKS, []) == {"weibo_note": 5, "xhs_note": 0}
+
+    def test_pending_refresh_skips_cache(self):
+        assert query_cache.source_versions(self.WATERMARKS, ["weibo_note"]) is None
+
+    def test_hotness_versions_do_not_refresh(self, monkeypatch):
+        from InsightEngine.utils import hotness
+        from InsightEngine.utils.config import settings
+
+        watermarks = {table: {"last_modify_ts": 1, "last_id": 1, "refreshed_at": 0} for table in hotness.HOTNESS_SOURCES}
+        monkeypatch.setattr(settings, "HOTNESS_INLINE_REFRESH_SECONDS", 1.0)
+        # 全部过期：需要刷新，版本为 None（不在这里刷新）
+        assert hotness.source_versions(watermarks, max_staleness=60) is None
+        monkeypatch.setattr(settings, "HOTNESS_INLINE_REFRESH_SECONDS", 0)
+        assert hotness.source_versions(watermarks, max_staleness=60) == {table: 1 for table in hotness.HOTNESS_SOURCES}
+
+    def test_unbuilt_rollup_raises(self):
+        from InsightEngine.utils import hotness
+        from InsightEngine.utils.watermark import WatermarkNotBuilt
+
+        with pytest.raises(WatermarkNotBuilt):
+            hotness.source_versions({}, max_staleness=60)
@@ -0,0 +1,83 @@
+"""
+测试InsightEngine/tools/search.py在源表尚未迁移出 publish_ts / likes_num 列时回退到原始列的SQL生成
+（替换 _execute_query 捕获生成的SQL，不连接数据库）
+"""
+
+from datetime import datetime
+
+import pytest
+
+from InsightEngine.tools.search import MediaCrawlerDB
+from InsightEngine.utils.config import settings
+
+MIGRATED = ['id', 'publish_ts', 'likes_num']
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(settings, "DB_DIALECT", "mysql")
+    monkeypatch.setattr(MediaCrawlerDB, "_table_columns_cache", {})
+    monkeypatch.setattr(MediaCrawlerDB, "_legacy_tables_warned", set())
+    client = MediaCrawlerDB()
+    client.captured = []
+    client._execute_query = lambda query, params: client.captured.append((query, params)) or []
+    return client
+
+
+class TestTimeRangeClause:
+    """时间范围子句"""
+
+    def test_migrated_table_uses_publish_ts(self, db):
+        db._table_columns_cache['bilibili_video'] = MIGRATED
+        clause, params = db._build_time_range_clause('bilibili_video', datetime(2025, 1, 1), datetime(2025, 2, 1))
+        assert clause == "(`publish_ts` >= :t_start AND `publish_ts` < :t_end)"
+        assert params == {'t_start': int(datetime(2025, 1, 1).timestamp() * 1000),
+                          't_end': int(datetime(2025, 2, 1).timestamp() * 1000)}
+
+    def test_legacy_tables_use_original_time_columns(self, db):
+        db._table_columns_cache.update({'zhihu_content': ['id', 'created_time'], 'weibo_note': ['id', 'create_date_time']})
+        clause, params = db._build_time_range_clause('zhihu_content', datetime(2025, 1, 1), datetime(2025, 2, 1))
+        assert clause.startswith("(CAST(`created_time` AS UNSIGNED) >= :t_start")
+        assert params['t_start'] == int(datetime(2025, 1, 1).timestamp())
+        clause, params = db._build_time_range_clause('weibo_note', datetime(2025, 1, 1), param_prefix="w")
+        assert clause == "(`create_date_time` >= :w_start)"
+        assert params == {'w_start': '2025-01-01 00:00:00'}
+
+    def test_legacy_comment_table_has_no_time_filter(self, db):
+        db._table_columns_cache['weibo_note_comment'] = ['id', 'content', 'create_date_time']
+        assert db._build_time_range_clause('weibo_note_comment', datetime(2025, 1, 1), datetime(2025, 2, 1)) == ("1=1", {})
+
+    def test_unknown_columns_assume_migrated(self, db):
+        # information_schema 读不到列清单时按已迁移处理
+        db._table_columns_cache['xhs_note'] = []
+        clause, _ = db._build_time_range_clause('xhs_note', datetime(2025, 1, 1), datetime(2025, 2, 1))
+        assert '`publish_ts`' in clause
+
+
+class TestLegacyQueries:
+    """热点内容与话题评论的回退查询"""
+
+    def test_hot_content_mixes_migrated_and_legacy_tables(self, db):
+        for table in ['bilibili_video', 'douyin_aweme', 'kuaishou_video', 'xhs_note', 'zhihu_content']:
+            db._table_columns_cache[table] = MIGRATED
+        db._table_columns_cache['weibo_note'] = ['id', 'content', 'liked_count', 'create_date_time']
+        db._search_hot_content_live(datetime(2025, 1, 1), 10)
+        (query, params), = db.captured
+        assert "COALESCE(CAST(`liked_count` AS UNSIGNED), 0) as likes_num" in query
+        assert "CAST(`create_date_time` AS CHAR) as ts" in query
+        assert "CAST(`publish_ts` AS CHAR) as ts" in query
+        assert params['t2_start'] == '2025-01-01 00:00:00'
+        assert params['t0_start'] == int(datetime(2025, 1, 1).timestamp() * 1000)
+
+    def test_comments_fall_back_to_like_and_time_columns(self, db, monkeypatch):
+        monkeypatch.setattr(settings, "SOCIAL_PROJECTION_ENABLED", False)
+        monkeypatch.setattr(db, "_prepare_topic_backend", lambda table_fields: None)
+        for table in ['bilibili_video_comment', 'douyin_aweme_comment', 'kuaishou_video_comment', 'xhs_note_comment',
+                      'zhihu_comment', 'tieba_comment']:
+            db._table_columns_cache[table] = MIGRATED + ['content', 'nickname']
+        db._table_columns_cache['weibo_note_comment'] = ['id', 'content', 'nickname', 'comment_like_count', 'create_date_time']
+        db.get_comments_for_topic.__wrapped__(db, "话题", limit=10)
+        query = db.captured[-1][0]
+        assert "COALESCE(CAST(`comment_like_count` AS UNSIGNED), 0) as likes" in query
+        assert "CAST(`create_date_time` AS CHAR) as ts" in query
+        assert "`likes_num` as likes" in query
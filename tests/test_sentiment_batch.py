@@ -0,0 +1,87 @@
+"""
+测试InsightEngine/tools/sentiment_analyzer.py中analyze_batch的批量推理：结果顺序与输入一致、
+按token长度分批、相同内容只推理一次、整批失败逐条重试（以桩替换分词器与模型，不需要PyTorch）
+"""
+
+import numpy as np
+import pytest
+
+from InsightEngine.tools import sentiment_analyzer
+from InsightEngine.tools.sentiment_analyzer import WeiboMultilingualSentimentAnalyzer
+
+
+def _probabilities(label, num_labels=5):
+    row = [0.05] * num_labels
+    row[label] = 1.0 - 0.05 * (num_labels - 1)
+    return row
+
+
+class StubAnalyzer(WeiboMultilingualSentimentAnalyzer):
+    """以文本长度决定类别（长度 % 5）的桩模型，记录每次前向推理的批次"""
+
+    def __init__(self):
+        super().__init__(use_service=False)
+        self.is_disabled, self.disable_reason, self.is_initialized = False, None, True
+        self.batches = []
+        self.fail_batches = False
+
+    def _encode(self, texts):
+        return [[ord(ch) for ch in text] for text in texts]
+
+    def _predict_encoded(self, encoded):
+        if self.fail_batches and len(encoded) > 1:
+            raise RuntimeError("batch failed")
+        self.batches.append([len(ids) for ids in encoded])
+        return [(len(ids) % 5, _probabilities(len(ids) % 5)) for ids in encoded]
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(sentiment_analyzer, "get_sentiment_cache", lambda: None)
+    monkeypatch.setattr(sentiment_analyzer, "get_fast_sentiment_model", lambda: None)
+    return StubAnalyzer()
+
+
+class TestAnalyzeBatch:
+    """批量推理"""
+
+    def test_results_follow_input_order(self, analyzer):
+        texts = ["a" * n for n in (7, 1, 4, 9, 2, 3)]
+        batch = analyzer.analyze_batch(texts, show_progress=False, batch_size=2)
+        assert [r.text for r in batch.results] == texts
+        assert [r.sentiment_label for r in batch.results] == [analyzer.sentiment_map[len(t) % 5] for t in texts]
+        assert batch.success_count == len(texts)
+        np.testing.assert_allclose(batch.probabilities[0], _probabilities(7 % 5))
+
+    def test_batches_are_sorted_by_length(self, analyzer):
+        analyzer.analyze_batch(["a" * n for n in (7, 1, 4, 9, 2, 3)], show_progress=False, batch_size=2)
+        assert analyzer.batches == [[1, 2], [3, 4], [7, 9]]
+
+    def test_duplicates_are_inferred_once(self, analyzer):
+        texts = ["好评", "差评", "好评", "  好评  ", "差评"]
+        batch = analyzer.analyze_batch(texts, show_progress=False, batch_size=8)
+        assert sum(len(b) for b in analyzer.batches) == 2
+        assert [r.text for r in batch.results] == texts
+        assert batch.results[0].sentiment_label == batch.results[2].sentiment_label == batch.results[3].sentiment_label
+
+    def test_empty_texts_are_reported_not_inferred(self, analyzer):
+        batch = analyzer.analyze_batch(["ok", "   ", ""], show_progress=False)
+        assert batch.success_count == 1
+        assert batch.failed_count == 2
+        assert batch.results[1].sentiment_label == "输入错误"
+        assert np.isnan(batch.probabilities[1]).all()
+
+    def test_failed_batch_retries_each_text(self, analyzer):
+        analyzer.fail_batches = True
+        texts = ["abc", "de", "fghij"]
+        batch = analyzer.analyze_batch(texts, show_progress=False, batch_size=8)
+        assert batch.success_count == 3
+        assert sorted(analyzer.batches) == [[2], [3], [5]]
+        assert [r.sentiment_label for r in batch.results] == [analyzer.sentiment_map[len(t) % 5] for t in texts]
+
+    def test_disabled_analyzer_passes_through(self, analyzer):
+        analyzer.disable("测试")
+        batch = analyzer.analyze_batch(["a", "b"], show_progress=False)
+        assert not batch.analysis_performed
+        assert batch.failed_count == 2
+        assert analyzer.batches == []
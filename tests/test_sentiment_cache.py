@@ -0,0 +1,95 @@
+"""
+测试InsightEngine/utils/sentiment_cache.py：按 (内容哈希, 模型版本) 命中、进程内LRU淘汰、
+SQLite持久化跨实例复用、按时间/版本清理，以及analyze_batch只把未命中的文本送入模型
+"""
+
+import time
+
+from InsightEngine.tools import sentiment_analyzer
+from InsightEngine.utils import sentiment_cache
+from InsightEngine.utils.sentiment_cache import SentimentCache, content_hash
+
+PREDICTION = (3, [0.0, 0.1, 0.1, 0.7, 0.1])
+
+
+class TestMemoryCache:
+    """进程内缓存"""
+
+    def test_hit_requires_same_model_version(self):
+        cache = SentimentCache()
+        cache.put_many({"h1": PREDICTION}, "v1")
+        assert cache.get_many(["h1"], "v1") == {"h1": PREDICTION}
+        assert cache.get_many(["h1"], "v2") == {}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_lru_eviction(self):
+        cache = SentimentCache(max_entries=2)
+        cache.put_many({"a": PREDICTION, "b": PREDICTION}, "v")
+        cache.get_many(["a"], "v")  # a 成为最近使用
+        cache.put_many({"c": PREDICTION}, "v")
+        assert set(cache.get_many(["a", "b", "c"], "v")) == {"a", "c"}
+
+    def test_duplicate_hashes_counted_once(self):
+        cache = SentimentCache()
+        cache.put_many({"a": PREDICTION}, "v")
+        assert cache.get_many(["a", "a", "b"], "v") == {"a": PREDICTION}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_content_hash_is_stable(self):
+        assert content_hash("好评") == content_hash("好评")
+        assert content_hash("好评") != content_hash("差评")
+
+
+class TestPersistentCache:
+    """SQLite 持久化"""
+
+    def test_entries_survive_new_instance(self, tmp_path):
+        path = str(tmp_path / "cache" / "sentiment.sqlite")
+        SentimentCache(path).put_many({"a": PREDICTION}, "v1")
+        reopened = SentimentCache(path)
+        assert reopened.get_many(["a"], "v1") == {"a": PREDICTION}
+        assert reopened.stats()["memory_entries"] == 1
+        assert reopened.version_counts() == {"v1": 1}
+
+    def test_prune_by_version_and_age(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "sentiment.sqlite")
+        cache = SentimentCache(path)
+        now = time.time()
+        monkeypatch.setattr(sentiment_cache.time, "time", lambda: now - 10 * 86400)
+        cache.put_many({"old": PREDICTION}, "v1")
+        monkeypatch.setattr(sentiment_cache.time, "time", lambda: now)
+        cache.put_many({"new": PREDICTION}, "v1")
+        cache.put_many({"other": PREDICTION}, "v2")
+
+        assert cache.prune(keep_version="v1") == 1
+        assert cache.version_counts() == {"v1": 2}
+        assert cache.prune(max_age_days=7) == 1
+        assert set(SentimentCache(path).get_many(["old", "new"], "v1")) == {"new"}
+
+
+class TestAnalyzerUsesCache:
+    """analyze_batch 只推理未命中的文本，并写回新结果"""
+
+    def test_only_misses_reach_the_model(self, monkeypatch):
+        cache = SentimentCache()
+        monkeypatch.setattr(sentiment_analyzer, "get_sentiment_cache", lambda: cache)
+        monkeypatch.setattr(sentiment_analyzer, "get_fast_sentiment_model", lambda: None)
+        analyzer = sentiment_analyzer.WeiboMultilingualSentimentAnalyzer(use_service=False)
+        analyzer.is_disabled, analyzer.is_initialized = False, True
+        inferred = []
+        analyzer._encode = lambda texts: [[len(text)] for text in texts]
+        analyzer._predict_encoded = lambda encoded: inferred.extend(encoded) or [PREDICTION for _ in encoded]
+
+        cache.put_many({content_hash("已缓存"): (0, [0.6, 0.1, 0.1, 0.1, 0.1])}, analyzer.model_version)
+        batch = analyzer.analyze_batch(["已缓存", "新文本", "已缓存"], show_progress=False)
+        assert inferred == [[3]]
+        assert [r.sentiment_label for r in batch.results] == ["非常负面", "正面", "非常负面"]
+        assert cache.get_many([content_hash("新文本")], analyzer.model_version) == {content_hash("新文本"): PREDICTION}
+
+        analyzer.analyze_batch(["新文本"], show_progress=False)
+        assert inferred == [[3]]
+
+
+def test_get_sentiment_cache_respects_switch(monkeypatch):
+    monkeypatch.setattr(sentiment_cache.settings, "SENTIMENT_CACHE_ENABLED", False)
+    assert sentiment_cache.get_sentiment_cache() is None
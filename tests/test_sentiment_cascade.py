@@ -0,0 +1,109 @@
+"""
+测试InsightEngine/tools/sentiment_analyzer.py的级联模式：快速模型置信度足够的文本不进入Transformer、
+低置信度文本升级、超出时间预算时保留快速模型结果，以及级联统计（以桩替换快速模型与Transformer）
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from InsightEngine.tools import sentiment_analyzer
+from InsightEngine.tools.sentiment_analyzer import WeiboMultilingualSentimentAnalyzer
+from InsightEngine.utils.config import settings
+
+# 快速模型给出的五级概率：按文本查表，未列出的文本视为高置信度正面
+FAST_ROWS = {
+    "好评如潮": [0.0, 0.02, 0.0, 0.98, 0.0],
+    "一般般": [0.0, 0.45, 0.0, 0.55, 0.0],
+    "还行吧": [0.0, 0.2, 0.0, 0.8, 0.0],
+}
+
+
+class StubFastModel:
+    """按 FAST_ROWS 返回概率矩阵的快速模型桩，记录收到的文本；fail 时打分抛出异常"""
+
+    name = "stub-fast"
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    def sentiment_probabilities(self, texts, num_labels=5):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("fast model failed")
+        return np.array([FAST_ROWS.get(text, FAST_ROWS["好评如潮"]) for text in texts])
+
+
+class StubAnalyzer(WeiboMultilingualSentimentAnalyzer):
+    """Transformer 桩：一律预测「中性」，记录送入推理的文本；delay 模拟每批耗时"""
+
+    def __init__(self):
+        super().__init__(use_service=False)
+        self.is_disabled, self.disable_reason, self.is_initialized = False, None, True
+        self.inferred = []
+        self.delay = 0.0
+
+    def _encode(self, texts):
+        return [list(text) for text in texts]
+
+    def _predict_encoded(self, encoded):
+        time.sleep(self.delay)
+        self.inferred.extend("".join(ids) for ids in encoded)
+        return [(2, [0.05, 0.05, 0.8, 0.05, 0.05]) for _ in encoded]
+
+
+@pytest.fixture
+def fast_model(monkeypatch):
+    model = StubFastModel()
+    monkeypatch.setattr(sentiment_analyzer, "get_sentiment_cache", lambda: None)
+    monkeypatch.setattr(sentiment_analyzer, "get_fast_sentiment_model", lambda: model)
+    monkeypatch.setattr(settings, "SENTIMENT_CASCADE_THRESHOLD", 0.9)
+    monkeypatch.setattr(settings, "SENTIMENT_CASCADE_BUDGET_MS", 0.0)
+    return model
+
+
+@pytest.fixture
+def analyzer(fast_model):
+    return StubAnalyzer()
+
+
+class TestCascade:
+    """快速模型与 Transformer 的分流"""
+
+    def test_confident_texts_skip_transformer(self, analyzer, fast_model):
+        texts = ["好评如潮", "一般般", "好评如潮", "还行吧"]
+        batch = analyzer.analyze_batch(texts, show_progress=False)
+        assert fast_model.calls == [["好评如潮", "一般般", "还行吧"]]
+        assert sorted(analyzer.inferred) == ["一般般", "还行吧"]
+        assert [r.sentiment_label for r in batch.results] == ["正面", "中性", "正面", "中性"]
+        np.testing.assert_allclose(batch.probabilities[0], FAST_ROWS["好评如潮"])
+        assert batch.success_count == 4
+
+    def test_cascade_false_bypasses_fast_model(self, analyzer, fast_model):
+        analyzer.analyze_batch(["好评如潮", "一般般"], show_progress=False, cascade=False)
+        assert fast_model.calls == []
+        assert sorted(analyzer.inferred) == ["一般般", "好评如潮"]
+        assert analyzer.cascade_metrics.snapshot()["texts"] == 0
+
+    def test_metrics_count_accepted_and_escalated(self, analyzer):
+        analyzer.analyze_batch(["好评如潮", "一般般", "还行吧", "非常满意"], show_progress=False)
+        snapshot = analyzer.cascade_metrics.snapshot()
+        assert (snapshot["texts"], snapshot["accepted"], snapshot["escalated"], snapshot["budget_skipped"]) == (4, 2, 2, 0)
+        assert snapshot["escalated_fraction"] == 0.5
+
+    def test_budget_keeps_fast_result_for_remaining_batches(self, analyzer, monkeypatch):
+        # 每批耗时超出预算：最没把握的「一般般」先升级，「还行吧」保留快速模型结果
+        monkeypatch.setattr(settings, "SENTIMENT_CASCADE_BUDGET_MS", 50.0)
+        analyzer.delay = 0.1
+        batch = analyzer.analyze_batch(["还行吧", "一般般"], show_progress=False, batch_size=1)
+        assert analyzer.inferred == ["一般般"]
+        assert [r.sentiment_label for r in batch.results] == ["正面", "中性"]
+        np.testing.assert_allclose(batch.probabilities[0], FAST_ROWS["还行吧"])
+        assert analyzer.cascade_metrics.snapshot()["budget_skipped"] == 1
+
+    def test_fast_model_failure_escalates_everything(self, analyzer, fast_model):
+        fast_model.fail = True
+        analyzer.analyze_batch(["好评如潮", "一般般"], show_progress=False)
+        assert sorted(analyzer.inferred) == ["一般般", "好评如潮"]
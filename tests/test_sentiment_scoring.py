@@ -0,0 +1,88 @@
+"""
+测试InsightEngine/utils/sentiment_scoring.py的离线打分水位线：只推进到连续打分成功的最后一行，
+模型未执行时不写入也不推进（使用SQLite临时库，依赖 aiosqlite）
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from InsightEngine.tools.sentiment_analyzer import BatchSentimentResult, SentimentResult
+from InsightEngine.utils import db, sentiment_scoring
+from InsightEngine.utils.social_projection import SOCIAL_COMMENT_TABLE
+
+
+class StubAnalyzer:
+    """按文本给出结果：含 "fail" 的文本推理失败，disabled 时整批未执行"""
+
+    model_version = "stub-v1"
+    disable_reason = "测试禁用"
+
+    def __init__(self, disabled=False):
+        self.disabled = disabled
+
+    def analyze_batch(self, texts, show_progress=False, cascade=True):
+        results = []
+        for text_value in texts:
+            if self.disabled or not text_value.strip() or "fail" in text_value:
+                results.append(SentimentResult(text=text_value, sentiment_label="分析失败", confidence=0.0,
+                                               probability_distribution={}, success=False, analysis_performed=False))
+            else:
+                results.append(SentimentResult(text=text_value, sentiment_label="正面", confidence=0.9,
+                                               probability_distribution={"正面": 0.9}))
+        success = sum(r.success for r in results)
+        return BatchSentimentResult(results=results, total_processed=len(results), success_count=success,
+                                    failed_count=len(results) - success, average_confidence=0.0,
+                                    analysis_performed=not self.disabled)
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path, monkeypatch):
+    """把 db 模块的异步引擎替换为临时 SQLite 库；NullPool 避免连接跨事件循环复用"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'scoring.db'}", poolclass=NullPool)
+    monkeypatch.setattr(db, "_engine", engine)
+    monkeypatch.setattr(sentiment_scoring, "_q", lambda name: f'"{name}"')
+    return engine
+
+
+def _score(engine, contents, analyzer, last_id=0):
+    async def scenario():
+        async with engine.begin() as conn:
+            await conn.execute(text(f"CREATE TABLE {SOCIAL_COMMENT_TABLE} (id INTEGER PRIMARY KEY, content TEXT, "
+                                    "sentiment_label INTEGER, sentiment_confidence REAL, sentiment_model TEXT)"))
+            await conn.execute(text(f"CREATE TABLE {sentiment_scoring.WATERMARK_TABLE} "
+                                    "(target_table TEXT PRIMARY KEY, last_id BIGINT, refreshed_at BIGINT)"))
+            await conn.execute(text(f"INSERT INTO {SOCIAL_COMMENT_TABLE} (id, content) VALUES (:id, :content)"),
+                               [{"id": i, "content": c} for i, c in enumerate(contents, start=1)])
+        written = await sentiment_scoring._score_table(SOCIAL_COMMENT_TABLE, analyzer, last_id, rescore=False)
+        watermarks = await sentiment_scoring._load_watermarks()
+        labels = await db.fetch_all(f"SELECT id, sentiment_label FROM {SOCIAL_COMMENT_TABLE} ORDER BY id")
+        return written, watermarks.get(SOCIAL_COMMENT_TABLE), [row["sentiment_label"] for row in labels]
+
+    return asyncio.run(scenario())
+
+
+class TestScoringWatermark:
+    """打分水位线"""
+
+    def test_all_scored_advances_to_last_row(self, sqlite_engine):
+        written, watermark, labels = _score(sqlite_engine, ["好", "", "不错"], StubAnalyzer())
+        assert (written, watermark) == (2, 3)
+        assert labels == [3, None, 3]
+
+    def test_failed_row_holds_watermark(self, sqlite_engine):
+        written, watermark, labels = _score(sqlite_engine, ["好", "fail", "不错"], StubAnalyzer())
+        # 失败行之后已打分的行照常写入，但水位线停在失败行之前，下次从失败行重试
+        assert (written, watermark) == (2, 1)
+        assert labels == [3, None, 3]
+
+    def test_analysis_not_performed_saves_nothing(self, sqlite_engine):
+        written, watermark, labels = _score(sqlite_engine, ["好", "不错"], StubAnalyzer(disabled=True))
+        assert (written, watermark) == (0, None)
+        assert labels == [None, None]
@@ -0,0 +1,101 @@
+"""
+测试InsightEngine/utils/sentiment_stats.py中基于概率矩阵的情感统计
+"""
+
+import numpy as np
+
+from InsightEngine.utils.sentiment_stats import (
+    SentimentAggregator,
+    confidence_histogram,
+    group_distribution,
+    label_counts,
+    polarity_scores,
+    probability_matrix,
+    sentiment_time_series,
+    valid_rows,
+)
+
+LABELS = ["非常负面", "负面", "中性", "正面", "非常正面"]
+
+
+def _one_hot(index, confidence=1.0):
+    row = np.full(len(LABELS), (1.0 - confidence) / (len(LABELS) - 1))
+    row[index] = confidence
+    return row
+
+
+# 第 3 行分析失败（NaN）
+PROBABILITIES = np.array([
+    _one_hot(0),
+    _one_hot(4, 0.9),
+    np.full(len(LABELS), np.nan),
+    _one_hot(4, 0.6),
+    _one_hot(2, 0.95),
+])
+PLATFORMS = ["weibo", "weibo", "weibo", "douyin", ""]
+TIMES = ["2024-01-01 10:00:00", 1704178800000, "2024-01-02 09:00:00", 1704103200, None]
+
+
+class TestSentimentStats:
+    """测试一次性统计函数"""
+
+    def test_probability_matrix_marks_failures(self):
+        matrix = probability_matrix([{"正面": 0.8, "中性": 0.2}, None], LABELS)
+        assert matrix[0].tolist() == [0.0, 0.0, 0.2, 0.8, 0.0]
+        assert valid_rows(matrix).tolist() == [True, False]
+
+    def test_polarity_scores(self):
+        """得分是类别极性的期望：非常负面 -2，非常正面 +2，均匀分布 0，失败行为 NaN"""
+        scores = polarity_scores(np.array([_one_hot(0), _one_hot(4), np.full(5, 0.2), np.full(5, np.nan)]))
+        assert np.allclose(scores[:3], [-2.0, 2.0, 0.0])
+        assert np.isnan(scores[3])
+
+    def test_polarity_scores_normalizes_partial_rows(self):
+        """只保存了预测类别置信度的行，得分即该类别的极性"""
+        assert np.allclose(polarity_scores(probability_matrix([{"正面": 0.7}], LABELS)), [1.0])
+
+    def test_label_counts_skip_failures(self):
+        assert label_counts(PROBABILITIES, LABELS) == {"非常负面": 1, "中性": 1, "非常正面": 2}
+
+    def test_confidence_histogram(self):
+        histogram = confidence_histogram(PROBABILITIES)
+        assert len(histogram) == 10
+        assert sum(bucket["count"] for bucket in histogram) == 4
+        assert histogram[-1] == {"range": "0.9-1.0", "count": 3}
+
+    def test_group_distribution_skips_empty_keys(self):
+        groups = group_distribution(PROBABILITIES, PLATFORMS, LABELS)
+        assert set(groups) == {"weibo", "douyin"}
+        assert groups["weibo"]["total"] == 2
+        assert groups["weibo"]["distribution"] == {"非常负面": 1, "非常正面": 1}
+        assert groups["douyin"]["distribution"] == {"非常正面": 1}
+
+    def test_time_series_by_day(self):
+        """混合字符串、毫秒与秒级时间戳，按天升序聚合"""
+        series = sentiment_time_series(PROBABILITIES, TIMES, LABELS, bucket="day")
+        assert [point["bucket"] for point in series] == ["2024-01-01", "2024-01-02"]
+        assert [point["total"] for point in series] == [2, 1]
+
+
+class TestSentimentAggregator:
+    """测试增量汇总与一次性统计一致"""
+
+    def test_batches_match_one_shot_statistics(self):
+        aggregator = SentimentAggregator(LABELS, bucket="day")
+        for start, end in ((0, 2), (2, 5)):
+            aggregator.update(PROBABILITIES[start:end], PLATFORMS[start:end], TIMES[start:end])
+        snapshot = aggregator.snapshot()
+
+        assert snapshot["processed"] == 5
+        assert snapshot["total_analyzed"] == 4
+        assert snapshot["sentiment_distribution"] == label_counts(PROBABILITIES, LABELS)
+        assert snapshot["confidence_histogram"] == confidence_histogram(PROBABILITIES)
+        assert snapshot["platform_distribution"] == group_distribution(PROBABILITIES, PLATFORMS, LABELS)
+        assert snapshot["time_distribution"] == sentiment_time_series(PROBABILITIES, TIMES, LABELS, bucket="day")
+
+    def test_keeps_top_confident_samples(self):
+        aggregator = SentimentAggregator(LABELS, min_confidence=0.5, max_samples=2)
+        aggregator.update(PROBABILITIES, samples=["a", "b", "c", "d", "e"])
+        assert [(sample, label) for sample, label, _ in aggregator.high_confidence_samples()] == [
+            ("a", "非常负面"), ("e", "中性"),
+        ]
@@ -0,0 +1,56 @@
+"""
+测试InsightEngine/utils/simhash.py中的文本归一化与SimHash签名
+"""
+
+from InsightEngine.utils.simhash import (
+    SIMHASH_BANDS,
+    hamming_distance,
+    normalize_text,
+    simhash,
+    simhash_bands,
+    to_signed64,
+    to_unsigned64,
+)
+
+ORIGINAL = "今天北京的天气非常好，阳光明媚，适合出去散步和运动，大家一起去公园吧"
+EDITED = "今天北京的天气非常好，阳光明媚，适合出去散步和跑步，大家一起去公园吧"
+UNRELATED = "央行宣布下调存款准备金率，释放长期资金约一万亿元，支持实体经济发展"
+
+
+class TestSimHash:
+    """测试归一化、签名距离与分段"""
+
+    def test_normalize_text_strips_noise(self):
+        """链接、@提及、话题井号与标点被去掉，英文统一为小写"""
+        assert normalize_text("#话题# @张三 Hello, World! https://x.com/y") == "话题helloworld"
+        assert normalize_text("") == ""
+
+    def test_repost_variants_share_signature(self):
+        """转发前缀、链接和标点不同的同一内容得到相同签名"""
+        repost = f"转发微博 {ORIGINAL}！！ http://t.cn/abc"
+        assert simhash(repost) == simhash(ORIGINAL)
+
+    def test_near_duplicates_are_closer_than_unrelated_text(self):
+        """改动一个词的文本比无关文本的汉明距离更小"""
+        near = hamming_distance(simhash(ORIGINAL), simhash(EDITED))
+        far = hamming_distance(simhash(ORIGINAL), simhash(UNRELATED))
+        assert 0 < near < far
+
+    def test_empty_text_has_zero_signature(self):
+        assert simhash("") == 0
+        assert simhash("！！ http://t.cn/abc") == 0
+
+    def test_bands_reassemble_signature(self):
+        """各段拼回原签名，每段都在 16 位以内"""
+        value = simhash(ORIGINAL)
+        bands = simhash_bands(value)
+        assert len(bands) == SIMHASH_BANDS
+        assert all(0 <= band < 1 << 16 for band in bands)
+        assert sum(band << (16 * i) for i, band in enumerate(bands)) == value
+
+    def test_signed_round_trip(self):
+        """有符号转换落在 BIGINT 范围内且可以还原"""
+        for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1, simhash(ORIGINAL)):
+            signed = to_signed64(value)
+            assert -(1 << 63) <= signed < 1 << 63
+            assert to_unsigned64(signed) == value
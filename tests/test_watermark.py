@@ -0,0 +1,179 @@
+"""
+测试InsightEngine/utils/watermark.py中按 (last_modify_ts, id) 复合水位线的增量分页，
+以及content_hotness汇总表的增量刷新（使用SQLite临时库，依赖 aiosqlite）
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from InsightEngine.utils import db, hotness
+from InsightEngine.utils.watermark import (
+    WatermarkNotBuilt,
+    fetch_batch,
+    load_watermarks,
+    require_built,
+    save_watermark,
+    stale_tables,
+)
+
+WATERMARK_DDL = ("CREATE TABLE {name} (source_table TEXT PRIMARY KEY, last_modify_ts BIGINT, "
+                 "last_id BIGINT, refreshed_at BIGINT)")
+
+
+def _quote(name):
+    return f'"{name}"'
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path, monkeypatch):
+    """把 db 模块的异步引擎替换为临时 SQLite 库；NullPool 避免连接跨事件循环复用"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'watermark.db'}", poolclass=NullPool)
+    monkeypatch.setattr(db, "_engine", engine)
+    return engine
+
+
+async def _execute(engine, *statements):
+    async with engine.begin() as conn:
+        for statement, params in statements:
+            await conn.execute(text(statement), params or {})
+
+
+def _rows(count, ts_of):
+    return [{"id": i, "ts": ts_of(i)} for i in range(1, count + 1)]
+
+
+class TestFetchBatch:
+    """测试复合水位线分页"""
+
+    def test_pages_cover_ties_without_gaps(self, sqlite_engine):
+        """多行 last_modify_ts 相同且跨越批次边界时，逐批推进不重复也不遗漏"""
+        rows = _rows(11, lambda i: 100 if i <= 7 else 200)
+
+        async def scenario():
+            await _execute(
+                sqlite_engine,
+                ("CREATE TABLE src (id INTEGER PRIMARY KEY, last_modify_ts BIGINT NOT NULL DEFAULT 0)", None),
+                ("INSERT INTO src (id, last_modify_ts) VALUES (:id, :ts)", rows),
+            )
+            seen, last_ts, last_id = [], 0, 0
+            while True:
+                batch = await fetch_batch("src", ["id", "last_modify_ts"], last_ts, last_id, 3, _quote)
+                if not batch:
+                    return seen, last_ts, last_id
+                seen.extend(row["id"] for row in batch)
+                last_ts, last_id = batch[-1]["last_modify_ts"], batch[-1]["id"]
+
+        seen, last_ts, last_id = asyncio.run(scenario())
+        assert seen == list(range(1, 12))
+        assert (last_ts, last_id) == (200, 11)
+
+    def test_updated_row_is_picked_up_after_watermark(self, sqlite_engine):
+        """已同步的行被更新（last_modify_ts 变大）后，下一次只取到这一行"""
+        async def scenario():
+            await _execute(
+                sqlite_engine,
+                ("CREATE TABLE src (id INTEGER PRIMARY KEY, last_modify_ts BIGINT NOT NULL DEFAULT 0)", None),
+                ("INSERT INTO src (id, last_modify_ts) VALUES (:id, :ts)", _rows(5, lambda i: i * 10)),
+                ("UPDATE src SET last_modify_ts = 60 WHERE id = 2", None),
+            )
+            return await fetch_batch("src", ["id"], 50, 5, 10, _quote)
+
+        assert [row["id"] for row in asyncio.run(scenario())] == [2]
+
+
+class TestWatermarkTable:
+    """测试水位线表读写与陈旧度判断"""
+
+    def test_save_and_load(self, sqlite_engine):
+        async def scenario():
+            await _execute(sqlite_engine, (WATERMARK_DDL.format(name="wm"), None))
+            async with sqlite_engine.begin() as conn:
+                await save_watermark(conn, "wm", "weibo_note", 100, 7, 1000, _quote)
+                await save_watermark(conn, "wm", "weibo_note", 200, 3, 2000, _quote)
+            return await load_watermarks("wm", _quote)
+
+        watermarks = asyncio.run(scenario())
+        assert watermarks == {
+            "weibo_note": {"source_table": "weibo_note", "last_modify_ts": 200, "last_id": 3, "refreshed_at": 2000},
+        }
+
+    def test_require_built_and_stale_tables(self):
+        watermarks = {"a": {"refreshed_at": 1000}, "b": {"refreshed_at": 1900}}
+        require_built(watermarks, ["a", "b"], "build")
+        with pytest.raises(WatermarkNotBuilt):
+            require_built(watermarks, ["a", "c"], "build")
+        assert stale_tables(watermarks, ["a", "b", "c"], max_staleness=500, now=2000) == ["a", "c"]
+
+
+class TestHotnessRefresh:
+    """测试 content_hotness 的全量构建与增量刷新"""
+
+    TABLE = "weibo_note"
+
+    def _setup_statements(self):
+        metrics = ", ".join(f"{column} BIGINT DEFAULT 0" for column, _ in hotness.HOTNESS_METRICS)
+        return [
+            (f"CREATE TABLE {self.TABLE} (id INTEGER PRIMARY KEY, last_modify_ts BIGINT NOT NULL DEFAULT 0, "
+             f"publish_ts BIGINT, {metrics})", None),
+            ("CREATE TABLE content_hotness (platform TEXT, source_table TEXT, content_id BIGINT, publish_ts BIGINT, "
+             "hotness_score REAL, last_modify_ts BIGINT)", None),
+            (WATERMARK_DDL.format(name="content_hotness_watermark"), None),
+            (f"INSERT INTO {self.TABLE} (id, last_modify_ts, publish_ts, likes_num, comments_num) "
+             "VALUES (:id, :ts, :ts, :likes, 0)",
+             [{"id": i, "ts": 100 + i, "likes": i} for i in range(1, 6)]),
+        ]
+
+    @staticmethod
+    async def _scores():
+        rows = await db.fetch_all("SELECT content_id, hotness_score FROM content_hotness ORDER BY content_id")
+        return {row["content_id"]: row["hotness_score"] for row in rows}
+
+    def test_full_then_incremental(self, sqlite_engine, monkeypatch):
+        monkeypatch.setattr(hotness, "REFRESH_BATCH_SIZE", 2)
+        monkeypatch.setattr(hotness, "_refresh_lock", None)
+
+        async def scenario():
+            await _execute(sqlite_engine, *self._setup_statements())
+            with pytest.raises(WatermarkNotBuilt):
+                await hotness.ensure_fresh()
+
+            full = await hotness.refresh_content_hotness(full=True, tables=[self.TABLE])
+            after_full = await self._scores()
+
+            await _execute(
+                sqlite_engine,
+                (f"UPDATE {self.TABLE} SET comments_num = 2, last_modify_ts = 500 WHERE id = 3", None),
+            )
+            incremental = await hotness.refresh_content_hotness(tables=[self.TABLE])
+            after_incremental = await self._scores()
+            watermark = (await hotness._load_watermarks())[self.TABLE]
+            return full, after_full, incremental, after_incremental, watermark
+
+        full, after_full, incremental, after_incremental, watermark = asyncio.run(scenario())
+        assert full == {self.TABLE: 5}
+        assert after_full == {i: float(i) for i in range(1, 6)}
+        assert incremental == {self.TABLE: 1}
+        assert after_incremental[3] == 3 + 2 * hotness.HOTNESS_WEIGHTS["comment"]
+        assert (watermark["last_modify_ts"], watermark["last_id"]) == (500, 3)
+
+    def test_out_of_budget_refresh_keeps_refreshed_at(self, sqlite_engine, monkeypatch):
+        """时间预算用尽、尚未追平时不更新追平时间"""
+        monkeypatch.setattr(hotness, "_refresh_lock", None)
+
+        async def scenario():
+            await _execute(sqlite_engine, *self._setup_statements())
+            await hotness.refresh_content_hotness(full=True, tables=[self.TABLE])
+            async with sqlite_engine.begin() as conn:
+                await save_watermark(conn, "content_hotness_watermark", self.TABLE, 0, 0, 1234, _quote)
+            await hotness.refresh_content_hotness(tables=[self.TABLE], budget_seconds=0)
+            return (await hotness._load_watermarks())[self.TABLE]
+
+        watermark = asyncio.run(scenario())
+        assert watermark["refreshed_at"] == 1234
@@ -0,0 +1,226 @@
+"""
+各引擎共用的异步 LLM 客户端
+
+AsyncLLMClient 是 LLMClient（utils/llm_client.py）的异步版本，接口与之一致
+（invoke / stream_invoke / stream_invoke_to_string 均为协程，stream_invoke_to_string 同样支持 cache_node 与 validate）：
+
+- 同一事件循环内共享 HTTP 连接池（max_connections，见 llm_limiter.get_async_http_client）
+- 与同步 LLMClient 共用按服务商（base_url）划分的限流器：并发上限（max_concurrency）与每秒请求数上限
+  （requests_per_second），0 表示不限
+- 失败后按 LLM_RETRY_CONFIG 异步重试（退避带随机抖动），等待期间不阻塞事件循环，也不占用并发名额
+
+各 Agent 的段落研究运行在工作线程中，节点通过 blocking() 返回的同步外观调用：协程提交到本模块常驻后台线程的
+事件循环上执行，所有段落的 LLM 请求在同一个循环上并发等待，共用一个连接池。
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Optional, TypeVar
+
+from loguru import logger
+from openai import AsyncOpenAI
+
+from llm_cache import get_llm_cache
+from llm_limiter import get_async_http_client, get_provider_limiter
+from llm_client import request_timeout
+from llm_registry import achat_completion, astream_chat_completion, build_messages
+from retry_helper import LLM_RETRY_CONFIG, with_async_retry
+
+__all__ = ["AsyncLLMClient", "BlockingLLMClient", "run_sync"]
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """获取（必要时启动）常驻后台线程的事件循环，连接池绑定在该循环上"""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="llm-async-loop", daemon=True)
+            thread.start()
+            _loop = loop
+    return _loop
+
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """在后台事件循环中执行协程并同步等待结果，可以从任意线程调用"""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+    return future.result(timeout)
+
+
+class AsyncLLMClient:
+    """基于 AsyncOpenAI 的 LLM 客户端，engine_name 用于调用指标与错误信息"""
+
+    def __init__(self, engine_name: str, api_key: str, model_name: str, base_url: Optional[str] = None,
+                 max_concurrency: int = 0, requests_per_second: float = 0.0, max_connections: int = 100,
+                 timeout: Optional[float] = None):
+        if not api_key:
+            raise ValueError(f"{engine_name} LLM API key is required.")
+        if not model_name:
+            raise ValueError(f"{engine_name} model name is required.")
+
+        self.engine_name = engine_name
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model_name = model_name
+        self.provider = model_name
+        self.timeout = timeout if timeout is not None else request_timeout(engine_name)
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.max_connections = max_connections
+        # AsyncOpenAI 的连接绑定事件循环，每个事件循环各建一个
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client_kwargs: Dict[str, Any] = {
+                "api_key": self.api_key,
+                "max_retries": 0,
+                "http_client": get_async_http_client(self.max_connections),
+            }
+            if self.base_url:
+                client_kwargs["base_url"] = self.base_url
+            client = self._clients[loop] = AsyncOpenAI(**client_kwargs)
+        return client
+
+    def _limiter(self):
+        return get_provider_limiter(self.base_url, self.max_concurrency, self.requests_per_second)
+
+    @with_async_retry(LLM_RETRY_CONFIG)
+    async def invoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        messages = build_messages(system_prompt, user_prompt)
+
+        allowed_keys = {"temperature", "top_p", "presence_penalty", "frequency_penalty"}
+        extra_params = {key: value for key, value in kwargs.items() if key in allowed_keys and value is not None}
+
+        timeout = kwargs.pop("timeout", self.timeout)
+
+        async with self._limiter():
+            response = await achat_completion(
+                self.client,
+                self.engine_name,
+                model=self.model_name,
+                messages=messages,
+                timeout=timeout,
+                **extra_params,
+            )
+
+        if response.choices and response.choices[0].message:
+            return (response.choices[0].message.content or "").strip()
+        return ""
+
+    async def stream_invoke(self, system_prompt: str, user_prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        """
+        流式调用LLM，逐步返回响应内容（整个流式读取期间占用一个并发名额）
+
+        Args:
+            system_prompt: 系统提示词
+            user_prompt: 用户提示词
+            **kwargs: 额外参数（temperature, top_p等）
+
+        Yields:
+            响应文本块（str）
+        """
+        messages = build_messages(system_prompt, user_prompt)
+
+        allowed_keys = {"temperature", "top_p", "presence_penalty", "frequency_penalty"}
+        extra_params = {key: value for key, value in kwargs.items() if key in allowed_keys and value is not None}
+
+        timeout = kwargs.pop("timeout", self.timeout)
+
+        try:
+            async with self._limiter():
+                async for content in astream_chat_completion(
+                    self.client,
+                    self.engine_name,
+                    model=self.model_name,
+                    messages=messages,
+                    timeout=timeout,
+                    **extra_params,
+                ):
+                    yield content
+        except Exception as e:
+            logger.error(f"流式请求失败: {str(e)}")
+            raise e
+
+    @with_async_retry(LLM_RETRY_CONFIG)
+    async def _stream_to_string(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        """流式读取完整响应，流中途失败时整体重试"""
+        byte_chunks = []
+        async for chunk in self.stream_invoke(system_prompt, user_prompt, **kwargs):
+            byte_chunks.append(chunk.encode('utf-8'))
+        return b''.join(byte_chunks).decode('utf-8', errors='replace') if byte_chunks else ""
+
+    async def stream_invoke_to_string(self, system_prompt: str, user_prompt: str, cache_node: Optional[str] = None,
+                                      validate: Optional[Callable[[str], bool]] = None, **kwargs) -> str:
+        """
+        流式调用LLM并安全地拼接为完整字符串（避免UTF-8多字节字符截断）
+
+        Args:
+            system_prompt: 系统提示词
+            user_prompt: 用户提示词
+            cache_node: 调用方节点名称；该节点开启了LLM响应缓存时先查缓存（见 utils/llm_cache.py）
+            validate: 判断响应能否被节点解析；只有通过校验的响应才写入缓存，命中但未通过校验的条目会被清除并重新请求。
+                      未提供时不写入缓存
+            **kwargs: 额外参数（temperature, top_p等）
+
+        Returns:
+            完整的响应字符串
+        """
+        cache = get_llm_cache(cache_node) if cache_node else None
+        if cache is not None:
+            cached = cache.lookup(cache_node, self.model_name, system_prompt, user_prompt, kwargs)
+            if cached is not None:
+                if validate is not None and validate(cached):
+                    return cached
+                cache.evict(cache_node, self.model_name, system_prompt, user_prompt, kwargs)
+
+        response = await self._stream_to_string(system_prompt, user_prompt, **kwargs)
+        if cache is not None and validate is not None and validate(response):
+            cache.store(cache_node, self.model_name, system_prompt, user_prompt, response, kwargs)
+        return response
+
+    def blocking(self) -> "BlockingLLMClient":
+        """供工作线程中的同步节点使用的外观"""
+        return BlockingLLMClient(self)
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "model": self.model_name,
+            "api_base": self.base_url or "default",
+            "max_concurrency": self.max_concurrency or "unlimited",
+            "requests_per_second": self.requests_per_second or "unlimited",
+        }
+
+
+class BlockingLLMClient:
+    """
+    AsyncLLMClient 的同步外观，接口与 LLMClient 的 invoke / stream_invoke_to_string 一致
+
+    每次调用都在后台事件循环上执行对应协程并等待结果，调用线程阻塞期间其它线程提交的请求照常并发进行。
+    """
+
+    def __init__(self, async_client: AsyncLLMClient):
+        self.async_client = async_client
+        self.model_name = async_client.model_name
+
+    def invoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        return run_sync(self.async_client.invoke(system_prompt, user_prompt, **kwargs))
+
+    def stream_invoke_to_string(self, system_prompt: str, user_prompt: str, cache_node: Optional[str] = None,
+                                validate: Optional[Callable[[str], bool]] = None, **kwargs) -> str:
+        return run_sync(self.async_client.stream_invoke_to_string(
+            system_prompt, user_prompt, cache_node=cache_node, validate=validate, **kwargs
+        ))
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return self.async_client.get_model_info()
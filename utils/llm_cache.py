@@ -0,0 +1,184 @@
+"""
+LLM 响应缓存
+调试时反复运行同一查询、Streamlit 会话重载、下游失败后重试，都会让 FirstSearchNode、ReflectionNode、
+ReportStructureNode、KeywordOptimizer、ForumHost 等节点收到字节级相同的提示词。
+开启 LLM_CACHE_ENABLED 后，这些调用的响应按以下键缓存在本地 SQLite 文件中：
+
+- 模型名称
+- 系统提示词的 SHA-256
+- 用户提示词的 SHA-256（去掉客户端注入的「今天的实际时间是...」前缀，否则每分钟都会失效）
+- 采样参数（temperature、top_p 等）
+
+条目超过 LLM_CACHE_TTL_SECONDS 后失效，总数超过 LLM_CACHE_MAX_ENTRIES 时淘汰最久未命中的条目。
+LLM_CACHE_NODES 列出启用缓存的节点名称，未列出的节点照常调用 LLM。
+只缓存节点能成功解析的响应：调用方在解析/校验通过后才写入，命中的条目解析失败时清除并重新请求。
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+# 客户端在用户提示词前注入的当前时间（见 llm_registry.build_messages）
+_TIME_PREFIX = re.compile(r"^今天的实际时间是[^\n]*\n?")
+
+# 参与缓存键的采样参数，timeout 等其它参数不影响输出
+_SAMPLING_PARAMS = ("temperature", "top_p", "presence_penalty", "frequency_penalty")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(model: str, system_prompt: str, user_prompt: str,
+                   params: Optional[Dict[str, Any]] = None) -> str:
+    """计算缓存键：模型、系统/用户提示词哈希与采样参数"""
+    params = params or {}
+    payload = {
+        "model": model,
+        "system": _digest(system_prompt or ""),
+        "user": _digest(_TIME_PREFIX.sub("", user_prompt or "", count=1)),
+        "params": {key: params[key] for key in _SAMPLING_PARAMS if params.get(key) is not None},
+    }
+    return _digest(json.dumps(payload, ensure_ascii=False, sort_keys=True))
+
+
+class LLMResponseCache:
+    """SQLite 持久化的 LLM 响应缓存，带 TTL 与按最近命中时间的容量淘汰，线程安全"""
+
+    def __init__(self, path: str, ttl_seconds: int = 86400, max_entries: int = 5000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "cache_key TEXT PRIMARY KEY, node TEXT NOT NULL, model TEXT NOT NULL, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+        self._conn.commit()
+
+    def lookup(self, node: str, model: str, system_prompt: str, user_prompt: str,
+               params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """查询缓存，未命中或已过期时返回 None"""
+        key = make_cache_key(model, system_prompt, user_prompt, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE cache_key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        logger.info(f"LLM缓存命中: {node} ({model})")
+        return row[0]
+
+    def store(self, node: str, model: str, system_prompt: str, user_prompt: str, response: str,
+              params: Optional[Dict[str, Any]] = None) -> None:
+        """写入响应，并清理过期条目、淘汰超出容量的最久未命中条目"""
+        if not response:
+            return
+        key = make_cache_key(model, system_prompt, user_prompt, params)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (cache_key, node, model, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, node, model, response, now, now),
+            )
+            if self.ttl_seconds > 0:
+                self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            overflow = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE cache_key IN "
+                    "(SELECT cache_key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+            self._conn.commit()
+
+    def evict(self, node: str, model: str, system_prompt: str, user_prompt: str,
+              params: Optional[Dict[str, Any]] = None) -> None:
+        """删除一条缓存（命中的响应未能被节点解析时调用）"""
+        key = make_cache_key(model, system_prompt, user_prompt, params)
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+            self._conn.commit()
+        logger.warning(f"LLM缓存条目未通过校验，已清除: {node} ({model})")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": entries,
+            "path": self.path,
+        }
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_error: Optional[str] = None
+_cache_lock = threading.Lock()
+
+
+def _settings():
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_root not in sys.path:
+        sys.path.append(project_root)
+    from config import settings
+    return settings
+
+
+def get_llm_cache(node: str) -> Optional[LLMResponseCache]:
+    """
+    返回 node 可用的缓存（单例）
+
+    未开启 LLM_CACHE_ENABLED、node 不在 LLM_CACHE_NODES 中或缓存文件不可用时返回 None，调用方直接请求 LLM。
+    """
+    global _cache, _cache_error
+    settings = _settings()
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    enabled_nodes = {name.strip() for name in settings.LLM_CACHE_NODES.split(",") if name.strip()}
+    if node not in enabled_nodes:
+        return None
+    with _cache_lock:
+        if _cache is None and _cache_error is None:
+            try:
+                _cache = LLMResponseCache(
+                    settings.LLM_CACHE_PATH, settings.LLM_CACHE_TTL_SECONDS, settings.LLM_CACHE_MAX_ENTRIES
+                )
+                logger.info(f"LLM响应缓存: {settings.LLM_CACHE_PATH}（节点: {', '.join(sorted(enabled_nodes))}）")
+            except (OSError, sqlite3.Error) as e:
+                _cache_error = str(e)
+                logger.warning(f"LLM响应缓存不可用，直接调用LLM: {e}")
+        return _cache
@@ -0,0 +1,192 @@
+"""
+各引擎共用的同步 LLM 客户端
+
+Insight / Media / Query / Report 各引擎原先各自维护一份几乎相同的 LLMClient，只有引擎名称与报错信息不同。
+现在统一由本模块提供，engine_name 用于调用指标、报错信息与超时环境变量；各引擎的 llms 包只做导出。
+
+- 同一 (base_url, api_key) 的 OpenAI 客户端进程内共享，复用 keep-alive 连接（见 llm_registry.get_openai_client）
+- 与 AsyncLLMClient 共用按服务商（base_url）划分的限流器：并发上限（max_concurrency）与每秒请求数上限
+  （requests_per_second），0 表示不限
+- stream_invoke_to_string 支持按节点开启的响应缓存（cache_node）与响应校验（validate），见 utils/llm_cache.py
+"""
+
+import contextlib
+import os
+import re
+from typing import Any, Callable, Dict, Generator, Optional
+
+from loguru import logger
+
+from llm_cache import get_llm_cache
+from llm_limiter import get_provider_limiter
+from llm_registry import build_messages, chat_completion, get_openai_client, llm_metrics, stream_chat_completion
+from retry_helper import LLM_RETRY_CONFIG, with_retry
+
+__all__ = ["LLMClient", "request_timeout"]
+
+
+def request_timeout(engine_name: str, default: float = 1800.0) -> float:
+    """
+    请求超时（秒）：依次读取 LLM_REQUEST_TIMEOUT 与引擎专属的环境变量（InsightEngine 对应
+    INSIGHT_ENGINE_REQUEST_TIMEOUT），都未设置或无法解析时使用 default
+    """
+    engine_env = re.sub(r"(?<!^)(?=[A-Z])", "_", engine_name).upper() + "_REQUEST_TIMEOUT"
+    value = os.getenv("LLM_REQUEST_TIMEOUT") or os.getenv(engine_env)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+class LLMClient:
+    """Minimal wrapper around the OpenAI-compatible chat completion API."""
+
+    def __init__(self, engine_name: str, api_key: str, model_name: str, base_url: Optional[str] = None,
+                 max_concurrency: int = 0, requests_per_second: float = 0.0, default_timeout: float = 1800.0,
+                 with_current_time: bool = True):
+        if not api_key:
+            raise ValueError(f"{engine_name} LLM API key is required.")
+        if not model_name:
+            raise ValueError(f"{engine_name} model name is required.")
+
+        self.engine_name = engine_name
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model_name = model_name
+        self.provider = model_name
+        self.timeout = request_timeout(engine_name, default_timeout)
+        # 是否在用户提示词前注入当前时间（ReportEngine 不注入）
+        self.with_current_time = with_current_time
+
+        # 同一 (base_url, api_key) 的客户端进程内共享，复用 keep-alive 连接
+        self.client = get_openai_client(api_key, base_url)
+        # 并行研究多个段落时限制同时进行的请求数与每秒请求数（0 表示不限），重试等待期间不占用名额；
+        # 限流器按 base_url 进程内共享，与 AsyncLLMClient 及指向同一服务商的其它引擎共用同一份限额；
+        # 两项都不限时（如 ReportEngine）不登记限流器，以免它的配置成为该服务商的限额
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        if max_concurrency > 0 or requests_per_second > 0:
+            self._slots = get_provider_limiter(base_url, max_concurrency, requests_per_second)
+        else:
+            self._slots = contextlib.nullcontext()
+
+    def _messages(self, system_prompt: str, user_prompt: str):
+        if self.with_current_time:
+            return build_messages(system_prompt, user_prompt)
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    @with_retry(LLM_RETRY_CONFIG)
+    def invoke(self, system_prompt: str, user_prompt: str, **kwargs) -> str:
+        messages = self._messages(system_prompt, user_prompt)
+
+        allowed_keys = {"temperature", "top_p", "presence_penalty", "frequency_penalty", "stream"}
+        extra_params = {key: value for key, value in kwargs.items() if key in allowed_keys and value is not None}
+
+        timeout = kwargs.pop("timeout", self.timeout)
+
+        with self._slots:
+            response = chat_completion(
+                self.client,
+                self.engine_name,
+                model=self.model_name,
+                messages=messages,
+                timeout=timeout,
+                **extra_params,
+            )
+
+        if response.choices and response.choices[0].message:
+            return self.validate_response(response.choices[0].message.content)
+        return ""
+
+    @with_retry(LLM_RETRY_CONFIG)
+    def stream_invoke(self, system_prompt: str, user_prompt: str, **kwargs) -> Generator[str, None, None]:
+        """
+        流式调用LLM，逐步返回响应内容
+
+        Args:
+            system_prompt: 系统提示词
+            user_prompt: 用户提示词
+            **kwargs: 额外参数（temperature, top_p等）
+
+        Yields:
+            响应文本块（str）
+        """
+        messages = self._messages(system_prompt, user_prompt)
+
+        allowed_keys = {"temperature", "top_p", "presence_penalty", "frequency_penalty"}
+        extra_params = {key: value for key, value in kwargs.items() if key in allowed_keys and value is not None}
+
+        timeout = kwargs.pop("timeout", self.timeout)
+
+        try:
+            with self._slots:
+                yield from stream_chat_completion(
+                    self.client,
+                    self.engine_name,
+                    model=self.model_name,
+                    messages=messages,
+                    timeout=timeout,
+                    **extra_params,
+                )
+        except Exception as e:
+            logger.error(f"流式请求失败: {str(e)}")
+            raise e
+
+    def stream_invoke_to_string(self, system_prompt: str, user_prompt: str, cache_node: Optional[str] = None,
+                                validate: Optional[Callable[[str], bool]] = None, **kwargs) -> str:
+        """
+        流式调用LLM并安全地拼接为完整字符串（避免UTF-8多字节字符截断）
+
+        Args:
+            system_prompt: 系统提示词
+            user_prompt: 用户提示词
+            cache_node: 调用方节点名称；该节点开启了LLM响应缓存时先查缓存（见 utils/llm_cache.py）
+            validate: 判断响应能否被节点解析；只有通过校验的响应才写入缓存，命中但未通过校验的条目会被清除并重新请求。
+                      未提供时不写入缓存
+            **kwargs: 额外参数（temperature, top_p等）
+
+        Returns:
+            完整的响应字符串
+        """
+        cache = get_llm_cache(cache_node) if cache_node else None
+        if cache is not None:
+            cached = cache.lookup(cache_node, self.model_name, system_prompt, user_prompt, kwargs)
+            if cached is not None:
+                if validate is not None and validate(cached):
+                    return cached
+                cache.evict(cache_node, self.model_name, system_prompt, user_prompt, kwargs)
+
+        # 以字节形式收集所有块
+        byte_chunks = []
+        for chunk in self.stream_invoke(system_prompt, user_prompt, **kwargs):
+            byte_chunks.append(chunk.encode('utf-8'))
+
+        # 拼接所有字节，然后一次性解码
+        response = b''.join(byte_chunks).decode('utf-8', errors='replace') if byte_chunks else ""
+        if cache is not None and validate is not None and validate(response):
+            cache.store(cache_node, self.model_name, system_prompt, user_prompt, response, kwargs)
+        return response
+
+    @staticmethod
+    def validate_response(response: Optional[str]) -> str:
+        if response is None:
+            return ""
+        return response.strip()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """本进程中该引擎的 LLM 调用指标（调用次数、错误数、token 用量、延迟与 TTFB）"""
+        return llm_metrics.snapshot(self.engine_name)
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "model": self.model_name,
+            "api_base": self.base_url or "default",
+            "max_concurrency": self.max_concurrency or "unlimited",
+            "requests_per_second": self.requests_per_second or "unlimited",
+        }
@@ -0,0 +1,218 @@
+"""
+LLM 请求的连接池与限流工具
+供各引擎的 LLMClient（同步）与 AsyncLLMClient（utils/llm_async_client.py）共同使用：
+
+- 同一服务商（base_url）的请求共享一个并发上限和一个令牌桶，与发起方是同步线程还是协程无关，
+  多个引擎、多个段落工作线程指向同一服务商时合计不超过其限额
+- 同一事件循环内的所有 AsyncLLMClient 共享一个 HTTP 连接池（keep-alive 连接复用，安装了 h2 时启用 HTTP/2）
+
+限流器基于线程原语，进程内全局共享；httpx 连接绑定在创建时的事件循环上，因此连接池按事件循环分别维护，
+事件循环被回收后自动释放。
+"""
+
+import asyncio
+import collections
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+
+import httpx
+from openai import DefaultAsyncHttpxClient
+
+from llm_registry import HTTP2_AVAILABLE
+
+class TokenBucket:
+    """令牌桶限速器：每秒补充 rate 个令牌，最多积攒 capacity 个（允许的突发请求数），线程安全"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = max(1.0, capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """预订一个令牌，返回需要等待的秒数；令牌不足时记为欠额，后到的请求排在其后（按到达顺序）"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class SharedSemaphore:
+    """
+    线程与协程共用的信号量
+
+    名额不足时按到达顺序排队：线程在 threading.Event 上阻塞，协程在所属事件循环的 Future 上等待，
+    release() 把名额直接交给队首的等待者，协程等待期间不占用线程也不轮询。
+    """
+
+    def __init__(self, value: int):
+        self._value = value
+        self._lock = threading.Lock()
+        self._waiters: "collections.deque" = collections.deque()
+
+    def acquire(self):
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            future = loop.create_future()
+            self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(future)
+                    granted = False
+                except ValueError:
+                    granted = True
+            # 取消前名额已经交给了本协程，转交给下一个等待者
+            if granted:
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                try:
+                    waiter.get_loop().call_soon_threadsafe(_grant, waiter)
+                    return
+                except RuntimeError:
+                    # 等待者所在的事件循环已关闭
+                    continue
+            self._value += 1
+
+
+def _grant(future: "asyncio.Future"):
+    if not future.done():
+        future.set_result(None)
+
+
+class ProviderLimiter:
+    """
+    单个服务商的限流：并发请求数上限 + 每秒请求数上限
+
+    同步代码用 `with limiter: ...`，协程用 `async with limiter: ...`，两者占用同一份名额。
+    """
+
+    def __init__(self, max_concurrency: int = 0, requests_per_second: float = 0.0):
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self._semaphore = SharedSemaphore(max_concurrency) if max_concurrency > 0 else None
+        self._bucket = TokenBucket(requests_per_second) if requests_per_second > 0 else None
+
+    def __enter__(self):
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        if self._bucket is not None:
+            try:
+                self._bucket.acquire()
+            except BaseException:
+                self._release()
+                raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._release()
+        return False
+
+    async def __aenter__(self):
+        if self._semaphore is not None:
+            await self._semaphore.acquire_async()
+        if self._bucket is not None:
+            try:
+                await self._bucket.acquire_async()
+            except BaseException:
+                self._release()
+                raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._release()
+        return False
+
+    def _release(self):
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_provider_limiter(base_url: Optional[str], max_concurrency: int = 0,
+                         requests_per_second: float = 0.0) -> ProviderLimiter:
+    """
+    获取 base_url 对应的限流器（进程内共享，同步与异步客户端共用）
+
+    同一服务商的限额以首个创建限流器的客户端配置为准。
+    """
+    key = (base_url or "default").rstrip("/")
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = ProviderLimiter(max_concurrency, requests_per_second)
+        return limiter
+
+
+class _LoopResources:
+    def __init__(self):
+        self.http_client: Optional[httpx.AsyncClient] = None
+
+
+_loop_resources: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources]" = weakref.WeakKeyDictionary()
+
+
+def _resources() -> _LoopResources:
+    loop = asyncio.get_running_loop()
+    resources = _loop_resources.get(loop)
+    if resources is None:
+        resources = _loop_resources[loop] = _LoopResources()
+    return resources
+
+
+def get_async_http_client(max_connections: int = 100) -> httpx.AsyncClient:
+    """当前事件循环共享的 HTTP 连接池（首次调用时按 max_connections 创建）"""
+    resources = _resources()
+    if resources.http_client is None or resources.http_client.is_closed:
+        resources.http_client = DefaultAsyncHttpxClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+    return resources.http_client
+
+
+async def aclose_shared_clients():
+    """关闭当前事件循环的共享连接池（在事件循环结束前调用）"""
+    resources = _loop_resources.pop(asyncio.get_running_loop(), None)
+    if resources is not None and resources.http_client is not None:
+        await resources.http_client.aclose()
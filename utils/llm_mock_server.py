@@ -0,0 +1,216 @@
+"""
+本地 OpenAI 兼容模拟服务，用于 LLM 客户端的基准测试
+
+- POST /v1/chat/completions  支持普通与流式（SSE）响应，返回 usage；首 token 延迟与输出速度可配置
+- GET  /v1/models            模型列表
+- GET  /stats                请求数与服务端接受的 TCP 连接数（连接数远小于请求数说明连接被复用）
+
+--benchmark 在模拟服务上对比两种客户端用法：每次调用新建 OpenAI 客户端（原实现）与 llm_registry 的共享客户端，
+报告吞吐、新建连接数，以及 llm_metrics 统计的平均延迟与 TTFB。
+
+用法:
+    python utils/llm_mock_server.py --serve --port 8900 --ttfb-ms 200 --tokens-per-sec 50
+    python utils/llm_mock_server.py --benchmark --requests 200 --concurrency 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from llm_registry import get_openai_client, llm_metrics, stream_chat_completion
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """统计接受的连接数与请求数的模拟服务"""
+
+    daemon_threads = True
+
+    def __init__(self, address, ttfb_ms: float = 100.0, tokens_per_sec: float = 200.0, response_tokens: int = 50):
+        super().__init__(address, _MockHandler)
+        self.ttfb = ttfb_ms / 1000.0
+        self.token_interval = 1.0 / tokens_per_sec if tokens_per_sec > 0 else 0.0
+        self.response_tokens = response_tokens
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # 客户端关闭连接属于正常情况（如每次调用新建客户端的基准组）
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 逐块写出 SSE，关闭 Nagle 算法避免小包被延迟
+    disable_nagle_algorithm = True
+    server: MockLLMServer
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(200, {"connections": self.server.connections, "requests": self.server.requests})
+        elif self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "mock-model", "object": "model", "owned_by": "mock"}]})
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        self.server.count_request()
+        model = request.get("model", "mock-model")
+        prompt_tokens = sum(len(str(message.get("content", ""))) for message in request.get("messages", []))
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": self.server.response_tokens,
+                 "total_tokens": prompt_tokens + self.server.response_tokens}
+        time.sleep(self.server.ttfb)
+
+        if not request.get("stream"):
+            time.sleep(self.server.token_interval * self.server.response_tokens)
+            self._send_json(200, {
+                "id": "chatcmpl-mock", "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "模拟" * self.server.response_tokens},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send_event(payload: Any) -> None:
+            data = f"data: {payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        for index in range(self.server.response_tokens):
+            if index:
+                time.sleep(self.server.token_interval)
+            send_event({"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                        "choices": [{"index": 0, "delta": {"content": "模拟"}, "finish_reason": None}]})
+        send_event({"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage})
+        send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(host: str = "127.0.0.1", port: int = 0, **options) -> MockLLMServer:
+    """在后台线程启动模拟服务（port=0 时随机端口），返回服务对象"""
+    server = MockLLMServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="llm-mock-server", daemon=True).start()
+    return server
+
+
+def _stream_once(client, engine: str) -> None:
+    for _ in stream_chat_completion(client, engine, model="mock-model",
+                                    messages=[{"role": "user", "content": "基准测试"}]):
+        pass
+
+
+def benchmark(requests: int = 200, concurrency: int = 8, url: Optional[str] = None, **options) -> Dict[str, Any]:
+    """
+    对比每次调用新建客户端与共享客户端的吞吐与连接数
+
+    Returns:
+        {"per_call_client": {...}, "shared_client": {...}}，每项包含 seconds、requests_per_sec、connections 与 llm_metrics 统计
+    """
+    from openai import OpenAI
+
+    server = None
+    if not url:
+        server = start_mock_server(**options)
+        url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    def connections() -> int:
+        return server.connections if server else 0
+
+    report: Dict[str, Any] = {}
+    for name, make_client in (
+        ("per_call_client", lambda: OpenAI(api_key="mock", base_url=url, max_retries=0)),
+        ("shared_client", lambda: get_openai_client("mock", url)),
+    ):
+        llm_metrics.reset()
+        opened = connections()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda _: _stream_once(make_client(), name), range(requests)))
+        seconds = time.perf_counter() - started
+        report[name] = {
+            "seconds": round(seconds, 3),
+            "requests_per_sec": round(requests / seconds, 1),
+            "connections": connections() - opened if server else None,
+            **llm_metrics.snapshot(name),
+        }
+        logger.info(f"{name:>15}: {requests} 次请求  耗时 {seconds:6.2f}s  吞吐 {report[name]['requests_per_sec']:7.1f} 次/s  "
+                    f"新建连接 {report[name]['connections']}  平均TTFB {report[name]['avg_ttfb_seconds']:.3f}s")
+
+    if server:
+        server.shutdown()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 OpenAI 兼容模拟服务 / LLM 客户端基准测试")
+    parser.add_argument("--serve", action="store_true", help="启动模拟服务（阻塞运行）")
+    parser.add_argument("--benchmark", action="store_true", help="对比每次新建客户端与共享客户端")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8900, help="监听端口")
+    parser.add_argument("--ttfb-ms", type=float, default=100.0, help="首 token 延迟（毫秒）")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0, help="输出速度（token/秒）")
+    parser.add_argument("--response-tokens", type=int, default=50, help="每次响应的 token 数")
+    parser.add_argument("--requests", type=int, default=200, help="基准测试的请求数")
+    parser.add_argument("--concurrency", type=int, default=8, help="基准测试的并发数")
+    parser.add_argument("--url", help="基准测试使用已有服务的 BaseUrl，默认在进程内启动模拟服务")
+    args = parser.parse_args()
+    options = {"ttfb_ms": args.ttfb_ms, "tokens_per_sec": args.tokens_per_sec, "response_tokens": args.response_tokens}
+
+    if args.serve:
+        server = MockLLMServer((args.host, args.port), **options)
+        logger.info(f"模拟 LLM 服务已启动: http://{args.host}:{args.port}/v1")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    elif args.benchmark:
+        benchmark(args.requests, args.concurrency, args.url, **options)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+进程级共享的 OpenAI 兼容客户端与 LLM 调用指标
+
+各引擎的 LLMClient、ReportEngine、ForumHost 与 KeywordOptimizer 原先各自创建 OpenAI 客户端，
+彼此不共享连接，对同一个 BaseUrl 反复做 TLS 握手。本模块：
+
+- get_openai_client: 按 (base_url, api_key) 复用 OpenAI 客户端，所有客户端共用一个 keep-alive 连接池
+  （DEFAULT_MAX_CONNECTIONS），安装了 h2 时启用 HTTP/2
+- chat_completion / stream_chat_completion（及其异步版本）: 发起请求并按引擎记录调用次数、错误数、
+  token 用量、总延迟与首 token 延迟（TTFB）；流式响应的 token 用量只在服务商返回 usage 时统计
+- llm_metrics: 指标汇总，snapshot() 返回各引擎的统计
+- build_messages: 组装对话消息（用户提示词前注入当前时间），同步与异步客户端及 ForumHost 共用
+
+基准测试可使用本地模拟服务 utils/llm_mock_server.py。
+"""
+
+import importlib.util
+import itertools
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from openai import APIError, AsyncOpenAI, DefaultHttpxClient, OpenAI
+
+# 安装 h2 后 httpx 才能协商 HTTP/2
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+DEFAULT_MAX_CONNECTIONS = 100
+
+
+def build_messages(system_prompt: str, user_prompt: str) -> List[Dict[str, str]]:
+    """在用户提示词前加上当前时间，组装对话消息"""
+    current_time = datetime.now().strftime("%Y年%m月%d日%H时%M分")
+    time_prefix = f"今天的实际时间是{current_time}"
+    if user_prompt:
+        user_prompt = f"{time_prefix}\n{user_prompt}"
+    else:
+        user_prompt = time_prefix
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def _usage_value(usage: Any, name: str) -> int:
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return value or 0
+
+
+class LLMMetrics:
+    """按引擎汇总的 LLM 调用指标，线程安全"""
+
+    _FIELDS = ("calls", "errors", "prompt_tokens", "completion_tokens", "latency_seconds", "ttfb_seconds")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engines: Dict[str, Dict[str, float]] = {}
+
+    def record(self, engine: str, latency: float, ttfb: Optional[float] = None, usage: Any = None,
+               error: bool = False) -> None:
+        with self._lock:
+            stats = self._engines.setdefault(engine, {**{name: 0 for name in self._FIELDS}, "max_latency_seconds": 0.0})
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["latency_seconds"] += latency
+            stats["ttfb_seconds"] += latency if ttfb is None else ttfb
+            stats["max_latency_seconds"] = max(stats["max_latency_seconds"], latency)
+            if usage is not None:
+                stats["prompt_tokens"] += _usage_value(usage, "prompt_tokens")
+                stats["completion_tokens"] += _usage_value(usage, "completion_tokens")
+
+    def snapshot(self, engine: Optional[str] = None) -> Dict[str, Any]:
+        """各引擎统计（含平均延迟与平均 TTFB）；指定 engine 时只返回该引擎"""
+        with self._lock:
+            engines = {name: dict(stats) for name, stats in self._engines.items() if engine in (None, name)}
+        for stats in engines.values():
+            calls = stats["calls"] or 1
+            stats["avg_latency_seconds"] = round(stats["latency_seconds"] / calls, 3)
+            stats["avg_ttfb_seconds"] = round(stats["ttfb_seconds"] / calls, 3)
+            stats["latency_seconds"] = round(stats["latency_seconds"], 3)
+            stats["ttfb_seconds"] = round(stats["ttfb_seconds"], 3)
+            stats["max_latency_seconds"] = round(stats["max_latency_seconds"], 3)
+        return engines.get(engine, {}) if engine else engines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._engines.clear()
+
+
+llm_metrics = LLMMetrics()
+
+_clients: Dict[Tuple[str, str], OpenAI] = {}
+_http_client: Optional[httpx.Client] = None
+_registry_lock = threading.Lock()
+
+
+def _shared_http_client(max_connections: int) -> httpx.Client:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = DefaultHttpxClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+    return _http_client
+
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None, max_retries: int = 0,
+                      max_connections: int = DEFAULT_MAX_CONNECTIONS) -> OpenAI:
+    """
+    获取 (base_url, api_key) 对应的共享 OpenAI 客户端
+
+    所有客户端共用同一个 HTTP 连接池（首次创建时按 max_connections 设定容量）；
+    max_retries 不同的调用方得到共享连接的副本（with_options）。
+    """
+    key = ((base_url or "").rstrip("/"), api_key)
+    with _registry_lock:
+        client = _clients.get(key)
+        if client is None:
+            client_kwargs: Dict[str, Any] = {
+                "api_key": api_key,
+                "max_retries": 0,
+                "http_client": _shared_http_client(max_connections),
+            }
+            if base_url:
+                client_kwargs["base_url"] = base_url
+            client = _clients[key] = OpenAI(**client_kwargs)
+    return client if max_retries == 0 else client.with_options(max_retries=max_retries)
+
+
+def chat_completion(client: OpenAI, engine: str, **kwargs) -> Any:
+    """非流式请求，记录延迟与 token 用量"""
+    started = time.perf_counter()
+    try:
+        response = client.chat.completions.create(**kwargs)
+    except Exception:
+        llm_metrics.record(engine, time.perf_counter() - started, error=True)
+        raise
+    llm_metrics.record(engine, time.perf_counter() - started, usage=getattr(response, "usage", None))
+    return response
+
+
+def _iter_sse_data(response) -> Iterator[Dict[str, Any]]:
+    """
+    逐个解析 SSE 的 data 事件
+
+    按 SSE 规范解析：同一事件的多行 data 以换行拼接，空行结束一个事件，以冒号开头的注释行（心跳）
+    与 event/id/retry 等其它字段忽略。
+
+    openai 同步 Stream 读到 [DONE] 即关闭响应，HTTP/1.1 连接因响应体未读完而被丢弃，每次流式请求都要重新建连；
+    这里读到 [DONE] 后继续读完响应体，连接才能放回连接池复用。
+    """
+    done = False
+    data_lines: List[str] = []
+    for line in itertools.chain(response.iter_lines(), [""]):
+        if line:
+            field, _, value = line.partition(":")
+            if field == "data" and not done:
+                data_lines.append(value[1:] if value.startswith(" ") else value)
+            continue
+        if not data_lines:
+            continue
+        data, data_lines = "\n".join(data_lines), []
+        if data.startswith("[DONE]"):
+            done = True
+            continue
+        payload = json.loads(data)
+        if isinstance(payload, dict) and payload.get("error"):
+            error = payload["error"]
+            message = error.get("message") if isinstance(error, dict) else None
+            raise APIError(message=message or "An error occurred during streaming",
+                           request=response.http_request, body=error)
+        yield payload
+
+
+def stream_chat_completion(client: OpenAI, engine: str, **kwargs) -> Iterator[str]:
+    """流式请求，逐块返回文本内容，记录首 token 延迟、总延迟与（服务商返回时的）token 用量"""
+    started = time.perf_counter()
+    ttfb, usage, error = None, None, True
+    try:
+        with client.chat.completions.with_streaming_response.create(stream=True, **kwargs) as response:
+            for chunk in _iter_sse_data(response):
+                usage = chunk.get("usage") or usage
+                choices = chunk.get("choices") or []
+                content = (choices[0].get("delta") or {}).get("content") if choices else None
+                if content:
+                    if ttfb is None:
+                        ttfb = time.perf_counter() - started
+                    yield content
+        error = False
+    except GeneratorExit:
+        # 调用方提前结束读取，不算错误
+        error = False
+        raise
+    finally:
+        llm_metrics.record(engine, time.perf_counter() - started, ttfb=ttfb, usage=usage, error=error)
+
+
+async def achat_completion(client: AsyncOpenAI, engine: str, **kwargs) -> Any:
+    """chat_completion 的异步版本"""
+    started = time.perf_counter()
+    try:
+        response = await client.chat.completions.create(**kwargs)
+    except Exception:
+        llm_metrics.record(engine, time.perf_counter() - started, error=True)
+        raise
+    llm_metrics.record(engine, time.perf_counter() - started, usage=getattr(response, "usage", None))
+    return response
+
+
+async def astream_chat_completion(client: AsyncOpenAI, engine: str, **kwargs) -> AsyncIterator[str]:
+    """stream_chat_completion 的异步版本"""
+    started = time.perf_counter()
+    ttfb, usage, error = None, None, True
+    try:
+        stream = await client.chat.completions.create(stream=True, **kwargs)
+        async for chunk in stream:
+            usage = getattr(chunk, "usage", None) or usage
+            if chunk.choices and len(chunk.choices) > 0:
+                delta = chunk.choices[0].delta
+                if delta and delta.content:
+                    if ttfb is None:
+                        ttfb = time.perf_counter() - started
+                    yield delta.content
+        error = False
+    except GeneratorExit:
+        # 调用方提前结束读取，不算错误
+        error = False
+        raise
+    finally:
+        llm_metrics.record(engine, time.perf_counter() - started, ttfb=ttfb, usage=usage, error=error)
@@ -0,0 +1,173 @@
+"""
+总结节点的提示词 token 预算
+
+FirstSummaryNode / ReflectionSummaryNode 的提示词由 HOST 发言、段落标题与内容、段落当前状态和搜索结果组成，
+搜索结果每条最长可达数万字符，整段提示词经常远超实际需要，拖慢响应并增加费用。本模块：
+
+- count_tokens: 统计 token 数；安装了 tiktoken 时使用 cl100k_base 编码，否则按中文每字 1 个、
+  其它字符每 4 个 1 个估算（对中文模型偏保守）
+- pack_search_results: 按与查询的相关度排序搜索结果，在 token 预算内优先装入最相关的结果，
+  放不下的结果截断或跳过
+- budget_summary_input: 总结节点使用，扣除其它部分后把剩余预算留给搜索结果，并记录各部分 token 数与预算
+"""
+
+import importlib.util
+import json
+import math
+import re
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+# 预算紧张时，搜索结果至少保留总预算的这一比例
+MIN_SEARCH_RESULTS_SHARE = 0.5
+# 单条搜索结果最多占用搜索结果预算的这一比例，避免一条超长结果挤掉其它结果
+MAX_RESULT_SHARE = 0.5
+# 剩余预算不足该 token 数时不再截断装入，截得太短的结果没有参考价值
+MIN_TRUNCATED_TOKENS = 200
+# 排序时相关度与搜索引擎原始排名的权重
+RELEVANCE_WEIGHT = 0.7
+# 计算相关度时只看每条结果的前若干字符（标题与开头最能反映主题，也避免对超长结果逐字切分）
+RANK_WINDOW_CHARS = 4000
+
+_CJK = re.compile(r"[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]")
+_HAN_RUN = re.compile(r"[\u4e00-\u9fff]+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+_encoding = None
+_encoding_checked = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_checked
+    if not _encoding_checked:
+        _encoding_checked = True
+        if importlib.util.find_spec("tiktoken") is not None:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning(f"tiktoken 编码加载失败，按字符数估算 token: {e}")
+    return _encoding
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """统计文本的 token 数"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    cjk = len(text) - len(_CJK.sub("", text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """把文本截断到不超过 max_tokens 个 token，截断时末尾加 ..."""
+    if max_tokens <= 0:
+        return ""
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens - 1]) + "..."
+    # 按比例估算截断位置，再逐步收缩到预算以内
+    length = int(len(text) * (max_tokens - 1) / tokens)
+    while length > 0 and count_tokens(text[:length]) + 1 > max_tokens:
+        length = min(length - 1, int(length * 0.98))
+    return text[:length] + "..."
+
+
+def _terms(text: str) -> set:
+    """检索词项：中文字符二元组与英文/数字单词"""
+    text = text.lower()
+    terms = set(_WORD.findall(text))
+    for run in _HAN_RUN.findall(text):
+        terms.update(run[i:i + 2] for i in range(max(1, len(run) - 1)))
+    return terms
+
+
+def rank_search_results(query: str, results: List[str]) -> List[int]:
+    """
+    按相关度返回搜索结果下标（由高到低）
+
+    相关度为查询词项在结果中的覆盖率，与搜索引擎原始排名加权（RELEVANCE_WEIGHT），
+    查询为空时保持原始顺序。
+    """
+    query_terms = _terms(query or "")
+    count = len(results)
+    scores = []
+    for index, result in enumerate(results):
+        prior = 1 - index / count
+        if query_terms:
+            coverage = len(query_terms & _terms(result[:RANK_WINDOW_CHARS])) / len(query_terms)
+            score = RELEVANCE_WEIGHT * coverage + (1 - RELEVANCE_WEIGHT) * prior
+        else:
+            score = prior
+        scores.append((-score, index))
+    return [index for _, index in sorted(scores)]
+
+
+def pack_search_results(query: str, results: List[str], budget_tokens: int) -> List[str]:
+    """
+    在 budget_tokens 内按相关度装入搜索结果（最相关的在前）
+
+    单条结果先截断到预算的 MAX_RESULT_SHARE 以内；放不下时，剩余预算不少于 MIN_TRUNCATED_TOKENS 则截断装入，
+    否则跳过并尝试后面更短的结果。
+    """
+    packed = []
+    remaining = budget_tokens
+    result_cap = max(MIN_TRUNCATED_TOKENS, int(budget_tokens * MAX_RESULT_SHARE))
+    for index in rank_search_results(query, results):
+        if remaining <= 0:
+            break
+        result = truncate_to_tokens(results[index], result_cap)
+        tokens = count_tokens(result)
+        if tokens <= remaining:
+            packed.append(result)
+            remaining -= tokens
+        elif remaining >= MIN_TRUNCATED_TOKENS:
+            packed.append(truncate_to_tokens(result, remaining))
+            remaining = 0
+    return packed
+
+
+def budget_summary_input(node: str, system_prompt: str, data: Dict[str, Any], budget_tokens: int) -> Dict[str, Any]:
+    """
+    按 token 预算裁剪总结节点的输入，并记录实际与预算 token 数
+
+    Args:
+        node: 节点名称（用于日志）
+        system_prompt: 系统提示词
+        data: 总结节点输入（search_query、search_results，以及可选的 host_speech、paragraph_latest_state 等）
+        budget_tokens: 整个提示词的 token 预算，0 表示不限（只记录 token 数）
+
+    Returns:
+        search_results 已按预算装入的新输入
+    """
+    results = [str(result) for result in data.get("search_results") or []]
+    sections = {
+        "system_prompt": count_tokens(system_prompt),
+        "host_speech": count_tokens(data.get("host_speech")),
+        "paragraph_state": count_tokens(data.get("paragraph_latest_state")),
+    }
+    other = {key: value for key, value in data.items()
+             if key not in ("search_results", "host_speech", "paragraph_latest_state")}
+    sections["paragraph"] = count_tokens(json.dumps(other, ensure_ascii=False))
+
+    packed = results
+    if budget_tokens > 0:
+        fixed = sum(sections.values())
+        results_budget = max(budget_tokens - fixed, int(budget_tokens * MIN_SEARCH_RESULTS_SHARE))
+        packed = pack_search_results(data.get("search_query", ""), results, results_budget)
+
+    sections["search_results"] = sum(count_tokens(result) for result in packed)
+    total = sum(sections.values())
+    original = total - sections["search_results"] + sum(count_tokens(result) for result in results)
+    breakdown = "，".join(f"{name} {tokens}" for name, tokens in sections.items())
+    logger.info(
+        f"{node} 提示词 token: {total}/{budget_tokens or '不限'}（{breakdown}；"
+        f"搜索结果保留 {len(packed)}/{len(results)} 条，裁剪前共 {original}）"
+    )
+    return {**data, "search_results": packed}
@@ -3,6 +3,8 @@
 提供通用的网络请求重试功能，增强系统健壮性
 """
 
+import asyncio
+import random
 import time
 from functools import wraps
 from typing import Callable, Any
@@ -111,6 +113,56 @@ def with_retry(config: RetryConfig = None):
         return wrapper
     return decorator
 
+def with_async_retry(config: RetryConfig = None):
+    """
+    协程版本的重试装饰器
+    
+    等待期间使用 asyncio.sleep，不阻塞事件循环；退避时间带随机抖动（取计算值的 50%~100%），
+    避免并发请求同时失败后又在同一时刻重试。
+    
+    Args:
+        config: 重试配置，如果不提供则使用默认配置
+    
+    Returns:
+        装饰器函数
+    """
+    if config is None:
+        config = DEFAULT_RETRY_CONFIG
+    
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            for attempt in range(config.max_retries + 1):
+                try:
+                    result = await func(*args, **kwargs)
+                    if attempt > 0:
+                        logger.info(f"函数 {func.__name__} 在第 {attempt + 1} 次尝试后成功")
+                    return result
+                
+                except config.retry_on_exceptions as e:
+                    if attempt == config.max_retries:
+                        logger.error(f"函数 {func.__name__} 在 {config.max_retries + 1} 次尝试后仍然失败")
+                        logger.error(f"最终错误: {str(e)}")
+                        raise e
+                    
+                    delay = min(
+                        config.initial_delay * (config.backoff_factor ** attempt),
+                        config.max_delay
+                    )
+                    delay = delay / 2 + random.uniform(0, delay / 2)
+                    
+                    logger.warning(f"函数 {func.__name__} 第 {attempt + 1} 次尝试失败: {str(e)}")
+                    logger.info(f"将在 {delay:.1f} 秒后进行第 {attempt + 2} 次尝试...")
+                    
+                    await asyncio.sleep(delay)
+                
+                except Exception as e:
+                    logger.error(f"函数 {func.__name__} 遇到不可重试的异常: {str(e)}")
+                    raise e
+            
+        return wrapper
+    return decorator
+
 def retry_on_network_error(
     max_retries: int = 3,
     initial_delay: float = 1.0,